@@ -5,3 +5,6 @@ class DictionariesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.dictionaries"
     verbose_name = "数据字典"
+
+    def ready(self):
+        from . import signals  # noqa: F401
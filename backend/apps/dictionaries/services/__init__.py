@@ -0,0 +1,91 @@
+"""
+数据字典业务逻辑层
+"""
+
+import hashlib
+import json
+
+from apps.utils.cache import CacheNamespace
+from apps.utils.request_cache import request_cached
+
+from ..models import DictionaryItem, DictionaryType
+
+DICTIONARY_CACHE = CacheNamespace(
+    "dictionaries", timeout_setting="DICTIONARY_CACHE_TIMEOUT"
+)
+
+
+class DictionarySnapshotService:
+    """
+    全部启用字典的快照：一次构建（两条查询）后按版本缓存，
+    任何字典类型或条目写入都会提升版本。
+    """
+
+    @staticmethod
+    def get_snapshot():
+        """
+        返回 {"etag": ..., "data": {code: {"name", "items"}}}
+        """
+        return DICTIONARY_CACHE.get_or_set(
+            "snapshot", DictionarySnapshotService._build_snapshot
+        )
+
+    @staticmethod
+    def _build_snapshot():
+        from ..serializers import DictionaryItemSimpleSerializer
+
+        data = {
+            code: {"name": name, "items": []}
+            for code, name in DictionaryType.objects.filter(is_active=True)
+            .order_by("id")
+            .values_list("code", "name")
+        }
+        items = (
+            DictionaryItem.objects.filter(dict_type__is_active=True, is_active=True)
+            .select_related("dict_type")
+            .order_by("dict_type_id", "sort_order", "id")
+        )
+        for item in items:
+            data[item.dict_type.code]["items"].append(
+                DictionaryItemSimpleSerializer(item).data
+            )
+        digest = hashlib.sha1(
+            json.dumps(data, sort_keys=True, ensure_ascii=False, default=str).encode()
+        ).hexdigest()
+        return {"etag": f'"dict-{digest}"', "data": data}
+
+    @staticmethod
+    def get_dictionaries(codes=None):
+        """
+        按编码取快照中的字典；codes 为 None 时返回全部
+        """
+        data = DictionarySnapshotService.get_snapshot()["data"]
+        if codes is None:
+            return data
+        return {code: data[code] for code in codes if code in data}
+
+    @staticmethod
+    def get_label_map(code):
+        """
+        字典类型下全部条目（含停用条目）的 {value: label}，用于把存储的编码显示为名称
+        """
+        return request_cached(
+            f"{DICTIONARY_CACHE.prefix}labels:{code}",
+            lambda: DICTIONARY_CACHE.get_or_set(
+                f"labels:{code}",
+                lambda: DictionarySnapshotService._build_label_map(code),
+            ),
+        )
+
+    @staticmethod
+    def _build_label_map(code):
+        labels = {}
+        for value, label in DictionaryItem.objects.filter(
+            dict_type__code=code
+        ).values_list("value", "label"):
+            labels.setdefault(value, label)
+        return labels
+
+    @staticmethod
+    def invalidate_cache():
+        DICTIONARY_CACHE.invalidate()
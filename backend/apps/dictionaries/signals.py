@@ -0,0 +1,8 @@
+"""
+字典类型或条目变更时失效字典快照
+"""
+
+from .models import DictionaryItem, DictionaryType
+from .services import DICTIONARY_CACHE
+
+DICTIONARY_CACHE.invalidate_on(DictionaryType, DictionaryItem)
@@ -1,8 +1,12 @@
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.db import connection
 from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from apps.dictionaries.models import DictionaryItem, DictionaryType
@@ -155,3 +159,129 @@ class DictionaryItemApiValidationTestCase(TestCase):
             "dictionary_templates/innovation-template",
             response_item["template_file"],
         )
+
+
+class DictionarySnapshotApiTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="dictionary_reader",
+            password="password123",
+            real_name="字典读取",
+            employee_id="D20001",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.dict_type = DictionaryType.objects.create(
+            code="snapshot_test", name="快照测试"
+        )
+        DictionaryItem.objects.create(
+            dict_type=self.dict_type, value="B", label="乙", sort_order=2
+        )
+        DictionaryItem.objects.create(
+            dict_type=self.dict_type, value="A", label="甲", sort_order=1
+        )
+        DictionaryItem.objects.create(
+            dict_type=self.dict_type, value="X", label="停用", is_active=False
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_all_returns_etag_and_not_modified_on_match(self):
+        response = self.client.get("/api/v1/dictionaries/types/all/")
+
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag)
+        self.assertEqual(
+            [item["value"] for item in response.data["snapshot_test"]["items"]],
+            ["A", "B"],
+        )
+
+        cached = self.client.get(
+            "/api/v1/dictionaries/types/all/", HTTP_IF_NONE_MATCH=f"W/{etag}"
+        )
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.content, b"")
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_dictionary_writes_change_etag(self):
+        etag = self.client.get("/api/v1/dictionaries/types/all/")["ETag"]
+
+        DictionaryItem.objects.filter(value="A").first().delete()
+        response = self.client.get(
+            "/api/v1/dictionaries/types/all/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            [item["value"] for item in response.data["snapshot_test"]["items"]],
+            ["B"],
+        )
+
+    def test_snapshot_is_cached_and_invalidated_by_bulk_create(self):
+        admin_role, _ = Role.objects.get_or_create(
+            code="LEVEL1_ADMIN",
+            defaults={"name": "校级管理员", "scope_dimension": "SCHOOL"},
+        )
+        admin = User.objects.create_user(
+            username="dictionary_snapshot_admin",
+            password="password123",
+            role_fk=admin_role,
+            real_name="字典管理员",
+            employee_id="D20002",
+        )
+        admin_client = APIClient()
+        admin_client.force_authenticate(user=admin)
+
+        with patch(
+            "apps.utils.cache.connection",
+            new=type("Connection", (), {"in_atomic_block": False})(),
+        ):
+            etag = self.client.get("/api/v1/dictionaries/types/all/")["ETag"]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    "/api/v1/dictionaries/types/by-code/snapshot_test/"
+                )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["ETag"], etag)
+            self.assertEqual(len(queries), 0)
+
+            bulk = admin_client.post(
+                "/api/v1/dictionaries/items/bulk/",
+                {
+                    "dict_type_code": "snapshot_test",
+                    "items": [
+                        {"label": "丙", "value": "C"},
+                        {"label": "甲", "value": "A"},
+                    ],
+                },
+                format="json",
+            )
+            self.assertEqual(bulk.data, {"created": 1, "skipped": 1})
+
+            response = self.client.get(
+                "/api/v1/dictionaries/types/by-code/snapshot_test/",
+                HTTP_IF_NONE_MATCH=etag,
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(
+            [item["value"] for item in response.data["items"]], ["A", "B", "C"]
+        )
+
+    def test_snapshot_builds_with_constant_queries(self):
+        for index in range(20):
+            dict_type = DictionaryType.objects.create(
+                code=f"snapshot_bulk_{index}", name=f"批量{index}"
+            )
+            DictionaryItem.objects.create(dict_type=dict_type, value="V", label="值")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/v1/dictionaries/types/all/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("snapshot_bulk_19", response.data)
+        self.assertLessEqual(len(queries), 2)
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Max
 from django.db.models.deletion import ProtectedError
+from django.utils.http import parse_etags
 from django_filters.rest_framework import DjangoFilterBackend  # type: ignore[import-untyped]
 from rest_framework.filters import SearchFilter
 
@@ -16,10 +17,10 @@ from ..serializers import (
     DictionaryTypeSerializer,
     DictionaryTypeDetailSerializer,
     DictionaryItemSerializer,
-    DictionaryItemSimpleSerializer,
     DictionaryBatchSerializer,
     DictionaryItemBulkSerializer,
 )
+from ..services import DictionarySnapshotService
 from apps.users.permissions import IsLevel1Admin
 from apps.utils.pagination import optional_positive_int
 
@@ -84,26 +85,15 @@ class DictionaryTypeViewSet(viewsets.ModelViewSet):
         根据编码获取字典类型及其条目
         GET /api/dictionaries/types/by-code/{code}/
         """
-        try:
-            dict_type = DictionaryType.objects.prefetch_related("items").get(
-                code=code, is_active=True
-            )
-        except DictionaryType.DoesNotExist:
+        snapshot = DictionarySnapshotService.get_snapshot()
+        dictionary = snapshot["data"].get(code)
+        if dictionary is None:
             return Response(
                 {"detail": f"字典类型 '{code}' 不存在"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-
-        # 只返回启用的条目
-        items = dict_type.items.filter(is_active=True).order_by("sort_order", "id")
-        serializer = DictionaryItemSimpleSerializer(items, many=True)
-
-        return Response(
-            {
-                "code": dict_type.code,
-                "name": dict_type.name,
-                "items": serializer.data,
-            }
+        return _snapshot_response(
+            request, snapshot["etag"], {"code": code, **dictionary}
         )
 
     @action(detail=False, methods=["post"], url_path="batch")
@@ -117,40 +107,35 @@ class DictionaryTypeViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
 
         codes = serializer.validated_data["codes"]
-        result = {}
-
-        dict_types = DictionaryType.objects.prefetch_related("items").filter(
-            code__in=codes, is_active=True
-        )
-
-        for dict_type in dict_types:
-            items = dict_type.items.filter(is_active=True).order_by("sort_order", "id")
-            result[dict_type.code] = {
-                "name": dict_type.name,
-                "items": DictionaryItemSimpleSerializer(items, many=True).data,
-            }
-
-        return Response(result)
+        return Response(DictionarySnapshotService.get_dictionaries(codes))
 
     @action(detail=False, methods=["get"], url_path="all")
     def all_dictionaries(self, request):
         """
         获取所有字典数据（用于前端初始化缓存）
         GET /api/dictionaries/types/all/
+        支持 If-None-Match，字典未变化时返回 304
         """
-        dict_types = DictionaryType.objects.prefetch_related("items").filter(
-            is_active=True
-        )
+        snapshot = DictionarySnapshotService.get_snapshot()
+        return _snapshot_response(request, snapshot["etag"], snapshot["data"])
 
-        result = {}
-        for dict_type in dict_types:
-            items = dict_type.items.filter(is_active=True).order_by("sort_order", "id")
-            result[dict_type.code] = {
-                "name": dict_type.name,
-                "items": DictionaryItemSimpleSerializer(items, many=True).data,
-            }
 
-        return Response(result)
+def _snapshot_response(request, etag, data):
+    """
+    带 ETag 返回字典快照；客户端缓存仍有效时返回 304 且不带响应体
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        candidates = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+        if "*" in candidates or etag in candidates:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response["ETag"] = etag
+            response["Cache-Control"] = "private, no-cache"
+            return response
+    response = Response(data)
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
 
 
 class DictionaryItemViewSet(viewsets.ModelViewSet):
@@ -249,7 +234,7 @@ class DictionaryItemViewSet(viewsets.ModelViewSet):
             or 0
         )
 
-        created_count = 0
+        new_items = []
         skipped_count = 0
         for item in serializer.validated_data:
             label = item.get("label", "").strip()
@@ -261,17 +246,23 @@ class DictionaryItemViewSet(viewsets.ModelViewSet):
                 skipped_count += 1
                 continue
             max_sort += 1
-            DictionaryItem.objects.create(
-                dict_type=dict_type,
-                label=label,
-                value=value,
-                description=item.get("description", ""),
-                extra_data=item.get("extra_data") or {},
-                sort_order=max_sort,
-                is_active=True,
+            new_items.append(
+                DictionaryItem(
+                    dict_type=dict_type,
+                    label=label,
+                    value=value,
+                    description=item.get("description", ""),
+                    extra_data=item.get("extra_data") or {},
+                    sort_order=max_sort,
+                    is_active=True,
+                )
             )
             existing_values.add(value)
-            created_count += 1
+
+        # bulk_create 不触发 post_save，需显式失效字典快照
+        DictionaryItem.objects.bulk_create(new_items)
+        DictionarySnapshotService.invalidate_cache()
+        created_count = len(new_items)
 
         return Response(
             {"created": created_count, "skipped": skipped_count},
@@ -321,5 +312,6 @@ class DictionaryItemViewSet(viewsets.ModelViewSet):
                 {"detail": "存在被引用的条目，无法清空"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        DictionarySnapshotService.invalidate_cache()
 
         return Response({"deleted": deleted_count}, status=status.HTTP_200_OK)
@@ -0,0 +1,3 @@
+"""
+Management package for notifications app.
+"""
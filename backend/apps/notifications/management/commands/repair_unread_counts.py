@@ -0,0 +1,26 @@
+"""
+Recount unread notifications and rewrite the cached per-user counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.notifications.services import NotificationService
+
+
+class Command(BaseCommand):
+    help = "Recount unread notifications from the database and rewrite cached counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            dest="user_ids",
+            help="Only repair the given user (repeatable; default: all users).",
+        )
+
+    def handle(self, *args, **options):
+        processed = NotificationService.repair_unread_counts(options["user_ids"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Repaired unread counters for {processed} users.")
+        )
@@ -2,8 +2,45 @@
 通知业务逻辑层
 """
 
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.utils.cache import is_shared_cache
+
 from ..models import Notification
 
+logger = logging.getLogger(__name__)
+
+UNREAD_COUNT_CACHE_KEY = "notifications:unread:{user_id}"
+
+# 批量写入通知时每条 INSERT / 每个异步任务包含的通知数
+NOTIFICATION_BULK_SIZE = 500
+
+
+def notification_entry(
+    recipient,
+    title,
+    content,
+    notification_type=Notification.NotificationType.SYSTEM,
+    related_project=None,
+):
+    """
+    构造一条待写入的通知（可序列化的字典，便于投递到 Celery）
+    """
+    return {
+        "recipient_id": getattr(recipient, "id", recipient),
+        "title": title,
+        "content": content,
+        "notification_type": notification_type,
+        "related_project_id": getattr(related_project, "id", related_project),
+    }
+
 
 class NotificationService:
     """
@@ -30,19 +67,94 @@ class NotificationService:
         )
 
     @staticmethod
-    def _notify_users(users, title, content, notification_type, related_project=None):
+    def fan_out(
+        recipients,
+        title,
+        content,
+        notification_type=Notification.NotificationType.SYSTEM,
+        related_project=None,
+        *,
+        defer=False,
+    ):
+        """
+        向多个接收人发送同一条通知（接收人可为用户或用户ID，自动去重），
+        返回写入（defer=True 时为计划写入）的通知数。
+        """
+        return NotificationService.send_bulk(
+            [
+                notification_entry(
+                    recipient, title, content, notification_type, related_project
+                )
+                for recipient in recipients
+                if recipient
+            ],
+            defer=defer,
+        )
+
+    @staticmethod
+    def send_bulk(entries, *, defer=False):
+        """
+        批量发送通知。defer=True 时在事务提交后投递到 Celery 写入，
+        业务事务内不再逐条插入通知。
+        """
         unique = {}
-        for user in users:
-            if user and user.id not in unique:
-                unique[user.id] = user
-        for user in unique.values():
-            NotificationService.create_notification(
-                recipient=user,
-                title=title,
-                content=content,
-                notification_type=notification_type,
-                related_project=related_project,
+        for entry in entries:
+            if entry["recipient_id"]:
+                unique.setdefault(tuple(entry.values()), entry)
+        entries = list(unique.values())
+        if not entries:
+            return 0
+        if defer:
+            transaction.on_commit(lambda: NotificationService.dispatch(entries))
+            return len(entries)
+        return NotificationService.write_bulk(entries)
+
+    @staticmethod
+    def write_bulk(entries):
+        """
+        按 NOTIFICATION_BULK_SIZE 分批 bulk_create，返回写入数量
+        """
+        written = 0
+        for start in range(0, len(entries), NOTIFICATION_BULK_SIZE):
+            chunk = entries[start : start + NOTIFICATION_BULK_SIZE]
+            written += len(
+                Notification.objects.bulk_create(
+                    Notification(**entry) for entry in chunk
+                )
             )
+        # bulk_create 不触发 post_save，单独累加未读计数
+        NotificationService.adjust_unread_counts(
+            Counter(entry["recipient_id"] for entry in entries)
+        )
+        return written
+
+    @staticmethod
+    def dispatch(entries):
+        """
+        分批投递通知写入任务到 Celery；投递失败时在当前进程内同步写入。
+        """
+        for start in range(0, len(entries), NOTIFICATION_BULK_SIZE):
+            chunk = entries[start : start + NOTIFICATION_BULK_SIZE]
+            try:
+                from ..tasks import write_notifications
+
+                write_notifications.delay(chunk)
+            except Exception:
+                logger.exception(
+                    "Failed to enqueue %s notifications; writing synchronously",
+                    len(chunk),
+                )
+                NotificationService.write_bulk(chunk)
+
+    @staticmethod
+    def _notify_users(users, title, content, notification_type, related_project=None):
+        return NotificationService.fan_out(
+            users,
+            title=title,
+            content=content,
+            notification_type=notification_type,
+            related_project=related_project,
+        )
 
     @staticmethod
     def notify_project_submitted(project):
@@ -123,84 +235,138 @@ class NotificationService:
             related_project=project,
         )
 
+    @staticmethod
+    def notify_reviews_assigned(reviews, *, defer=False):
+        """
+        通知：批量评审任务分配
+        """
+        return NotificationService.send_bulk(
+            [
+                notification_entry(
+                    review.reviewer_id,
+                    title="新的评审任务",
+                    content=f"项目《{review.project.title}》已分配给您评审，请及时处理。",
+                    notification_type=Notification.NotificationType.REVIEW,
+                    related_project=review.project_id,
+                )
+                for review in reviews
+            ],
+            defer=defer,
+        )
+
     @staticmethod
     def notify_review_result(project, approved, comments=""):
         """
         通知：审核结果
         """
-        if approved:
-            title = "项目审核通过"
-            content = f"恭喜！您的项目《{project.title}》审核通过。"
-        else:
-            title = "项目审核未通过"
-            content = f"很抱歉，您的项目《{project.title}》审核未通过。"
-
-        if comments:
-            content += f"\n审核意见：{comments}"
+        return NotificationService.notify_review_results([project], approved, comments)
 
-        NotificationService.create_notification(
-            recipient=project.leader,
-            title=title,
-            content=content,
-            notification_type=Notification.NotificationType.REVIEW,
-            related_project=project,
-        )
+    @staticmethod
+    def notify_review_results(projects, approved, comments="", *, defer=False):
+        """
+        通知：批量审核结果（同一项目只通知一次）
+        """
+        title = "项目审核通过" if approved else "项目审核未通过"
+        entries = []
+        for project in projects:
+            if approved:
+                content = f"恭喜！您的项目《{project.title}》审核通过。"
+            else:
+                content = f"很抱歉，您的项目《{project.title}》审核未通过。"
+            if comments:
+                content += f"\n审核意见：{comments}"
+            entries.append(
+                notification_entry(
+                    project.leader_id,
+                    title=title,
+                    content=content,
+                    notification_type=Notification.NotificationType.REVIEW,
+                    related_project=project.id,
+                )
+            )
+        return NotificationService.send_bulk(entries, defer=defer)
 
     @staticmethod
     def notify_establishment_published(project):
         """
         通知：立项结果已发布
         """
-        level = project.final_level or project.level
-        budget = project.final_budget or project.approved_budget
-        details = []
-        if project.project_no:
-            details.append(f"项目编号：{project.project_no}")
-        if level:
-            details.append(f"立项级别：{level.label}")
-        if budget is not None:
-            details.append(f"批准经费：{budget}元")
-        detail_text = "\n".join(details)
-        content = f"您的项目《{project.title}》立项结果已发布。"
-        if detail_text:
-            content = f"{content}\n{detail_text}"
-
-        users = [project.leader]
-        users.extend([advisor.user for advisor in project.advisors.select_related("user")])
-        users.extend(list(project.members.all()))
-        NotificationService._notify_users(
-            users,
-            title="立项结果已发布",
-            content=content,
-            notification_type=Notification.NotificationType.PROJECT,
-            related_project=project,
-        )
+        return NotificationService.notify_establishments_published([project])
+
+    @staticmethod
+    def notify_establishments_published(projects, *, defer=False):
+        """
+        通知：批量发布立项结果，负责人、指导教师与成员各收到一条通知。
+        指导教师与成员按项目一次性查询。
+        """
+        from apps.projects.models import ProjectAdvisor, ProjectMember
+
+        projects = list(projects)
+        recipients = {project.id: [project.leader_id] for project in projects}
+        for model in (ProjectAdvisor, ProjectMember):
+            for project_id, user_id in model.objects.filter(
+                project_id__in=recipients
+            ).values_list("project_id", "user_id"):
+                recipients[project_id].append(user_id)
+
+        entries = []
+        for project in projects:
+            level = project.final_level or project.level
+            budget = project.final_budget or project.approved_budget
+            details = []
+            if project.project_no:
+                details.append(f"项目编号：{project.project_no}")
+            if level:
+                details.append(f"立项级别：{level.label}")
+            if budget is not None:
+                details.append(f"批准经费：{budget}元")
+            detail_text = "\n".join(details)
+            content = f"您的项目《{project.title}》立项结果已发布。"
+            if detail_text:
+                content = f"{content}\n{detail_text}"
+            entries.extend(
+                notification_entry(
+                    user_id,
+                    title="立项结果已发布",
+                    content=content,
+                    notification_type=Notification.NotificationType.PROJECT,
+                    related_project=project.id,
+                )
+                for user_id in recipients[project.id]
+            )
+        return NotificationService.send_bulk(entries, defer=defer)
 
     @staticmethod
     def notify_expenditure_submitted(project, expenditure, created_by):
         """
         通知：经费支出已提交
         """
-        users = [project.leader]
-        users.extend([advisor.user for advisor in project.advisors.select_related("user")])
-        NotificationService._notify_users(
-            users,
-            title="经费支出待审核",
-            content=(
-                f"项目《{project.title}》提交了经费支出"
-                f"《{expenditure.title}》，金额：{expenditure.amount}元。"
-            ),
-            notification_type=Notification.NotificationType.PROJECT,
-            related_project=project,
-        )
-        if created_by and created_by.id != project.leader_id:
-            NotificationService.create_notification(
-                recipient=created_by,
-                title="经费支出提交成功",
-                content=f"经费支出《{expenditure.title}》已提交，等待审核。",
+        users = [project.leader_id]
+        users.extend(project.advisors.values_list("user_id", flat=True))
+        entries = [
+            notification_entry(
+                user_id,
+                title="经费支出待审核",
+                content=(
+                    f"项目《{project.title}》提交了经费支出"
+                    f"《{expenditure.title}》，金额：{expenditure.amount}元。"
+                ),
                 notification_type=Notification.NotificationType.PROJECT,
                 related_project=project,
             )
+            for user_id in users
+        ]
+        if created_by and created_by.id != project.leader_id:
+            entries.append(
+                notification_entry(
+                    created_by,
+                    title="经费支出提交成功",
+                    content=f"经费支出《{expenditure.title}》已提交，等待审核。",
+                    notification_type=Notification.NotificationType.PROJECT,
+                    related_project=project,
+                )
+            )
+        return NotificationService.send_bulk(entries)
 
     @staticmethod
     def notify_expenditure_reviewed(project, expenditure, reviewer, approved, comment=""):
@@ -214,25 +380,116 @@ class NotificationService:
         )
         if comment:
             content = f"{content}\n审核意见：{comment}"
-        NotificationService._notify_users(
-            [project.leader, expenditure.created_by],
-            title=f"经费支出审核{result}",
-            content=content,
-            notification_type=Notification.NotificationType.REVIEW,
-            related_project=project,
-        )
-        if reviewer:
-            NotificationService.create_notification(
-                recipient=reviewer,
-                title="经费支出审核已处理",
-                content=f"经费支出《{expenditure.title}》审核已处理。",
+        entries = [
+            notification_entry(
+                user_id,
+                title=f"经费支出审核{result}",
+                content=content,
                 notification_type=Notification.NotificationType.REVIEW,
                 related_project=project,
             )
+            for user_id in (project.leader_id, expenditure.created_by_id)
+        ]
+        if reviewer:
+            entries.append(
+                notification_entry(
+                    reviewer,
+                    title="经费支出审核已处理",
+                    content=f"经费支出《{expenditure.title}》审核已处理。",
+                    notification_type=Notification.NotificationType.REVIEW,
+                    related_project=project,
+                )
+            )
+        return NotificationService.send_bulk(entries)
 
     @staticmethod
     def get_unread_count(user):
         """
-        获取用户未读通知数量
+        获取用户未读通知数量：优先读取缓存计数，未命中时统计一次并写入缓存。
+        缓存不在进程间共享时各进程的计数会各自漂移，直接统计数据库。
+        """
+        user_id = getattr(user, "id", user)
+        if not is_shared_cache():
+            return Notification.objects.filter(
+                recipient_id=user_id, is_read=False
+            ).count()
+        key = UNREAD_COUNT_CACHE_KEY.format(user_id=user_id)
+        count = cache.get(key)
+        if count is not None:
+            return count
+        count = Notification.objects.filter(recipient_id=user_id, is_read=False).count()
+        # 事务内可能读到未提交的数据，只在事务外写入缓存；已有计数时不覆盖
+        if not connection.in_atomic_block:
+            cache.add(key, count, timeout=settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    def adjust_unread_counts(deltas):
+        """
+        事务提交后按 {user_id: 增量} 调整已缓存的未读计数；
+        未缓存的用户不处理，下次读取时重新统计。
+        """
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if deltas and is_shared_cache():
+            transaction.on_commit(lambda: NotificationService._apply_unread_deltas(deltas))
+
+    @staticmethod
+    def _apply_unread_deltas(deltas):
+        for user_id, delta in deltas.items():
+            key = UNREAD_COUNT_CACHE_KEY.format(user_id=user_id)
+            try:
+                count = cache.incr(key, delta)
+            except ValueError:
+                continue
+            if count < 0:
+                cache.delete(key)
+
+    @staticmethod
+    def repair_unread_counts(user_ids=None):
         """
-        return Notification.objects.filter(recipient=user, is_read=False).count()
+        按数据库重新统计并写入未读计数，返回处理的用户数
+        """
+        from apps.users.models import User
+
+        users = User.objects.all()
+        if user_ids is not None:
+            users = users.filter(id__in=user_ids)
+        counts = dict(
+            Notification.objects.filter(recipient__in=users, is_read=False)
+            .values("recipient_id")
+            .annotate(count=Count("id"))
+            .values_list("recipient_id", "count")
+        )
+        processed = 0
+        batch = {}
+        for user_id in users.values_list("id", flat=True).iterator(chunk_size=1000):
+            batch[UNREAD_COUNT_CACHE_KEY.format(user_id=user_id)] = counts.get(user_id, 0)
+            processed += 1
+            if len(batch) >= 1000:
+                cache.set_many(batch, timeout=settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+                batch = {}
+        if batch:
+            cache.set_many(batch, timeout=settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+        return processed
+
+    @staticmethod
+    def mark_read(notification):
+        """
+        标记单条通知为已读
+        """
+        updated = Notification.objects.filter(pk=notification.pk, is_read=False).update(
+            is_read=True, read_at=timezone.now()
+        )
+        NotificationService.adjust_unread_counts({notification.recipient_id: -updated})
+        return updated
+
+    @staticmethod
+    def mark_all_read(user):
+        """
+        标记用户全部通知为已读
+        """
+        updated = Notification.objects.filter(recipient=user, is_read=False).update(
+            is_read=True, read_at=timezone.now()
+        )
+        NotificationService.adjust_unread_counts({user.id: -updated})
+        return updated
@@ -0,0 +1,21 @@
+"""
+逐条新增或删除通知时同步未读计数（批量写入与已读更新由 NotificationService 处理）
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services import NotificationService
+
+
+@receiver(post_save, sender=Notification)
+def count_created_notification(sender, instance, created=False, **kwargs):
+    if created and not instance.is_read:
+        NotificationService.adjust_unread_counts({instance.recipient_id: 1})
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        NotificationService.adjust_unread_counts({instance.recipient_id: -1})
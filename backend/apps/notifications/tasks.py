@@ -0,0 +1,13 @@
+try:
+    from config.celery import app
+except Exception:  # pragma: no cover
+    app = None
+
+from .services import NotificationService
+
+
+if app:
+
+    @app.task(name="notifications.write_notifications")
+    def write_notifications(entries):
+        return NotificationService.write_bulk(entries)
@@ -1,6 +1,10 @@
+from io import StringIO
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import SimpleTestCase
 from django.test import TestCase, override_settings
@@ -8,6 +12,7 @@ from rest_framework.test import APIClient
 
 from apps.dictionaries.models import DictionaryItem, DictionaryType
 from apps.notifications.models import Notification, PlatformMaterial, PlatformNotice
+from apps.notifications.services import NotificationService
 from apps.notifications.serializers import (
     NotificationSerializer,
     PlatformMaterialSerializer,
@@ -455,3 +460,132 @@ class NotificationSerializerContractTestCase(TestCase):
 
         self.assertEqual(data["type_display"], "审核通知")
         self.assertEqual(data["notification_type_display"], "审核通知")
+
+
+class NotificationFanOutTestCase(TestCase):
+    def setUp(self):
+        self.student_role, _ = Role.objects.get_or_create(
+            code="STUDENT",
+            defaults={"name": "学生"},
+        )
+        self.users = [
+            User.objects.create_user(
+                username=f"fan_out_user_{index}",
+                employee_id=f"FO{index:05d}",
+                password="password123",
+                role_fk=self.student_role,
+                real_name=f"通知接收人{index}",
+            )
+            for index in range(3)
+        ]
+
+    def test_fan_out_deduplicates_recipients_and_writes_in_chunks(self):
+        recipients = [*self.users, self.users[0].id, None]
+
+        with patch("apps.notifications.services.NOTIFICATION_BULK_SIZE", 2):
+            with self.assertNumQueries(2):
+                written = NotificationService.fan_out(
+                    recipients, title="批量通知", content="内容"
+                )
+
+        self.assertEqual(written, 3)
+        self.assertEqual(
+            Notification.objects.filter(title="批量通知").count(), 3
+        )
+
+    def test_deferred_fan_out_writes_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            scheduled = NotificationService.fan_out(
+                self.users, title="延迟通知", content="内容", defer=True
+            )
+            self.assertFalse(Notification.objects.filter(title="延迟通知").exists())
+
+        self.assertEqual(scheduled, 3)
+        with patch(
+            "apps.notifications.tasks.write_notifications.delay",
+            side_effect=RuntimeError("broker unavailable"),
+        ), self.assertLogs("apps.notifications.services", level="ERROR"):
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(
+            Notification.objects.filter(title="延迟通知").count(), 3
+        )
+
+
+class NotificationUnreadCounterTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student_role, _ = Role.objects.get_or_create(
+            code="STUDENT",
+            defaults={"name": "学生"},
+        )
+        self.user = User.objects.create_user(
+            username="unread_counter_user",
+            employee_id="UC00001",
+            password="password123",
+            role_fk=self.student_role,
+            real_name="未读计数用户",
+        )
+        # 测试环境为本地内存缓存，按共享缓存验证计数维护
+        shared = patch("apps.notifications.services.is_shared_cache", return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.notification = NotificationService.create_notification(
+            recipient=self.user, title="第一条", content="内容"
+        )
+
+    def _poll(self):
+        response = self.client.get("/api/v1/notifications/unread_count/")
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]["count"]
+
+    def test_unread_counter_is_maintained_without_recounting(self):
+        with patch("apps.notifications.services.connection", in_atomic_block=False):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.get_unread_count(self.user), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.create_notification(
+                recipient=self.user, title="第二条", content="内容"
+            )
+            NotificationService.fan_out([self.user], title="第三条", content="内容")
+        self.assertEqual(self._poll(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/v1/notifications/{self.notification.id}/mark_read/"
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._poll(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.filter(title="第二条").delete()
+        self.assertEqual(self._poll(), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/api/v1/notifications/mark-all-read/")
+        self.assertEqual(self._poll(), 0)
+
+    def test_local_cache_counts_from_database(self):
+        with patch(
+            "apps.notifications.services.is_shared_cache", return_value=False
+        ), patch("apps.notifications.services.connection", in_atomic_block=False):
+            with self.assertNumQueries(1):
+                self.assertEqual(NotificationService.get_unread_count(self.user), 1)
+            with self.assertNumQueries(1):
+                self.assertEqual(NotificationService.get_unread_count(self.user), 1)
+
+        self.assertIsNone(cache.get(f"notifications:unread:{self.user.id}"))
+
+    def test_repair_command_rewrites_drifted_counter(self):
+        cache.set(f"notifications:unread:{self.user.id}", 42)
+
+        call_command(
+            "repair_unread_counts", user_ids=[self.user.id], stdout=StringIO()
+        )
+
+        self.assertEqual(NotificationService.get_unread_count(self.user), 1)
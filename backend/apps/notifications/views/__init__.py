@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from apps.dictionaries.models import DictionaryItem
 from ..models import Notification, PlatformMaterial, PlatformNotice
+from ..services import NotificationService
 from ..serializers import (
     NotificationSerializer,
     PlatformMaterialSerializer,
@@ -157,9 +158,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         标记为已读
         """
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        NotificationService.mark_read(notification)
 
         return Response({"code": 200, "message": "已标记为已读"})
 
@@ -168,9 +167,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         标记所有为已读
         """
-        Notification.objects.filter(recipient=request.user, is_read=False).update(
-            is_read=True, read_at=timezone.now()
-        )
+        NotificationService.mark_all_read(request.user)
 
         return Response({"code": 200, "message": "已标记所有通知为已读"})
 
@@ -179,9 +176,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         获取未读通知数量
         """
-        count = Notification.objects.filter(
-            recipient=request.user, is_read=False
-        ).count()
+        count = NotificationService.get_unread_count(request.user)
 
         return Response({"code": 200, "data": {"count": count}})
 
@@ -233,15 +228,12 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         if user.is_college_admin:
             queryset = queryset.filter(college=user.college)
 
-        created = 0
-        for recipient in queryset:
-            Notification.objects.create(
-                recipient=recipient,
-                title=title,
-                content=content,
-                notification_type=Notification.NotificationType.SYSTEM,
-            )
-            created += 1
+        created = NotificationService.fan_out(
+            queryset.values_list("id", flat=True),
+            title=title,
+            content=content,
+            notification_type=Notification.NotificationType.SYSTEM,
+        )
 
         return Response(
             {"code": 200, "message": "发送成功", "data": {"created": created}}
@@ -0,0 +1,141 @@
+"""
+Benchmark per-request database latency for each connection reuse mode.
+"""
+
+import copy
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import load_backend
+
+MODES = ("none", "persistent", "pool")
+# 模拟一次典型的轻量接口：按主键取一行并统计数量
+REQUEST_SQL = (
+    "SELECT id, username FROM users ORDER BY id LIMIT 1",
+    "SELECT count(*) FROM roles",
+)
+
+
+def _mode_settings(base, mode):
+    settings_dict = copy.deepcopy(base)
+    options = settings_dict.setdefault("OPTIONS", {})
+    options.pop("pool", None)
+    settings_dict["CONN_MAX_AGE"] = 0
+    settings_dict["CONN_HEALTH_CHECKS"] = False
+    if mode == "persistent":
+        settings_dict["CONN_MAX_AGE"] = 60
+        settings_dict["CONN_HEALTH_CHECKS"] = True
+    elif mode == "pool":
+        options["pool"] = {"min_size": 1, "max_size": 4}
+    return settings_dict
+
+
+def _pool_available():
+    try:
+        import psycopg  # type: ignore[import-not-found]  # noqa: F401
+        import psycopg_pool  # type: ignore[import-not-found]  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate requests against the default database for each connection mode "
+        "(none / persistent / pool) and report per-request latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Number of worker threads, each with its own connection.",
+        )
+        parser.add_argument("--mode", choices=["all", *MODES], default="all")
+
+    def handle(self, *args, **options):
+        if options["requests"] <= 0 or options["concurrency"] <= 0:
+            raise CommandError("--requests and --concurrency must be positive")
+        modes = MODES if options["mode"] == "all" else (options["mode"],)
+        base = connections[DEFAULT_DB_ALIAS].settings_dict
+
+        self.stdout.write(
+            f"{'mode':<12}{'requests':>10}{'connects':>10}{'mean ms':>10}"
+            f"{'p50 ms':>10}{'p95 ms':>10}{'req/sec':>10}"
+        )
+        for mode in modes:
+            if mode == "pool" and not _pool_available():
+                self.stdout.write(
+                    f"{mode:<12}skipped: psycopg 3 with psycopg_pool is not installed"
+                )
+                continue
+            timings, connects, seconds = self._run(
+                _mode_settings(base, mode), options["requests"], options["concurrency"]
+            )
+            ordered = sorted(timings)
+            self.stdout.write(
+                f"{mode:<12}{len(timings):>10}{connects:>10}"
+                f"{statistics.fmean(timings):>10.2f}"
+                f"{ordered[len(ordered) // 2]:>10.2f}"
+                f"{ordered[int(len(ordered) * 0.95) - 1]:>10.2f}"
+                f"{len(timings) / seconds:>10.0f}"
+            )
+
+    @staticmethod
+    def _run(settings_dict, total, concurrency):
+        backend = load_backend(settings_dict["ENGINE"])
+        timings = []
+        connects = []
+        lock = threading.Lock()
+        per_worker = [
+            total // concurrency + (index < total % concurrency)
+            for index in range(concurrency)
+        ]
+
+        def worker(count):
+            wrapper = backend.DatabaseWrapper(settings_dict, alias="benchmark")
+            local_timings = []
+            opened = 0
+            try:
+                for _ in range(count):
+                    started = time.perf_counter()
+                    # 与 Django 请求开始/结束时的 close_old_connections 相同
+                    wrapper.close_if_unusable_or_obsolete()
+                    if wrapper.connection is None:
+                        opened += 1
+                    with wrapper.cursor() as cursor:
+                        for sql in REQUEST_SQL:
+                            cursor.execute(sql)
+                            cursor.fetchall()
+                    wrapper.close_if_unusable_or_obsolete()
+                    local_timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                wrapper.close()
+            with lock:
+                timings.extend(local_timings)
+                connects.append(opened)
+
+        threads = [
+            threading.Thread(target=worker, args=(count,))
+            for count in per_worker
+            if count
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        opened = sum(connects)
+        if "pool" in settings_dict["OPTIONS"]:
+            # 连接池模式下每个请求都是借出/归还，实际建立的连接数以连接池统计为准
+            wrapper = backend.DatabaseWrapper(settings_dict, alias="benchmark")
+            opened = wrapper.pool.get_stats().get("connections_num", 0)
+            wrapper.close_pool()
+        return timings, opened, seconds
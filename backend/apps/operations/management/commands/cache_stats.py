@@ -0,0 +1,52 @@
+"""
+Report hit/miss counters of the versioned cache namespaces.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.cache import get_namespace, registered_namespaces
+
+
+class Command(BaseCommand):
+    help = (
+        "Show per-namespace hit/miss counters recorded in the shared cache. "
+        "Counters are aggregated across processes only when DJANGO_CACHE_URL "
+        "points at a shared backend such as Redis."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "namespaces", nargs="*", help="Limit the report to these namespaces."
+        )
+        parser.add_argument(
+            "--reset", action="store_true", help="Reset the counters after reporting."
+        )
+
+    def handle(self, *args, **options):
+        if options["namespaces"]:
+            namespaces = []
+            for name in options["namespaces"]:
+                namespace = get_namespace(name)
+                if namespace is None:
+                    raise CommandError(f"Unknown cache namespace: {name}")
+                namespaces.append(namespace)
+        else:
+            namespaces = registered_namespaces()
+
+        if not settings.CACHE_STATS_ENABLED:
+            self.stdout.write(
+                "Counters are disabled (DJANGO_CACHE_STATS_ENABLED=false)."
+            )
+        self.stdout.write(
+            f"{'namespace':<20}{'version':>10}{'hits':>12}{'misses':>12}{'hit rate':>10}"
+        )
+        for namespace in namespaces:
+            stats = namespace.stats()
+            hit_rate = "-" if stats["hit_rate"] is None else f"{stats['hit_rate']:.1%}"
+            self.stdout.write(
+                f"{namespace.name:<20}{namespace.version():>10}{stats['hits']:>12}"
+                f"{stats['misses']:>12}{hit_rate:>10}"
+            )
+            if options["reset"]:
+                namespace.reset_stats()
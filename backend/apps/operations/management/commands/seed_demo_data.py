@@ -10,6 +10,7 @@ from apps.dictionaries.models import DictionaryItem, DictionaryType
 from apps.notifications.models import PlatformMaterial, PlatformNotice
 from apps.projects.models import Project, ProjectPhaseInstance
 from apps.system_settings.models import ProjectBatch, WorkflowConfig, WorkflowNode
+from apps.system_settings.services import SystemSettingService
 from apps.users.models import Role
 
 
@@ -65,6 +66,7 @@ class Command(BaseCommand):
         ProjectBatch.objects.exclude(id=batch.id).filter(is_current=True).update(
             is_current=False
         )
+        SystemSettingService.invalidate_cache()
 
         student = self._user(
             "demo_student",
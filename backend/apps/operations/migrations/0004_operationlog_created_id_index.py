@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0003_remove_report_tasks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='operationlog',
+            index=models.Index(fields=['-created_at', '-id'], name='operation_l_created_b13686_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0004_operationlog_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='asynctaskrecord',
+            name='task_type',
+            field=models.CharField(choices=[('IMPORT', '数据导入'), ('EXPORT', '数据导出'), ('BATCH_REVIEW', '批量审核')], default='IMPORT', max_length=20, verbose_name='任务类型'),
+        ),
+    ]
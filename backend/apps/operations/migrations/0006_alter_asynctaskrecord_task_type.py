@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('operations', '0005_alter_asynctaskrecord_task_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='asynctaskrecord',
+            name='task_type',
+            field=models.CharField(choices=[('IMPORT', '数据导入'), ('EXPORT', '数据导出'), ('BATCH_REVIEW', '批量审核'), ('PUBLICATION', '立项发布')], default='IMPORT', max_length=20, verbose_name='任务类型'),
+        ),
+    ]
@@ -6,6 +6,8 @@ class AsyncTaskRecord(models.Model):
     class TaskType(models.TextChoices):
         IMPORT = "IMPORT", "数据导入"
         EXPORT = "EXPORT", "数据导出"
+        BATCH_REVIEW = "BATCH_REVIEW", "批量审核"
+        PUBLICATION = "PUBLICATION", "立项发布"
 
     class TaskStatus(models.TextChoices):
         PENDING = "PENDING", "待执行"
@@ -100,6 +102,7 @@ class OperationLog(models.Model):
             models.Index(fields=["module", "-created_at"]),
             models.Index(fields=["operator", "-created_at"]),
             models.Index(fields=["status", "-created_at"]),
+            models.Index(fields=["-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -1,7 +1,9 @@
 import os
 import hashlib
+import tempfile
 import uuid
 import logging
+import zipfile
 from pathlib import Path, PurePosixPath, PureWindowsPath
 from decimal import Decimal, InvalidOperation
 
@@ -15,6 +17,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from apps.dictionaries.models import DictionaryItem, DictionaryType
+from apps.dictionaries.services import DictionarySnapshotService
 from apps.projects.models import Project
 from apps.system_settings.models import ProjectBatch
 from apps.users.models import User
@@ -73,6 +76,8 @@ IMPORT_KINDS = {
 
 ALLOWED_IMPORT_EXTENSIONS = {".xlsx", ".xlsm", ".xltx", ".xltm"}
 MAX_IMPORT_UPLOAD_SIZE = 10 * 1024 * 1024
+# 导出任务每处理多少个项目回写一次进度，避免逐条 UPDATE
+EXPORT_PROGRESS_STEP = 20
 
 
 def _safe_task_error_message(exc):
@@ -81,6 +86,12 @@ def _safe_task_error_message(exc):
     return "导入失败，请检查文件内容后重试"
 
 
+def _safe_export_error_message(exc):
+    if isinstance(exc, ValueError):
+        return str(exc)
+    return "导出失败，请稍后重试"
+
+
 def _cleanup_local_file(file_path):
     if not file_path:
         return
@@ -322,10 +333,15 @@ class DataCenterService:
     @staticmethod
     @transaction.atomic
     def _import_history_projects(file_path):
+        from apps.projects.services.project_number_service import (
+            ProjectNumberService,
+        )
+
         headers, rows = DataCenterService._load_rows(file_path)
         created = 0
         updated = 0
         errors = []
+        imported_numbers = []
         for row_index, row in enumerate(rows, start=2):
             row_data = DataCenterService._row_dict(headers, row)
             if not any(row_data.values()):
@@ -376,10 +392,13 @@ class DataCenterService:
                     "published_at": timezone.now(),
                 },
             )
+            imported_numbers.append(project_no)
             if was_created:
                 created += 1
             else:
                 updated += 1
+        # 导入的编号可能占用计数器后续序号，推进计数器避免重号
+        ProjectNumberService.observe(imported_numbers)
         return {"created": created, "updated": updated, "errors": errors}
 
     @staticmethod
@@ -426,6 +445,7 @@ class DataCenterService:
                 created += 1
             else:
                 updated += 1
+        DictionarySnapshotService.invalidate_cache()
         return {"created": created, "updated": updated, "errors": errors}
 
     @staticmethod
@@ -469,6 +489,7 @@ class DataCenterService:
                 created += 1
             else:
                 updated += 1
+        DictionarySnapshotService.invalidate_cache()
         return {"created": created, "updated": updated, "errors": errors}
 
     @staticmethod
@@ -625,3 +646,152 @@ class DataCenterService:
             detail={"filename": filename, "task_type": task_type},
         )
         return task
+
+    @staticmethod
+    def create_export_task(user, kind, project_ids):
+        from apps.projects.services.export_service import ProjectExportService
+
+        config = ProjectExportService.EXPORT_KINDS.get(kind)
+        if not config:
+            raise ValueError("不支持的导出类型")
+        return AsyncTaskRecord.objects.create(
+            task_type=AsyncTaskRecord.TaskType.EXPORT,
+            title=config["title"],
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+            progress=0,
+            message="任务已创建",
+            payload={"kind": kind, "project_ids": list(project_ids)},
+            created_by=user,
+        )
+
+    @staticmethod
+    def dispatch_export_task(task):
+        """
+        投递导出任务到 Celery；投递失败时在当前进程内同步执行。
+        """
+        try:
+            from .tasks import run_export_task
+
+            async_result = run_export_task.delay(task.id)
+            payload = dict(task.payload, celery_task_id=async_result.id)
+            AsyncTaskRecord.objects.filter(id=task.id).update(payload=payload)
+        except Exception:
+            logger.exception(
+                "Failed to enqueue export task %s; running synchronously",
+                task.id,
+            )
+            DataCenterService.run_export_task(task.id)
+        task.refresh_from_db()
+        return task
+
+    @staticmethod
+    def _update_task_progress(task_id, progress, message):
+        AsyncTaskRecord.objects.filter(
+            id=task_id,
+            status=AsyncTaskRecord.TaskStatus.RUNNING,
+        ).update(progress=progress, message=message)
+
+    @staticmethod
+    def run_export_task(task_id):
+        from apps.projects.services.export_service import (
+            ProjectExportService,
+            SharedExportEntry,
+        )
+
+        claimed = AsyncTaskRecord.objects.filter(
+            id=task_id,
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+        ).update(
+            status=AsyncTaskRecord.TaskStatus.RUNNING,
+            progress=5,
+            started_at=timezone.now(),
+            message="正在生成文件",
+        )
+        task = AsyncTaskRecord.objects.get(id=task_id)
+        if not claimed:
+            return task
+
+        kind = task.payload.get("kind")
+        try:
+            config = ProjectExportService.EXPORT_KINDS.get(kind)
+            if not config:
+                raise ValueError("不支持的导出类型")
+            project_ids = task.payload.get("project_ids") or []
+            total = len(project_ids)
+            exported = 0
+            failed = 0
+            with tempfile.TemporaryFile() as output:
+                with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+                    entries = ProjectExportService.iter_export_entries(kind, project_ids)
+                    for index, entry in enumerate(entries, start=1):
+                        if entry is None:
+                            failed += 1
+                        else:
+                            arcname, content = entry
+                            zf.writestr(arcname, content)
+                            if not isinstance(entry, SharedExportEntry):
+                                exported += 1
+                        if index % EXPORT_PROGRESS_STEP == 0 and index < total:
+                            DataCenterService._update_task_progress(
+                                task.id,
+                                5 + int(90 * index / total),
+                                f"已处理 {index}/{total}",
+                            )
+                output.seek(0)
+                task.result_file.save(
+                    config["filename"], File(output), save=False
+                )
+
+            result = {"total": exported, "failed": failed}
+            task.status = AsyncTaskRecord.TaskStatus.SUCCESS
+            task.progress = 100
+            task.message = "生成完成"
+            task.result = result
+            task.completed_at = timezone.now()
+            task.save(
+                update_fields=[
+                    "status",
+                    "progress",
+                    "message",
+                    "result",
+                    "result_file",
+                    "completed_at",
+                ]
+            )
+            OperationLogService.log(
+                operator=task.created_by,
+                module="任务中心",
+                action="生成文件任务",
+                target_type="AsyncTaskRecord",
+                target_id=task.id,
+                target_name=task.title,
+                detail={"kind": kind, "filename": config["filename"], "result": result},
+            )
+        except Exception as exc:
+            message = _safe_export_error_message(exc)
+            logger.exception("Failed to run export task %s for kind %s", task.id, kind)
+            task.status = AsyncTaskRecord.TaskStatus.FAILED
+            task.progress = 100
+            task.message = message
+            task.result = {"errors": [message]}
+            task.completed_at = timezone.now()
+            task.save(
+                update_fields=[
+                    "status",
+                    "progress",
+                    "message",
+                    "result",
+                    "completed_at",
+                ]
+            )
+            OperationLogService.log(
+                operator=task.created_by,
+                module="任务中心",
+                action="生成文件任务",
+                target_type="AsyncTaskRecord",
+                target_id=task.id,
+                target_name=task.title,
+                status=OperationLog.LogStatus.FAILED,
+                detail={"error": message, "kind": kind},
+            )
+        return task
@@ -11,3 +11,7 @@ if app:
     @app.task(name="operations.run_import_task")
     def run_import_task(task_id):
         DataCenterService.run_import_task(task_id)
+
+    @app.task(name="operations.run_export_task")
+    def run_export_task(task_id):
+        DataCenterService.run_export_task(task_id)
@@ -1,6 +1,7 @@
 from io import BytesIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
+import zipfile
 
 import openpyxl  # type: ignore[import-untyped]
 from django.contrib.auth import get_user_model
@@ -194,6 +195,34 @@ class DataCenterServiceTestCase(TestCase):
         self.assertIn(own_log.id, log_ids)
         self.assertIn(other_log.id, log_ids)
 
+    def test_operation_logs_support_cursor_pagination(self):
+        logs = [
+            OperationLog.objects.create(
+                operator=self.custom_school_admin,
+                module="测试",
+                action=f"游标日志{index}",
+            )
+            for index in range(12)
+        ]
+        self.client.force_authenticate(user=self.custom_school_admin)
+
+        first = self.client.get("/api/v1/operations/logs/", {"pagination": "cursor"})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(len(first.data["results"]), 10)
+        self.assertIsNotNone(first.data["next_cursor"])
+        self.assertIn("cursor=", first.data["next"])
+
+        second = self.client.get(
+            "/api/v1/operations/logs/", {"cursor": first.data["next_cursor"]}
+        )
+        self.assertEqual(second.status_code, 200)
+        self.assertIsNone(second.data["next_cursor"])
+        ids = [item["id"] for item in first.data["results"] + second.data["results"]]
+        self.assertEqual(ids, sorted((log.id for log in logs), reverse=True))
+
+        invalid = self.client.get("/api/v1/operations/logs/", {"cursor": "%%%"})
+        self.assertEqual(invalid.status_code, 404)
+
     def test_legacy_level1_admin_retains_school_operations_access(self):
         self.admin_role.scope_dimension = None
         self.admin_role.save(update_fields=["scope_dimension"])
@@ -546,3 +575,90 @@ class DataCenterServiceTestCase(TestCase):
         item = DictionaryItem.objects.get(dict_type__code="demo_type", value="DEMO")
         self.assertEqual(item.label, "演示选项")
         self.assertEqual(item.sort_order, 10)
+
+    def _export_projects(self, count):
+        batch = ProjectBatch.objects.create(
+            name="2026 导出批次",
+            year=2026,
+            code="EXP2026",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_current=True,
+            is_active=True,
+        )
+        leader = User.objects.create_user(
+            username="export_leader",
+            password="123456",
+            role_fk=self.student_role,
+            real_name="导出负责人",
+            employee_id="EXP0001",
+            college="计算机学院",
+        )
+        return [
+            Project.objects.create(
+                project_no=f"EXP2026{index:04d}",
+                title=f"导出项目{index}",
+                leader=leader,
+                batch=batch,
+                year=2026,
+                status=Project.ProjectStatus.IN_PROGRESS,
+            )
+            for index in range(1, count + 1)
+        ]
+
+    def test_run_export_task_writes_zip_result_file(self):
+        projects = self._export_projects(2)
+        task = DataCenterService.create_export_task(
+            self.admin,
+            "establishment_notices",
+            [project.id for project in projects] + [999999],
+        )
+
+        self.assertEqual(task.status, AsyncTaskRecord.TaskStatus.PENDING)
+        self.assertEqual(task.task_type, AsyncTaskRecord.TaskType.EXPORT)
+
+        finished = DataCenterService.run_export_task(task.id)
+
+        self.assertEqual(finished.status, AsyncTaskRecord.TaskStatus.SUCCESS)
+        self.assertEqual(finished.progress, 100)
+        self.assertEqual(finished.result, {"total": 2, "failed": 1})
+        with finished.result_file.open("rb") as stream:
+            with zipfile.ZipFile(stream) as archive:
+                self.assertEqual(
+                    sorted(archive.namelist()),
+                    [
+                        "EXP20260001_立项通知书.doc",
+                        "EXP20260002_立项通知书.doc",
+                    ],
+                )
+        self.assertEqual(DataCenterService.run_export_task(task.id).result, finished.result)
+
+    def test_run_export_task_marks_unknown_kind_failed(self):
+        task = AsyncTaskRecord.objects.create(
+            task_type=AsyncTaskRecord.TaskType.EXPORT,
+            title="unknown",
+            payload={"kind": "unknown", "project_ids": []},
+            created_by=self.admin,
+        )
+
+        finished = DataCenterService.run_export_task(task.id)
+
+        self.assertEqual(finished.status, AsyncTaskRecord.TaskStatus.FAILED)
+        self.assertEqual(finished.message, "不支持的导出类型")
+        self.assertFalse(finished.result_file)
+
+    def test_batch_notice_task_endpoint_enqueues_export_task(self):
+        projects = self._export_projects(1)
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            "/api/v1/projects/admin/manage/batch-establishment-notice-task/",
+            {"ids": str(projects[0].id)},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        task = AsyncTaskRecord.objects.get(id=response.data["data"]["task_id"])
+        self.assertEqual(task.payload["kind"], "establishment_notices")
+        self.assertEqual(task.payload["project_ids"], [projects[0].id])
+        self.assertEqual(task.status, AsyncTaskRecord.TaskStatus.SUCCESS)
+        self.assertEqual(task.result["total"], 1)
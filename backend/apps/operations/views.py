@@ -15,6 +15,7 @@ from apps.utils.downloads import (
     attachment_content_disposition,
     file_field_download_response,
 )
+from apps.utils.pagination import KeysetPageNumberPagination
 
 logger = logging.getLogger(__name__)
 
@@ -163,6 +164,7 @@ class AsyncTaskRecordViewSet(viewsets.ReadOnlyModelViewSet):
 class OperationLogViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = OperationLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPageNumberPagination
     filterset_fields = ["module", "action", "status", "target_type"]
 
     def get_queryset(self):
@@ -3,15 +3,26 @@ Certificate rendering helpers.
 """
 
 import base64
-from html import escape
+import hashlib
 import mimetypes
+import posixpath
+from functools import lru_cache
+from html import escape
 
 from apps.system_settings.models import CertificateSetting
 
+# 进程内缓存的证书图片数量（底图与印章各算一项）
+CERTIFICATE_ASSET_CACHE_SIZE = 8
+CERTIFICATE_ASSET_DIR = "assets"
 
-def get_best_match_setting(project=None):
+
+def _html_text(value):
+    return escape(str(value or ""), quote=True)
+
+
+def match_certificate_setting(settings_list, level_id=None, category_id=None):
     """
-    根据项目获取最匹配的证书配置
+    在已按更新时间倒序排列的启用配置中选出最匹配的一项
     优先级：
     1. 级别 + 类别 完全匹配
     2. 级别匹配 (类别为空)
@@ -19,79 +30,135 @@ def get_best_match_setting(project=None):
     4. 通用匹配 (级别、类别均为空)
     5. 最新启用的任意配置 (兜底)
     """
-    base_qs = CertificateSetting.objects.filter(is_active=True)
-
-    if not project:
-        return base_qs.order_by("-updated_at").first()
-
-    # 准备查询条件
-    level_id = project.level_id if project.level else None
-    category_id = project.category_id if project.category else None
-
-    # 1. 级别 + 类别 完全匹配
+    candidates = []
     if level_id and category_id:
-        match = (
-            base_qs.filter(project_level_id=level_id, project_category_id=category_id)
-            .order_by("-updated_at")
-            .first()
-        )
-        if match:
-            return match
-
-    # 2. 级别匹配 (类别无限制)
+        candidates.append((level_id, category_id))
     if level_id:
-        match = (
-            base_qs.filter(project_level_id=level_id, project_category__isnull=True)
-            .order_by("-updated_at")
-            .first()
-        )
-        if match:
-            return match
-
-    # 3. 类别匹配 (级别无限制)
+        candidates.append((level_id, None))
     if category_id:
-        match = (
-            base_qs.filter(project_level__isnull=True, project_category_id=category_id)
-            .order_by("-updated_at")
-            .first()
-        )
-        if match:
-            return match
-
-    # 4. 通用匹配 (无限制)
-    match = (
-        base_qs.filter(project_level__isnull=True, project_category__isnull=True)
-        .order_by("-updated_at")
-        .first()
+        candidates.append((None, category_id))
+    candidates.append((None, None))
+
+    for candidate in candidates:
+        for setting in settings_list:
+            if (setting.project_level_id, setting.project_category_id) == candidate:
+                return setting
+    return settings_list[0] if settings_list else None
+
+
+def get_best_match_setting(project=None):
+    """
+    根据项目获取最匹配的证书配置（一次查询取出全部启用配置后在内存中匹配）
+    """
+    settings_list = list(
+        CertificateSetting.objects.filter(is_active=True).order_by("-updated_at")
+    )
+    if not project:
+        return settings_list[0] if settings_list else None
+    return match_certificate_setting(
+        settings_list, project.level_id, project.category_id
     )
-    if match:
-        return match
 
-    # 5. 兜底 (最新)
-    return base_qs.order_by("-updated_at").first()
 
+@lru_cache(maxsize=CERTIFICATE_ASSET_CACHE_SIZE)
+def _read_asset(storage, name, updated_at):
+    # updated_at 参与缓存键：配置更新后不会读到旧图片
+    with storage.open(name, "rb") as file_obj:
+        return file_obj.read()
 
-def render_certificate_html(project, setting=None, request=None):
-    setting = setting or get_best_match_setting(project)
-    issuer = escape(setting.issuer_name if setting else "")
-    style_config = setting.style_config if setting else {}
 
-    def html_text(value):
-        return escape(str(value or ""), quote=True)
+@lru_cache(maxsize=CERTIFICATE_ASSET_CACHE_SIZE)
+def _asset_data_url(storage, name, updated_at):
+    content_type = mimetypes.guess_type(name)[0] or "image/png"
+    encoded = base64.b64encode(_read_asset(storage, name, updated_at)).decode("ascii")
+    return f"data:{content_type};base64,{encoded}"
+
 
-    def build_asset_url(file_field):
+class CertificateRenderer:
+    """
+    结题证书渲染引擎。
+
+    启用的证书配置只加载一次，按（级别, 类别）缓存匹配结果和页面框架；
+    图片按文件名与配置更新时间缓存。shared_assets=True 时证书通过相对路径
+    引用 ``assets/`` 下的共享图片，调用方用 ``shared_entries()`` 把图片写入
+    ZIP 一次，而不是在每份证书中内联 base64。
+    """
+
+    def __init__(self, shared_assets=False):
+        self.shared_assets = shared_assets
+        self._settings = None
+        self._matches = {}
+        self._frames = {}
+        self._shared = {}
+
+    def match_setting(self, level_id=None, category_id=None):
+        key = (level_id, category_id)
+        if key not in self._matches:
+            if self._settings is None:
+                self._settings = list(
+                    CertificateSetting.objects.filter(is_active=True).order_by(
+                        "-updated_at"
+                    )
+                )
+            self._matches[key] = match_certificate_setting(
+                self._settings, level_id, category_id
+            )
+        return self._matches[key]
+
+    def render(self, project, setting=None):
+        setting = setting or self.match_setting(project.level_id, project.category_id)
+        head, tail = self._frame(setting)
+        html_text = _html_text
+        return f"""{head}
+              <p>兹证明：{html_text(project.leader.real_name)} 负责的项目《{html_text(project.title)}》已通过结题验收。</p>
+              <p>项目编号：{html_text(project.project_no)}</p>
+              <p>项目级别：{html_text(project.level.label if project.level else "")}</p>
+              <p>项目类别：{html_text(project.category.label if project.category else "")}</p>{tail}"""
+
+    def shared_entries(self):
+        """
+        已引用的共享图片 ``[(arcname, content)]``
+        """
+        return list(self._shared.items())
+
+    def _frame(self, setting):
+        key = (setting.pk, setting.updated_at) if setting else None
+        if key not in self._frames:
+            self._frames[key] = _certificate_frame(
+                setting,
+                self._asset_url(setting, setting.background_image) if setting else "",
+                self._asset_url(setting, setting.seal_image) if setting else "",
+            )
+        return self._frames[key]
+
+    def _asset_url(self, setting, file_field):
         if not file_field:
             return ""
+        storage, name = file_field.storage, file_field.name
+        updated_at = setting.updated_at.isoformat() if setting.updated_at else ""
         try:
-            content_type = mimetypes.guess_type(file_field.name)[0] or "image/png"
-            with file_field.open("rb") as file_obj:
-                encoded = base64.b64encode(file_obj.read()).decode("ascii")
-            return f"data:{content_type};base64,{encoded}"
+            if not self.shared_assets:
+                return _asset_data_url(storage, name, updated_at)
+            content = _read_asset(storage, name, updated_at)
         except Exception:
             return ""
+        digest = hashlib.sha1(f"{name}:{updated_at}".encode()).hexdigest()[:16]
+        extension = posixpath.splitext(name)[1].lower()
+        arcname = f"{CERTIFICATE_ASSET_DIR}/{digest}{extension}"
+        self._shared[arcname] = content
+        return arcname
 
-    bg_url = build_asset_url(setting.background_image) if setting else ""
-    seal_url = build_asset_url(setting.seal_image) if setting else ""
+
+def render_certificate_html(project, setting=None, request=None):
+    return CertificateRenderer().render(project, setting)
+
+
+def _certificate_frame(setting, bg_url, seal_url):
+    """
+    证书页面中只与配置相关的部分，返回 (内容之前, 内容之后) 两段 HTML
+    """
+    issuer = escape(setting.issuer_name if setting else "")
+    style_config = setting.style_config if setting else {}
 
     font_family = style_config.get("font_family", "SimSun")
     body_size = style_config.get("body_size", 18)
@@ -109,7 +176,7 @@ def render_certificate_html(project, setting=None, request=None):
     )
     page_size = style_config.get("page_size", "A4 landscape")
     background_image = f'url("{bg_url}")' if bg_url else "none"
-    return f"""
+    head = f"""
         <html>
         <head>
           <meta charset="utf-8" />
@@ -169,11 +236,8 @@ def render_certificate_html(project, setting=None, request=None):
         </head>
         <body>
           <div class="certificate">
-            <div class="content">
-              <p>兹证明：{html_text(project.leader.real_name)} 负责的项目《{html_text(project.title)}》已通过结题验收。</p>
-              <p>项目编号：{html_text(project.project_no)}</p>
-              <p>项目级别：{html_text(project.level.label if project.level else "")}</p>
-              <p>项目类别：{html_text(project.category.label if project.category else "")}</p>
+            <div class="content">"""
+    tail = f"""
             </div>
             <div class="issuer">{issuer}</div>
             {f'<img class="seal" src="{seal_url}" alt="seal" />' if seal_url else ""}
@@ -181,3 +245,4 @@ def render_certificate_html(project, setting=None, request=None):
         </body>
         </html>
         """
+    return head, tail
@@ -0,0 +1,151 @@
+"""
+Benchmark batch certificate rendering with shared assets against per-certificate inlining.
+"""
+
+import os
+import tempfile
+import time
+import zipfile
+from tempfile import TemporaryDirectory
+
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from apps.dictionaries.models import DictionaryItem, DictionaryType
+from apps.projects.certificates import (
+    CertificateRenderer,
+    _asset_data_url,
+    _read_asset,
+    render_certificate_html,
+)
+from apps.projects.models import Project
+from apps.system_settings.models import CertificateSetting
+from apps.users.models import User
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_render(project):
+    # 与旧流程相同：每份证书各自匹配配置，并重新读取、编码图片
+    _read_asset.cache_clear()
+    _asset_data_url.cache_clear()
+    return render_certificate_html(project)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark certificate rendering for a batch of synthetic closed projects. "
+        "All data is created inside a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=300)
+        parser.add_argument(
+            "--image-kib",
+            type=int,
+            default=2048,
+            help="Size of the synthetic background image in KiB.",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["all", "legacy", "inline", "shared"],
+            default="all",
+        )
+
+    def handle(self, *args, **options):
+        if options["projects"] <= 0 or options["image_kib"] <= 0:
+            raise CommandError("--projects and --image-kib must be positive")
+        engines = (
+            ["legacy", "inline", "shared"]
+            if options["engine"] == "all"
+            else [options["engine"]]
+        )
+
+        self.stdout.write(
+            f"{'engine':<10}{'projects':>10}{'queries':>9}{'ms/cert':>10}"
+            f"{'seconds':>10}{'zip KiB':>10}"
+        )
+        with (
+            TemporaryDirectory() as media_root,
+            override_settings(MEDIA_ROOT=media_root),
+        ):
+            try:
+                with transaction.atomic():
+                    projects = self._seed(options["projects"], options["image_kib"])
+                    for engine in engines:
+                        queries, seconds, size = self._run(engine, projects)
+                        self.stdout.write(
+                            f"{engine:<10}{len(projects):>10}{queries:>9}"
+                            f"{seconds * 1000 / len(projects):>10.2f}"
+                            f"{seconds:>10.2f}{size / 1024:>10.0f}"
+                        )
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    @staticmethod
+    def _seed(count, image_kib):
+        dict_type = DictionaryType.objects.create(
+            code="benchmark_certificate_level", name="证书压测级别"
+        )
+        levels = [
+            DictionaryItem.objects.create(
+                dict_type=dict_type, value=f"LEVEL_{index}", label=f"级别{index}"
+            )
+            for index in range(3)
+        ]
+        setting = CertificateSetting(
+            name="压测模板",
+            school_name="压测学校",
+            issuer_name="压测发证单位",
+            project_level=levels[0],
+            is_active=True,
+        )
+        setting.background_image.save(
+            "benchmark-background.png",
+            ContentFile(os.urandom(image_kib * 1024)),
+            save=False,
+        )
+        setting.seal_image.save(
+            "benchmark-seal.png", ContentFile(os.urandom(64 * 1024)), save=False
+        )
+        setting.save()
+        CertificateSetting.objects.create(
+            name="通用模板", school_name="压测学校", issuer_name="压测发证单位"
+        )
+
+        leader = User(real_name="压测负责人", employee_id="BENCH0001")
+        return [
+            Project(
+                project_no=f"BENCH{index:06d}",
+                title=f"结题证书压测项目 {index}",
+                leader=leader,
+                level=levels[index % len(levels)],
+                status=Project.ProjectStatus.CLOSED,
+            )
+            for index in range(count)
+        ]
+
+    @staticmethod
+    def _run(engine, projects):
+        renderer = CertificateRenderer(shared_assets=engine == "shared")
+        with tempfile.TemporaryFile() as output:
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+                    for project in projects:
+                        html = (
+                            _legacy_render(project)
+                            if engine == "legacy"
+                            else renderer.render(project)
+                        )
+                        zf.writestr(f"{project.project_no}_结题证书.html", html)
+                    for arcname, content in renderer.shared_entries():
+                        zf.writestr(arcname, content)
+                seconds = time.perf_counter() - started
+            size = output.tell()
+        return len(queries.captured_queries), seconds, size
@@ -0,0 +1,73 @@
+"""
+Benchmark template-based Word rendering against the python-docx builder.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.projects.services.document import build_generic_report, build_project_doc
+from apps.projects.services.document_templates import (
+    REPORT_TYPES,
+    TEMPLATE_FILES,
+    render_document,
+)
+
+
+def _synthetic_context(index):
+    return {
+        "project_id": index,
+        "title": f"大学生创新训练项目 {index}",
+        "project_no": f"DC2026{index:06d}",
+        "leader_name": f"学生{index}",
+        "leader_employee_id": f"2026{index:08d}",
+        "leader_college": "计算机学院",
+        "level_label": "校级",
+        "description": "面向校园场景的创新训练项目研究意义与现状分析。\n" * 20,
+        "expected_results": "完成原型系统并发表论文一篇。",
+        "budget": "5000.00",
+    }
+
+
+def _builder(kind):
+    if kind == "application":
+        return build_project_doc
+    return lambda context: build_generic_report(context, REPORT_TYPES[kind])
+
+
+class Command(BaseCommand):
+    help = "Benchmark documents per second for the template engine and the builder."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--docs", type=int, default=200)
+        parser.add_argument(
+            "--kind",
+            choices=["all", *TEMPLATE_FILES.keys()],
+            default="all",
+        )
+
+    def handle(self, *args, **options):
+        if options["docs"] <= 0:
+            raise CommandError("--docs must be positive")
+        kinds = TEMPLATE_FILES.keys() if options["kind"] == "all" else [options["kind"]]
+        contexts = [_synthetic_context(index) for index in range(options["docs"])]
+
+        self.stdout.write(
+            f"{'kind':<13}{'engine':<10}{'docs':>8}{'seconds':>10}{'docs/sec':>10}"
+        )
+        for kind in kinds:
+            # 模板首次加载（解析/生成默认模板）不计入耗时
+            render_document(kind, contexts[0])
+            engines = {
+                "builder": _builder(kind),
+                "template": lambda context, kind=kind: render_document(kind, context),
+            }
+            for name, render in engines.items():
+                started = time.perf_counter()
+                for context in contexts:
+                    render(context)
+                seconds = time.perf_counter() - started
+                self.stdout.write(
+                    f"{kind:<13}{name:<10}{len(contexts):>8}{seconds:>10.2f}"
+                    f"{len(contexts) / seconds:>10.1f}"
+                )
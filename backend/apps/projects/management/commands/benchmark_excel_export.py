@@ -0,0 +1,141 @@
+"""
+Benchmark the project Excel export engine against the legacy in-memory builder.
+"""
+
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import openpyxl  # type: ignore[import-untyped]
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.utils.export import write_excel
+
+BENCHMARK_HEADERS = {
+    "project_no": "项目编号",
+    "title": "项目名称",
+    "description": "项目简介",
+    "level_label": "项目级别",
+    "category_label": "项目类别",
+    "start_date": "开始日期",
+    "end_date": "结束日期",
+    "budget": "项目经费(元)",
+    "approved_budget": "批准经费(元)",
+    "status_display": "状态",
+    "leader_name": "负责人姓名",
+    "leader_employee_id": "负责人学号",
+    "leader_phone": "负责人电话",
+    "leader_email": "负责人邮箱",
+    "leader_college": "负责人学院",
+    "advisors": "指导教师",
+    "members": "项目成员",
+    "achievements_count": "成果数量",
+    "created_at": "创建时间",
+    "submitted_at": "提交时间",
+}
+
+
+def _synthetic_rows(count):
+    base_date = date(2026, 3, 1)
+    base_time = datetime(2026, 3, 1, 8, 0, 0)
+    for index in range(count):
+        yield {
+            "project_no": f"DC2026{index:06d}",
+            "title": f"大学生创新训练项目 {index}",
+            "description": "面向校园场景的创新训练项目简介" * 4,
+            "level_label": "校级" if index % 3 else "省级",
+            "category_label": "创新训练",
+            "start_date": base_date,
+            "end_date": base_date + timedelta(days=365),
+            "budget": Decimal("5000.00") + index % 100,
+            "approved_budget": Decimal("4000.00"),
+            "status_display": "已提交",
+            "leader_name": f"学生{index}",
+            "leader_employee_id": f"2026{index:08d}",
+            "leader_phone": "13800000000",
+            "leader_email": f"student{index}@example.com",
+            "leader_college": "计算机学院",
+            "advisors": "张老师(T0001)；李老师(T0002)",
+            "members": "成员甲(S0001)；成员乙(S0002)；成员丙(S0003)",
+            "achievements_count": index % 5,
+            "created_at": base_time + timedelta(minutes=index),
+            "submitted_at": base_time + timedelta(minutes=index, seconds=30),
+        }
+
+
+def _legacy_write_excel(data, headers, output):
+    # 与旧版 generate_excel 相同：常规工作簿、逐单元格写入并全部转为字符串
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Export Data"
+    for col_num, header in enumerate(headers.values(), 1):
+        ws.cell(row=1, column=col_num, value=header)
+    for row_num, item in enumerate(data, 2):
+        for col_num, field in enumerate(headers.keys(), 1):
+            value = item.get(field, "")
+            ws.cell(
+                row=row_num,
+                column=col_num,
+                value=str(value) if value is not None else "",
+            )
+    wb.save(output)
+
+
+ENGINES = {
+    "legacy": _legacy_write_excel,
+    "write_only": write_excel,
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark Excel export throughput and peak memory with synthetic projects."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            default="10000,50000",
+            help="Comma separated row counts to benchmark.",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=["all", *ENGINES.keys()],
+            default="all",
+            help="Only run the given engine.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            row_counts = [int(value) for value in options["rows"].split(",") if value]
+        except ValueError as exc:
+            raise CommandError("--rows must be comma separated integers") from exc
+        if not row_counts or any(count <= 0 for count in row_counts):
+            raise CommandError("--rows must be positive integers")
+
+        engines = ENGINES
+        if options["engine"] != "all":
+            engines = {options["engine"]: ENGINES[options["engine"]]}
+        self.stdout.write(
+            f"{'engine':<12}{'rows':>8}{'seconds':>10}{'rows/sec':>12}{'peak MiB':>10}{'file KiB':>10}"
+        )
+        for count in row_counts:
+            for name, engine in engines.items():
+                seconds, peak, size = self._run(engine, count)
+                self.stdout.write(
+                    f"{name:<12}{count:>8}{seconds:>10.2f}{count / seconds:>12.0f}"
+                    f"{peak / 1024 / 1024:>10.1f}{size / 1024:>10.0f}"
+                )
+
+    def _run(self, engine, count):
+        with tempfile.TemporaryFile() as output:
+            tracemalloc.start()
+            started = time.perf_counter()
+            try:
+                engine(_synthetic_rows(count), BENCHMARK_HEADERS, output)
+                seconds = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            size = output.tell()
+        return seconds, peak, size
@@ -0,0 +1,129 @@
+"""
+Benchmark bulk publication of establishment results against publishing one
+project per call.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.projects.models import Project, ProjectAdvisor
+from apps.projects.services import PublicationService
+from apps.system_settings.models import ProjectBatch
+from apps.users.models import Role, User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark PublicationService.publish_projects with synthetic confirmed "
+        "projects. All data is created inside a transaction and rolled back, so "
+        "notifications deferred to commit are never written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=1000)
+        parser.add_argument(
+            "--mode",
+            choices=["all", "bulk", "per_project"],
+            default="all",
+            help="bulk: one call for all projects; per_project: one call per project.",
+        )
+
+    def handle(self, *args, **options):
+        if options["projects"] <= 0:
+            raise CommandError("--projects must be positive")
+        modes = (
+            ["bulk", "per_project"] if options["mode"] == "all" else [options["mode"]]
+        )
+
+        self.stdout.write(
+            f"{'mode':<12}{'projects':>10}{'published':>11}{'queries':>9}{'seconds':>10}"
+        )
+        try:
+            with transaction.atomic():
+                admin, project_ids = self._seed(options["projects"])
+                for mode in modes:
+                    Project.objects.filter(id__in=project_ids).update(
+                        status=Project.ProjectStatus.LEVEL1_AUDITING,
+                        publish_status=Project.PublishStatus.CONFIRMED,
+                        published_at=None,
+                        published_by=None,
+                    )
+                    published, queries, seconds = self._run(mode, admin, project_ids)
+                    self.stdout.write(
+                        f"{mode:<12}{len(project_ids):>10}{published:>11}"
+                        f"{queries:>9}{seconds:>10.2f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _run(mode, admin, project_ids):
+        calls = [project_ids] if mode == "bulk" else [[pid] for pid in project_ids]
+        published = 0
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for ids in calls:
+                published += PublicationService.publish_projects(admin, ids)
+            seconds = time.perf_counter() - started
+        return published, len(queries.captured_queries), seconds
+
+    @staticmethod
+    def _seed(project_count):
+        ProjectBatch.objects.filter(is_current=True).update(is_current=False)
+        batch = ProjectBatch.objects.create(
+            name="Benchmark",
+            year=2099,
+            code="BENCHMARK-PUBLISH",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_active=True,
+            is_current=True,
+        )
+        role = Role.objects.create(
+            code="BENCHMARK_PUBLISH_ADMIN",
+            name="Benchmark School Admin",
+            scope_dimension="SCHOOL",
+        )
+        admin = User.objects.create(
+            username="benchmark-publish-admin",
+            role_fk=role,
+            real_name="Benchmark Admin",
+            employee_id="BP0001",
+        )
+        leader = User.objects.create(
+            username="benchmark-publish-leader",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="Benchmark Leader",
+            employee_id="BP1001",
+            college="BENCH",
+        )
+        advisor = User.objects.create(
+            username="benchmark-publish-advisor",
+            role_fk=Role.objects.get(code="TEACHER"),
+            real_name="Benchmark Advisor",
+            employee_id="BP2001",
+        )
+        projects = Project.objects.bulk_create(
+            Project(
+                project_no=f"2099BENCH{index:04d}",
+                title=f"Benchmark Project {index}",
+                leader=leader,
+                status=Project.ProjectStatus.LEVEL1_AUDITING,
+                publish_status=Project.PublishStatus.CONFIRMED,
+                final_budget=5000,
+                year=2099,
+                batch=batch,
+            )
+            for index in range(1, project_count + 1)
+        )
+        ProjectAdvisor.objects.bulk_create(
+            ProjectAdvisor(project=project, user=advisor) for project in projects
+        )
+        return admin, [project.id for project in projects]
@@ -0,0 +1,186 @@
+"""
+Benchmark the admin project/user search against the legacy icontains filters.
+"""
+
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+
+from apps.projects.models import Project
+from apps.projects.services import ProjectService
+from apps.users.models import User
+from apps.users.repositories.user_repository import search_users
+
+SURNAMES = "王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘"
+GIVEN_CHARS = "伟芳娜秀英敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红娥玲芬燕彬鹏辉宇轩浩然子涵欣怡梓萱思远"
+TITLE_WORDS = [
+    "基于",
+    "深度学习",
+    "校园",
+    "智慧农业",
+    "传感网络",
+    "安全监测",
+    "区块链",
+    "乡村振兴",
+    "新能源",
+    "储能材料",
+    "机器人",
+    "图像识别",
+    "文化传承",
+    "碳中和",
+    "医疗影像",
+    "数据分析",
+    "的研究",
+    "系统设计",
+    "与实现",
+    "平台开发",
+]
+
+PROJECT_TERMS = ["深度学习", "校园安全", "研究", "BENCH0012", "张伟", "涵"]
+USER_TERMS = ["张伟", "欣怡", "bench01234", "B0012", "王"]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _legacy_search_projects(queryset, term):
+    # 与旧版列表相同：连表负责人后逐行 icontains
+    return queryset.filter(
+        Q(title__icontains=term)
+        | Q(project_no__icontains=term)
+        | Q(leader__real_name__icontains=term)
+    )
+
+
+def _legacy_search_users(queryset, term):
+    return queryset.filter(
+        Q(username__icontains=term)
+        | Q(employee_id__icontains=term)
+        | Q(real_name__icontains=term)
+    )
+
+
+ENGINES = {
+    "legacy": (_legacy_search_projects, _legacy_search_users),
+    "ngram": (ProjectService.search_projects, search_users),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark admin list search (count + first page) over synthetic projects "
+        "and users. All data is created inside a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=100000)
+        parser.add_argument("--users", type=int, default=200000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--engine", choices=["all", *ENGINES.keys()], default="all")
+
+    def handle(self, *args, **options):
+        if min(options["projects"], options["users"], options["repeat"]) <= 0:
+            raise CommandError("--projects, --users and --repeat must be positive")
+        engines = (
+            ENGINES
+            if options["engine"] == "all"
+            else {options["engine"]: ENGINES[options["engine"]]}
+        )
+
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                self._seed(options["users"], options["projects"])
+                self.stdout.write(
+                    f"seeded {options['users']} users / {options['projects']} projects "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+                self.stdout.write(
+                    f"{'list':<10}{'term':<14}{'engine':<10}{'rows':>8}{'median ms':>12}"
+                )
+                for term in PROJECT_TERMS:
+                    for name, (search, _) in engines.items():
+                        self._report(
+                            "projects",
+                            term,
+                            name,
+                            Project.objects.all(),
+                            search,
+                            options["repeat"],
+                        )
+                for term in USER_TERMS:
+                    for name, (_, search) in engines.items():
+                        self._report(
+                            "users",
+                            term,
+                            name,
+                            User.objects.all(),
+                            search,
+                            options["repeat"],
+                        )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _report(self, label, term, engine, queryset, search, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            filtered = search(queryset, term)
+            rows = filtered.count()
+            list(filtered.order_by("-created_at", "-id")[:20])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{label:<10}{term:<14}{engine:<10}{rows:>8}"
+            f"{statistics.median(timings):>12.1f}"
+        )
+
+    @staticmethod
+    def _seed(user_count, project_count):
+        rng = random.Random(2026)
+        users = (
+            User(
+                username=f"bench{index:06d}",
+                employee_id=f"B{index:08d}",
+                real_name=rng.choice(SURNAMES)
+                + "".join(rng.choices(GIVEN_CHARS, k=rng.randint(1, 2))),
+                password="!",
+                college="压测学院",
+            )
+            for index in range(user_count)
+        )
+        _bulk_create(User, users)
+        user_ids = list(
+            User.objects.filter(username__startswith="bench").values_list(
+                "id", flat=True
+            )
+        )
+        projects = (
+            Project(
+                project_no=f"BENCH{index:06d}",
+                title="".join(rng.sample(TITLE_WORDS, k=rng.randint(3, 5))),
+                leader_id=rng.choice(user_ids),
+                year=2026,
+            )
+            for index in range(project_count)
+        )
+        _bulk_create(Project, projects)
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+            cursor.execute(f"ANALYZE {Project._meta.db_table}")
+
+
+def _bulk_create(model, objects, batch_size=5000):
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
@@ -0,0 +1,32 @@
+"""
+Rebuild the per-batch statistics snapshot used by school-level dashboards.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.projects.services.statistics_service import BatchStatisticsService
+from apps.system_settings.models import ProjectBatch
+
+
+class Command(BaseCommand):
+    help = "Rebuild batch statistics snapshots from projects, expenditures and achievements."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-id",
+            type=int,
+            default=None,
+            help="Only rebuild the given batch (default: all batches).",
+        )
+
+    def handle(self, *args, **options):
+        batches = ProjectBatch.objects.order_by("id")
+        if options["batch_id"]:
+            batches = batches.filter(id=options["batch_id"])
+            if not batches.exists():
+                raise CommandError(f"Batch {options['batch_id']} does not exist")
+
+        for batch_id in batches.values_list("id", flat=True):
+            buckets = BatchStatisticsService.refresh_batch(batch_id)
+            self.stdout.write(f"Batch {batch_id}: {buckets} buckets")
+        self.stdout.write(self.style.SUCCESS("Batch statistics refreshed."))
@@ -0,0 +1,94 @@
+# Generated by Django 6.0 on 2026-10-18 12:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def _bucket_key(row, fields):
+    batch_id, college, level_id, status = (row[field] for field in fields)
+    return batch_id, college or "", level_id, status
+
+
+def backfill_batch_statistics(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectExpenditure = apps.get_model("projects", "ProjectExpenditure")
+    ProjectAchievement = apps.get_model("projects", "ProjectAchievement")
+    BatchStatistics = apps.get_model("projects", "BatchStatistics")
+
+    fields = ("batch_id", "leader__college", "level_id", "status")
+    related_fields = [f"project__{field}" for field in fields]
+    rows = {}
+    for row in (
+        Project.objects.filter(batch__isnull=False, is_deleted=False)
+        .values(*fields)
+        .annotate(
+            project_count=Count("id"),
+            budgeted_count=Count("id", filter=Q(approved_budget__isnull=False)),
+            approved_budget_total=Sum("approved_budget"),
+        )
+        .order_by()
+    ):
+        key = _bucket_key(row, fields)
+        rows[key] = BatchStatistics(
+            batch_id=key[0],
+            college=key[1],
+            level_id=key[2],
+            status=key[3],
+            project_count=row["project_count"],
+            budgeted_count=row["budgeted_count"],
+            approved_budget_total=row["approved_budget_total"] or 0,
+        )
+    related_filter = {"project__batch__isnull": False, "project__is_deleted": False}
+    for row in (
+        ProjectExpenditure.objects.filter(is_deleted=False, **related_filter)
+        .values(*related_fields)
+        .annotate(total=Sum("amount"))
+        .order_by()
+    ):
+        key = _bucket_key(row, related_fields)
+        rows[key].expenditure_total = row["total"] or 0
+    for row in (
+        ProjectAchievement.objects.filter(**related_filter)
+        .values(*related_fields)
+        .annotate(total=Count("id"))
+        .order_by()
+    ):
+        key = _bucket_key(row, related_fields)
+        rows[key].achievement_count = row["total"]
+    BatchStatistics.objects.bulk_create(rows.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dictionaries', '0006_seed_teacher_staff_title'),
+        ('projects', '0037_rename_projects_publish_5596ce_idx_projects_publish_63598c_idx_and_more'),
+        ('system_settings', '0023_alter_workflowconfig_phase'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('college', models.CharField(blank=True, default='', max_length=100, verbose_name='学院')),
+                ('status', models.CharField(max_length=30, verbose_name='项目状态')),
+                ('project_count', models.PositiveIntegerField(default=0, verbose_name='项目数')),
+                ('budgeted_count', models.PositiveIntegerField(default=0, verbose_name='已批经费项目数')),
+                ('approved_budget_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='批准经费合计')),
+                ('expenditure_total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='支出合计')),
+                ('achievement_count', models.PositiveIntegerField(default=0, verbose_name='成果数')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('batch', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='system_settings.projectbatch', verbose_name='所属批次')),
+                ('level', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='batch_statistics', to='dictionaries.dictionaryitem', verbose_name='项目级别')),
+            ],
+            options={
+                'verbose_name': '批次统计快照',
+                'verbose_name_plural': '批次统计快照',
+                'db_table': 'project_batch_statistics',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('level__isnull', False)), fields=('batch', 'college', 'level', 'status'), name='uniq_batch_statistics_bucket'), models.UniqueConstraint(condition=models.Q(('level__isnull', True)), fields=('batch', 'college', 'status'), name='uniq_batch_statistics_no_level')],
+            },
+        ),
+        migrations.RunPython(backfill_batch_statistics, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0038_batch_statistics'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['batch', '-created_at', '-id'], name='projects_batch_created_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-10-18 12:54
+
+import apps.utils.search
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0039_project_batch_created_index'),
+        ('users', '0021_user_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(models.Func(models.F('title'), models.F('project_no'), function='search_ngrams', output_field=apps.utils.search.NgramSearchField()), name='projects_search_idx'),
+        ),
+    ]
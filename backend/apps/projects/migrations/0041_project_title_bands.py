@@ -0,0 +1,63 @@
+# Generated by Django 6.0 on 2026-10-18 13:01
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# 32 个 MinHash 值分为 16 段、每段 2 个：相似度 0.5 时命中概率约 99%，0.2 时约 48%。
+# 调用 title_shingles 时带上 schema：pg_restore 以空 search_path 重建表达式索引
+CREATE_FUNCTIONS_SQL = r"""
+CREATE OR REPLACE FUNCTION title_shingles(value text) RETURNS text[]
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT CASE
+        WHEN char_length(normalized.text) < 2 THEN array_remove(ARRAY[normalized.text], '')
+        ELSE ARRAY(
+            SELECT DISTINCT substr(normalized.text, i, 2)
+            FROM generate_series(1, char_length(normalized.text) - 1) AS i
+        )
+    END
+    FROM (
+        SELECT regexp_replace(lower(value), '[[:space:][:punct:]]+', '', 'g') AS text
+    ) AS normalized
+$$;
+
+CREATE OR REPLACE FUNCTION title_minhash_bands(value text) RETURNS bigint[]
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT coalesce(
+        array_agg(hashtextextended(bands.signature, bands.band) ORDER BY bands.band),
+        '{}'
+    )
+    FROM (
+        SELECT (seed - 1) / 2 AS band,
+               string_agg(minimum::text, ':' ORDER BY seed) AS signature
+        FROM (
+            SELECT seed, min(hashtextextended(shingle, seed)) AS minimum
+            FROM unnest(public.title_shingles(value)) AS shingle,
+                 generate_series(1, 32) AS seed
+            GROUP BY seed
+        ) AS minhash
+        GROUP BY (seed - 1) / 2
+    ) AS bands
+$$;
+"""
+
+DROP_FUNCTIONS_SQL = """
+DROP FUNCTION IF EXISTS title_minhash_bands(text);
+DROP FUNCTION IF EXISTS title_shingles(text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0040_project_search_vector'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_FUNCTIONS_SQL, DROP_FUNCTIONS_SQL),
+        migrations.AddIndex(
+            model_name='project',
+            index=django.contrib.postgres.indexes.GinIndex(models.Func(models.F('title'), function='title_minhash_bands', output_field=django.contrib.postgres.fields.ArrayField(base_field=models.BigIntegerField(), size=None)), name='projects_title_bands_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 13:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0041_project_title_bands'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectNumberSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=50, unique=True, verbose_name='编号前缀')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='已分配最大序号')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '项目编号计数器',
+                'verbose_name_plural': '项目编号计数器',
+                'db_table': 'project_number_sequences',
+            },
+        ),
+    ]
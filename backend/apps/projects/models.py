@@ -3,10 +3,13 @@
 项目模型定义
 """
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.conf import settings
 from apps.dictionaries.models import DictionaryItem
 from apps.system_settings.models import ProjectBatch
+from apps.utils.search import search_ngrams
 
 
 PROJECT_FILE_FIELDS = {
@@ -16,6 +19,8 @@ PROJECT_FILE_FIELDS = {
     "final_report",
     "achievement_file",
 }
+# 模糊搜索的字段：GIN 表达式索引与查询条件必须使用同一表达式
+PROJECT_SEARCH_FIELDS = ("title", "project_no")
 _PROJECT_RUNTIME_FILE_ATTACHMENTS = {}
 
 
@@ -23,6 +28,17 @@ def get_project_runtime_file(project_id, field_name):
     return _PROJECT_RUNTIME_FILE_ATTACHMENTS.get((project_id, field_name))
 
 
+def title_minhash_bands(expression):
+    """
+    标题 MinHash 分段（SQL 函数由迁移 0041 创建），GIN 表达式索引与查询共用
+    """
+    return models.Func(
+        expression,
+        function="title_minhash_bands",
+        output_field=ArrayField(models.BigIntegerField()),
+    )
+
+
 class Project(models.Model):
     """
     大创项目模型
@@ -285,6 +301,18 @@ class Project(models.Model):
             models.Index(fields=["project_no"]),
             models.Index(fields=["status"]),
             models.Index(fields=["publish_status"]),
+            models.Index(
+                fields=["batch", "-created_at", "-id"],
+                name="projects_batch_created_idx",
+            ),
+            GinIndex(
+                search_ngrams(*PROJECT_SEARCH_FIELDS), name="projects_search_idx"
+            ),
+            # 标题近似查重（见 services/title_similarity.py）
+            GinIndex(
+                title_minhash_bands(models.F("title")),
+                name="projects_title_bands_idx",
+            ),
         ]
 
     def __str__(self):
@@ -807,3 +835,76 @@ class ProjectArchive(models.Model):
 
     def __str__(self):
         return f"{self.project.project_no} - 归档"
+
+
+class BatchStatistics(models.Model):
+    """
+    批次统计快照（批次 × 学院 × 级别 × 状态），随项目变化增量维护
+    """
+
+    batch = models.ForeignKey(
+        ProjectBatch,
+        on_delete=models.CASCADE,
+        related_name="statistics",
+        verbose_name="所属批次",
+    )
+    college = models.CharField(
+        max_length=100, blank=True, default="", verbose_name="学院"
+    )
+    level = models.ForeignKey(
+        DictionaryItem,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="batch_statistics",
+        verbose_name="项目级别",
+    )
+    status = models.CharField(max_length=30, verbose_name="项目状态")
+    project_count = models.PositiveIntegerField(default=0, verbose_name="项目数")
+    budgeted_count = models.PositiveIntegerField(default=0, verbose_name="已批经费项目数")
+    approved_budget_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name="批准经费合计"
+    )
+    expenditure_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name="支出合计"
+    )
+    achievement_count = models.PositiveIntegerField(default=0, verbose_name="成果数")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        db_table = "project_batch_statistics"
+        verbose_name = "批次统计快照"
+        verbose_name_plural = verbose_name
+        constraints = [
+            models.UniqueConstraint(
+                fields=["batch", "college", "level", "status"],
+                condition=models.Q(level__isnull=False),
+                name="uniq_batch_statistics_bucket",
+            ),
+            models.UniqueConstraint(
+                fields=["batch", "college", "status"],
+                condition=models.Q(level__isnull=True),
+                name="uniq_batch_statistics_no_level",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.batch_id}-{self.college}-{self.level_id}-{self.status}"
+
+
+class ProjectNumberSequence(models.Model):
+    """
+    项目编号计数器（年份 + 学院代码前缀），由 ProjectNumberService 原子递增
+    """
+
+    prefix = models.CharField(max_length=50, unique=True, verbose_name="编号前缀")
+    last_value = models.BigIntegerField(default=0, verbose_name="已分配最大序号")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        db_table = "project_number_sequences"
+        verbose_name = "项目编号计数器"
+        verbose_name_plural = verbose_name
+
+    def __str__(self):
+        return f"{self.prefix}:{self.last_value}"
@@ -8,7 +8,7 @@ from django.urls import NoReverseMatch
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 
-from apps.dictionaries.models import DictionaryItem
+from apps.dictionaries.services import DictionarySnapshotService
 
 from ..models import ProjectAchievement
 from ..upload_validation import validate_project_support_file
@@ -93,10 +93,8 @@ class ProjectAchievementSerializer(serializers.ModelSerializer):
     def get_college(self, obj):
         if not obj.project.leader or not obj.project.leader.college:
             return ""
-        item = DictionaryItem.objects.filter(
-            dict_type__code="college", value=obj.project.leader.college
-        ).first()
-        return item.label if item else obj.project.leader.college
+        labels = DictionarySnapshotService.get_label_map("college")
+        return labels.get(obj.project.leader.college, obj.project.leader.college)
 
     def get_attachment_url(self, obj):
         if not obj.attachment:
@@ -4,24 +4,83 @@
 
 from pathlib import Path
 
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
 from django.urls import NoReverseMatch
 from rest_framework import serializers
 from rest_framework.reverse import reverse
 
 from apps.dictionaries.models import DictionaryItem
+from apps.dictionaries.services import DictionarySnapshotService
 from apps.system_settings.models import ProjectBatch
 from apps.system_settings.services import SystemSettingService
 from apps.utils.pagination import non_negative_int
 
-from ..models import Project
+from ..models import Project, ProjectAchievement, ProjectAdvisor, ProjectMember
 from .members import ProjectAdvisorSerializer, ProjectMemberSerializer
 from ..upload_validation import (
     validate_project_document_file,
     validate_project_support_file,
 )
 
+# 文件下载地址的占位参数：每次序列化只解析一次路由，再按项目替换
+_URL_PK = "__pk__"
+_URL_FIELD = "__field__"
 
-class ProjectSerializer(serializers.ModelSerializer):
+
+class ProjectDisplayMixin:
+    """
+    项目序列化器共用的学院名称与文件下载地址。
+
+    学院字典映射和下载路由在一次序列化（含 many=True 的整页）中只取一次，
+    逐行只做字典查找和字符串替换。
+    """
+
+    def _file_url_template(self):
+        template = getattr(self, "_file_url_template_cache", None)
+        if template is None:
+            try:
+                template = reverse(
+                    "project-download-file",
+                    args=[_URL_PK, _URL_FIELD],
+                    request=self.context.get("request"),
+                )
+            except NoReverseMatch:
+                template = f"/api/v1/projects/{_URL_PK}/files/{_URL_FIELD}/download/"
+            except Exception:
+                template = ""
+            self._file_url_template_cache = template
+        return template
+
+    def _build_file_url(self, obj, field_name):
+        if not getattr(obj, field_name, None):
+            return ""
+        template = self._file_url_template()
+        if not template:
+            return ""
+        return template.replace(_URL_PK, str(obj.pk)).replace(_URL_FIELD, field_name)
+
+    def get_college(self, obj):
+        if not obj.leader or not obj.leader.college:
+            return ""
+        labels = getattr(self, "_college_labels", None)
+        if labels is None:
+            labels = DictionarySnapshotService.get_label_map("college")
+            self._college_labels = labels
+        return labels.get(obj.leader.college, obj.leader.college)
+
+    def get_batch_name(self, obj):
+        if not obj.batch:
+            return ""
+        return obj.batch.name
+
+    def get_batch_year(self, obj):
+        if not obj.batch:
+            return obj.year
+        return obj.batch.year
+
+
+class ProjectSerializer(ProjectDisplayMixin, serializers.ModelSerializer):
     """
     项目序列化器
     """
@@ -246,26 +305,53 @@ class ProjectSerializer(serializers.ModelSerializer):
             "published_by",
         ]
 
+    @staticmethod
+    def eager_load(queryset):
+        """
+        列表序列化前调用：连表取回负责人、批次与字典项，预取成员和指导教师，
+        成果数量以子查询注解，整页的查询数与行数无关。
+        """
+        achievements = (
+            ProjectAchievement.objects.filter(project=OuterRef("pk"))
+            .order_by()
+            .values("project")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return (
+            queryset.select_related(
+                "leader",
+                "batch",
+                "level",
+                "category",
+                "source",
+                "recommended_level",
+                "final_level",
+                "published_by",
+            )
+            .prefetch_related(
+                Prefetch(
+                    "projectmember_set",
+                    queryset=ProjectMember.objects.select_related("user"),
+                ),
+                Prefetch(
+                    "advisors", queryset=ProjectAdvisor.objects.select_related("user")
+                ),
+            )
+            .annotate(
+                achievements_count=Coalesce(
+                    Subquery(achievements, output_field=IntegerField()), 0
+                )
+            )
+        )
+
     def get_achievements_count(self, obj):
-        """获取项目成果数量"""
+        """获取项目成果数量（列表中使用 eager_load 注解的数量）"""
+        count = getattr(obj, "achievements_count", None)
+        if count is not None:
+            return count
         return obj.achievements.count()
 
-    def _build_file_url(self, obj, field_name):
-        file_field = getattr(obj, field_name, None)
-        if not file_field:
-            return ""
-        try:
-            request = self.context.get("request")
-            return reverse(
-                "project-download-file",
-                args=[obj.pk, field_name],
-                request=request,
-            )
-        except NoReverseMatch:
-            return f"/api/v1/projects/{obj.pk}/files/{field_name}/download/"
-        except Exception:
-            return ""
-
     def get_proposal_file_url(self, obj):
         return self._build_file_url(obj, "proposal_file")
 
@@ -296,24 +382,6 @@ class ProjectSerializer(serializers.ModelSerializer):
     def get_achievement_file_name(self, obj):
         return Path(obj.achievement_file.name).name if obj.achievement_file else ""
 
-    def get_college(self, obj):
-        if not obj.leader or not obj.leader.college:
-            return ""
-        item = DictionaryItem.objects.filter(
-            dict_type__code="college", value=obj.leader.college
-        ).first()
-        return item.label if item else obj.leader.college
-
-    def get_batch_name(self, obj):
-        if not obj.batch:
-            return ""
-        return obj.batch.name
-
-    def get_batch_year(self, obj):
-        if not obj.batch:
-            return obj.year
-        return obj.batch.year
-
     def validate_proposal_file(self, value):
         """
         验证申报书文件
@@ -500,7 +568,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(ProjectDisplayMixin, serializers.ModelSerializer):
     """
     项目列表序列化器（简化版）
     """
@@ -569,6 +637,12 @@ class ProjectListSerializer(serializers.ModelSerializer):
             "submitted_at",
         ]
 
+    @staticmethod
+    def eager_load(queryset):
+        return queryset.select_related(
+            "leader", "batch", "level", "category", "recommended_level", "final_level"
+        )
+
     def get_level_display(self, obj):
         return obj.level.label if obj.level else ""
 
@@ -581,40 +655,6 @@ class ProjectListSerializer(serializers.ModelSerializer):
     def get_category_display(self, obj):
         return obj.category.label if obj.category else ""
 
-    def get_college(self, obj):
-        if not obj.leader or not obj.leader.college:
-            return ""
-        item = DictionaryItem.objects.filter(
-            dict_type__code="college", value=obj.leader.college
-        ).first()
-        return item.label if item else obj.leader.college
-
-    def get_batch_name(self, obj):
-        if not obj.batch:
-            return ""
-        return obj.batch.name
-
-    def get_batch_year(self, obj):
-        if not obj.batch:
-            return obj.year
-        return obj.batch.year
-
-    def _build_file_url(self, obj, field_name):
-        file_field = getattr(obj, field_name, None)
-        if not file_field:
-            return ""
-        try:
-            request = self.context.get("request")
-            return reverse(
-                "project-download-file",
-                args=[obj.pk, field_name],
-                request=request,
-            )
-        except NoReverseMatch:
-            return f"/api/v1/projects/{obj.pk}/files/{field_name}/download/"
-        except Exception:
-            return ""
-
     def get_proposal_file_url(self, obj):
         return self._build_file_url(obj, "proposal_file")
 
@@ -6,18 +6,22 @@ from .archive_service import (
     ensure_project_archive,
 )
 from .project_service import ProjectService
+from .project_number_service import ProjectNumberService
 from .publication_service import PublicationService
 from .change_service import ProjectChangeService
 from .application_service import ProjectApplicationService
 from .closure_service import ProjectClosureService
+from .export_service import ProjectExportService
 
 __all__ = [
     "DocumentService",
     "ProjectService",
+    "ProjectNumberService",
     "PublicationService",
     "ProjectChangeService",
     "ProjectApplicationService",
     "ProjectClosureService",
+    "ProjectExportService",
     "archive_projects",
     "build_archive_attachments",
     "build_archive_snapshot",
@@ -16,7 +16,8 @@ from apps.utils.pagination import non_negative_int
 
 from ..models import Project, ProjectAdvisor, ProjectMember, ProjectPhaseInstance
 from ..serializers import ProjectSerializer
-from ..services import ProjectService
+from ..services.project_number_service import ProjectNumberService
+from ..services.participation_service import ParticipationService, person_user_id
 from ..services.phase_service import ProjectPhaseService
 from ..services.validation_service import ProjectValidationService
 
@@ -28,7 +29,7 @@ def _generate_project_no(year, college_code=""):
     """
     生成项目编号：年份 + 学院代码 + 序号
     """
-    return ProjectService.generate_project_no(year, college_code)
+    return ProjectNumberService.allocate(year, college_code)[0]
 
 
 def _to_bool(val, default=True):
@@ -71,21 +72,6 @@ def _normalize_nullable_fk_fields(data, fields):
             data[field] = None
 
 
-def _get_active_projects_qs(batch=None):
-    queryset = Project.objects.exclude(
-        status__in=[
-            Project.ProjectStatus.DRAFT,
-            Project.ProjectStatus.TEACHER_REJECTED,
-            Project.ProjectStatus.COMPLETED,
-            Project.ProjectStatus.CLOSED,
-            Project.ProjectStatus.TERMINATED,
-        ]
-    )
-    if batch:
-        queryset = queryset.filter(batch=batch)
-    return queryset
-
-
 def _get_current_batch():
     return SystemSettingService.get_current_batch()
 
@@ -117,41 +103,40 @@ def _validate_limits(user, advisors_data, members_data, project=None, batch=None
     if max_members and len(members_data) > max_members:
         return False, f"项目成员人数不能超过{max_members}人"
 
-    active_projects = _get_active_projects_qs(batch=batch)
-    active_projects_all = _get_active_projects_qs(batch=None)
+    active_projects = ParticipationService.active_projects()
     if project:
         active_projects = active_projects.exclude(id=project.id)
-        active_projects_all = active_projects_all.exclude(id=project.id)
 
+    # 每种参与关系一条分组查询，同时得到本批次和全部批次的在研项目数
+    advisor_counts = ParticipationService.counts(
+        [person_user_id(advisor) for advisor in advisors_data],
+        active_projects,
+        "advisor",
+        batch=batch,
+    )
     for advisor in advisors_data:
-        advisor_id = advisor.get("user") or advisor.get("user_id") or advisor.get("id")
+        advisor_id = person_user_id(advisor)
         if not advisor_id:
             continue
-        count = active_projects.filter(advisors__user_id=advisor_id).distinct().count()
-        historical_unfinished = (
-            active_projects_all.filter(advisors__user_id=advisor_id).distinct().exists()
-        )
-        if historical_unfinished:
+        count, total = advisor_counts.get(int(advisor_id), (0, 0))
+        if total:
             return False, "指导教师存在未结题项目，无法继续指导新项目"
         if max_teacher_active and count >= max_teacher_active:
             return False, "指导教师在研项目数量已达上限"
 
     if max_student_member:
+        member_counts = ParticipationService.counts(
+            [person_user_id(member) for member in members_data],
+            active_projects,
+            "member",
+            batch=batch,
+        )
         for member in members_data:
-            member_id = member.get("user") or member.get("user_id") or member.get("id")
+            member_id = person_user_id(member)
             if not member_id:
                 continue
-            count = (
-                active_projects.filter(projectmember__user_id=member_id)
-                .distinct()
-                .count()
-            )
-            historical_unfinished = (
-                active_projects_all.filter(projectmember__user_id=member_id)
-                .distinct()
-                .exists()
-            )
-            if historical_unfinished:
+            count, total = member_counts.get(int(member_id), (0, 0))
+            if total:
                 return False, "成员存在未结题项目，无法继续参与新项目"
             if count >= max_student_member:
                 return False, "项目成员已参与项目数量达到上限"
@@ -274,6 +259,7 @@ class ProjectApplicationService:
                     )
 
                 project = serializer.save()
+                similar_projects = []
 
                 # 如果不是草稿，则进行智能校验
                 if not is_draft:
@@ -297,6 +283,7 @@ class ProjectApplicationService:
                             },
                             status.HTTP_400_BAD_REQUEST,
                         )
+                    similar_projects = validation_result["similar_projects"]
 
                 if current_batch and not project.batch:
                     project.batch = current_batch
@@ -396,6 +383,7 @@ class ProjectApplicationService:
                         "code": 201,
                         "message": "保存成功" if is_draft else "提交成功",
                         "data": ProjectSerializer(project).data,
+                        "similar_projects": similar_projects,
                     },
                     status.HTTP_201_CREATED,
                 )
@@ -56,12 +56,10 @@ class ProjectChangeService:
     @staticmethod
     def _get_review_nodes(change_request: ProjectChangeRequest):
         phase = "CHANGE"
-        nodes = WorkflowService.get_nodes(phase, change_request.project.batch)
-        review_nodes = [
-            node
-            for node in nodes
-            if node.node_type != "SUBMIT" and WorkflowService.get_node_by_id(node.id)
-        ]
+        graph = WorkflowService.get_workflow_graph(phase, change_request.project.batch)
+        review_nodes = []
+        if graph.persisted:
+            review_nodes = [node for node in graph.nodes if node.node_type != "SUBMIT"]
         if not review_nodes:
             raise ValueError("流程未落库，请先配置并启用工作流")
         return phase, review_nodes
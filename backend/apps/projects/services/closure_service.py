@@ -298,7 +298,7 @@ class ProjectClosureService:
             else:
                 projects = projects.filter(level_id=parsed_level)
 
-        projects = projects.order_by("-created_at")
+        projects = ProjectSerializer.eager_load(projects).order_by("-created_at")
         total = projects.count()
         start = (page - 1) * page_size
         end = start + page_size
@@ -380,7 +380,9 @@ class ProjectClosureService:
             else:
                 projects = projects.filter(level_id=parsed_level)
 
-        projects = projects.order_by("-closure_applied_at")
+        projects = ProjectSerializer.eager_load(projects).order_by(
+            "-closure_applied_at"
+        )
         total = projects.count()
         start = (page - 1) * page_size
         end = start + page_size
@@ -434,7 +436,7 @@ class ProjectClosureService:
         if title:
             projects = projects.filter(title__icontains=title)
 
-        projects = projects.order_by("-updated_at")
+        projects = ProjectSerializer.eager_load(projects).order_by("-updated_at")
         total = projects.count()
         start = (page - 1) * page_size
         end = start + page_size
@@ -2,13 +2,39 @@
 仪表板统计服务
 """
 
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Q, Count, Sum
 from django.utils import timezone
 from datetime import timedelta
 from ..models import Project, ProjectAchievement
+from .statistics_service import BatchStatisticsService
 from apps.system_settings.services import SystemSettingService
 from apps.reviews.models import Review
 from apps.users.models import User
+from apps.utils.cache import CacheNamespace
+
+DASHBOARD_CACHE = CacheNamespace("dashboard", timeout_setting="DASHBOARD_CACHE_TIMEOUT")
+
+IN_PROGRESS_STATUSES = [
+    Project.ProjectStatus.IN_PROGRESS,
+    Project.ProjectStatus.MID_TERM_DRAFT,
+    Project.ProjectStatus.MID_TERM_SUBMITTED,
+]
+COMPLETED_STATUSES = [
+    Project.ProjectStatus.COMPLETED,
+    Project.ProjectStatus.CLOSED,
+]
+
+
+def count_buckets(queryset, buckets, distinct=False):
+    """
+    用一次条件聚合查询统计多个分组：buckets 为 {名称: Q 条件或 None(总数)}。
+    """
+    return queryset.aggregate(
+        **{
+            name: Count("id", filter=condition, distinct=distinct)
+            for name, condition in buckets.items()
+        }
+    )
 
 
 class DashboardService:
@@ -16,6 +42,23 @@ class DashboardService:
     仪表板数据统计服务
     """
 
+    @staticmethod
+    def cached_dashboard(kind, scope, builder):
+        """
+        按用户/范围短时缓存仪表板数据，项目或审核状态变化时整体失效。
+        """
+        return DASHBOARD_CACHE.get_or_set(f"{kind}:{scope}", builder)
+
+    @staticmethod
+    def invalidate_cache():
+        DASHBOARD_CACHE.invalidate()
+
+    @staticmethod
+    def batch_scope():
+        """仪表板缓存键中的批次部分，切换当前批次后自动使用新的缓存"""
+        current_batch = SystemSettingService.get_current_batch()
+        return current_batch.id if current_batch else "none"
+
     @staticmethod
     def _pending_reviews_for_admin_scope(scope_dimension, fallback_role_code=None):
         role_filter = Q(workflow_node__role_fk__scope_dimension=scope_dimension)
@@ -31,6 +74,14 @@ class DashboardService:
         """
         获取学生端仪表板数据
         """
+        return DashboardService.cached_dashboard(
+            "student",
+            f"{DashboardService.batch_scope()}:{user.id}",
+            lambda: DashboardService._build_student_dashboard(user),
+        )
+
+    @staticmethod
+    def _build_student_dashboard(user):
         # 我的项目统计
         current_batch = SystemSettingService.get_current_batch()
         if not current_batch:
@@ -52,101 +103,79 @@ class DashboardService:
             Q(leader=user) | Q(members=user),
             is_deleted=False,
             batch=current_batch,
-        ).distinct()
+        )
+
+        # 成员关联会产生重复行，统计时按项目ID去重
+        counts = count_buckets(
+            my_projects,
+            {
+                "total": None,
+                "draft": Q(status=Project.ProjectStatus.DRAFT),
+                "in_progress": Q(status__in=IN_PROGRESS_STATUSES),
+                "completed": Q(status__in=COMPLETED_STATUSES),
+                "returned": Q(
+                    status__in=[
+                        Project.ProjectStatus.APPLICATION_RETURNED,
+                        Project.ProjectStatus.MID_TERM_RETURNED,
+                        Project.ProjectStatus.CLOSURE_RETURNED,
+                    ]
+                ),
+                "midterm_pending": Q(
+                    status__in=[
+                        Project.ProjectStatus.IN_PROGRESS,
+                        Project.ProjectStatus.MID_TERM_DRAFT,
+                    ]
+                ),
+                "closure_pending": Q(
+                    status__in=[
+                        Project.ProjectStatus.READY_FOR_CLOSURE,
+                        Project.ProjectStatus.CLOSURE_DRAFT,
+                    ]
+                ),
+            },
+            distinct=True,
+        )
 
         project_stats = {
-            "total": my_projects.count(),
-            "draft": my_projects.filter(status=Project.ProjectStatus.DRAFT).count(),
-            "in_progress": my_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.IN_PROGRESS,
-                    Project.ProjectStatus.MID_TERM_DRAFT,
-                    Project.ProjectStatus.MID_TERM_SUBMITTED,
-                ]
-            ).count(),
-            "completed": my_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.COMPLETED,
-                    Project.ProjectStatus.CLOSED,
-                ]
-            ).count(),
+            "total": counts["total"],
+            "draft": counts["draft"],
+            "in_progress": counts["in_progress"],
+            "completed": counts["completed"],
         }
 
         # 待办事项
         pending_tasks = []
-
-        # 待提交申报
-        draft_projects = my_projects.filter(status=Project.ProjectStatus.DRAFT)
-        if draft_projects.exists():
-            pending_tasks.append(
-                {
-                    "type": "submit_application",
-                    "title": "待提交项目申报",
-                    "count": draft_projects.count(),
-                    "priority": "high",
-                }
-            )
-
-        # 退回修改的项目
-        returned_projects = my_projects.filter(
-            status__in=[
-                Project.ProjectStatus.APPLICATION_RETURNED,
-                Project.ProjectStatus.MID_TERM_RETURNED,
-                Project.ProjectStatus.CLOSURE_RETURNED,
-            ]
-        )
-        if returned_projects.exists():
-            pending_tasks.append(
-                {
-                    "type": "revise_project",
-                    "title": "需要修改的项目",
-                    "count": returned_projects.count(),
-                    "priority": "urgent",
-                }
-            )
-
-        # 待提交中期报告
-        midterm_pending = my_projects.filter(
-            status__in=[
-                Project.ProjectStatus.IN_PROGRESS,
-                Project.ProjectStatus.MID_TERM_DRAFT,
-            ]
-        )
-        if midterm_pending.exists():
-            pending_tasks.append(
-                {
-                    "type": "submit_midterm",
-                    "title": "待提交中期报告",
-                    "count": midterm_pending.count(),
-                    "priority": "medium",
-                }
-            )
-
-        # 待提交结题报告
-        closure_pending = my_projects.filter(
-            status__in=[
-                Project.ProjectStatus.READY_FOR_CLOSURE,
-                Project.ProjectStatus.CLOSURE_DRAFT,
-            ]
-        )
-        if closure_pending.exists():
-            pending_tasks.append(
-                {
-                    "type": "submit_closure",
-                    "title": "待提交结题报告",
-                    "count": closure_pending.count(),
-                    "priority": "high",
-                }
-            )
+        task_specs = [
+            # 待提交申报
+            ("draft", "submit_application", "待提交项目申报", "high"),
+            # 退回修改的项目
+            ("returned", "revise_project", "需要修改的项目", "urgent"),
+            # 待提交中期报告
+            ("midterm_pending", "submit_midterm", "待提交中期报告", "medium"),
+            # 待提交结题报告
+            ("closure_pending", "submit_closure", "待提交结题报告", "high"),
+        ]
+        for bucket, task_type, title, priority in task_specs:
+            if counts[bucket]:
+                pending_tasks.append(
+                    {
+                        "type": task_type,
+                        "title": title,
+                        "count": counts[bucket],
+                        "priority": priority,
+                    }
+                )
 
         # 最近动态（最近7天）
         recent_date = timezone.now() - timedelta(days=7)
         recent_activities = []
 
         # 项目状态更新
-        recent_updates = my_projects.filter(updated_at__gte=recent_date).order_by(
-            "-updated_at"
-        )[:5]
+        recent_updates = (
+            my_projects.filter(updated_at__gte=recent_date)
+            .distinct()
+            .order_by("-updated_at")[:5]
+        )
 
         for project in recent_updates:
             recent_activities.append(
@@ -170,6 +199,14 @@ class DashboardService:
         """
         获取教师端仪表板数据
         """
+        return DashboardService.cached_dashboard(
+            "teacher",
+            f"{DashboardService.batch_scope()}:{user.id}",
+            lambda: DashboardService._build_teacher_dashboard(user),
+        )
+
+    @staticmethod
+    def _build_teacher_dashboard(user):
         # 指导项目统计
         current_batch = SystemSettingService.get_current_batch()
         if not current_batch:
@@ -186,37 +223,30 @@ class DashboardService:
 
         guided_projects = Project.objects.filter(
             advisors__user=user, is_deleted=False, batch=current_batch
-        ).distinct()
+        )
 
-        project_stats = {
-            "total": guided_projects.count(),
-            "in_progress": guided_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.IN_PROGRESS,
-                    Project.ProjectStatus.MID_TERM_DRAFT,
-                    Project.ProjectStatus.MID_TERM_SUBMITTED,
-                ]
-            ).count(),
-            "completed": guided_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.COMPLETED,
-                    Project.ProjectStatus.CLOSED,
-                ]
-            ).count(),
-            "excellent": guided_projects.filter(
-                status=Project.ProjectStatus.CLOSED, closure_rating="EXCELLENT"
-            ).count(),
-        }
+        project_stats = count_buckets(
+            guided_projects,
+            {
+                "total": None,
+                "in_progress": Q(status__in=IN_PROGRESS_STATUSES),
+                "completed": Q(status__in=COMPLETED_STATUSES),
+                "excellent": Q(
+                    status=Project.ProjectStatus.CLOSED, closure_rating="EXCELLENT"
+                ),
+            },
+            distinct=True,
+        )
 
         # 待审核任务
         pending_reviews = Review.objects.filter(
-            project__in=guided_projects,
+            project__in=guided_projects.values("id"),
             workflow_node__role_fk__code="TEACHER",
             status=Review.ReviewStatus.PENDING,
-        ).select_related("project")
+        )
 
         review_tasks = []
-        for review in pending_reviews:
+        for review in pending_reviews.select_related("project")[:10]:  # 只返回前10条
             review_tasks.append(
                 {
                     "review_id": review.id,
@@ -229,8 +259,8 @@ class DashboardService:
 
         return {
             "project_stats": project_stats,
-            "pending_reviews": len(review_tasks),
-            "review_tasks": review_tasks[:10],  # 只返回前10条
+            "pending_reviews": pending_reviews.count(),
+            "review_tasks": review_tasks,
         }
 
     @staticmethod
@@ -238,6 +268,14 @@ class DashboardService:
         """
         获取学院管理员端仪表板数据
         """
+        return DashboardService.cached_dashboard(
+            "level2",
+            f"{DashboardService.batch_scope()}:{user.college}",
+            lambda: DashboardService._build_level2_admin_dashboard(user),
+        )
+
+    @staticmethod
+    def _build_level2_admin_dashboard(user):
         # 学院项目统计
         current_batch = SystemSettingService.get_current_batch()
         if not current_batch:
@@ -259,32 +297,22 @@ class DashboardService:
             leader__college=user.college, is_deleted=False, batch=current_batch
         )
 
-        project_stats = {
-            "total": college_projects.count(),
-            "draft": college_projects.filter(
-                status=Project.ProjectStatus.DRAFT
-            ).count(),
-            "reviewing": college_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.COLLEGE_AUDITING,
-                    Project.ProjectStatus.MID_TERM_REVIEWING,
-                    Project.ProjectStatus.CLOSURE_LEVEL2_REVIEWING,
-                ]
-            ).count(),
-            "in_progress": college_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.IN_PROGRESS,
-                    Project.ProjectStatus.MID_TERM_DRAFT,
-                    Project.ProjectStatus.MID_TERM_SUBMITTED,
-                ]
-            ).count(),
-            "completed": college_projects.filter(
-                status__in=[
-                    Project.ProjectStatus.COMPLETED,
-                    Project.ProjectStatus.CLOSED,
-                ]
-            ).count(),
-        }
+        project_stats = count_buckets(
+            college_projects,
+            {
+                "total": None,
+                "draft": Q(status=Project.ProjectStatus.DRAFT),
+                "reviewing": Q(
+                    status__in=[
+                        Project.ProjectStatus.COLLEGE_AUDITING,
+                        Project.ProjectStatus.MID_TERM_REVIEWING,
+                        Project.ProjectStatus.CLOSURE_LEVEL2_REVIEWING,
+                    ]
+                ),
+                "in_progress": Q(status__in=IN_PROGRESS_STATUSES),
+                "completed": Q(status__in=COMPLETED_STATUSES),
+            },
+        )
 
         # 待审核项目
         pending_reviews = (
@@ -321,6 +349,14 @@ class DashboardService:
         """
         获取校级管理员端仪表板数据
         """
+        return DashboardService.cached_dashboard(
+            "level1",
+            DashboardService.batch_scope(),
+            lambda: DashboardService._build_level1_admin_dashboard(user),
+        )
+
+    @staticmethod
+    def _build_level1_admin_dashboard(user):
         # 全校项目统计
         current_batch = SystemSettingService.get_current_batch()
         if not current_batch:
@@ -340,31 +376,20 @@ class DashboardService:
                 "timeline": [],
             }
 
-        all_projects = Project.objects.filter(
-            is_deleted=False, batch=current_batch
-        )
-
-        # 按状态统计
+        # 状态、级别、学院与经费分布读取批次统计快照
+        summary = BatchStatisticsService.get_summary(current_batch.id)
+        status_counts = summary["status_counts"]
+        total_projects = summary["total_projects"]
+        recent_date = timezone.now() - timedelta(days=7)
+        recent_projects = Project.objects.filter(
+            is_deleted=False, batch=current_batch, created_at__gte=recent_date
+        ).count()
         status_stats = {}
-        for status_choice in Project.ProjectStatus.choices:
-            status_code = status_choice[0]
-            status_label = status_choice[1]
-            count = all_projects.filter(status=status_code).count()
+        for status_code, status_label in Project.ProjectStatus.choices:
+            count = status_counts.get(status_code, 0)
             if count > 0:
                 status_stats[status_code] = {"label": status_label, "count": count}
 
-        # 按级别统计
-        level_stats = all_projects.values("level__value", "level__label").annotate(
-            count=Count("id")
-        )
-
-        # 按学院统计
-        college_stats = (
-            all_projects.values("leader__college")
-            .annotate(count=Count("id"))
-            .order_by("-count")
-        )
-
         # 待审核统计
         pending_reviews = (
             DashboardService._pending_reviews_for_admin_scope(
@@ -377,13 +402,6 @@ class DashboardService:
 
         review_stats = {item["review_type"]: item["count"] for item in pending_reviews}
 
-        # 经费统计
-        budget_stats = all_projects.aggregate(
-            total_budget=Sum("approved_budget"),
-            total_expenditure=Sum("expenditures__amount"),
-            avg_budget=Avg("approved_budget"),
-        )
-
         # 成果统计
         achievement_stats = (
             ProjectAchievement.objects.filter(project__is_deleted=False)
@@ -391,37 +409,37 @@ class DashboardService:
             .annotate(count=Count("id"))
         )
 
-        # 最近7天新增项目
-        recent_date = timezone.now() - timedelta(days=7)
-        recent_projects = all_projects.filter(created_at__gte=recent_date).count()
+        # 用户统计
+        user_counts = count_buckets(
+            User.objects.filter(is_active=True),
+            {
+                "total_students": Q(role_fk__code=User.UserRole.STUDENT),
+                "total_teachers": Q(role_fk__code=User.UserRole.TEACHER)
+                | Q(role_fk__scope_dimension__isnull=False)
+                | Q(
+                    role_fk__code__in=[
+                        User.UserRole.LEVEL1_ADMIN,
+                        User.UserRole.LEVEL2_ADMIN,
+                    ]
+                ),
+            },
+        )
 
         return {
             "overview": {
-                "total_projects": all_projects.count(),
+                "total_projects": total_projects,
                 "recent_projects": recent_projects,
-                "total_students": User.objects.filter(
-                    role_fk__code=User.UserRole.STUDENT, is_active=True
-                ).count(),
-                "total_teachers": User.objects.filter(
-                    Q(role_fk__code=User.UserRole.TEACHER)
-                    | Q(role_fk__scope_dimension__isnull=False)
-                    | Q(
-                        role_fk__code__in=[
-                            User.UserRole.LEVEL1_ADMIN,
-                            User.UserRole.LEVEL2_ADMIN,
-                        ]
-                    ),
-                    is_active=True,
-                ).count(),
+                "total_students": user_counts["total_students"],
+                "total_teachers": user_counts["total_teachers"],
             },
             "status_stats": status_stats,
-            "level_stats": list(level_stats),
-            "college_stats": list(college_stats),
+            "level_stats": summary["level_stats"],
+            "college_stats": summary["college_stats"],
             "review_stats": review_stats,
             "budget_stats": {
-                "total_budget": float(budget_stats["total_budget"] or 0),
-                "total_expenditure": float(budget_stats["total_expenditure"] or 0),
-                "avg_budget": float(budget_stats["avg_budget"] or 0),
+                "total_budget": float(summary["total_budget"]),
+                "total_expenditure": float(summary["total_expenditure"]),
+                "avg_budget": float(summary["avg_budget"]),
             },
             "achievement_stats": list(achievement_stats),
         }
@@ -431,20 +449,31 @@ class DashboardService:
         """
         获取专家端仪表板数据
         """
-        pending_tasks = Review.objects.filter(
-            reviewer=user,
-            is_expert_review=True,
-            status=Review.ReviewStatus.PENDING,
-        ).select_related("project")
+        return DashboardService.cached_dashboard(
+            "expert",
+            user.id,
+            lambda: DashboardService._build_expert_dashboard(user),
+        )
 
-        completed_tasks = Review.objects.filter(
-            reviewer=user,
-            is_expert_review=True,
-            status__in=[
-                Review.ReviewStatus.APPROVED,
-                Review.ReviewStatus.REJECTED,
-            ],
-        ).count()
+    @staticmethod
+    def _build_expert_dashboard(user):
+        expert_reviews = Review.objects.filter(reviewer=user, is_expert_review=True)
+        counts = count_buckets(
+            expert_reviews,
+            {
+                "pending": Q(status=Review.ReviewStatus.PENDING),
+                "completed": Q(
+                    status__in=[
+                        Review.ReviewStatus.APPROVED,
+                        Review.ReviewStatus.REJECTED,
+                    ]
+                ),
+            },
+        )
+
+        pending_tasks = expert_reviews.filter(
+            status=Review.ReviewStatus.PENDING
+        ).select_related("project")
 
         task_list = []
         for task in pending_tasks[:10]:
@@ -460,7 +489,7 @@ class DashboardService:
             )
 
         return {
-            "pending_count": pending_tasks.count(),
-            "completed_count": completed_tasks,
+            "pending_count": counts["pending"],
+            "completed_count": counts["completed"],
             "pending_tasks": task_list,
         }
@@ -1,14 +1,136 @@
 import io
 import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
+from django.conf import settings
 from docx import Document  # type: ignore[import-untyped]
 from docx.enum.text import WD_ALIGN_PARAGRAPH  # type: ignore[import-untyped]
 from apps.projects.models import Project
 from apps.utils.downloads import safe_download_filename
 
+from .document_templates import REPORT_TYPES, get_template, render_document
+
 logger = logging.getLogger(__name__)
 
 
+# 少于该数量的批量导出直接在当前进程生成，不值得启动进程池
+DOCUMENT_POOL_MIN_ITEMS = 4
+DOCUMENT_ITERATOR_CHUNK_SIZE = 200
+
+
+def project_doc_context(project):
+    """
+    申报书所需字段，全部为可序列化的基本类型，可交给子进程渲染
+    """
+    return {
+        "project_id": project.id,
+        "title": project.title,
+        "project_no": project.project_no,
+        "leader_name": project.leader.real_name,
+        "leader_employee_id": project.leader.employee_id,
+        "leader_college": getattr(project.leader, "college", ""),
+        "level_label": project.level.label if project.level else "",
+        "description": project.description,
+        "expected_results": project.expected_results,
+        "budget": str(project.budget),
+        "filename": safe_download_filename(f"{project.title}_申报书.docx"),
+    }
+
+
+def render_project_doc(context):
+    """
+    根据 project_doc_context 生成申报书 .docx 字节，不访问数据库
+    """
+    return render_document("application", context)
+
+
+def build_project_doc(context):
+    """
+    用 python-docx 逐项构建申报书；只用于生成默认模板和性能对比
+    """
+    doc = Document()
+
+    # Title
+    title = doc.add_heading('大学生创新创业训练计划项目申报书', 0)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # Basic Info
+    doc.add_heading('一、基本信息', level=1)
+    table = doc.add_table(rows=6, cols=2)
+    table.style = 'Table Grid'
+
+    # Helper to set cell content
+    def set_row(idx, label, value):
+        row = table.rows[idx]
+        row.cells[0].text = label
+        row.cells[1].text = str(value) if value else ""
+
+    set_row(0, "项目名称", context["title"])
+    set_row(1, "项目编号", context["project_no"])
+    set_row(2, "负责人", context["leader_name"])
+    set_row(3, "学号", context["leader_employee_id"])
+    set_row(4, "学院", context["leader_college"])
+    set_row(5, "项目级别", context["level_label"])
+
+    # Project Content
+    doc.add_heading('二、立项依据', level=1)
+    doc.add_paragraph("（包含研究意义、现状分析等）")
+    doc.add_paragraph(context["description"])
+
+    doc.add_heading('三、预期成果', level=1)
+    doc.add_paragraph(context["expected_results"])
+
+    doc.add_heading('四、经费预算', level=1)
+    doc.add_paragraph(f"申请经费：{context['budget']} 元")
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def report_doc_context(project):
+    return {
+        "project_id": project.id,
+        "title": project.title,
+        "project_no": project.project_no,
+        "leader_name": project.leader.real_name,
+    }
+
+
+def build_generic_report(context, report_type):
+    """
+    用 python-docx 逐项构建中期/结题报告；只用于生成默认模板和性能对比
+    """
+    doc = Document()
+    doc.add_heading(f'{context["title"]} - {report_type}', 0)
+    doc.add_paragraph(f"项目编号: {context['project_no']}")
+    doc.add_paragraph(f"负责人: {context['leader_name']}")
+
+    doc.add_heading('报告内容', level=1)
+    doc.add_paragraph("此处为系统自动生成的报告摘要，详细内容请参考附件。")
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def _document_pool_workers(total, workers=None):
+    if workers is None:
+        workers = settings.DOCUMENT_EXPORT_WORKERS
+    workers = min(workers, total)
+    if workers <= 1 or total < DOCUMENT_POOL_MIN_ITEMS:
+        return 1
+    # Celery prefork 子进程是守护进程，不能再创建子进程
+    if multiprocessing.current_process().daemon:
+        return 1
+    # 子进程依赖 fork 继承已初始化的 Django 与模板，不支持 fork 的平台（Windows）串行渲染
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return 1
+    return workers
+
+
 class DocumentService:
     @staticmethod
     def generate_project_doc(project_id):
@@ -20,74 +142,101 @@ class DocumentService:
             if not project:
                 raise ValueError("Project not found")
 
-            doc = Document()
-            
-            # Title
-            title = doc.add_heading('大学生创新创业训练计划项目申报书', 0)
-            title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Basic Info
-            doc.add_heading('一、基本信息', level=1)
-            table = doc.add_table(rows=6, cols=2)
-            table.style = 'Table Grid'
-            
-            # Helper to set cell content
-            def set_row(idx, label, value):
-                row = table.rows[idx]
-                row.cells[0].text = label
-                row.cells[1].text = str(value) if value else ""
-
-            set_row(0, "项目名称", project.title)
-            set_row(1, "项目编号", project.project_no)
-            set_row(2, "负责人", project.leader.real_name)
-            set_row(3, "学号", project.leader.employee_id)
-            set_row(4, "学院", getattr(project.leader, 'college', ''))
-            set_row(5, "项目级别", project.level.label if project.level else "")
-
-            # Project Content
-            doc.add_heading('二、立项依据', level=1)
-            doc.add_paragraph("（包含研究意义、现状分析等）")
-            doc.add_paragraph(project.description)
-
-            doc.add_heading('三、预期成果', level=1)
-            doc.add_paragraph(project.expected_results)
-            
-            doc.add_heading('四、经费预算', level=1)
-            doc.add_paragraph(f"申请经费：{project.budget} 元")
-            
-            # Save to buffer
-            buffer = io.BytesIO()
-            doc.save(buffer)
-            buffer.seek(0)
-            return buffer, safe_download_filename(f"{project.title}_申报书.docx")
+            context = project_doc_context(project)
+            buffer = io.BytesIO(render_project_doc(context))
+            return buffer, context["filename"]
 
         except Exception:
             logger.exception("Failed to generate project doc for project %s", project_id)
             raise
 
+    @staticmethod
+    def iter_project_docs(project_ids, workers=None):
+        """
+        批量生成申报书，按 project_ids 顺序产出 ``(filename, content)``；
+        项目不存在或生成失败时产出 ``None``。
+
+        项目及关联数据一次查询取出，文档在进程池中并行渲染，同时在途的任务数
+        有上限，结果按顺序交给调用方（通常是流式 ZIP 写入）。
+        """
+        projects = {
+            project.id: project
+            for project in Project.objects.filter(id__in=project_ids)
+            .select_related("leader", "level")
+            .iterator(chunk_size=DOCUMENT_ITERATOR_CHUNK_SIZE)
+        }
+        contexts = []
+        for project_id in project_ids:
+            project = projects.get(project_id)
+            contexts.append(project_doc_context(project) if project else None)
+        del projects
+
+        workers = _document_pool_workers(len(contexts), workers)
+        if workers == 1:
+            for context in contexts:
+                yield DocumentService._render_doc_entry(context)
+            return
+
+        # 先在父进程加载模板，fork 出的子进程直接继承已解析的模板；
+        # 子进程只渲染文档，不使用继承的数据库连接
+        get_template("application")
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        )
+        try:
+            pending = deque()
+            for context in contexts:
+                pending.append(
+                    (context, executor.submit(render_project_doc, context))
+                    if context
+                    else (None, None)
+                )
+                if len(pending) >= workers * 2:
+                    yield DocumentService._pool_entry(*pending.popleft())
+            while pending:
+                yield DocumentService._pool_entry(*pending.popleft())
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _render_doc_entry(context):
+        if context is None:
+            return None
+        try:
+            return context["filename"], render_project_doc(context)
+        except Exception as exc:
+            logger.warning(
+                "Failed to export doc for project %s: %s", context["project_id"], exc
+            )
+            return None
+
+    @staticmethod
+    def _pool_entry(context, future):
+        if future is None:
+            return None
+        try:
+            return context["filename"], future.result()
+        except Exception as exc:
+            logger.warning(
+                "Failed to export doc for project %s: %s", context["project_id"], exc
+            )
+            return None
+
     @staticmethod
     def generate_midterm_doc(project_id):
-        return DocumentService._generate_generic_report(project_id, "中期检查报告")
+        return DocumentService._generate_generic_report(project_id, "midterm")
 
     @staticmethod
     def generate_closure_doc(project_id):
-        return DocumentService._generate_generic_report(project_id, "结题报告")
+        return DocumentService._generate_generic_report(project_id, "closure")
 
     @staticmethod
-    def _generate_generic_report(project_id, report_type):
+    def _generate_generic_report(project_id, kind):
+        report_type = REPORT_TYPES[kind]
         try:
-            project = Project.objects.get(id=project_id)
-            doc = Document()
-            doc.add_heading(f'{project.title} - {report_type}', 0)
-            doc.add_paragraph(f"项目编号: {project.project_no}")
-            doc.add_paragraph(f"负责人: {project.leader.real_name}")
-            
-            doc.add_heading('报告内容', level=1)
-            doc.add_paragraph("此处为系统自动生成的报告摘要，详细内容请参考附件。")
-            
-            buffer = io.BytesIO()
-            doc.save(buffer)
-            buffer.seek(0)
+            project = Project.objects.select_related("leader").get(id=project_id)
+            context = report_doc_context(project)
+            buffer = io.BytesIO(render_document(kind, context))
             return buffer, safe_download_filename(f"{project.title}_{report_type}.docx")
         except Exception:
             logger.exception(
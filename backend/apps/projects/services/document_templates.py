@@ -0,0 +1,178 @@
+"""
+Word 文档模板引擎：模板在每个进程内只解析一次，逐份文档复制缓存的 XML 树后替换占位符。
+"""
+
+import copy
+import io
+import os
+import re
+import threading
+import zipfile
+
+from django.conf import settings
+from lxml import etree  # type: ignore[import-untyped]
+
+DOCUMENT_PART = "word/document.xml"
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_P = f"{{{W_NS}}}p"
+W_T = f"{{{W_NS}}}t"
+W_BR = f"{{{W_NS}}}br"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# XML 1.0 不允许的控制字符
+INVALID_XML_CHARS_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# 模板类型 -> 配置目录中的模板文件名
+TEMPLATE_FILES = {
+    "application": "project_application.docx",
+    "midterm": "project_midterm.docx",
+    "closure": "project_closure.docx",
+}
+REPORT_TYPES = {
+    "midterm": "中期检查报告",
+    "closure": "结题报告",
+}
+
+
+def _clean_text(value):
+    return INVALID_XML_CHARS_RE.sub("", "" if value is None else str(value))
+
+
+def _set_text(text_element, value):
+    """
+    写入文本，换行转换为 <w:br/>，与 python-docx 的 run.text 行为一致
+    """
+    lines = value.split("\n")
+    text_element.text = lines[0]
+    text_element.set(XML_SPACE, "preserve")
+    run = text_element.getparent()
+    index = run.index(text_element)
+    for line in lines[1:]:
+        line_element = etree.Element(W_T)
+        line_element.text = line
+        line_element.set(XML_SPACE, "preserve")
+        run.insert(index + 1, etree.Element(W_BR))
+        run.insert(index + 2, line_element)
+        index += 2
+
+
+def _fill_paragraph(paragraph, context):
+    texts = [
+        element
+        for element in paragraph.iter(W_T)
+        if next(element.iterancestors(W_P), None) is paragraph
+    ]
+    if not texts:
+        return
+    values = [element.text or "" for element in texts]
+    joined = "".join(values)
+    if "{{" not in joined:
+        return
+
+    def replace(match):
+        key = match.group(1)
+        if key not in context:
+            return match.group(0)
+        return _clean_text(context[key])
+
+    total = len(PLACEHOLDER_RE.findall(joined))
+    if total == sum(len(PLACEHOLDER_RE.findall(value)) for value in values):
+        for element, value in zip(texts, values):
+            if PLACEHOLDER_RE.search(value):
+                _set_text(element, PLACEHOLDER_RE.sub(replace, value))
+        return
+    # Word 编辑过的模板可能把占位符拆到多个 run 中，合并到第一个 run
+    _set_text(texts[0], PLACEHOLDER_RE.sub(replace, joined))
+    for element in texts[1:]:
+        element.text = ""
+
+
+class DocxTemplate:
+    """
+    已解析的 .docx 模板。除正文外的部件原样缓存，正文 XML 只解析一次。
+    """
+
+    def __init__(self, content):
+        self._parts = []
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            for info in archive.infolist():
+                data = archive.read(info)
+                if info.filename == DOCUMENT_PART:
+                    self._document = etree.fromstring(data)
+                    data = None
+                self._parts.append((info, data))
+
+    def render(self, context):
+        root = copy.deepcopy(self._document)
+        for paragraph in root.iter(W_P):
+            _fill_paragraph(paragraph, context)
+        document = etree.tostring(
+            root, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for info, data in self._parts:
+                archive.writestr(info, document if data is None else data)
+        return buffer.getvalue()
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def _template_path(kind):
+    template_dir = settings.DOCUMENT_TEMPLATE_DIR
+    if not template_dir:
+        return None
+    path = os.path.join(template_dir, TEMPLATE_FILES[kind])
+    return path if os.path.isfile(path) else None
+
+
+def _default_template(kind):
+    from .document import build_generic_report, build_project_doc
+
+    placeholders = {
+        "title": "{{title}}",
+        "project_no": "{{project_no}}",
+        "leader_name": "{{leader_name}}",
+        "leader_employee_id": "{{leader_employee_id}}",
+        "leader_college": "{{leader_college}}",
+        "level_label": "{{level_label}}",
+        "description": "{{description}}",
+        "expected_results": "{{expected_results}}",
+        "budget": "{{budget}}",
+    }
+    if kind == "application":
+        return build_project_doc(placeholders)
+    return build_generic_report(placeholders, REPORT_TYPES[kind])
+
+
+def get_template(kind):
+    """
+    取模板：配置了 DOCUMENT_TEMPLATE_DIR 且存在对应文件时使用该文件（修改后自动重新加载），
+    否则使用内置版式生成的默认模板。
+    """
+    if kind not in TEMPLATE_FILES:
+        raise ValueError(f"Unknown document template: {kind}")
+    path = _template_path(kind)
+    key = (path, os.path.getmtime(path) if path else None)
+    cached = _templates.get(kind)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    with _templates_lock:
+        cached = _templates.get(kind)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if path:
+            with open(path, "rb") as template_file:
+                content = template_file.read()
+        else:
+            content = _default_template(kind)
+        template = DocxTemplate(content)
+        _templates[kind] = (key, template)
+        return template
+
+
+def render_document(kind, context):
+    return get_template(kind).render(context)
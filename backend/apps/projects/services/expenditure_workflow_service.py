@@ -6,7 +6,6 @@ from django.utils import timezone
 from django.db import transaction
 from typing import Any, cast
 
-from apps.system_settings.models import WorkflowNode
 from apps.system_settings.services import WorkflowService, AdminAssignmentService
 
 from ..models import ProjectExpenditure, ProjectExpenditureReview
@@ -19,23 +18,11 @@ class ExpenditureWorkflowService:
 
     @staticmethod
     def _get_review_nodes(expenditure: ProjectExpenditure):
-        workflow = WorkflowService.get_active_workflow(
-            "BUDGET", expenditure.project.batch
-        )
-        if not workflow:
+        graph = WorkflowService.get_workflow_graph("BUDGET", expenditure.project.batch)
+        if not graph.persisted:
             raise ValueError("经费流程未配置可用审核节点")
 
-        persisted_node_ids = set(
-            WorkflowNode.objects.filter(workflow=workflow, is_active=True).values_list(
-                "id", flat=True
-            )
-        )
-        nodes = WorkflowService.get_nodes("BUDGET", expenditure.project.batch)
-        review_nodes = [
-            node
-            for node in nodes
-            if node.node_type != "SUBMIT" and node.id in persisted_node_ids
-        ]
+        review_nodes = [node for node in graph.nodes if node.node_type != "SUBMIT"]
         if not review_nodes:
             raise ValueError("经费流程未配置可用审核节点")
         return review_nodes
@@ -0,0 +1,118 @@
+"""
+专家评审进度统计：一次分组条件聚合得到多个项目当前节点的专家评审进度
+"""
+
+from django.db.models import Avg, Count, Q
+
+from apps.reviews.models import Review
+from apps.system_settings.services import AdminAssignmentService, WorkflowService
+
+from .phase_service import ProjectPhaseService
+
+# 批量接口单次最多统计的项目数
+EXPERT_SUMMARY_MAX_PROJECTS = 100
+
+SUMMARY_GROUP_FIELDS = ("project_id", "phase_instance_id", "workflow_node_id")
+
+
+def summary_aggregates():
+    pending = Q(status=Review.ReviewStatus.PENDING)
+    return {
+        "assigned": Count("id"),
+        "pending": Count("id", filter=pending),
+        "approved": Count("id", filter=Q(status=Review.ReviewStatus.APPROVED)),
+        "rejected": Count("id", filter=Q(status=Review.ReviewStatus.REJECTED)),
+        "avg_score": Avg("score", filter=~pending),
+    }
+
+
+def build_summary(counts, phase_instance, node_id, require_expert_review):
+    counts = counts or {}
+    assigned = counts.get("assigned", 0)
+    pending = counts.get("pending", 0)
+    return {
+        "phase_instance_id": phase_instance.id if phase_instance else None,
+        "attempt_no": phase_instance.attempt_no if phase_instance else None,
+        "step": phase_instance.step if phase_instance else "",
+        "state": phase_instance.state if phase_instance else "",
+        "node_id": node_id,
+        "require_expert_review": require_expert_review,
+        "assigned": assigned,
+        "submitted": assigned - pending,
+        "pending": pending,
+        "approved": counts.get("approved", 0),
+        "rejected": counts.get("rejected", 0),
+        "all_submitted": assigned > 0 and pending == 0,
+        "avg_score": counts.get("avg_score"),
+    }
+
+
+class ExpertSummaryService:
+    """
+    专家评审进度
+    """
+
+    @staticmethod
+    def summarize(reviews):
+        """
+        单个项目评审查询集的统计（一条聚合查询）
+        """
+        return reviews.aggregate(**summary_aggregates())
+
+    @staticmethod
+    def summaries(projects, review_type, user):
+        """
+        批量统计多个项目当前节点的专家评审进度。
+
+        只统计 user 为当前节点负责管理员的项目；负责管理员按（节点, 负责人学院）解析一次。
+        :return: {project_id: summary}
+        """
+        projects = list(projects)
+        phase_map = ProjectPhaseService.get_current_map(
+            [project.id for project in projects], review_type
+        )
+        admins = {}
+        targets = {}
+        for project in projects:
+            phase_instance = phase_map.get(project.id)
+            if not phase_instance or not phase_instance.current_node_id:
+                continue
+            node = WorkflowService.get_node_by_id(phase_instance.current_node_id)
+            if not node:
+                continue
+            key = (node.id, project.leader.college if project.leader else None)
+            if key not in admins:
+                try:
+                    admins[key] = AdminAssignmentService.resolve_admin_user(
+                        project, review_type, node
+                    ).id
+                except ValueError:
+                    admins[key] = None
+            if admins[key] == user.id:
+                targets[project.id] = (phase_instance, node)
+        if not targets:
+            return {}
+
+        rows = {
+            tuple(row[field] for field in SUMMARY_GROUP_FIELDS): row
+            for row in Review.objects.filter(
+                project_id__in=list(targets),
+                phase_instance_id__in=[
+                    phase_instance.id for phase_instance, _ in targets.values()
+                ],
+                review_type=review_type,
+                is_expert_review=True,
+            )
+            .values(*SUMMARY_GROUP_FIELDS)
+            .annotate(**summary_aggregates())
+            .order_by()
+        }
+        return {
+            project_id: build_summary(
+                rows.get((project_id, phase_instance.id, node.id)),
+                phase_instance,
+                node.id,
+                bool(node.require_expert_review),
+            )
+            for project_id, (phase_instance, node) in targets.items()
+        }
@@ -0,0 +1,134 @@
+"""
+项目批量导出任务的文件构建
+"""
+
+import logging
+from collections import namedtuple
+from html import escape
+
+from apps.projects.models import Project
+from apps.utils.export import safe_zip_arcname, safe_zip_path
+
+from ..certificates import CertificateRenderer
+from .document import DocumentService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_ITERATOR_CHUNK_SIZE = 200
+
+# 多个条目共用的文件（如证书底图），写入 ZIP 但不计入导出数量
+SharedExportEntry = namedtuple("SharedExportEntry", ["arcname", "content"])
+
+
+def _html_text(value):
+    return escape(str(value or ""), quote=True)
+
+
+def render_establishment_notice_html(project):
+    text = _html_text
+    return f"""
+        <html>
+        <head>
+          <meta charset="utf-8" />
+          <title>立项通知书</title>
+        </head>
+        <body>
+          <h1 style="text-align:center;">立项通知书</h1>
+          <p>项目编号：{text(project.project_no)}</p>
+          <p>项目名称：{text(project.title)}</p>
+          <p>负责人：{text(project.leader.real_name)}({text(project.leader.employee_id)})</p>
+          <p>项目级别：{text(project.level.label if project.level else "")}</p>
+          <p>项目类别：{text(project.category.label if project.category else "")}</p>
+          <p>批准经费：{text(project.approved_budget)}</p>
+          <p>请按要求组织实施项目。</p>
+        </body>
+        </html>
+        """
+
+
+class ProjectExportService:
+    """
+    后台导出任务使用的 ZIP 条目生成器。
+
+    每个项目产出一个条目 ``(arcname, content)``；单个项目生成失败时产出 ``None``，
+    由任务执行方统计失败数并继续处理后续项目。共享文件以 ``SharedExportEntry``
+    产出，只写入一次。
+    """
+
+    EXPORT_KINDS = {
+        "project_docs": {
+            "title": "批量申报书导出",
+            "filename": "project_docs.zip",
+        },
+        "establishment_notices": {
+            "title": "批量立项通知书生成",
+            "filename": "establishment_notices.zip",
+        },
+        "certificates": {
+            "title": "批量结题证书生成",
+            "filename": "certificates.zip",
+        },
+    }
+
+    @staticmethod
+    def iter_export_entries(kind, project_ids):
+        if kind == "project_docs":
+            return ProjectExportService._iter_project_docs(project_ids)
+        if kind == "establishment_notices":
+            return ProjectExportService._iter_establishment_notices(project_ids)
+        if kind == "certificates":
+            return ProjectExportService._iter_certificates(project_ids)
+        raise ValueError("不支持的导出类型")
+
+    @staticmethod
+    def _iter_project_docs(project_ids):
+        for entry in DocumentService.iter_project_docs(project_ids):
+            if entry is None:
+                yield None
+                continue
+            filename, content = entry
+            yield safe_zip_arcname(filename), content
+
+    @staticmethod
+    def _iter_establishment_notices(project_ids):
+        projects = {
+            project.id: project
+            for project in Project.objects.filter(id__in=project_ids)
+            .select_related("leader", "level", "category")
+            .iterator(chunk_size=EXPORT_ITERATOR_CHUNK_SIZE)
+        }
+        for project_id in project_ids:
+            project = projects.get(project_id)
+            if project is None:
+                yield None
+                continue
+            yield (
+                safe_zip_path(f"{project.project_no}_立项通知书.doc"),
+                render_establishment_notice_html(project),
+            )
+
+    @staticmethod
+    def _iter_certificates(project_ids):
+        renderer = CertificateRenderer(shared_assets=True)
+        projects = {
+            project.id: project
+            for project in Project.objects.filter(id__in=project_ids)
+            .select_related("leader", "level", "category")
+            .iterator(chunk_size=EXPORT_ITERATOR_CHUNK_SIZE)
+        }
+        for project_id in project_ids:
+            project = projects.get(project_id)
+            if project is None:
+                yield None
+                continue
+            try:
+                html = renderer.render(project)
+            except Exception as exc:
+                logger.warning(
+                    "Failed to render certificate for project %s: %s", project_id, exc
+                )
+                yield None
+                continue
+            yield safe_zip_path(f"{project.project_no}_结题证书.html"), html
+        for arcname, content in renderer.shared_entries():
+            yield SharedExportEntry(arcname, content)
@@ -0,0 +1,77 @@
+"""
+项目参与计数：一次分组查询统计一组用户参与的项目数，供限项校验使用
+"""
+
+from django.db.models import Count, F, Q
+
+from ..models import Project, ProjectAdvisor, ProjectMember
+
+# 不计入“在研/未结题”的项目状态
+INACTIVE_PROJECT_STATUSES = [
+    Project.ProjectStatus.DRAFT,
+    Project.ProjectStatus.TEACHER_REJECTED,
+    Project.ProjectStatus.COMPLETED,
+    Project.ProjectStatus.CLOSED,
+    Project.ProjectStatus.TERMINATED,
+]
+
+
+def person_user_id(item):
+    """
+    指导教师/成员提交数据中的用户 ID
+    """
+    return item.get("user") or item.get("user_id") or item.get("id")
+
+
+class ParticipationService:
+    """
+    按用户集合统计参与项目数。每种参与关系一条 GROUP BY 查询，
+    同时返回指定批次内和全部批次的数量。
+    """
+
+    @staticmethod
+    def active_projects(batch=None):
+        queryset = Project.objects.exclude(status__in=INACTIVE_PROJECT_STATUSES)
+        if batch:
+            queryset = queryset.filter(batch=batch)
+        return queryset
+
+    @staticmethod
+    def counts(user_ids, projects, relation, batch=None):
+        """
+        统计 user_ids 中每个用户在 projects 范围内的参与项目数。
+
+        :param relation: "advisor"（指导教师）、"member"（成员表，含负责人行）或 "leader"（项目负责人）
+        :param batch: 指定时同时统计该批次内的数量
+        :return: {user_id: (批次内数量, 全部数量)}，未参与的用户不在结果中
+        """
+        user_ids = {int(user_id) for user_id in user_ids if user_id}
+        if not user_ids:
+            return {}
+        if relation == "leader":
+            rows = projects.filter(leader_id__in=user_ids).values(
+                user_key=F("leader_id")
+            )
+            project_key, batch_key = "id", "batch_id"
+        else:
+            model = ProjectAdvisor if relation == "advisor" else ProjectMember
+            rows = model.objects.filter(
+                user_id__in=user_ids, project__in=projects.values("id")
+            ).values(user_key=F("user_id"))
+            project_key, batch_key = "project_id", "project__batch_id"
+
+        batch_count = (
+            Count(
+                project_key,
+                filter=Q(**{batch_key: getattr(batch, "pk", batch)}),
+                distinct=True,
+            )
+            if batch
+            else Count(project_key, distinct=True)
+        )
+        return {
+            row["user_key"]: (row["batch_total"], row["total"])
+            for row in rows.annotate(
+                batch_total=batch_count, total=Count(project_key, distinct=True)
+            ).order_by()
+        }
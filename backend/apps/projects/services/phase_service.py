@@ -47,6 +47,18 @@ class ProjectPhaseService:
             .first()
         )
 
+    @staticmethod
+    def get_current_map(
+        project_ids, phase: str
+    ) -> dict[int, ProjectPhaseInstance]:
+        """批量获取多个项目的当前阶段实例：{project_id: phase_instance}"""
+        current: dict[int, ProjectPhaseInstance] = {}
+        for instance in ProjectPhaseInstance.objects.filter(
+            project_id__in=project_ids, phase=phase
+        ).order_by("project_id", "-attempt_no", "-id"):
+            current.setdefault(instance.project_id, instance)
+        return current
+
     @staticmethod
     def get_in_progress(project: Project, phase: str) -> Optional[ProjectPhaseInstance]:
         return (
@@ -0,0 +1,138 @@
+"""
+项目编号分配：按（年份 + 学院代码）前缀维护计数器，一条语句预留一段连续序号
+"""
+
+import re
+
+from django.db import connection
+
+from ..models import Project, ProjectNumberSequence
+
+# 序号补足的最小位数，例如 2025CS0001
+PROJECT_NO_DIGITS = 4
+
+# 只把纯数字后缀视为序号（上限 18 位，避免 bigint 溢出）
+SUFFIX_PATTERN = "^[0-9]{1,18}$"
+
+SEQUENCE_TABLE = ProjectNumberSequence._meta.db_table
+PROJECT_TABLE = Project._meta.db_table
+
+# 计数器已存在：原子递增并返回新的最大序号
+ADVANCE_SQL = f"""
+UPDATE {SEQUENCE_TABLE}
+SET last_value = last_value + %s, updated_at = NOW()
+WHERE prefix = %s
+RETURNING last_value
+"""
+
+# 计数器不存在：以现有项目编号的最大序号为起点创建；并发创建时退化为递增
+SEED_SQL = f"""
+INSERT INTO {SEQUENCE_TABLE} (prefix, last_value, updated_at)
+SELECT %s, COALESCE(MAX(CAST(SUBSTRING(project_no FROM %s) AS BIGINT)), 0) + %s, NOW()
+FROM {PROJECT_TABLE}
+WHERE project_no LIKE %s AND SUBSTRING(project_no FROM %s) ~ '{SUFFIX_PATTERN}'
+ON CONFLICT (prefix) DO UPDATE
+SET last_value = {SEQUENCE_TABLE}.last_value + %s, updated_at = NOW()
+RETURNING last_value
+"""
+
+# 外部写入的编号（如历史导入）超过计数器时，把计数器推进到其最大序号
+OBSERVE_SQL = f"""
+UPDATE {SEQUENCE_TABLE} AS sequence
+SET last_value = observed.max_value, updated_at = NOW()
+FROM (
+    SELECT counter.prefix,
+           MAX(CAST(SUBSTRING(numbers.project_no FROM char_length(counter.prefix) + 1) AS BIGINT)) AS max_value
+    FROM {SEQUENCE_TABLE} AS counter
+    JOIN unnest(%s::text[]) AS numbers(project_no)
+      ON numbers.project_no LIKE counter.prefix || '%%'
+     AND SUBSTRING(numbers.project_no FROM char_length(counter.prefix) + 1) ~ '{SUFFIX_PATTERN}'
+    GROUP BY counter.prefix
+) AS observed
+WHERE sequence.prefix = observed.prefix AND observed.max_value > sequence.last_value
+"""
+
+
+class ProjectNumberService:
+    """
+    项目编号分配服务
+
+    计数器行在递增时被行锁锁定直至事务结束：并发分配同一前缀时串行执行、
+    不会重号；事务回滚时预留的序号随之释放，不会留下空号。
+    """
+
+    @staticmethod
+    def build_prefix(year, college_code=""):
+        """
+        编号前缀：年份 + 学院代码（只保留字母数字，缺省为 XX）
+        """
+        college_code = (college_code or "").strip().upper()
+        college_code = re.sub(r"[^0-9A-Z]", "", college_code) or "XX"
+        return f"{year}{college_code}"
+
+    @staticmethod
+    def reserve(prefix, count=1):
+        """
+        为前缀预留 count 个连续编号
+        :return: 编号列表，按序号递增
+        """
+        if count <= 0:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(ADVANCE_SQL, [count, prefix])
+            row = cursor.fetchone()
+            if row is None:
+                start = len(prefix) + 1
+                cursor.execute(
+                    SEED_SQL, [prefix, start, count, f"{prefix}%", start, count]
+                )
+                row = cursor.fetchone()
+        last_value = row[0]
+        return [
+            f"{prefix}{value:0{PROJECT_NO_DIGITS}d}"
+            for value in range(last_value - count + 1, last_value + 1)
+        ]
+
+    @staticmethod
+    def allocate(year, college_code="", count=1):
+        """
+        按年份与学院代码预留 count 个编号
+        """
+        return ProjectNumberService.reserve(
+            ProjectNumberService.build_prefix(year, college_code), count
+        )
+
+    @staticmethod
+    def assign(projects):
+        """
+        为没有编号的项目分配编号：按前缀分组，每个前缀只执行一次预留。
+        只修改内存中的 project_no，由调用方保存。
+        :return: 新分配编号的项目列表
+        """
+        groups = {}
+        for project in projects:
+            if project.project_no:
+                continue
+            prefix = ProjectNumberService.build_prefix(
+                project.year, project.leader.college if project.leader else ""
+            )
+            groups.setdefault(prefix, []).append(project)
+        assigned = []
+        for prefix, group in groups.items():
+            numbers = ProjectNumberService.reserve(prefix, len(group))
+            for project, project_no in zip(group, numbers):
+                project.project_no = project_no
+            assigned.extend(group)
+        return assigned
+
+    @staticmethod
+    def observe(project_nos):
+        """
+        登记由外部写入的编号，使已有计数器不会再分配到这些序号
+        （尚未创建的计数器在首次分配时会从现有编号起算）
+        """
+        project_nos = sorted({project_no for project_no in project_nos if project_no})
+        if not project_nos:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(OBSERVE_SQL, [project_nos])
@@ -6,8 +6,10 @@ from django.utils import timezone
 from django.db import models, transaction
 
 from apps.projects.upload_validation import validate_project_document_file
+from apps.utils.search import ngram_filter
 
 from ..models import (
+    PROJECT_SEARCH_FIELDS,
     Project,
     ProjectMember,
     ProjectExpenditure,
@@ -19,6 +21,27 @@ class ProjectService:
     项目服务类
     """
 
+    @staticmethod
+    def search_projects(queryset, term):
+        """
+        按项目名称、项目编号、负责人姓名模糊搜索。
+        项目和负责人分别走各自的 n-gram 索引，负责人先解析为 ID 列表，避免连表扫描。
+        """
+        from apps.users.repositories.user_repository import search_users
+        from apps.users.models import User
+
+        leader_ids = list(
+            search_users(User.objects.all(), term)
+            .filter(real_name__icontains=term)
+            .values_list("id", flat=True)
+        )
+        matches = ngram_filter(term, PROJECT_SEARCH_FIELDS) & (
+            models.Q(title__icontains=term) | models.Q(project_no__icontains=term)
+        )
+        if leader_ids:
+            matches |= models.Q(leader_id__in=leader_ids)
+        return queryset.filter(matches)
+
     @staticmethod
     def generate_project_no(year, college_code=""):
         """
@@ -26,24 +49,9 @@ class ProjectService:
         格式：YYYY + 学院代码 + 4位序号
         例如：2025CS0001
         """
-        import re
-
-        college_code = (college_code or "").strip().upper()
-        # 保证学院代码只包含字母数字
-        college_code = re.sub(r"[^0-9A-Z]", "", college_code) or "XX"
-        prefix = f"{year}{college_code}"
-
-        last_project = (
-            Project.objects.filter(project_no__startswith=prefix)
-            .order_by("-project_no")
-            .first()
-        )
-        if last_project:
-            suffix = last_project.project_no[len(prefix) :]
-            if suffix.isdigit():
-                return f"{prefix}{int(suffix) + 1:04d}"
+        from .project_number_service import ProjectNumberService
 
-        return f"{prefix}0001"
+        return ProjectNumberService.allocate(year, college_code)[0]
 
     @staticmethod
     @transaction.atomic
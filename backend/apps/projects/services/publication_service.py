@@ -1,3 +1,4 @@
+import logging
 from decimal import Decimal, InvalidOperation
 
 from django.db import transaction
@@ -7,12 +8,37 @@ from django.utils import timezone
 from apps.dictionaries.models import DictionaryItem
 from apps.notifications.models import PlatformNotice
 from apps.notifications.services import NotificationService
+from apps.operations.models import AsyncTaskRecord, OperationLog
 from apps.operations.services import OperationLogService
 from apps.system_settings.services import SystemSettingService
 from apps.utils.pagination import optional_positive_int
+from apps.utils.request_cache import request_cache_scope
 
 from ..models import Project
-from .project_service import ProjectService
+from .dashboard_service import DashboardService
+from .project_number_service import ProjectNumberService
+from .statistics_service import BatchStatisticsService
+
+logger = logging.getLogger(__name__)
+
+# 每个事务发布的项目数，同时是每条 UPDATE 语句包含的记录数
+PUBLICATION_CHUNK_SIZE = 500
+
+PUBLISHABLE_STATUSES = [
+    Project.PublishStatus.CONFIRMED,
+    Project.PublishStatus.PUBLISHED,
+]
+
+PUBLISH_FIELDS = [
+    "project_no",
+    "level",
+    "approved_budget",
+    "status",
+    "publish_status",
+    "published_at",
+    "published_by",
+    "updated_at",
+]
 
 
 class PublicationService:
@@ -244,51 +270,85 @@ class PublicationService:
         return updated
 
     @staticmethod
-    @transaction.atomic
-    def publish_projects(user, project_ids):
+    def _publish_chunk(user, project_ids, now):
+        """
+        在一个事务内发布一段项目：内存中计算字段变更后一次 bulk_update。
+        :return: 本段发布的项目数
+        """
+        with transaction.atomic():
+            projects = list(
+                Project.objects.filter(
+                    id__in=project_ids, publish_status__in=PUBLISHABLE_STATUSES
+                )
+                .select_related("leader", "level", "final_level")
+                .select_for_update(of=("self",))
+                .order_by("id")
+            )
+            if not projects:
+                return 0
+            stale_buckets = {
+                BatchStatisticsService.project_bucket_key(project)
+                for project in projects
+            }
+            # 未编号的项目按前缀整段预留编号
+            ProjectNumberService.assign(projects)
+
+            newly_published = []
+            for project in projects:
+                if project.publish_status != Project.PublishStatus.PUBLISHED:
+                    newly_published.append(project)
+                if project.final_level:
+                    project.level = project.final_level
+                if project.final_budget is not None:
+                    project.approved_budget = project.final_budget
+                project.status = Project.ProjectStatus.IN_PROGRESS
+                project.publish_status = Project.PublishStatus.PUBLISHED
+                project.published_at = now
+                project.published_by = user
+                project.updated_at = now
+            Project.objects.bulk_update(projects, PUBLISH_FIELDS)
+
+            # bulk_update 不触发信号：按发布前后所在分组重算统计快照，并失效仪表板缓存
+            BatchStatisticsService.refresh_buckets(
+                stale_buckets
+                | {
+                    BatchStatisticsService.project_bucket_key(project)
+                    for project in projects
+                }
+            )
+            DashboardService.invalidate_cache()
+            # 负责人、指导教师与成员的通知在本段事务提交后批量写入
+            NotificationService.notify_establishments_published(
+                newly_published, defer=True
+            )
+        return len(projects)
+
+    @staticmethod
+    def publish_projects(user, project_ids, progress=None):
+        """
+        批量发布立项结果。
+
+        项目按 PUBLICATION_CHUNK_SIZE 分段，每段独立事务提交，行锁只在本段内持有；
+        中途失败时已提交的分段保持已发布，重新发布是幂等的。
+        :param progress: 可选回调 progress(done, total)，每段提交后调用
+        """
         if not PublicationService._has_school_admin_scope(user):
             raise PermissionError("只有校级管理员可以发布立项结果")
 
-        queryset = PublicationService.get_scope_queryset(user)
-        projects = queryset.filter(
-            id__in=project_ids,
-            publish_status__in=[
-                Project.PublishStatus.CONFIRMED,
-                Project.PublishStatus.PUBLISHED,
-            ],
-        ).select_related("leader", "final_level")
+        ids = list(
+            PublicationService.get_scope_queryset(user)
+            .filter(id__in=project_ids, publish_status__in=PUBLISHABLE_STATUSES)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
         published = 0
         now = timezone.now()
-
-        for project in projects:
-            was_published = project.publish_status == Project.PublishStatus.PUBLISHED
-            if not project.project_no:
-                project.project_no = ProjectService.generate_project_no(
-                    project.year, project.leader.college if project.leader else ""
-                )
-            if project.final_level:
-                project.level = project.final_level
-            if project.final_budget is not None:
-                project.approved_budget = project.final_budget
-            project.status = Project.ProjectStatus.IN_PROGRESS
-            project.publish_status = Project.PublishStatus.PUBLISHED
-            project.published_at = now
-            project.published_by = user
-            project.save(
-                update_fields=[
-                    "project_no",
-                    "level",
-                    "approved_budget",
-                    "status",
-                    "publish_status",
-                    "published_at",
-                    "published_by",
-                    "updated_at",
-                ]
+        for start in range(0, len(ids), PUBLICATION_CHUNK_SIZE):
+            published += PublicationService._publish_chunk(
+                user, ids[start : start + PUBLICATION_CHUNK_SIZE], now
             )
-            if not was_published:
-                NotificationService.notify_establishment_published(project)
-            published += 1
+            if progress:
+                progress(min(start + PUBLICATION_CHUNK_SIZE, len(ids)), len(ids))
 
         notice = None
         if published:
@@ -306,3 +366,100 @@ class PublicationService:
             },
         )
         return published
+
+    @staticmethod
+    def create_task(user, project_ids):
+        return AsyncTaskRecord.objects.create(
+            task_type=AsyncTaskRecord.TaskType.PUBLICATION,
+            title=f"发布立项结果（{len(project_ids)}个项目）",
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+            progress=0,
+            message="任务已创建",
+            payload={"project_ids": list(project_ids)},
+            created_by=user,
+        )
+
+    @staticmethod
+    def dispatch_task(task):
+        """
+        投递立项发布任务到 Celery；投递失败时在当前进程内同步执行。
+        """
+        try:
+            from ..tasks import run_publication_task
+
+            async_result = run_publication_task.delay(task.id)
+            payload = dict(task.payload, celery_task_id=async_result.id)
+            AsyncTaskRecord.objects.filter(id=task.id).update(payload=payload)
+        except Exception:
+            logger.exception(
+                "Failed to enqueue publication task %s; running synchronously",
+                task.id,
+            )
+            PublicationService.run_task(task.id)
+        task.refresh_from_db()
+        return task
+
+    @staticmethod
+    def run_task(task_id):
+        claimed = AsyncTaskRecord.objects.filter(
+            id=task_id,
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+        ).update(
+            status=AsyncTaskRecord.TaskStatus.RUNNING,
+            progress=10,
+            started_at=timezone.now(),
+            message="正在发布立项结果",
+        )
+        task = AsyncTaskRecord.objects.select_related("created_by__role_fk").get(
+            id=task_id
+        )
+        if not claimed:
+            return task
+
+        def report(done, total):
+            # 每段提交后更新进度，任务中心可看到已发布的项目数
+            AsyncTaskRecord.objects.filter(id=task.id).update(
+                progress=10 + 85 * done // total,
+                message=f"已处理 {done}/{total} 个项目",
+            )
+
+        try:
+            if not task.created_by:
+                raise ValueError("任务创建人不存在")
+            with request_cache_scope():
+                published = PublicationService.publish_projects(
+                    task.created_by, task.payload.get("project_ids", []), report
+                )
+            task.status = AsyncTaskRecord.TaskStatus.SUCCESS
+            task.message = f"已发布 {published} 个项目"
+            task.result = {"published": published}
+            log_status = OperationLog.LogStatus.SUCCESS
+            detail = {"published": published}
+        except Exception as exc:
+            logger.exception("Failed to run publication task %s", task.id)
+            message = (
+                str(exc)
+                if isinstance(exc, (ValueError, PermissionError))
+                else "发布立项结果失败，请稍后重试"
+            )
+            task.status = AsyncTaskRecord.TaskStatus.FAILED
+            task.message = message
+            task.result = {"errors": [message]}
+            log_status = OperationLog.LogStatus.FAILED
+            detail = {"error": message}
+        task.progress = 100
+        task.completed_at = timezone.now()
+        task.save(
+            update_fields=["status", "progress", "message", "result", "completed_at"]
+        )
+        OperationLogService.log(
+            operator=task.created_by,
+            module="立项发布",
+            action="发布立项结果任务",
+            target_type="AsyncTaskRecord",
+            target_id=task.id,
+            target_name=task.title,
+            status=log_status,
+            detail=detail,
+        )
+        return task
@@ -0,0 +1,250 @@
+"""
+批次统计快照维护与读取
+"""
+
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+
+from ..models import BatchStatistics, Project, ProjectAchievement, ProjectExpenditure
+
+# 快照维度：(batch_id, college, level_id, status)
+BUCKET_FIELDS = ("batch_id", "leader__college", "level_id", "status")
+
+
+def bucket_key(batch_id, college, level_id, status):
+    if not batch_id:
+        return None
+    return (batch_id, college or "", level_id, status)
+
+
+def _bucket_filter(prefix, key):
+    batch_id, college, level_id, status = key
+    level_lookup = (
+        {f"{prefix}level__isnull": True}
+        if level_id is None
+        else {f"{prefix}level_id": level_id}
+    )
+    return Q(
+        **{
+            f"{prefix}batch_id": batch_id,
+            f"{prefix}leader__college": college,
+            f"{prefix}status": status,
+            f"{prefix}is_deleted": False,
+        },
+        **level_lookup,
+    )
+
+
+class BatchStatisticsService:
+    """
+    维护 BatchStatistics 快照：项目状态、级别、经费、成果变化时重算所在分组，
+    校级仪表板与统计接口直接读取快照，避免每次扫描项目表。
+    """
+
+    @staticmethod
+    def project_bucket_key(project):
+        college = project.leader.college if project.leader_id else ""
+        return bucket_key(project.batch_id, college, project.level_id, project.status)
+
+    @staticmethod
+    def bucket_keys(queryset):
+        """查询集中项目所在的全部分组"""
+        return {
+            bucket_key(*row)
+            for row in queryset.values_list(*BUCKET_FIELDS).distinct()
+            if row[0]
+        }
+
+    @staticmethod
+    def refresh_buckets(keys):
+        """
+        在当前事务提交后重算分组（不在事务内时立即执行）。
+
+        每个分组在各自的短事务中加锁重算：调用方的事务不持有快照行锁，
+        并发保存同一分组的项目不会互相等待，也不会因加锁顺序不同而死锁。
+        重算失败只记录日志，快照可用 refresh_batch_statistics 修复。
+        """
+        keys = {key for key in keys if key}
+        if keys:
+            transaction.on_commit(
+                lambda: BatchStatisticsService._refresh_now(keys), robust=True
+            )
+
+    @staticmethod
+    def _refresh_now(keys):
+        for key in sorted(keys, key=lambda key: tuple(map(str, key))):
+            BatchStatisticsService.refresh_bucket(key)
+
+    @staticmethod
+    @transaction.atomic
+    def refresh_bucket(key):
+        """
+        重算单个分组。先锁定快照行再聚合，同一分组的并发重算串行执行，
+        每次都基于已提交的最新数据计算。
+        """
+        row = BatchStatisticsService._lock_bucket(key)
+
+        projects = Project.objects.filter(_bucket_filter("", key))
+        counts = projects.aggregate(
+            project_count=Count("id"),
+            budgeted_count=Count("id", filter=Q(approved_budget__isnull=False)),
+            approved_budget_total=Sum("approved_budget"),
+        )
+        if not counts["project_count"]:
+            row.delete()
+            return None
+
+        row.project_count = counts["project_count"]
+        row.budgeted_count = counts["budgeted_count"]
+        row.approved_budget_total = counts["approved_budget_total"] or Decimal("0")
+        row.expenditure_total = ProjectExpenditure.objects.filter(
+            _bucket_filter("project__", key), is_deleted=False
+        ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
+        row.achievement_count = ProjectAchievement.objects.filter(
+            _bucket_filter("project__", key)
+        ).count()
+        row.save()
+        return row
+
+    @staticmethod
+    def _lock_bucket(key):
+        """锁定分组快照行，不存在时先插入占位行（并发插入由唯一约束兜底）"""
+        batch_id, college, level_id, status = key
+        lookup = {
+            "batch_id": batch_id,
+            "college": college,
+            "level_id": level_id,
+            "status": status,
+        }
+        row = BatchStatistics.objects.select_for_update().filter(**lookup).first()
+        if row is not None:
+            return row
+        try:
+            with transaction.atomic():
+                return BatchStatistics.objects.create(**lookup)
+        except IntegrityError:
+            return BatchStatistics.objects.select_for_update().get(**lookup)
+
+    @staticmethod
+    @transaction.atomic
+    def refresh_batch(batch_id):
+        """
+        按分组聚合整批重建快照，用于初始化、批量更新后或数据修复。
+        """
+        BatchStatistics.objects.select_for_update().filter(batch_id=batch_id).delete()
+
+        project_filter = Q(batch_id=batch_id, is_deleted=False)
+        rows = {}
+        for row in (
+            Project.objects.filter(project_filter)
+            .values(*BUCKET_FIELDS)
+            .annotate(
+                project_count=Count("id"),
+                budgeted_count=Count("id", filter=Q(approved_budget__isnull=False)),
+                approved_budget_total=Sum("approved_budget"),
+            )
+            .order_by()
+        ):
+            key = bucket_key(*(row[field] for field in BUCKET_FIELDS))
+            rows[key] = BatchStatistics(
+                batch_id=batch_id,
+                college=key[1],
+                level_id=key[2],
+                status=key[3],
+                project_count=row["project_count"],
+                budgeted_count=row["budgeted_count"],
+                approved_budget_total=row["approved_budget_total"] or Decimal("0"),
+            )
+
+        related_fields = [f"project__{field}" for field in BUCKET_FIELDS]
+        for row in (
+            ProjectExpenditure.objects.filter(
+                project__batch_id=batch_id,
+                project__is_deleted=False,
+                is_deleted=False,
+            )
+            .values(*related_fields)
+            .annotate(total=Sum("amount"))
+            .order_by()
+        ):
+            key = bucket_key(*(row[field] for field in related_fields))
+            rows[key].expenditure_total = row["total"] or Decimal("0")
+        for row in (
+            ProjectAchievement.objects.filter(
+                project__batch_id=batch_id, project__is_deleted=False
+            )
+            .values(*related_fields)
+            .annotate(total=Count("id"))
+            .order_by()
+        ):
+            key = bucket_key(*(row[field] for field in related_fields))
+            rows[key].achievement_count = row["total"]
+
+        BatchStatistics.objects.bulk_create(rows.values())
+        return len(rows)
+
+    @staticmethod
+    def get_rows(batch_id, college=None, level_id=None, status=None):
+        rows = BatchStatistics.objects.filter(batch_id=batch_id, project_count__gt=0)
+        if college is not None:
+            rows = rows.filter(college=college)
+        if level_id is not None:
+            rows = rows.filter(level_id=level_id)
+        if status:
+            rows = rows.filter(status=status)
+        return rows
+
+    @staticmethod
+    def get_summary(batch_id, college=None, level_id=None, status=None):
+        """
+        汇总快照：总数、按状态/级别/学院分布及经费、成果合计。
+        """
+        rows = list(
+            BatchStatisticsService.get_rows(batch_id, college, level_id, status)
+            .select_related("level")
+            .order_by("college", "level_id", "status")
+        )
+
+        status_counts = {}
+        levels = {}
+        colleges = {}
+        totals = {
+            "total_projects": 0,
+            "budgeted_projects": 0,
+            "total_budget": Decimal("0"),
+            "total_expenditure": Decimal("0"),
+            "total_achievements": 0,
+        }
+        for row in rows:
+            status_counts[row.status] = status_counts.get(row.status, 0) + row.project_count
+            level_key = (
+                row.level.value if row.level else None,
+                row.level.label if row.level else None,
+            )
+            levels[level_key] = levels.get(level_key, 0) + row.project_count
+            colleges[row.college] = colleges.get(row.college, 0) + row.project_count
+            totals["total_projects"] += row.project_count
+            totals["budgeted_projects"] += row.budgeted_count
+            totals["total_budget"] += row.approved_budget_total
+            totals["total_expenditure"] += row.expenditure_total
+            totals["total_achievements"] += row.achievement_count
+
+        budgeted = totals["budgeted_projects"]
+        return {
+            **totals,
+            "avg_budget": totals["total_budget"] / budgeted if budgeted else Decimal("0"),
+            "status_counts": status_counts,
+            "level_stats": [
+                {"level__value": value, "level__label": label, "count": count}
+                for (value, label), count in levels.items()
+            ],
+            "college_stats": sorted(
+                (
+                    {"leader__college": college_name, "count": count}
+                    for college_name, count in colleges.items()
+                ),
+                key=lambda item: -item["count"],
+            ),
+        }
@@ -0,0 +1,182 @@
+"""
+项目标题近似查重：标题按相邻两字切分，MinHash 签名分段（LSH），
+GIN 表达式索引按分段重叠取候选，再对少量候选计算精确的 Jaccard 相似度。
+"""
+
+from collections import defaultdict
+
+from django.db.models import F, Value
+
+from apps.utils.search import SEARCH_NON_ALNUM_RE
+
+from ..models import Project, title_minhash_bands
+
+SIMILAR_TITLE_THRESHOLD = 0.5
+SIMILAR_TITLE_LIMIT = 5
+# 单次查询最多评分的候选数，防止极短或极常见的标题命中大量分段
+SIMILAR_TITLE_MAX_CANDIDATES = 5000
+
+DESCRIBE_FIELDS = ("id", "project_no", "title", "batch__name")
+CANDIDATE_FIELDS = (*DESCRIBE_FIELDS, "title_bands")
+
+
+def title_shingles(title):
+    """
+    与 SQL 函数 title_shingles（迁移 0041 创建）一致：小写、去空白和标点（含全角标点）后取相邻两字
+    """
+    text = SEARCH_NON_ALNUM_RE.sub("", (title or "").lower())
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[index : index + 2] for index in range(len(text) - 1)}
+
+
+def jaccard(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _with_title_bands(queryset):
+    """
+    附加标题分段；按 title_bands 过滤时条件与表达式索引一致
+    """
+    return queryset.annotate(title_bands=title_minhash_bands(F("title")))
+
+
+def parse_threshold(value, default=SIMILAR_TITLE_THRESHOLD):
+    try:
+        threshold = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not 0 < threshold <= 1:
+        return default
+    return threshold
+
+
+def _describe(row, score=None):
+    data = {
+        "id": row["id"],
+        "project_no": row["project_no"],
+        "title": row["title"],
+        "batch_name": row["batch__name"],
+    }
+    if score is not None:
+        data["score"] = round(score, 3)
+    return data
+
+
+class TitleSimilarityService:
+    """
+    历史项目标题近似查重
+    """
+
+    @staticmethod
+    def find_similar(
+        title,
+        exclude_id=None,
+        limit=SIMILAR_TITLE_LIMIT,
+        threshold=SIMILAR_TITLE_THRESHOLD,
+    ):
+        """
+        返回与标题最相似的历史项目（按相似度降序，最多 limit 个）
+        """
+        shingles = title_shingles(title)
+        if not shingles:
+            return []
+        candidates = Project.objects.alias(
+            title_bands=title_minhash_bands(F("title"))
+        ).filter(
+            is_deleted=False,
+            title_bands__overlap=title_minhash_bands(Value(title)),
+        )
+        if exclude_id:
+            candidates = candidates.exclude(id=exclude_id)
+
+        scored = []
+        for project_id, candidate_title in candidates.order_by().values_list(
+            "id", "title"
+        )[:SIMILAR_TITLE_MAX_CANDIDATES]:
+            score = jaccard(shingles, title_shingles(candidate_title))
+            if score >= threshold:
+                scored.append((score, project_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        scored = scored[:limit]
+        if not scored:
+            return []
+        rows = {
+            row["id"]: row
+            for row in Project.objects.filter(
+                id__in=[project_id for _, project_id in scored]
+            ).values(*DESCRIBE_FIELDS)
+        }
+        return [_describe(rows[project_id], score) for score, project_id in scored]
+
+    @staticmethod
+    def batch_duplicates(projects, history, threshold=SIMILAR_TITLE_THRESHOLD):
+        """
+        批量查重报告：projects 中的项目两两比较，并与 history 范围内的其余项目比较
+        （history 由调用方按权限限定，最多取 SIMILAR_TITLE_MAX_CANDIDATES 个候选）。
+        返回相似项目对，按相似度降序。
+        """
+        rows = {
+            row["id"]: row
+            for row in _with_title_bands(projects.filter(is_deleted=False)).values(
+                *CANDIDATE_FIELDS
+            )
+        }
+        by_band = defaultdict(list)
+        for row in rows.values():
+            for band in row["title_bands"]:
+                by_band[band].append(row["id"])
+
+        pairs = set()
+        for row_id, row in rows.items():
+            for band in row["title_bands"]:
+                pairs.update(
+                    (other_id, row_id)
+                    for other_id in by_band[band]
+                    if other_id < row_id
+                )
+        others = {}
+        if by_band:
+            for row in (
+                _with_title_bands(history)
+                .filter(is_deleted=False, title_bands__overlap=list(by_band))
+                .exclude(id__in=list(rows))
+                .order_by()
+                .values(*CANDIDATE_FIELDS)[:SIMILAR_TITLE_MAX_CANDIDATES]
+            ):
+                others[row["id"]] = row
+                for band in row["title_bands"]:
+                    pairs.update(
+                        (project_id, row["id"]) for project_id in by_band.get(band, ())
+                    )
+
+        shingles = {}
+
+        def shingles_of(row):
+            if row["id"] not in shingles:
+                shingles[row["id"]] = title_shingles(row["title"])
+            return shingles[row["id"]]
+
+        results = []
+        for project_id, other_id in pairs:
+            project = rows[project_id]
+            other = rows.get(other_id) or others[other_id]
+            score = jaccard(shingles_of(project), shingles_of(other))
+            if score >= threshold:
+                results.append(
+                    {
+                        "score": round(score, 3),
+                        "project": _describe(project),
+                        "similar": _describe(other),
+                    }
+                )
+        results.sort(
+            key=lambda item: (
+                -item["score"],
+                item["project"]["id"],
+                item["similar"]["id"],
+            )
+        )
+        return results
@@ -2,16 +2,27 @@
 项目申报智能校验服务
 """
 
-from ..models import Project, ProjectMember
+from ..models import Project
+from .participation_service import ParticipationService
+from .title_similarity import TitleSimilarityService
 from apps.system_settings.services import SystemSettingService
 from apps.utils.pagination import non_negative_int
 from apps.users.models import User
 
+# 指导教师“在研”项目状态
+ADVISOR_ACTIVE_STATUSES = [
+    Project.ProjectStatus.IN_PROGRESS,
+    Project.ProjectStatus.MID_TERM_DRAFT,
+    Project.ProjectStatus.MID_TERM_SUBMITTED,
+    Project.ProjectStatus.MID_TERM_REVIEWING,
+    Project.ProjectStatus.READY_FOR_CLOSURE,
+]
+
 
 class ProjectValidationService:
     """
     项目申报智能校验服务
-    包括：标题查重、超项拦截等
+    包括：标题查重、相似标题提示、超项拦截等
     """
 
     @staticmethod
@@ -21,14 +32,19 @@ class ProjectValidationService:
         :param project: 项目实例
         :param user: 申报用户
         :param is_update: 是否为更新操作
-        :return: 校验结果 dict，包含 is_valid 和 errors
+        :return: 校验结果 dict，包含 is_valid、errors 和 similar_projects（相似历史项目及相似度）
         """
         errors = []
+        similar_projects = []
 
         # 获取批次配置
         if not project.batch:
             errors.append("项目必须关联到有效批次")
-            return {"is_valid": False, "errors": errors}
+            return {
+                "is_valid": False,
+                "errors": errors,
+                "similar_projects": similar_projects,
+            }
 
         settings_service = SystemSettingService()
         limit_rules = (
@@ -46,6 +62,9 @@ class ProjectValidationService:
             )
             if title_error:
                 errors.append(title_error)
+            similar_projects = TitleSimilarityService.find_similar(
+                project.title, exclude_id=project.id
+            )
 
         # 2. 标题格式校验
         title_format_error = ProjectValidationService._validate_title_format(
@@ -68,7 +87,11 @@ class ProjectValidationService:
             )
             errors.extend(member_errors)
 
-        return {"is_valid": len(errors) == 0, "errors": errors}
+        return {
+            "is_valid": len(errors) == 0,
+            "errors": errors,
+            "similar_projects": similar_projects,
+        }
 
     @staticmethod
     def _validate_title_duplication(project, is_update):
@@ -121,23 +144,20 @@ class ProjectValidationService:
         # 指导教师在研项目数限制
         max_teacher_active = non_negative_int(limit_rules.get("max_teacher_active"), 5)
 
+        advisor_counts = ParticipationService.counts(
+            [advisor.get("user_id") for advisor in advisors],
+            Project.objects.filter(
+                is_deleted=False, status__in=ADVISOR_ACTIVE_STATUSES
+            ),
+            "advisor",
+        )
         for advisor in advisors:
             advisor_user_id = advisor.get("user_id")
             if not advisor_user_id:
                 continue
 
-            # 统计教师在研项目数
-            active_count = Project.objects.filter(
-                advisors__user_id=advisor_user_id,
-                is_deleted=False,
-                status__in=[
-                    Project.ProjectStatus.IN_PROGRESS,
-                    Project.ProjectStatus.MID_TERM_DRAFT,
-                    Project.ProjectStatus.MID_TERM_SUBMITTED,
-                    Project.ProjectStatus.MID_TERM_REVIEWING,
-                    Project.ProjectStatus.READY_FOR_CLOSURE,
-                ],
-            ).count()
+            # 教师在研项目数
+            active_count = advisor_counts.get(int(advisor_user_id), (0, 0))[1]
 
             if max_teacher_active and active_count >= max_teacher_active:
                 errors.append(
@@ -168,48 +188,34 @@ class ProjectValidationService:
             all_members.append(project.leader.id)
         all_members.extend([m.get("user_id") for m in members if m.get("user_id")])
 
-        for member_id in all_members:
-            # 统计学生作为负责人的项目数
-            leader_count = Project.objects.filter(
-                leader_id=member_id, batch=project.batch, is_deleted=False
-            ).exclude(
-                status__in=[
-                    Project.ProjectStatus.DRAFT,
-                    Project.ProjectStatus.TERMINATED,
-                ]
-            )
+        # 负责人和成员身份分别一条分组查询统计本批次参与数
+        projects = Project.objects.filter(
+            batch=project.batch, is_deleted=False
+        ).exclude(
+            status__in=[
+                Project.ProjectStatus.DRAFT,
+                Project.ProjectStatus.TERMINATED,
+            ]
+        )
+        if project.id:
+            projects = projects.exclude(id=project.id)
+        leader_counts = ParticipationService.counts(all_members, projects, "leader")
+        member_counts = ParticipationService.counts(all_members, projects, "member")
 
-            if project.id:
-                leader_count = leader_count.exclude(id=project.id)
-
-            leader_count = leader_count.count()
-
-            # 统计学生作为成员的项目数
-            member_count = ProjectMember.objects.filter(
-                user_id=member_id,
-                project__batch=project.batch,
-                project__is_deleted=False,
-            ).exclude(
-                project__status__in=[
-                    Project.ProjectStatus.DRAFT,
-                    Project.ProjectStatus.TERMINATED,
-                ]
+        over_limit = []
+        for member_id in all_members:
+            total_count = (
+                leader_counts.get(int(member_id), (0, 0))[1]
+                + member_counts.get(int(member_id), (0, 0))[1]
             )
-
-            if project.id:
-                member_count = member_count.exclude(project_id=project.id)
-
-            member_count = member_count.count()
-
-            total_count = leader_count + member_count
-
             if max_student_member and total_count >= max_student_member:
-                try:
-                    user = User.objects.get(id=member_id)
-                    user_name = user.real_name or user.username
-                except User.DoesNotExist:
-                    user_name = "未知"
+                over_limit.append((member_id, total_count))
 
+        if over_limit:
+            users = User.objects.in_bulk([member_id for member_id, _ in over_limit])
+            for member_id, total_count in over_limit:
+                user = users.get(int(member_id))
+                user_name = (user.real_name or user.username) if user else "未知"
                 errors.append(
                     f"成员 {user_name} 在当前批次参与的项目数已达上限（{total_count}/{max_student_member}）"
                 )
@@ -0,0 +1,150 @@
+"""
+项目与审核状态变化时失效仪表板缓存，并增量维护批次统计快照
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.reviews.models import Review
+from apps.users.models import User
+
+from .models import Project, ProjectAchievement, ProjectExpenditure
+from .services.dashboard_service import DASHBOARD_CACHE, DashboardService
+from .services.statistics_service import BatchStatisticsService, bucket_key
+
+# 影响仪表板统计的字段；仅保存其他字段时不失效缓存
+PROJECT_DASHBOARD_FIELDS = {
+    "status",
+    "publish_status",
+    "is_deleted",
+    "batch",
+    "leader",
+    "level",
+    "closure_rating",
+    "approved_budget",
+    "final_budget",
+    "proposal_file",
+}
+REVIEW_DASHBOARD_FIELDS = {"status", "reviewer", "workflow_node", "is_expert_review"}
+# 影响批次统计快照的字段
+PROJECT_STATISTICS_FIELDS = {
+    "batch",
+    "leader",
+    "level",
+    "status",
+    "is_deleted",
+    "approved_budget",
+}
+
+
+def _touches(update_fields, fields):
+    return update_fields is None or bool(set(update_fields) & fields)
+
+
+@receiver(post_save, sender=Project)
+def invalidate_dashboard_on_project_save(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, PROJECT_DASHBOARD_FIELDS):
+        DashboardService.invalidate_cache()
+
+
+@receiver(post_save, sender=Review)
+def invalidate_dashboard_on_review_save(sender, instance, update_fields=None, **kwargs):
+    if _touches(update_fields, REVIEW_DASHBOARD_FIELDS):
+        DashboardService.invalidate_cache()
+
+
+DASHBOARD_CACHE.invalidate_on(Project, Review, signals=(post_delete,))
+
+
+def _statistics_state(project_id):
+    return (
+        Project.objects.filter(pk=project_id)
+        .values_list(
+            "batch_id",
+            "leader__college",
+            "level_id",
+            "status",
+            "is_deleted",
+            "approved_budget",
+        )
+        .first()
+    )
+
+
+@receiver(pre_save, sender=Project)
+def remember_project_statistics_state(sender, instance, update_fields=None, **kwargs):
+    instance._statistics_state = None
+    if instance.pk and _touches(update_fields, PROJECT_STATISTICS_FIELDS):
+        instance._statistics_state = _statistics_state(instance.pk)
+
+
+def _instance_statistics_state(instance):
+    """保存后的状态直接取自实例，与 _statistics_state 的字段一一对应"""
+    return (
+        instance.batch_id,
+        instance.leader.college if instance.leader_id else None,
+        instance.level_id,
+        instance.status,
+        instance.is_deleted,
+        instance.approved_budget,
+    )
+
+
+@receiver(post_save, sender=Project)
+def refresh_statistics_on_project_save(
+    sender, instance, created=False, update_fields=None, **kwargs
+):
+    if not created and not _touches(update_fields, PROJECT_STATISTICS_FIELDS):
+        return
+    old_state = getattr(instance, "_statistics_state", None)
+    instance._statistics_state = None
+    new_state = _instance_statistics_state(instance)
+    if old_state == new_state:
+        return
+    keys = {bucket_key(*state[:4]) for state in (old_state, new_state) if state}
+    BatchStatisticsService.refresh_buckets(keys)
+
+
+@receiver(post_delete, sender=Project)
+def refresh_statistics_on_project_delete(sender, instance, **kwargs):
+    BatchStatisticsService.refresh_buckets(
+        {BatchStatisticsService.project_bucket_key(instance)}
+    )
+
+
+@receiver(post_save, sender=ProjectExpenditure)
+@receiver(post_delete, sender=ProjectExpenditure)
+@receiver(post_save, sender=ProjectAchievement)
+@receiver(post_delete, sender=ProjectAchievement)
+def refresh_statistics_on_project_detail_change(sender, instance, **kwargs):
+    BatchStatisticsService.refresh_buckets(
+        BatchStatisticsService.bucket_keys(
+            Project.objects.filter(pk=instance.project_id)
+        )
+    )
+
+
+@receiver(pre_save, sender=User)
+def remember_leader_college(sender, instance, update_fields=None, **kwargs):
+    instance._statistics_college = None
+    if instance.pk and _touches(update_fields, {"college"}):
+        instance._statistics_college = (
+            User.objects.filter(pk=instance.pk).values_list("college", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=User)
+def refresh_statistics_on_leader_college_change(sender, instance, **kwargs):
+    old_college = getattr(instance, "_statistics_college", None)
+    instance._statistics_college = None
+    if old_college is None or old_college == instance.college:
+        return
+    keys = set()
+    for batch_id, level_id, status in (
+        Project.objects.filter(leader=instance, batch__isnull=False)
+        .values_list("batch_id", "level_id", "status")
+        .distinct()
+    ):
+        keys.add(bucket_key(batch_id, old_college, level_id, status))
+        keys.add(bucket_key(batch_id, instance.college, level_id, status))
+    BatchStatisticsService.refresh_buckets(keys)
@@ -0,0 +1,13 @@
+try:
+    from config.celery import app
+except Exception:  # pragma: no cover
+    app = None
+
+from .services.publication_service import PublicationService
+
+
+if app:
+
+    @app.task(name="projects.run_publication_task")
+    def run_publication_task(task_id):
+        PublicationService.run_task(task_id)
@@ -144,6 +144,238 @@ class ProjectAdminImportPermissionsTestCase(TestCase):
         self.assertEqual(response.data["data"]["page_size"], 100)
         self.assertEqual(response.data["data"]["total"], 1)
 
+    def test_admin_project_list_cursor_pagination_walks_ties_in_order(self):
+        projects = [
+            Project.objects.create(
+                project_no=f"DC2026C{index:03d}",
+                title=f"游标分页项目{index}",
+                leader=self.student,
+                status=Project.ProjectStatus.IN_PROGRESS,
+                year=2026,
+                batch=self.batch,
+            )
+            for index in range(5)
+        ]
+        # 相同创建时间的记录按 id 倒序稳定排列
+        Project.objects.filter(id__in=[p.id for p in projects[1:4]]).update(
+            created_at=projects[0].created_at
+        )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        seen = []
+        params = {"pagination": "cursor", "page_size": 2}
+        while True:
+            response = self.client.get("/api/v1/projects/admin/manage/", params)
+            self.assertEqual(response.status_code, 200)
+            data = response.data["data"]
+            self.assertEqual(data["total"], 5)
+            seen.extend(item["id"] for item in data["results"])
+            if not data["has_more"]:
+                self.assertIsNone(data["next_cursor"])
+                break
+            params = {"cursor": data["next_cursor"], "page_size": 2}
+
+        expected = list(
+            Project.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+        invalid = self.client.get(
+            "/api/v1/projects/admin/manage/", {"cursor": "not-a-cursor"}
+        )
+        self.assertEqual(invalid.status_code, 400)
+        self.assertEqual(invalid.data["message"], "分页游标无效")
+
+    def test_admin_project_list_cached_count(self):
+        Project.objects.create(
+            project_no="DC20260C01",
+            title="总数缓存项目",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        with patch("apps.utils.pagination.cache") as count_cache:
+            count_cache.get.return_value = 42
+            response = self.client.get(
+                "/api/v1/projects/admin/manage/", {"count": "cached"}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["data"]["total"], 42)
+        self.assertEqual(len(response.data["data"]["results"]), 1)
+
+    def test_admin_project_list_search_uses_title_number_and_leader(self):
+        by_title = Project.objects.create(
+            project_no="DC2026S001",
+            title="基于深度学习的校园安全监测",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        other_leader = User.objects.create_user(
+            username="search_leader",
+            password="password123",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="诸葛青云",
+            employee_id="S90099",
+            college="计算机学院",
+        )
+        by_leader = Project.objects.create(
+            project_no="DC2026S002",
+            title="智慧农业传感网络",
+            leader=other_leader,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        def search(term):
+            response = self.client.get(
+                "/api/v1/projects/admin/manage/", {"search": term}
+            )
+            self.assertEqual(response.status_code, 200)
+            return {item["id"] for item in response.data["data"]["results"]}
+
+        self.assertEqual(search("深度学习"), {by_title.id})
+        self.assertEqual(search("s002"), {by_leader.id})
+        self.assertEqual(search("青云"), {by_leader.id})
+        self.assertEqual(search("DC2026S"), {by_title.id, by_leader.id})
+        self.assertEqual(search("学习深度"), set())
+
+        by_title.title = "校园安全巡检机器人"
+        by_title.save(update_fields=["title"])
+        self.assertEqual(search("深度学习"), set())
+        self.assertEqual(search("巡检"), {by_title.id})
+
+    def test_admin_project_list_search_by_full_width_punctuation(self):
+        project = Project.objects.create(
+            project_no="DC2026S003",
+            title="乡村振兴：电商助农模式研究",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        response = self.client.get("/api/v1/projects/admin/manage/", {"search": "："})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [item["id"] for item in response.data["data"]["results"]], [project.id]
+        )
+
+    def test_admin_duplicate_title_report_pairs_batch_and_history(self):
+        history = Project.objects.create(
+            project_no="DC2025D001",
+            title="校园共享单车调度优化研究",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        first = Project.objects.create(
+            project_no="DC2026D001",
+            title="校园共享单车智能调度优化研究",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+        )
+        second = Project.objects.create(
+            project_no="DC2026D002",
+            title="校园共享单车智能调度优化的研究",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+        )
+        Project.objects.create(
+            project_no="DC2026D003",
+            title="高校图书馆座位预约小程序",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        response = self.client.get(
+            "/api/v1/projects/admin/manage/duplicate-titles/", {"threshold": "0.55"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        self.assertEqual(data["threshold"], 0.55)
+        pairs = {
+            (item["project"]["id"], item["similar"]["id"]) for item in data["results"]
+        }
+        self.assertEqual(
+            pairs,
+            {(first.id, second.id), (first.id, history.id), (second.id, history.id)},
+        )
+        scores = [item["score"] for item in data["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_duplicate_title_report_scopes_history_to_college(self):
+        other_student = User.objects.create_user(
+            username="duplicate_other_student",
+            password="123456",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="数学学院学生",
+            employee_id="DUP2001",
+            college="数学学院",
+        )
+        own_history = Project.objects.create(
+            project_no="DC2025D101",
+            title="校园共享单车调度优化研究",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        Project.objects.create(
+            project_no="DC2025D102",
+            title="校园共享单车调度优化研究",
+            leader=other_student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        deleted_batch = ProjectBatch.objects.create(
+            name="已删除批次", year=2024, code="DUP2024", is_deleted=True
+        )
+        Project.objects.create(
+            project_no="DC2024D101",
+            title="校园共享单车调度优化研究",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2024,
+            batch=deleted_batch,
+        )
+        current = Project.objects.create(
+            project_no="DC2026D101",
+            title="校园共享单车智能调度优化研究",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+        )
+        self.client.force_authenticate(user=self.level2_admin)
+
+        response = self.client.get("/api/v1/projects/admin/manage/duplicate-titles/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [
+                (item["project"]["id"], item["similar"]["id"])
+                for item in response.data["data"]["results"]
+            ],
+            [(current.id, own_history.id)],
+        )
+
     def test_custom_school_admin_sees_all_college_projects(self):
         Project.objects.create(
             project_no="DC20260009",
@@ -604,7 +836,9 @@ class ProjectAdminImportPermissionsTestCase(TestCase):
         )
 
         self.assertEqual(response.status_code, 200)
-        with zipfile.ZipFile(BytesIO(response.content)) as zf:
+        self.assertTrue(response.streaming)
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(BytesIO(content)) as zf:
             self.assertEqual(
                 zf.namelist(),
                 ["DC20260020_远程存储附件项目/申请书.pdf"],
@@ -669,29 +903,30 @@ class ProjectAdminImportPermissionsTestCase(TestCase):
             batch=self.batch,
         )
 
-        def fake_doc(project_id):
-            return (
-                BytesIO(f"doc-{project_id}".encode()),
-                f"../unsafe:{project_id}?.docx",
-            )
+        def fake_doc(context):
+            return f"doc-{context['project_id']}".encode()
 
         with patch(
-            "apps.projects.views.mixins.project_admin_export_documents_mixin."
-            "DocumentService.generate_project_doc",
+            "apps.projects.services.document.render_project_doc",
             side_effect=fake_doc,
-        ) as generate_doc:
+        ) as render_doc:
             response = self.client.get(
                 "/api/v1/projects/admin/manage/batch-export-doc/",
                 {"ids": f"{allowed_project.id},{blocked_project.id}"},
             )
+            content = b"".join(response.streaming_content)
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(
-            [call.args[0] for call in generate_doc.call_args_list],
+            [call.args[0]["project_id"] for call in render_doc.call_args_list],
             [allowed_project.id],
         )
-        with zipfile.ZipFile(BytesIO(response.content)) as zf:
-            self.assertEqual(zf.namelist(), [f"unsafe_{allowed_project.id}_.docx"])
+        with zipfile.ZipFile(BytesIO(content)) as zf:
+            self.assertEqual(zf.namelist(), ["本学院申报书测试项目_申报书.docx"])
+            self.assertEqual(
+                zf.read("本学院申报书测试项目_申报书.docx"),
+                f"doc-{allowed_project.id}".encode(),
+            )
 
     def test_legacy_history_import_rejects_invalid_batch_id(self):
         self.client.force_authenticate(user=self.level1_admin)
@@ -994,3 +1229,41 @@ class ProjectAdminImportPermissionsTestCase(TestCase):
         project.refresh_from_db()
         self.assertEqual(project.title, "二级管理员允许修改的标题")
         self.assertIsNone(project.approved_budget)
+
+    def test_admin_export_data_writes_native_values_and_achievement_counts(self):
+        achievement_type = self._achievement_type()
+        project = Project.objects.create(
+            project_no="DC20260099",
+            title="导出项目",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+            budget=Decimal("1200.50"),
+        )
+        for index in range(2):
+            ProjectAchievement.objects.create(
+                project=project,
+                achievement_type=achievement_type,
+                title=f"成果{index}",
+                description="D",
+                authors="A",
+            )
+        self.client.force_authenticate(user=self.level1_admin)
+
+        response = self.client.get(
+            "/api/v1/projects/admin/manage/export/", {"ids": str(project.id)}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        workbook = openpyxl.load_workbook(
+            BytesIO(b"".join(response.streaming_content)), read_only=True
+        )
+        rows = list(workbook.active.iter_rows(values_only=True))
+        header = list(rows[0])
+        row = dict(zip(header, rows[1]))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(row["项目编号"], "DC20260099")
+        self.assertEqual(row["状态"], "已提交")
+        self.assertEqual(row["项目经费(元)"], 1200.5)
+        self.assertEqual(row["成果数量"], 2)
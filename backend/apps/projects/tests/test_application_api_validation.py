@@ -1,9 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from apps.projects.models import Project, ProjectAdvisor, ProjectMember
 from apps.projects.services.application_service import _normalize_list, _validate_limits
+from apps.projects.services.title_similarity import jaccard, title_shingles
 from apps.projects.services.validation_service import ProjectValidationService
 from apps.system_settings.models import ProjectBatch, SystemSetting
 from apps.users.models import Role
@@ -163,6 +166,64 @@ class ProjectApplicationApiValidationTestCase(TestCase):
         self.assertFalse(ok)
         self.assertEqual(message, "指导教师存在未结题项目，无法继续指导新项目")
 
+    def test_limit_queries_do_not_grow_with_people(self):
+        SystemSetting.objects.create(
+            code="LIMIT_RULES",
+            name="限制规则",
+            batch=self.batch,
+            data={"max_teacher_active": 3, "max_student_member": 2},
+        )
+        student_role = Role.objects.get(code="STUDENT")
+        people = [
+            User.objects.create_user(
+                username=f"limit_person_{index}",
+                password="password123",
+                role_fk=self.teacher_role if index < 2 else student_role,
+                real_name=f"限项人员{index}",
+                employee_id=f"APP3{index:03d}",
+            )
+            for index in range(7)
+        ]
+        finished = Project.objects.create(
+            project_no="APP20250009",
+            title="已结题项目",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        for person in people:
+            ProjectMember.objects.create(project=finished, user=person)
+
+        def run(advisors, members):
+            return _validate_limits(
+                self.student,
+                advisors_data=[{"user_id": person.id} for person in advisors],
+                members_data=[{"user_id": person.id} for person in members],
+                project=None,
+                batch=self.batch,
+            )
+
+        run(people[:1], people[2:3])
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(run(people[:1], people[2:3]), (True, ""))
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(run(people[:2], people[2:]), (True, ""))
+        self.assertEqual(len(large), len(small))
+
+        active = Project.objects.create(
+            project_no="APP20260019",
+            title="成员在研项目",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        ProjectMember.objects.create(project=active, user=people[4])
+        self.assertEqual(
+            run(people[:2], people[2:]),
+            (False, "成员存在未结题项目，无法继续参与新项目"),
+        )
+
     def test_zero_teacher_active_limit_is_disabled(self):
         teacher = User.objects.create_user(
             username="application_teacher_unlimited",
@@ -313,6 +374,62 @@ class ProjectApplicationApiValidationTestCase(TestCase):
         self.assertFalse(result["is_valid"])
         self.assertIn("项目标题与已有项目重复", result["errors"][0])
 
+    def test_validation_reports_similar_historical_titles(self):
+        history = Project.objects.create(
+            project_no="APP20250001",
+            title="基于深度学习的校园垃圾分类识别系统",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        Project.objects.create(
+            project_no="APP20250002",
+            title="乡村振兴背景下的文旅融合调研",
+            leader=self.student,
+            status=Project.ProjectStatus.CLOSED,
+            year=2025,
+        )
+        project = Project.objects.create(
+            project_no="APP20260006",
+            title="基于深度学习的校园垃圾分类识别系统设计",
+            leader=self.student,
+            status=Project.ProjectStatus.SUBMITTED,
+            year=2026,
+            batch=self.batch,
+        )
+
+        result = ProjectValidationService.validate_project_application(
+            project,
+            self.student,
+            is_update=False,
+        )
+
+        self.assertTrue(result["is_valid"])
+        self.assertEqual(
+            [item["id"] for item in result["similar_projects"]], [history.id]
+        )
+        self.assertGreater(result["similar_projects"][0]["score"], 0.8)
+        self.assertEqual(result["similar_projects"][0]["project_no"], "APP20250001")
+
+    def test_title_shingles_match_database_with_full_width_punctuation(self):
+        titles = [
+            "智慧校园（一期）：共享单车调度研究",
+            "“互联网+”背景下的乡村电商，调研。",
+            "AI-Driven 校园 Robot_v2",
+        ]
+        with connection.cursor() as cursor:
+            for title in titles:
+                cursor.execute("SELECT title_shingles(%s)", [title])
+                self.assertEqual(title_shingles(title), set(cursor.fetchone()[0]))
+
+        self.assertEqual(
+            jaccard(
+                title_shingles("智慧校园（一期）：共享单车调度研究"),
+                title_shingles("智慧校园一期共享单车调度研究"),
+            ),
+            1.0,
+        )
+
     def test_member_limit_validation_uses_current_member_schema(self):
         project = Project.objects.create(
             project_no="APP20260005",
@@ -1,12 +1,32 @@
+import datetime
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils.crypto import get_random_string
+from rest_framework.test import APIClient
 
-from apps.projects.models import Project
+from apps.dictionaries.models import DictionaryItem, DictionaryType
+from apps.projects.models import (
+    BatchStatistics,
+    Project,
+    ProjectAchievement,
+    ProjectExpenditure,
+    ProjectMember,
+)
 from apps.projects.services.dashboard_service import DashboardService
+from apps.projects.services.statistics_service import BatchStatisticsService
 from apps.reviews.models import Review
 from apps.system_settings.models import ProjectBatch, WorkflowConfig, WorkflowNode
+from apps.system_settings.services import SystemSettingService
 from apps.users.models import Role
+from apps.utils.request_cache import request_cache_scope
 
 User = get_user_model()
 
@@ -220,3 +240,307 @@ class DashboardServiceTestCase(TestCase):
         dashboard = DashboardService.get_level1_admin_dashboard(school_admin)
 
         self.assertEqual(dashboard["overview"]["total_teachers"], 6)
+
+    def _add_student_projects(self):
+        other_student = User.objects.create_user(
+            username="dashboard-other-student",
+            password=get_random_string(12),
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="Dashboard Other Student",
+            employee_id="DS002",
+            college="计算机学院",
+        )
+        ProjectMember.objects.create(
+            project=self.project,
+            user=self.student,
+            role=ProjectMember.MemberRole.LEADER,
+        )
+        ProjectMember.objects.create(
+            project=self.project,
+            user=other_student,
+            role=ProjectMember.MemberRole.MEMBER,
+        )
+        draft_project = Project.objects.create(
+            project_no="DC20260002",
+            title="Member Draft Project",
+            leader=other_student,
+            status=Project.ProjectStatus.DRAFT,
+            year=2026,
+            batch=self.batch,
+        )
+        ProjectMember.objects.create(
+            project=draft_project,
+            user=self.student,
+            role=ProjectMember.MemberRole.MEMBER,
+        )
+        Project.objects.create(
+            project_no="DC20260003",
+            title="Returned Project",
+            leader=self.student,
+            status=Project.ProjectStatus.APPLICATION_RETURNED,
+            year=2026,
+            batch=self.batch,
+        )
+
+    def test_student_dashboard_counts_buckets_in_one_aggregate_query(self):
+        self._add_student_projects()
+
+        with request_cache_scope():
+            SystemSettingService.get_current_batch()
+            with self.assertNumQueries(2):
+                dashboard = DashboardService.get_student_dashboard(self.student)
+
+        self.assertEqual(
+            dashboard["project_stats"],
+            {"total": 3, "draft": 1, "in_progress": 0, "completed": 0},
+        )
+        self.assertEqual(
+            {task["type"]: task["count"] for task in dashboard["pending_tasks"]},
+            {"submit_application": 1, "revise_project": 1},
+        )
+        self.assertEqual(len(dashboard["recent_activities"]), 3)
+
+    def test_level1_dashboard_groups_status_counts(self):
+        BatchStatisticsService.refresh_batch(self.batch.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(
+                project_no="DC20260004",
+                title="Second Auditing Project",
+                leader=self.student,
+                status=Project.ProjectStatus.COLLEGE_AUDITING,
+                year=2026,
+                batch=self.batch,
+            )
+            Project.objects.create(
+                project_no="DC20260005",
+                title="Draft Project",
+                leader=self.student,
+                status=Project.ProjectStatus.DRAFT,
+                year=2026,
+                batch=self.batch,
+            )
+
+        dashboard = DashboardService.get_level1_admin_dashboard(self.expert)
+
+        self.assertEqual(dashboard["overview"]["total_projects"], 3)
+        self.assertEqual(dashboard["overview"]["recent_projects"], 3)
+        self.assertEqual(
+            {code: item["count"] for code, item in dashboard["status_stats"].items()},
+            {
+                Project.ProjectStatus.DRAFT: 1,
+                Project.ProjectStatus.COLLEGE_AUDITING: 2,
+            },
+        )
+
+    def test_dashboard_cache_is_invalidated_by_project_status_change(self):
+        cache.clear()
+        with patch(
+            "apps.utils.cache.connection",
+            in_atomic_block=False,
+        ):
+            first = DashboardService.get_student_dashboard(self.student)
+            # 当前批次与仪表板数据都来自跨请求缓存
+            with self.assertNumQueries(0):
+                cached = DashboardService.get_student_dashboard(self.student)
+
+            self.project.status = Project.ProjectStatus.IN_PROGRESS
+            self.project.save(update_fields=["status", "updated_at"])
+            refreshed = DashboardService.get_student_dashboard(self.student)
+
+        self.assertEqual(first["project_stats"]["in_progress"], 0)
+        self.assertEqual(cached, first)
+        self.assertEqual(refreshed["project_stats"]["in_progress"], 1)
+
+
+class BatchStatisticsTestCase(TestCase):
+    def setUp(self):
+        student_role = Role.objects.get(code="STUDENT")
+        self.student = User.objects.create_user(
+            username="statistics-student",
+            password=get_random_string(12),
+            role_fk=student_role,
+            real_name="Statistics Student",
+            employee_id="ST001",
+            college="计算机学院",
+        )
+        self.batch = ProjectBatch.objects.create(
+            name="2026",
+            year=2026,
+            code="B2026",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_active=True,
+            is_current=True,
+        )
+        level_type, _ = DictionaryType.objects.get_or_create(
+            code="project_level", defaults={"name": "项目级别"}
+        )
+        self.level, _ = DictionaryItem.objects.get_or_create(
+            dict_type=level_type, value="SCHOOL", defaults={"label": "校级"}
+        )
+        achievement_type, _ = DictionaryType.objects.get_or_create(
+            code="achievement_type", defaults={"name": "成果类型"}
+        )
+        self.paper, _ = DictionaryItem.objects.get_or_create(
+            dict_type=achievement_type, value="PAPER", defaults={"label": "论文"}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project = Project.objects.create(
+                project_no="DC20260101",
+                title="Statistics Project",
+                leader=self.student,
+                level=self.level,
+                status=Project.ProjectStatus.SUBMITTED,
+                year=2026,
+                batch=self.batch,
+            )
+
+    def _snapshot(self):
+        return {
+            (row.college, row.level_id, row.status): (
+                row.project_count,
+                row.budgeted_count,
+                row.approved_budget_total,
+                row.expenditure_total,
+                row.achievement_count,
+            )
+            for row in BatchStatistics.objects.filter(batch=self.batch)
+        }
+
+    def test_snapshot_follows_project_changes(self):
+        self.assertEqual(
+            self._snapshot(),
+            {
+                ("计算机学院", self.level.id, Project.ProjectStatus.SUBMITTED): (
+                    1, 0, Decimal("0"), Decimal("0"), 0
+                )
+            },
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.status = Project.ProjectStatus.IN_PROGRESS
+            self.project.approved_budget = Decimal("5000.00")
+            self.project.save()
+            ProjectExpenditure.objects.create(
+                project=self.project,
+                title="Materials",
+                amount=Decimal("300.00"),
+                expenditure_date=datetime.date.today(),
+                created_by=self.student,
+            )
+            achievement = ProjectAchievement.objects.create(
+                project=self.project,
+                achievement_type=self.paper,
+                title="Paper",
+                description="Paper",
+            )
+        in_progress = ("计算机学院", self.level.id, Project.ProjectStatus.IN_PROGRESS)
+        self.assertEqual(
+            self._snapshot(),
+            {in_progress: (1, 1, Decimal("5000.00"), Decimal("300.00"), 1)},
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            achievement.delete()
+            self.student.college = "数学学院"
+            self.student.save()
+        moved = ("数学学院", self.level.id, Project.ProjectStatus.IN_PROGRESS)
+        self.assertEqual(
+            self._snapshot(),
+            {moved: (1, 1, Decimal("5000.00"), Decimal("300.00"), 0)},
+        )
+        expected = self._snapshot()
+        BatchStatistics.objects.all().delete()
+        call_command("refresh_batch_statistics", batch_id=self.batch.id, stdout=StringIO())
+        self.assertEqual(self._snapshot(), expected)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.delete()
+        self.assertEqual(self._snapshot(), {})
+
+    def test_project_save_does_not_lock_snapshot_inside_transaction(self):
+        self.project.status = Project.ProjectStatus.IN_PROGRESS
+        with self.captureOnCommitCallbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                self.project.save()
+
+        table = BatchStatistics._meta.db_table
+        self.assertFalse(any(table in query["sql"] for query in queries))
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(
+            list(self._snapshot()),
+            [("计算机学院", self.level.id, Project.ProjectStatus.IN_PROGRESS)],
+        )
+
+    def test_refresh_command_repairs_bulk_updates(self):
+        Project.objects.filter(pk=self.project.pk).update(
+            status=Project.ProjectStatus.CLOSED
+        )
+
+        call_command("refresh_batch_statistics", stdout=StringIO())
+
+        self.assertEqual(
+            list(self._snapshot()),
+            [("计算机学院", self.level.id, Project.ProjectStatus.CLOSED)],
+        )
+
+    def test_admin_statistics_count_same_projects_with_and_without_filters(self):
+        admin = User.objects.create_user(
+            username="statistics-admin",
+            password=get_random_string(12),
+            role_fk=Role.objects.get(code="LEVEL1_ADMIN"),
+            real_name="Statistics Admin",
+            employee_id="SA001",
+        )
+        Project.objects.create(
+            project_no="DC20260103",
+            title="Deleted Statistics Project",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+            is_deleted=True,
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        url = "/api/v1/projects/admin/manage/statistics/"
+
+        unfiltered = client.get(url).data["data"]
+        filtered = client.get(url, {"search": "Statistics"}).data["data"]
+
+        self.assertEqual(unfiltered, filtered)
+        self.assertEqual(unfiltered["total_projects"], 2)
+
+    def test_level1_dashboard_reads_snapshot(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.approved_budget = Decimal("4000.00")
+            self.project.save(update_fields=["approved_budget"])
+            Project.objects.create(
+                project_no="DC20260102",
+                title="Draft Statistics Project",
+                leader=self.student,
+                status=Project.ProjectStatus.DRAFT,
+                year=2026,
+                batch=self.batch,
+            )
+        # 快照之外的修改不会反映到仪表板，证明统计来自快照
+        BatchStatistics.objects.filter(status=Project.ProjectStatus.DRAFT).update(
+            project_count=5
+        )
+
+        dashboard = DashboardService._build_level1_admin_dashboard(self.student)
+
+        self.assertEqual(dashboard["overview"]["total_projects"], 6)
+        self.assertEqual(
+            {code: item["count"] for code, item in dashboard["status_stats"].items()},
+            {Project.ProjectStatus.DRAFT: 5, Project.ProjectStatus.SUBMITTED: 1},
+        )
+        self.assertEqual(
+            dashboard["college_stats"], [{"leader__college": "计算机学院", "count": 6}]
+        )
+        self.assertEqual(
+            sorted(item["count"] for item in dashboard["level_stats"]), [1, 5]
+        )
+        self.assertEqual(dashboard["budget_stats"]["total_budget"], 4000.0)
+        self.assertEqual(dashboard["budget_stats"]["avg_budget"], 4000.0)
@@ -1,9 +1,25 @@
+import io
+import zipfile
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from docx import Document  # type: ignore[import-untyped]
 
-from apps.projects.certificates import render_certificate_html
+from apps.dictionaries.models import DictionaryItem, DictionaryType
+from apps.projects.certificates import CertificateRenderer, render_certificate_html
 from apps.projects.models import Project
-from apps.projects.services.document import DocumentService
+from apps.projects.services.document import (
+    DocumentService,
+    build_project_doc,
+    render_project_doc,
+)
+from apps.projects.services.export_service import (
+    ProjectExportService,
+    SharedExportEntry,
+)
 from apps.projects.views.mixins.project_admin_export_documents_mixin import (
     ProjectAdminExportDocumentsMixin,
 )
@@ -50,6 +66,149 @@ class DocumentServiceTestCase(TestCase):
 
         self.assertEqual(filename, "unsafe_项目__申报书.docx")
 
+    def test_template_rendering_matches_builder_layout(self):
+        context = {
+            "project_id": 1,
+            "title": "模板<测试>&项目",
+            "project_no": "TPL0001",
+            "leader_name": "模板负责人",
+            "leader_employee_id": "TPL10001",
+            "leader_college": "",
+            "level_label": "校级",
+            "description": "第一行\n第二行\x0b",
+            "expected_results": "预期成果",
+            "budget": "1000.00",
+        }
+
+        def texts(content):
+            document = Document(io.BytesIO(content))
+            return [paragraph.text for paragraph in document.paragraphs] + [
+                cell.text for row in document.tables[0].rows for cell in row.cells
+            ]
+
+        expected = dict(context, description="第一行\n第二行")
+        self.assertEqual(
+            texts(render_project_doc(context)), texts(build_project_doc(expected))
+        )
+
+    def test_configured_template_fills_placeholders_split_across_runs(self):
+        project = Project.objects.create(
+            project_no="TPL20260001",
+            title="自定义模板项目",
+            leader=self.student,
+            status=Project.ProjectStatus.IN_PROGRESS,
+            year=2026,
+            batch=self.batch,
+        )
+        template = Document()
+        paragraph = template.add_paragraph()
+        paragraph.add_run("中期：{{ti")
+        paragraph.add_run("tle}}")
+        template.add_paragraph("编号：{{project_no}}，{{unknown}}")
+
+        with TemporaryDirectory() as template_dir:
+            template.save(f"{template_dir}/project_midterm.docx")
+            with override_settings(DOCUMENT_TEMPLATE_DIR=template_dir):
+                buffer, filename = DocumentService.generate_midterm_doc(project.id)
+
+        rendered = Document(buffer)
+        self.assertEqual(filename, "自定义模板项目_中期检查报告.docx")
+        self.assertEqual(
+            [paragraph.text for paragraph in rendered.paragraphs],
+            ["中期：自定义模板项目", "编号：TPL20260001，{{unknown}}"],
+        )
+
+    def test_iter_project_docs_renders_in_pool_and_keeps_order(self):
+        projects = [
+            Project.objects.create(
+                project_no=f"DOCPOOL{index:04d}",
+                title=f"并行申报书{index}",
+                leader=self.student,
+                status=Project.ProjectStatus.IN_PROGRESS,
+                year=2026,
+                batch=self.batch,
+            )
+            for index in range(5)
+        ]
+        project_ids = [project.id for project in reversed(projects)]
+        project_ids.insert(2, 999999)
+
+        with self.assertNumQueries(1):
+            entries = list(DocumentService.iter_project_docs(project_ids, workers=2))
+
+        self.assertIsNone(entries[2])
+        self.assertEqual(
+            [entry[0] for entry in entries if entry],
+            [f"并行申报书{index}_申报书.docx" for index in (4, 3, 2, 1, 0)],
+        )
+        rendered = Document(io.BytesIO(entries[0][1]))
+        self.assertEqual(rendered.tables[0].rows[0].cells[1].text, "并行申报书4")
+
+    def test_iter_project_docs_renders_serially_without_fork(self):
+        projects = [
+            Project.objects.create(
+                project_no=f"DOCSPAWN{index:04d}",
+                title=f"串行申报书{index}",
+                leader=self.student,
+                status=Project.ProjectStatus.IN_PROGRESS,
+                year=2026,
+                batch=self.batch,
+            )
+            for index in range(4)
+        ]
+
+        with (
+            patch(
+                "apps.projects.services.document.multiprocessing.get_all_start_methods",
+                return_value=["spawn"],
+            ),
+            patch("apps.projects.services.document.ProcessPoolExecutor") as executor,
+        ):
+            entries = list(
+                DocumentService.iter_project_docs(
+                    [project.id for project in projects], workers=4
+                )
+            )
+
+        executor.assert_not_called()
+        self.assertEqual(
+            [entry[0] for entry in entries],
+            [f"串行申报书{index}_申报书.docx" for index in range(4)],
+        )
+
+    def test_iter_project_docs_captures_per_item_errors(self):
+        projects = [
+            Project.objects.create(
+                project_no=f"DOCERR{index:04d}",
+                title=f"失败申报书{index}",
+                leader=self.student,
+                status=Project.ProjectStatus.IN_PROGRESS,
+                year=2026,
+                batch=self.batch,
+            )
+            for index in range(2)
+        ]
+
+        def flaky_render(context):
+            if context["project_id"] == projects[0].id:
+                raise RuntimeError("broken template")
+            return b"docx"
+
+        with (
+            patch(
+                "apps.projects.services.document.render_project_doc",
+                side_effect=flaky_render,
+            ),
+            self.assertLogs("apps.projects.services.document", level="WARNING"),
+        ):
+            entries = list(
+                DocumentService.iter_project_docs(
+                    [project.id for project in projects], workers=1
+                )
+            )
+
+        self.assertEqual(entries, [None, ("失败申报书1_申报书.docx", b"docx")])
+
     def test_certificate_html_escapes_project_and_issuer_text(self):
         self.student.real_name = '<img src=x onerror="alert(1)">'
         self.student.save(update_fields=["real_name"])
@@ -76,6 +235,85 @@ class DocumentServiceTestCase(TestCase):
         self.assertIn("&lt;script&gt;", html)
         self.assertIn("&lt;img src=x", html)
 
+    def test_certificate_renderer_matches_settings_once_and_shares_assets(self):
+        dict_type = DictionaryType.objects.create(
+            code="certificate_test_level", name="证书测试级别"
+        )
+        level = DictionaryItem.objects.create(
+            dict_type=dict_type, value="SCHOOL", label="校级"
+        )
+        other_level = DictionaryItem.objects.create(
+            dict_type=dict_type, value="PROVINCE", label="省级"
+        )
+        projects = [
+            Project.objects.create(
+                project_no=f"CERT2026{index:04d}",
+                title=f"证书项目{index}",
+                leader=self.student,
+                level=level if index % 2 else other_level,
+                status=Project.ProjectStatus.CLOSED,
+                year=2026,
+                batch=self.batch,
+            )
+            for index in range(4)
+        ]
+
+        with (
+            TemporaryDirectory() as media_root,
+            override_settings(MEDIA_ROOT=media_root),
+        ):
+            level_setting = CertificateSetting(
+                name="校级模板",
+                school_name="测试学校",
+                issuer_name="校级发证单位",
+                project_level=level,
+                is_active=True,
+            )
+            level_setting.background_image.save(
+                "background.png", ContentFile(b"background-bytes"), save=False
+            )
+            level_setting.save()
+            CertificateSetting.objects.create(
+                name="通用模板",
+                school_name="测试学校",
+                issuer_name="通用发证单位",
+                is_active=True,
+            )
+
+            renderer = CertificateRenderer(shared_assets=True)
+            with self.assertNumQueries(1):
+                pages = [renderer.render(project) for project in projects]
+            shared = renderer.shared_entries()
+
+            inline_html = render_certificate_html(projects[1])
+
+            entries = list(
+                ProjectExportService.iter_export_entries(
+                    "certificates", [project.id for project in projects]
+                )
+            )
+
+        self.assertEqual(len(shared), 1)
+        arcname, content = shared[0]
+        self.assertTrue(arcname.startswith("assets/"))
+        self.assertEqual(content, b"background-bytes")
+        self.assertIn("校级发证单位", pages[1])
+        self.assertIn(arcname, pages[1])
+        self.assertIn("通用发证单位", pages[0])
+        self.assertNotIn("base64", "".join(pages))
+        self.assertIn("data:image/png;base64,", inline_html)
+
+        self.assertEqual(
+            sum(isinstance(entry, SharedExportEntry) for entry in entries), 1
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            for entry in entries:
+                zf.writestr(*entry)
+        with zipfile.ZipFile(buffer) as zf:
+            self.assertEqual(len(zf.namelist()), 5)
+            self.assertIn(arcname, zf.namelist())
+
     def test_establishment_notice_html_escapes_project_text(self):
         self.student.real_name = '<img src=x onerror="alert(1)">'
         self.student.save(update_fields=["real_name"])
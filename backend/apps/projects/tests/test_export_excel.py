@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+import openpyxl  # type: ignore[import-untyped]
+from django.http import FileResponse
+from django.test import SimpleTestCase
+
+from apps.projects.models import Project
+from apps.utils.export import excel_download_response, generate_excel
+
+
+def _load_rows(content):
+    workbook = openpyxl.load_workbook(BytesIO(content), read_only=True)
+    return [list(row) for row in workbook.active.iter_rows(values_only=True)]
+
+
+class ExportExcelTestCase(SimpleTestCase):
+    def test_generate_excel_keeps_native_cell_types(self):
+        output = generate_excel(
+            [
+                {
+                    "start_date": date(2025, 3, 1),
+                    "budget": Decimal("1500.50"),
+                    "count": 3,
+                    "note": None,
+                }
+            ],
+            {
+                "start_date": "开始日期",
+                "budget": "经费",
+                "count": "成果数",
+                "note": "备注",
+            },
+        )
+
+        header, row = _load_rows(output.getvalue())
+
+        self.assertEqual(header, ["开始日期", "经费", "成果数", "备注"])
+        self.assertEqual(row[0].date(), date(2025, 3, 1))
+        self.assertEqual(row[1], 1500.5)
+        self.assertEqual(row[2], 3)
+        self.assertIn(row[3], ("", None))
+
+    def test_generate_excel_resolves_model_choice_display(self):
+        projects = [
+            Project(project_no="P001", status=Project.ProjectStatus.SUBMITTED),
+            Project(project_no="P002", status=Project.ProjectStatus.DRAFT),
+        ]
+
+        output = generate_excel(projects, {"project_no": "编号", "status": "状态"})
+
+        self.assertEqual(
+            _load_rows(output.getvalue())[1:],
+            [["P001", "已提交"], ["P002", "草稿"]],
+        )
+
+    def test_excel_download_response_streams_generator_rows(self):
+        rows = ({"name": f"项目{index}"} for index in range(3))
+
+        response = excel_download_response(
+            rows,
+            {"name": "名称"},
+            "projects.xlsx",
+            sheet_title="项目列表",
+            column_widths=[30],
+        )
+
+        self.assertIsInstance(response, FileResponse)
+        self.assertIn("projects.xlsx", response["Content-Disposition"])
+        content = b"".join(response.streaming_content)
+        workbook = openpyxl.load_workbook(BytesIO(content))
+        sheet = workbook.active
+        self.assertEqual(sheet.title, "项目列表")
+        self.assertEqual(sheet.column_dimensions["A"].width, 30)
+        self.assertEqual(sheet.max_row, 4)
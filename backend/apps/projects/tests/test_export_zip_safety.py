@@ -1,9 +1,17 @@
 from io import BytesIO
 import zipfile
 
+from django.http import FileResponse, StreamingHttpResponse
 from django.test import SimpleTestCase
 
-from apps.utils.export import generate_zip, safe_zip_arcname, safe_zip_path
+from apps.utils.export import (
+    generate_zip,
+    iter_zip_stream,
+    safe_zip_arcname,
+    safe_zip_path,
+    zip_download_response,
+    zip_entries_download_response,
+)
 
 
 class StorageBackedFile:
@@ -42,3 +50,70 @@ class ExportZipSafetyTestCase(SimpleTestCase):
 
         with zipfile.ZipFile(output) as archive:
             self.assertEqual(archive.namelist(), [])
+
+    def test_iter_zip_stream_copies_large_files_in_chunks(self):
+        payload = bytes(range(256)) * 4096
+
+        chunks = list(
+            iter_zip_stream(
+                [(ChunkedFile(payload), "big.bin")],
+                chunk_size=16 * 1024,
+            )
+        )
+
+        self.assertGreater(len(chunks), 1)
+        with zipfile.ZipFile(BytesIO(b"".join(chunks))) as archive:
+            self.assertEqual(archive.namelist(), ["big.bin"])
+            self.assertEqual(archive.read("big.bin"), payload)
+
+    def test_zip_download_response_streams_by_default(self):
+        response = zip_download_response(
+            [(StorageBackedFile(), "proposal.pdf")], "college/../attachments.zip"
+        )
+
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="attachments.zip"'
+        )
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as archive:
+            self.assertEqual(archive.read("proposal.pdf"), b"remote-content")
+
+    def test_zip_download_response_can_spool_to_disk(self):
+        response = zip_download_response(
+            [(StorageBackedFile(), "proposal.pdf")],
+            "attachments.zip",
+            spool_to_disk=True,
+        )
+
+        self.assertIsInstance(response, FileResponse)
+        content = b"".join(response.streaming_content)
+        self.assertEqual(int(response["Content-Length"]), len(content))
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            self.assertEqual(archive.namelist(), ["proposal.pdf"])
+
+    def test_zip_entries_download_response_skips_failed_entries(self):
+        entries = [("a.docx", b"first"), None, ("b.docx", b"second")]
+
+        for spool_to_disk, response_class in (
+            (False, StreamingHttpResponse),
+            (True, FileResponse),
+        ):
+            response = zip_entries_download_response(
+                iter(entries), "documents.zip", spool_to_disk=spool_to_disk
+            )
+
+            self.assertIsInstance(response, response_class)
+            content = b"".join(response.streaming_content)
+            with zipfile.ZipFile(BytesIO(content)) as archive:
+                self.assertEqual(archive.namelist(), ["a.docx", "b.docx"])
+                self.assertEqual(archive.read("b.docx"), b"second")
+
+
+class ChunkedFile:
+    name = "remote/big.bin"
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def open(self, mode="rb"):
+        return BytesIO(self.payload)
@@ -0,0 +1,196 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.dictionaries.models import DictionaryItem, DictionaryType
+from apps.projects.models import (
+    Project,
+    ProjectAchievement,
+    ProjectAdvisor,
+    ProjectMember,
+)
+from apps.system_settings.models import ProjectBatch
+from apps.users.models import Role
+
+
+User = get_user_model()
+
+
+class ProjectListQueryCountTestCase(TestCase):
+    """
+    列表接口的查询数固定，不随每页项目数增长
+    """
+
+    def setUp(self):
+        cache.clear()
+        level1_role, _ = Role.objects.get_or_create(
+            code="LEVEL1_ADMIN",
+            defaults={"name": "校级管理员", "scope_dimension": "SCHOOL"},
+        )
+        level1_role.scope_dimension = "SCHOOL"
+        level1_role.is_active = True
+        level1_role.save(update_fields=["scope_dimension", "is_active"])
+        self.admin = User.objects.create_user(
+            username="list_query_admin",
+            password="password123",
+            role_fk=level1_role,
+            real_name="校级管理员",
+            employee_id="LQ0001",
+        )
+        self.student = User.objects.create_user(
+            username="list_query_student",
+            password="password123",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="项目负责人",
+            employee_id="LQ1001",
+            college="CS",
+        )
+        self.batch = ProjectBatch.objects.create(
+            name="2026",
+            year=2026,
+            code="LQ2026",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_active=True,
+            is_current=True,
+        )
+        college_type, _ = DictionaryType.objects.get_or_create(
+            code="college", defaults={"name": "学院"}
+        )
+        DictionaryItem.objects.get_or_create(
+            dict_type=college_type, value="CS", defaults={"label": "计算机学院"}
+        )
+        achievement_type, _ = DictionaryType.objects.get_or_create(
+            code="achievement_type", defaults={"name": "成果类型"}
+        )
+        self.achievement_type, _ = DictionaryItem.objects.get_or_create(
+            dict_type=achievement_type, value="PAPER", defaults={"label": "论文"}
+        )
+        self.client = APIClient()
+        self.created = 0
+
+    def _create_projects(self, count, status):
+        student_role = Role.objects.get(code="STUDENT")
+        teacher_role = Role.objects.get(code="TEACHER")
+        for _ in range(count):
+            self.created += 1
+            index = self.created
+            project = Project.objects.create(
+                project_no=f"LQ2026{index:04d}",
+                title=f"查询数测试项目{index}",
+                leader=self.student,
+                status=status,
+                year=2026,
+                batch=self.batch,
+                proposal_file=f"projects/proposal-{index}.pdf",
+                final_report=f"projects/final-{index}.pdf",
+            )
+            member = User.objects.create_user(
+                username=f"list_query_member_{index}",
+                password="password123",
+                role_fk=student_role,
+                real_name=f"成员{index}",
+                employee_id=f"LQM{index:04d}",
+            )
+            advisor = User.objects.create_user(
+                username=f"list_query_advisor_{index}",
+                password="password123",
+                role_fk=teacher_role,
+                real_name=f"教师{index}",
+                employee_id=f"LQT{index:04d}",
+            )
+            ProjectMember.objects.create(
+                project=project,
+                user=self.student,
+                role=ProjectMember.MemberRole.LEADER,
+            )
+            ProjectMember.objects.create(
+                project=project, user=member, role=ProjectMember.MemberRole.MEMBER
+            )
+            ProjectAdvisor.objects.create(project=project, user=advisor)
+            for number in range(2):
+                ProjectAchievement.objects.create(
+                    project=project,
+                    achievement_type=self.achievement_type,
+                    title=f"成果{index}-{number}",
+                )
+
+    def _count_queries(self, user, url):
+        self.client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"page_size": 50})
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        rows = data["results"] if isinstance(data, dict) else data
+        return len(queries), rows
+
+    def _assert_fixed_queries(self, user, url, status, expected):
+        self._create_projects(2, status)
+        small, rows = self._count_queries(user, url)
+        self.assertEqual(len(rows), 2)
+        self._create_projects(8, status)
+        large, rows = self._count_queries(user, url)
+        self.assertEqual(len(rows), 10)
+        self.assertEqual((small, large), (expected, expected))
+        return rows
+
+    def test_admin_project_list(self):
+        rows = self._assert_fixed_queries(
+            self.admin,
+            "/api/v1/projects/admin/manage/",
+            Project.ProjectStatus.IN_PROGRESS,
+            expected=6,
+        )
+        row = rows[0]
+        self.assertEqual(row["college"], "计算机学院")
+        self.assertEqual(row["achievements_count"], 2)
+        self.assertEqual(len(row["members_info"]), 2)
+        self.assertEqual(len(row["advisors_info"]), 1)
+        self.assertTrue(
+            row["proposal_file_url"].endswith(
+                f"/api/v1/projects/{row['id']}/files/proposal_file/download/"
+            )
+        )
+        self.assertEqual(row["attachment_file_url"], "")
+
+    def test_publication_center(self):
+        self._assert_fixed_queries(
+            self.admin,
+            "/api/v1/projects/admin/manage/publication-center/",
+            Project.ProjectStatus.LEVEL1_AUDITING,
+            expected=6,
+        )
+
+    def test_public_project_list(self):
+        self._assert_fixed_queries(
+            self.admin,
+            "/api/v1/projects/",
+            Project.ProjectStatus.IN_PROGRESS,
+            expected=4,
+        )
+
+    def test_my_projects(self):
+        self._assert_fixed_queries(
+            self.student,
+            "/api/v1/projects/my-projects/",
+            Project.ProjectStatus.IN_PROGRESS,
+            expected=6,
+        )
+
+    def test_closure_pending(self):
+        self._assert_fixed_queries(
+            self.student,
+            "/api/v1/projects/closure/pending/",
+            Project.ProjectStatus.READY_FOR_CLOSURE,
+            expected=6,
+        )
+
+    def test_closure_applied(self):
+        self._assert_fixed_queries(
+            self.admin,
+            "/api/v1/projects/closure/applied/",
+            Project.ProjectStatus.CLOSURE_SUBMITTED,
+            expected=6,
+        )
@@ -0,0 +1,135 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.projects.models import Project, ProjectNumberSequence
+from apps.projects.services import ProjectNumberService, ProjectService
+from apps.users.models import Role
+
+
+User = get_user_model()
+
+
+class ProjectNumberServiceTestCase(TestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            username="number_student",
+            password="123456",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="编号测试学生",
+            employee_id="NUM1001",
+            college="CS",
+        )
+
+    def _project(self, project_no="", year=2026):
+        return Project.objects.create(
+            project_no=project_no,
+            title=f"编号测试项目{Project.objects.count()}",
+            leader=self.student,
+            year=year,
+        )
+
+    def test_counter_starts_after_existing_numbers(self):
+        self._project("2026CS0007")
+        self._project("2026CSE0042")
+
+        self.assertEqual(
+            ProjectNumberService.allocate(2026, " cs ", 3),
+            ["2026CS0008", "2026CS0009", "2026CS0010"],
+        )
+        self.assertEqual(ProjectService.generate_project_no(2026, "CS"), "2026CS0011")
+        self.assertEqual(ProjectService.generate_project_no(2026, ""), "2026XX0001")
+
+    def test_block_reservation_is_one_statement(self):
+        ProjectNumberService.reserve("2026CS")
+
+        with CaptureQueriesContext(connection) as queries:
+            numbers = ProjectNumberService.reserve("2026CS", 50)
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(numbers[0], "2026CS0002")
+        self.assertEqual(numbers[-1], "2026CS0051")
+
+    def test_assign_groups_projects_by_prefix(self):
+        other = User.objects.create_user(
+            username="number_student_ee",
+            password="123456",
+            role_fk=Role.objects.get(code="STUDENT"),
+            real_name="编号测试学生2",
+            employee_id="NUM1002",
+            college="EE",
+        )
+        numbered = self._project("2026CS0003")
+        projects = [
+            Project(leader=self.student, year=2026),
+            numbered,
+            Project(leader=self.student, year=2026),
+            Project(leader=other, year=2026),
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            assigned = ProjectNumberService.assign(projects)
+
+        self.assertEqual(len(assigned), 3)
+        self.assertEqual(
+            [project.project_no for project in projects],
+            ["2026CS0004", "2026CS0003", "2026CS0005", "2026EE0001"],
+        )
+        # 两个前缀首次分配：每个前缀一次递增 + 一次初始化
+        self.assertEqual(len(queries), 4)
+
+    def test_observe_advances_existing_counters(self):
+        ProjectNumberService.reserve("2025CS", 2)
+        ProjectNumberService.reserve("2025EE", 5)
+
+        ProjectNumberService.observe(
+            ["2025CS0010", "2025CS0004", "2025EE0003", "2025CSX0099", ""]
+        )
+
+        counters = dict(
+            ProjectNumberSequence.objects.values_list("prefix", "last_value")
+        )
+        self.assertEqual(counters, {"2025CS": 10, "2025EE": 5})
+        self.assertEqual(ProjectNumberService.reserve("2025CS"), ["2025CS0011"])
+
+
+class ProjectNumberConcurrencyTestCase(TransactionTestCase):
+    def test_parallel_allocators_never_share_numbers(self):
+        workers = 6
+        rounds = 5
+        block = 3
+        barrier = threading.Barrier(workers)
+        lock = threading.Lock()
+        allocated = []
+        failures = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(rounds):
+                    with transaction.atomic():
+                        numbers = ProjectNumberService.allocate(2026, "CS", block)
+                    with lock:
+                        allocated.extend(numbers)
+            except Exception as exc:  # 在主线程断言
+                failures.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        total = workers * rounds * block
+        self.assertEqual(
+            sorted(allocated), [f"2026CS{value:04d}" for value in range(1, total + 1)]
+        )
+        self.assertEqual(
+            ProjectNumberSequence.objects.get(prefix="2026CS").last_value, total
+        )
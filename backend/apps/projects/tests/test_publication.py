@@ -1,12 +1,17 @@
 from decimal import Decimal
+from unittest import mock
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
 from apps.dictionaries.models import DictionaryItem, DictionaryType
 from apps.notifications.models import Notification, PlatformNotice
-from apps.operations.models import OperationLog
-from apps.projects.models import Project
+from apps.operations.models import AsyncTaskRecord, OperationLog
+from apps.projects.models import BatchStatistics, Project
 from apps.projects.services import PublicationService
 from apps.system_settings.models import ProjectBatch
 from apps.users.models import Role
@@ -141,9 +146,10 @@ class PublicationServiceTestCase(TestCase):
         self.assertEqual(self.project.final_level, self.school_level)
         self.assertEqual(self.project.approved_budget, Decimal("2800.00"))
 
-        published = PublicationService.publish_projects(
-            self.level1_admin, [self.project.id]
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            published = PublicationService.publish_projects(
+                self.level1_admin, [self.project.id]
+            )
 
         self.assertEqual(published, 1)
         self.project.refresh_from_db()
@@ -175,6 +181,97 @@ class PublicationServiceTestCase(TestCase):
             ).exists()
         )
 
+    def _confirmed_projects(self, count, start=0):
+        return [
+            Project.objects.create(
+                project_no=f"2026PUB{start + index:04d}",
+                title=f"批量发布测试项目{start + index}",
+                leader=self.student,
+                status=Project.ProjectStatus.LEVEL1_AUDITING,
+                publish_status=Project.PublishStatus.CONFIRMED,
+                final_level=self.school_level,
+                final_budget=Decimal("2000.00"),
+                year=2026,
+                batch=self.batch,
+            ).id
+            for index in range(count)
+        ]
+
+    def _count_publish_queries(self, project_ids):
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                published = PublicationService.publish_projects(
+                    self.level1_admin, project_ids
+                )
+        self.assertEqual(published, len(project_ids))
+        return len(queries)
+
+    def test_publish_projects_in_fixed_queries(self):
+        warm_up = self._confirmed_projects(1)
+        small = self._confirmed_projects(2, start=1)
+        large = self._confirmed_projects(8, start=3)
+        # 保留一个未发布项目，避免统计分组被清空导致查询数不同
+        self._confirmed_projects(1, start=11)
+        self._count_publish_queries(warm_up)
+
+        self.assertEqual(
+            self._count_publish_queries(small), self._count_publish_queries(large)
+        )
+        published = Project.objects.filter(
+            id__in=small + large, publish_status=Project.PublishStatus.PUBLISHED
+        )
+        self.assertEqual(published.count(), 10)
+        self.assertEqual(
+            Notification.objects.filter(title="立项结果已发布").count(), 11
+        )
+        self.assertEqual(
+            BatchStatistics.objects.filter(
+                batch=self.batch, status=Project.ProjectStatus.IN_PROGRESS
+            ).aggregate(total=Sum("project_count"))["total"],
+            11,
+        )
+
+    def test_publish_projects_reports_progress_per_chunk(self):
+        project_ids = self._confirmed_projects(5)
+        progress = []
+
+        with mock.patch(
+            "apps.projects.services.publication_service.PUBLICATION_CHUNK_SIZE", 2
+        ):
+            published = PublicationService.publish_projects(
+                self.level1_admin,
+                project_ids,
+                lambda done, total: progress.append((done, total)),
+            )
+
+        self.assertEqual(published, 5)
+        self.assertEqual(progress, [(2, 5), (4, 5), (5, 5)])
+
+    @override_settings(PUBLICATION_ASYNC_THRESHOLD=2)
+    def test_publish_over_threshold_runs_as_task(self):
+        project_ids = self._confirmed_projects(3)
+        client = APIClient()
+        client.force_authenticate(user=self.level1_admin)
+
+        response = client.post(
+            "/api/v1/projects/admin/manage/publication/publish/",
+            {"project_ids": project_ids},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        task = AsyncTaskRecord.objects.get(id=response.data["data"]["task"]["id"])
+        self.assertEqual(task.task_type, AsyncTaskRecord.TaskType.PUBLICATION)
+        self.assertEqual(task.status, AsyncTaskRecord.TaskStatus.SUCCESS)
+        self.assertEqual(task.progress, 100)
+        self.assertEqual(task.result, {"published": 3})
+        self.assertEqual(
+            Project.objects.filter(
+                id__in=project_ids, publish_status=Project.PublishStatus.PUBLISHED
+            ).count(),
+            3,
+        )
+
     def test_level2_admin_cannot_confirm_publication_result(self):
         with self.assertRaises(PermissionError):
             PublicationService.confirm_projects(
@@ -243,8 +340,13 @@ class PublicationServiceTestCase(TestCase):
         self.project.publish_status = Project.PublishStatus.CONFIRMED
         self.project.save(update_fields=["publish_status"])
 
-        first = PublicationService.publish_projects(self.level1_admin, [self.project.id])
-        second = PublicationService.publish_projects(self.level1_admin, [self.project.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            first = PublicationService.publish_projects(
+                self.level1_admin, [self.project.id]
+            )
+            second = PublicationService.publish_projects(
+                self.level1_admin, [self.project.id]
+            )
 
         self.assertEqual(first, 1)
         self.assertEqual(second, 1)
@@ -229,3 +229,103 @@ class ProjectWorkflowFinalizeApiTestCase(TestCase):
         self.assertEqual(response.data["message"], "退回目标不属于当前节点可退回范围")
         review.refresh_from_db()
         self.assertEqual(review.status, Review.ReviewStatus.PENDING)
+
+    def test_expert_summaries_aggregate_page_in_fixed_queries(self):
+        workflow = WorkflowConfig.objects.create(
+            name="Expert Workflow",
+            phase=ProjectPhaseInstance.Phase.MID_TERM,
+            batch=self.batch,
+            version=1,
+            is_active=True,
+        )
+        expert_node = WorkflowNode.objects.create(
+            workflow=workflow,
+            code="MID_TERM_EXPERT",
+            name="专家评审",
+            node_type=WorkflowNode.NodeType.REVIEW,
+            role_fk=self.admin_role,
+            require_expert_review=True,
+            sort_order=1,
+        )
+        teacher_node = WorkflowNode.objects.create(
+            workflow=workflow,
+            code="MID_TERM_TEACHER",
+            name="导师审核",
+            node_type=WorkflowNode.NodeType.REVIEW,
+            role_fk=self.teacher_role,
+            sort_order=2,
+        )
+        projects = [self.project]
+        for index in range(2, 6):
+            projects.append(
+                Project.objects.create(
+                    project_no=f"FZ2026000{index}",
+                    title=f"Expert Project {index}",
+                    leader=self.student,
+                    status=Project.ProjectStatus.MID_TERM_REVIEWING,
+                    year=2026,
+                    batch=self.batch,
+                )
+            )
+        for project in projects:
+            phase_instance = ProjectPhaseInstance.objects.create(
+                project=project,
+                phase=ProjectPhaseInstance.Phase.MID_TERM,
+                attempt_no=1,
+                step=expert_node.code,
+                current_node_id=(
+                    teacher_node.id if project == projects[-1] else expert_node.id
+                ),
+                state=ProjectPhaseInstance.State.IN_PROGRESS,
+            )
+            if project != self.project:
+                continue
+            for review_status, score in (
+                (Review.ReviewStatus.APPROVED, 80),
+                (Review.ReviewStatus.REJECTED, 60),
+                (Review.ReviewStatus.PENDING, None),
+            ):
+                Review.objects.create(
+                    project=project,
+                    phase_instance=phase_instance,
+                    workflow_node=expert_node,
+                    review_type=Review.ReviewType.MID_TERM,
+                    status=review_status,
+                    score=score,
+                    is_expert_review=True,
+                )
+        ids = ",".join(str(project.id) for project in projects)
+
+        # 批次、项目、阶段实例、每个节点及其负责管理员各一次，外加一次分组聚合
+        with self.assertNumQueries(8):
+            response = self.client.get(
+                "/api/v1/projects/expert-summaries/",
+                {"review_type": "MID_TERM", "project_ids": ids},
+            )
+        single = self.client.get(
+            f"/api/v1/projects/{self.project.id}/expert-summary/",
+            {"review_type": "MID_TERM"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data["data"]
+        # 当前节点为导师审核的项目不由该管理员负责，不返回
+        self.assertEqual(set(data), {project.id for project in projects[:-1]})
+        summary = data[self.project.id]
+        self.assertEqual(summary, single.data["data"])
+        self.assertEqual(
+            (summary["assigned"], summary["submitted"], summary["pending"]), (3, 2, 1)
+        )
+        self.assertEqual((summary["approved"], summary["rejected"]), (1, 1))
+        self.assertEqual(summary["avg_score"], 70)
+        self.assertTrue(summary["require_expert_review"])
+        self.assertEqual(data[projects[1].id]["assigned"], 0)
+        self.assertFalse(data[projects[1].id]["all_submitted"])
+
+    def test_expert_summaries_rejects_invalid_project_ids(self):
+        response = self.client.get(
+            "/api/v1/projects/expert-summaries/", {"project_ids": "1,bad"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["message"], "project_ids格式错误")
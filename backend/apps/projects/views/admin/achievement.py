@@ -2,7 +2,7 @@
 项目成果管理相关视图（管理员）
 """
 
-from rest_framework import viewsets, status
+from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -12,7 +12,6 @@ from ...models import Project, ProjectAchievement
 from apps.system_settings.services import SystemSettingService
 from ...serializers import ProjectAchievementSerializer
 from apps.users.permissions import IsAdmin
-from apps.utils.downloads import attachment_content_disposition
 from apps.utils.pagination import optional_positive_int
 
 
@@ -154,15 +153,9 @@ class AchievementManagementViewSet(viewsets.ModelViewSet):
 
     @action(methods=["get"], detail=False, url_path="export")
     def export_data(self, request):
-        try:
-            from apps.utils.export import generate_excel
-            from django.http import HttpResponse
-            from datetime import datetime
-        except ImportError:
-            return Response(
-                {"code": 500, "message": "Export module not found"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        from datetime import datetime
+
+        from apps.utils.export import excel_download_response, iter_export_queryset
 
         queryset = self.filter_queryset(self.get_queryset())
 
@@ -177,37 +170,26 @@ class AchievementManagementViewSet(viewsets.ModelViewSet):
             "date": "发表/获奖日期",
         }
 
-        data = []
-        for ach in queryset:
-            date_str = ""
-            if ach.publication_date:
-                date_str = str(ach.publication_date)
-            elif ach.award_date:
-                date_str = str(ach.award_date)
-
-            data.append(
-                {
-                    "project_no": ach.project.project_no,
-                    "project_title": ach.project.title,
-                    "leader": ach.project.leader.real_name
-                    if ach.project.leader
-                    else "",
-                    "college": ach.project.leader.college if ach.project.leader else "",
-                    "type": ach.achievement_type.label
-                    if ach.achievement_type
-                    else "",
-                    "title": ach.title,
-                    "description": ach.description,
-                    "date": date_str,
-                }
-            )
-
-        excel_file = generate_excel(data, headers)
+        def build_row(ach):
+            project = ach.project
+            leader = project.leader
+            return {
+                "project_no": project.project_no,
+                "project_title": project.title,
+                "leader": leader.real_name if leader else "",
+                "college": leader.college if leader else "",
+                "type": ach.achievement_type.label if ach.achievement_type else "",
+                "title": ach.title,
+                "description": ach.description,
+                "date": ach.publication_date or ach.award_date,
+            }
+
+        queryset = queryset.select_related(
+            "project", "project__leader", "achievement_type"
+        )
         filename = f"achievements_export_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-
-        response = HttpResponse(
-            excel_file.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        return excel_download_response(
+            (build_row(ach) for ach in iter_export_queryset(queryset)),
+            headers,
+            filename,
         )
-        response["Content-Disposition"] = attachment_content_disposition(filename)
-        return response
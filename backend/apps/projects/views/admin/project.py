@@ -3,10 +3,13 @@
 """
 
 import csv
+import hashlib
 import io
 import json
 from datetime import timedelta
+from urllib.parse import urlencode
 
+from django.conf import settings
 from django.db.models import Q, Count, Sum, Avg
 from django.http import HttpResponse
 from django.utils import timezone
@@ -16,12 +19,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from ...models import Project
+from apps.system_settings.models import ProjectBatch
 from apps.system_settings.services import SystemSettingService
 from apps.operations.models import AsyncTaskRecord
+from apps.operations.serializers import AsyncTaskRecordSerializer
 from apps.operations.services import DataCenterService, OperationLogService
 from apps.reviews.models import Review
 from apps.users.permissions import IsAdmin
 from apps.utils.pagination import (
+    list_page,
     optional_positive_int,
     positive_int_list,
     positive_int_query,
@@ -29,7 +35,10 @@ from apps.utils.pagination import (
 from apps.utils.downloads import file_field_download_response
 from ...serializers import ProjectSerializer
 from ...models import ProjectPhaseInstance
-from ...services import PublicationService
+from ...services import ProjectService, PublicationService
+from ...services.dashboard_service import DashboardService, count_buckets
+from ...services.statistics_service import BatchStatisticsService
+from ...services.title_similarity import TitleSimilarityService, parse_threshold
 from ..mixins.project_batch_mixin import ProjectBatchMixin
 from ..mixins.project_admin_export_data_mixin import ProjectAdminExportDataMixin
 from ..mixins.project_admin_export_attachments_mixin import (
@@ -50,6 +59,24 @@ PROJECT_ADMIN_DOWNLOAD_FIELDS = {
     "achievement_file",
 }
 
+STATISTICS_APPROVED_STATUSES = [
+    Project.ProjectStatus.IN_PROGRESS,
+    Project.ProjectStatus.COMPLETED,
+]
+STATISTICS_PENDING_STATUSES = [
+    Project.ProjectStatus.SUBMITTED,
+    Project.ProjectStatus.TEACHER_AUDITING,
+    Project.ProjectStatus.COLLEGE_AUDITING,
+    Project.ProjectStatus.LEVEL1_AUDITING,
+    Project.ProjectStatus.MID_TERM_SUBMITTED,
+    Project.ProjectStatus.MID_TERM_REVIEWING,
+    Project.ProjectStatus.CLOSURE_SUBMITTED,
+    Project.ProjectStatus.CLOSURE_LEVEL2_REVIEWING,
+    Project.ProjectStatus.CLOSURE_LEVEL1_REVIEWING,
+]
+# 统计快照不含这些维度，带这些筛选时回退到实时查询
+STATISTICS_LIVE_ONLY_PARAMS = ("search", "category", "year")
+
 ADMIN_PROJECT_UPDATE_FORBIDDEN_FIELDS = {
     "batch",
     "final_budget",
@@ -151,11 +178,7 @@ class ProjectManagementViewSet(
         # 搜索
         search = self.request.query_params.get("search", "")
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search)
-                | Q(project_no__icontains=search)
-                | Q(leader__real_name__icontains=search)
-            )
+            queryset = ProjectService.search_projects(queryset, search)
 
         # 按级别筛选
         level = self.request.query_params.get("level", "")
@@ -190,32 +213,21 @@ class ProjectManagementViewSet(
     def list(self, request, *args, **kwargs):
         """
         获取项目列表（分页）
+        ?pagination=cursor 时使用游标分页，按返回的 next_cursor 翻页；
+        ?count=cached 时总数使用短期缓存
         """
-        queryset = self.get_queryset()
-
-        # 分页
-        page = positive_int_query(request.query_params, "page", 1)
-        page_size = positive_int_query(request.query_params, "page_size", 10, 100)
-
-        total = queryset.count()
-        start = (page - 1) * page_size
-        end = start + page_size
-        projects = queryset[start:end]
-
-        serializer = self.get_serializer(projects, many=True)
+        try:
+            data = list_page(
+                ProjectSerializer.eager_load(self.get_queryset()), request.query_params
+            )
+        except ValueError as exc:
+            return Response(
+                {"code": 400, "message": str(exc)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        data["results"] = self.get_serializer(data["results"], many=True).data
 
-        return Response(
-            {
-                "code": 200,
-                "message": "获取成功",
-                "data": {
-                    "results": serializer.data,
-                    "total": total,
-                    "page": page,
-                    "page_size": page_size,
-                },
-            }
-        )
+        return Response({"code": 200, "message": "获取成功", "data": data})
 
     def retrieve(self, request, *args, **kwargs):
         """
@@ -428,31 +440,61 @@ class ProjectManagementViewSet(
         self.perform_destroy(instance)
         return Response({"code": 200, "message": "删除成功"})
 
+    def _duplicate_history_queryset(self):
+        """
+        查重比对的历史范围：与列表相同的权限（非校级管理员仅本学院），不含已删除批次
+        """
+        queryset = Project.objects.exclude(batch__is_deleted=True)
+        user = self.request.user
+        if not _has_school_admin_scope(user):
+            queryset = queryset.filter(leader__college=user.college)
+        return queryset
+
+    @action(methods=["get"], detail=False, url_path="duplicate-titles")
+    def duplicate_titles(self, request):
+        """
+        批次标题查重报告：当前筛选范围内的项目两两比较，并与历史项目比较，返回相似项目对。
+        """
+        threshold = parse_threshold(request.query_params.get("threshold"))
+        pairs = TitleSimilarityService.batch_duplicates(
+            self.get_queryset(), self._duplicate_history_queryset(), threshold=threshold
+        )
+        return Response(
+            {
+                "code": 200,
+                "message": "获取成功",
+                "data": {"threshold": threshold, "total": len(pairs), "results": pairs},
+            }
+        )
+
     @action(methods=["get"], detail=False, url_path="statistics")
     def get_statistics(self, request):
         """
         获取项目统计数据
         """
-        # 基础查询集（已包含权限过滤）
-        base_queryset = self.get_queryset()
-
-        total_projects = base_queryset.count()
-        approved_projects = base_queryset.filter(
-            status__in=["IN_PROGRESS", "COMPLETED"]
-        ).count()
-        pending_review = base_queryset.filter(
-            status__in=[
-                "SUBMITTED",
-                "TEACHER_AUDITING",
-                "COLLEGE_AUDITING",
-                "LEVEL1_AUDITING",
-                "MID_TERM_SUBMITTED",
-                "MID_TERM_REVIEWING",
-                "CLOSURE_SUBMITTED",
-                "CLOSURE_LEVEL2_REVIEWING",
-                "CLOSURE_LEVEL1_REVIEWING",
-            ]
-        ).count()
+        status_counts = self._snapshot_status_counts(request)
+        if status_counts is not None:
+            total_projects = sum(status_counts.values())
+            approved_projects = sum(
+                status_counts.get(code, 0) for code in STATISTICS_APPROVED_STATUSES
+            )
+            pending_review = sum(
+                status_counts.get(code, 0) for code in STATISTICS_PENDING_STATUSES
+            )
+        else:
+            # 基础查询集（已包含权限过滤）
+            base_queryset = self.get_queryset()
+            counts = count_buckets(
+                base_queryset,
+                {
+                    "total": None,
+                    "approved": Q(status__in=STATISTICS_APPROVED_STATUSES),
+                    "pending": Q(status__in=STATISTICS_PENDING_STATUSES),
+                },
+            )
+            total_projects = counts["total"]
+            approved_projects = counts["approved"]
+            pending_review = counts["pending"]
 
         return Response(
             {
@@ -466,12 +508,67 @@ class ProjectManagementViewSet(
             }
         )
 
+    def _snapshot_status_counts(self, request):
+        """
+        未使用搜索、类别、年份等快照不支持的筛选时，从批次统计快照读取状态分布；
+        否则返回 None，由调用方回退到实时查询。
+        """
+        params = request.query_params
+        if any(params.get(name) for name in STATISTICS_LIVE_ONLY_PARAMS):
+            return None
+        user = request.user
+        if not user.is_admin:
+            return {}
+        batch_id = params.get("batch_id", "")
+        if batch_id:
+            batch_id = optional_positive_int(batch_id)
+            if batch_id is None:
+                return {}
+        else:
+            include_archived = str(params.get("include_archived")).lower()
+            if include_archived in ("true", "1", "yes"):
+                return None
+            current_batch = SystemSettingService.get_current_batch()
+            if not current_batch:
+                return {}
+            batch_id = current_batch.id
+        if not ProjectBatch.objects.filter(id=batch_id, is_deleted=False).exists():
+            return {}
+        # 快照不含软删除项目，而实时查询包含；批次内有软删除项目时回退实时查询，
+        # 保证是否附带其他筛选条件时统计口径一致
+        if Project.objects.filter(batch_id=batch_id, is_deleted=True).exists():
+            return None
+        level_id = None
+        if params.get("level"):
+            level_id = optional_positive_int(params.get("level"))
+            if level_id is None:
+                return {}
+        college = None if _has_school_admin_scope(user) else user.college
+        return BatchStatisticsService.get_summary(
+            batch_id,
+            college=college,
+            level_id=level_id,
+            status=params.get("status") or None,
+        )["status_counts"]
+
     @action(methods=["get"], detail=False, url_path="dashboard")
     def dashboard(self, request):
         """
         管理驾驶舱：指标、阶段漏斗、学院对比、风险和经费概览。
         """
-        queryset = self.get_queryset()
+        user = request.user
+        scope = "school" if _has_school_admin_scope(user) else f"college:{user.college}"
+        params = hashlib.sha1(
+            urlencode(sorted(request.query_params.lists()), doseq=True).encode()
+        ).hexdigest()
+        data = DashboardService.cached_dashboard(
+            "admin_cockpit",
+            f"{DashboardService.batch_scope()}:{scope}:{params}",
+            lambda: self._build_dashboard_data(self.get_queryset()),
+        )
+        return Response({"code": 200, "message": "获取成功", "data": data})
+
+    def _build_dashboard_data(self, queryset):
         now = timezone.now()
 
         submitted_statuses = [
@@ -505,13 +602,33 @@ class ProjectManagementViewSet(
             avg_budget=Avg("approved_budget"),
         )
 
+        counts = count_buckets(
+            queryset,
+            {
+                "applications": ~Q(status=Project.ProjectStatus.DRAFT),
+                "approved": Q(status=Project.ProjectStatus.IN_PROGRESS),
+                "returned": Q(status__in=returned_statuses),
+                "pending": Q(status__in=pending_statuses),
+                "published": Q(publish_status__in=published_statuses),
+                "completed": Q(status__in=completed_statuses),
+                "reviewing": Q(status__in=submitted_statuses),
+                "mid_term": Q(
+                    status__in=[
+                        Project.ProjectStatus.MID_TERM_DRAFT,
+                        Project.ProjectStatus.MID_TERM_SUBMITTED,
+                        Project.ProjectStatus.MID_TERM_REVIEWING,
+                        Project.ProjectStatus.READY_FOR_CLOSURE,
+                    ]
+                ),
+            },
+        )
         metrics = {
-            "applications": queryset.exclude(status=Project.ProjectStatus.DRAFT).count(),
-            "approved": queryset.filter(status=Project.ProjectStatus.IN_PROGRESS).count(),
-            "returned": queryset.filter(status__in=returned_statuses).count(),
-            "pending": queryset.filter(status__in=pending_statuses).count(),
-            "published": queryset.filter(publish_status__in=published_statuses).count(),
-            "completed": queryset.filter(status__in=completed_statuses).count(),
+            "applications": counts["applications"],
+            "approved": counts["approved"],
+            "returned": counts["returned"],
+            "pending": counts["pending"],
+            "published": counts["published"],
+            "completed": counts["completed"],
             "achievements": queryset.aggregate(total=Count("achievements"))["total"] or 0,
             "budget_used": float(budget_stats["expenditure"] or 0),
             "budget_approved": float(
@@ -522,22 +639,9 @@ class ProjectManagementViewSet(
 
         stage_funnel = [
             {"stage": "申报提交", "count": metrics["applications"]},
-            {
-                "stage": "立项审核",
-                "count": queryset.filter(status__in=submitted_statuses).count(),
-            },
+            {"stage": "立项审核", "count": counts["reviewing"]},
             {"stage": "结果发布", "count": metrics["published"]},
-            {
-                "stage": "中期阶段",
-                "count": queryset.filter(
-                    status__in=[
-                        Project.ProjectStatus.MID_TERM_DRAFT,
-                        Project.ProjectStatus.MID_TERM_SUBMITTED,
-                        Project.ProjectStatus.MID_TERM_REVIEWING,
-                        Project.ProjectStatus.READY_FOR_CLOSURE,
-                    ]
-                ).count(),
-            },
+            {"stage": "中期阶段", "count": counts["mid_term"]},
             {"stage": "结题归档", "count": metrics["completed"]},
         ]
 
@@ -590,19 +694,13 @@ class ProjectManagementViewSet(
                 }
             )
 
-        return Response(
-            {
-                "code": 200,
-                "message": "获取成功",
-                "data": {
-                    "metrics": metrics,
-                    "stage_funnel": stage_funnel,
-                    "college_compare": college_compare,
-                    "status_distribution": status_distribution,
-                    "risks": risks[:20],
-                },
-            }
-        )
+        return {
+            "metrics": metrics,
+            "stage_funnel": stage_funnel,
+            "college_compare": college_compare,
+            "status_distribution": status_distribution,
+            "risks": risks[:20],
+        }
 
     @action(methods=["get"], detail=False, url_path="publication-center")
     def publication_center(self, request):
@@ -613,11 +711,7 @@ class ProjectManagementViewSet(
 
         search = request.query_params.get("search", "")
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search)
-                | Q(project_no__icontains=search)
-                | Q(leader__real_name__icontains=search)
-            )
+            queryset = ProjectService.search_projects(queryset, search)
         publish_status = request.query_params.get("publish_status", "")
         if publish_status:
             queryset = queryset.filter(publish_status=publish_status)
@@ -631,7 +725,9 @@ class ProjectManagementViewSet(
         page = positive_int_query(request.query_params, "page", 1)
         page_size = positive_int_query(request.query_params, "page_size", 10, 100)
         total = queryset.count()
-        projects = queryset[(page - 1) * page_size : page * page_size]
+        projects = ProjectSerializer.eager_load(queryset)[
+            (page - 1) * page_size : page * page_size
+        ]
         serializer = ProjectSerializer(projects, many=True, context={"request": request})
 
         return Response(
@@ -713,6 +809,26 @@ class ProjectManagementViewSet(
                 {"code": 400, "message": "项目ID列表不合法"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if len(project_ids) > settings.PUBLICATION_ASYNC_THRESHOLD:
+            if not PublicationService._has_school_admin_scope(request.user):
+                return Response(
+                    {"code": 403, "message": "只有校级管理员可以发布立项结果"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            task = PublicationService.dispatch_task(
+                PublicationService.create_task(request.user, project_ids)
+            )
+            return Response(
+                {
+                    "code": 200,
+                    "message": "立项发布已转入后台处理，可在任务中心查看进度",
+                    "data": {
+                        "task": AsyncTaskRecordSerializer(
+                            task, context={"request": request}
+                        ).data
+                    },
+                }
+            )
         try:
             published = PublicationService.publish_projects(request.user, project_ids)
         except PermissionError as exc:
@@ -5,13 +5,11 @@
 from datetime import datetime
 import logging
 
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.utils.downloads import attachment_content_disposition
-from apps.utils.export import safe_zip_path
+from apps.utils.export import safe_zip_path, zip_download_response
 from apps.utils.pagination import positive_int_csv
 from apps.projects.models import get_project_runtime_file
 
@@ -44,15 +42,7 @@ class ProjectAdminExportAttachmentsMixin:
         """
         批量下载附件
         """
-        try:
-            from apps.utils.export import generate_zip
-        except ImportError:
-            return Response(
-                {"code": 500, "message": "Export module not found"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
-        queryset = self.get_queryset()
+        queryset = self.get_queryset().prefetch_related("achievements")
 
         # Support selecting specific IDs
         ids = request.query_params.get("ids", "")
@@ -126,12 +116,5 @@ class ProjectAdminExportAttachmentsMixin:
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        zip_file = generate_zip(files_to_zip)
         filename = f"attachments_{datetime.now().strftime('%Y%m%d%H%M%S')}.zip"
-
-        response = HttpResponse(
-            zip_file.read(),
-            content_type="application/zip",
-        )
-        response["Content-Disposition"] = attachment_content_disposition(filename)
-        return response
+        return zip_download_response(files_to_zip, filename)
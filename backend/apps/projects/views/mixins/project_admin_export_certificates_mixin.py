@@ -2,21 +2,18 @@
 项目证书导出相关 mixin
 """
 
-import io
-import zipfile
-
 from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.operations.models import AsyncTaskRecord
 from apps.operations.services import DataCenterService
-from apps.utils.export import safe_zip_path
+from apps.utils.export import zip_entries_download_response
 from apps.utils.pagination import positive_int_csv
 
 from ...certificates import render_certificate_html
 from ...models import Project
+from ...services.export_service import ProjectExportService
 
 
 class ProjectAdminExportCertificatesMixin:
@@ -55,19 +52,13 @@ class ProjectAdminExportCertificatesMixin:
             id__in=id_list, status=Project.ProjectStatus.CLOSED
         )
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for project in queryset:
-                # 假如不传递 setting，render_certificate_html 会内部自动匹配最佳模板
-                html = self._render_certificate_html(
-                    project, setting=None, request=request
-                )
-                filename = safe_zip_path(f"{project.project_no}_结题证书.html")
-                zf.writestr(filename, html)
-        buffer.seek(0)
-        response = HttpResponse(buffer.read(), content_type="application/zip")
-        response["Content-Disposition"] = 'attachment; filename="certificates.zip"'
-        return response
+        # 证书共用的底图和印章只写入一次，由各证书以相对路径引用
+        project_ids = list(queryset.values_list("id", flat=True))
+        return zip_entries_download_response(
+            ProjectExportService.iter_export_entries("certificates", project_ids),
+            "certificates.zip",
+            fallback="certificates.zip",
+        )
 
     @action(methods=["post"], detail=False, url_path="batch-certificates-task")
     def batch_certificates_task(self, request):
@@ -82,25 +73,15 @@ class ProjectAdminExportCertificatesMixin:
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        queryset = self.get_queryset().filter(
-            id__in=id_list, status=Project.ProjectStatus.CLOSED
+        export_ids = list(
+            self.get_queryset()
+            .filter(id__in=id_list, status=Project.ProjectStatus.CLOSED)
+            .values_list("id", flat=True)
         )
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for project in queryset:
-                html = self._render_certificate_html(project, setting=None, request=request)
-                zf.writestr(
-                    safe_zip_path(f"{project.project_no}_结题证书.html"),
-                    html,
-                )
-        task = DataCenterService.create_completed_file_task(
-            request.user,
-            "批量结题证书生成",
-            AsyncTaskRecord.TaskType.EXPORT,
-            "certificates.zip",
-            buffer.getvalue(),
-            result={"total": queryset.count()},
+        task = DataCenterService.create_export_task(
+            request.user, "certificates", export_ids
         )
+        DataCenterService.dispatch_export_task(task)
         return Response(
             {"code": 200, "message": "证书生成任务已创建", "data": {"task_id": task.id}}
         )
@@ -5,13 +5,12 @@
 from datetime import datetime
 from pathlib import Path
 
-from django.db.models import Prefetch
-from django.http import HttpResponse
+from django.db.models import Count, Prefetch
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.utils.downloads import attachment_content_disposition
+from apps.utils.export import excel_download_response, iter_export_queryset
 from apps.utils.pagination import positive_int_csv
 
 
@@ -21,14 +20,6 @@ class ProjectAdminExportDataMixin:
         """
         批量导出数据
         """
-        try:
-            from apps.utils.export import generate_excel
-        except ImportError:
-            return Response(
-                {"code": 500, "message": "Export module not found"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
         queryset = (
             self.get_queryset()
             .select_related("leader", "level", "category", "source")
@@ -39,8 +30,8 @@ class ProjectAdminExportDataMixin:
                     to_attr="export_members",
                     queryset=self._project_member_model().objects.select_related("user"),
                 ),
-                "achievements",
             )
+            .annotate(export_achievements_count=Count("achievements"))
         )
 
         # Support selecting specific IDs
@@ -123,8 +114,9 @@ class ProjectAdminExportDataMixin:
             "closure_applied_at": "结题申请时间",
         }
 
-        data = []
-        for p in queryset:
+        status_labels = dict(queryset.model.ProjectStatus.choices)
+
+        def build_row(p):
             leader = p.leader
 
             advisors_text = []
@@ -150,67 +142,60 @@ class ProjectAdminExportDataMixin:
                 else ""
             )
 
-            data.append(
-                {
-                    "project_no": p.project_no,
-                    "title": p.title,
-                    "description": p.description,
-                    "source_code": p.source.value if p.source else "",
-                    "source_label": p.source.label if p.source else "",
-                    "level_code": p.level.value if p.level else "",
-                    "level_label": p.level.label if p.level else "",
-                    "category_code": p.category.value if p.category else "",
-                    "category_label": p.category.label if p.category else "",
-                    "is_key_field": "是" if p.is_key_field else "否",
-                    "key_domain_code": p.key_domain_code,
-                    "start_date": p.start_date,
-                    "end_date": p.end_date,
-                    "budget": p.budget,
-                    "approved_budget": p.approved_budget,
-                    "expected_results": p.expected_results,
-                    "status_code": p.status,
-                    "status_display": p.get_status_display(),
-                    "leader_name": leader.real_name if leader else "",
-                    "leader_employee_id": leader.employee_id if leader else "",
-                    "leader_phone": leader.phone if leader else "",
-                    "leader_email": leader.email if leader else "",
-                    "leader_college_code": leader.college if leader else "",
-                    "leader_college": leader_college_label,
-                    "leader_major": leader.major if leader else "",
-                    "leader_grade": leader.grade if leader else "",
-                    "leader_class_name": leader.class_name if leader else "",
-                    "leader_department": leader.department if leader else "",
-                    "advisors": "；".join(advisors_text),
-                    "members": "；".join(members_text),
-                    "achievements_count": len(list(p.achievements.all())),
-                    "proposal_file_name": get_file_name(p.proposal_file),
-                    "proposal_file_url": build_project_file_url(p, "proposal_file"),
-                    "attachment_file_name": get_file_name(p.attachment_file),
-                    "attachment_file_url": build_project_file_url(
-                        p, "attachment_file"
-                    ),
-                    "final_report_url": build_project_file_url(p, "final_report"),
-                    "achievement_file_url": build_project_file_url(
-                        p, "achievement_file"
-                    ),
-                    "created_at": p.created_at,
-                    "updated_at": p.updated_at,
-                    "submitted_at": p.submitted_at,
-                    "closure_applied_at": p.closure_applied_at,
-                }
-            )
+            return {
+                "project_no": p.project_no,
+                "title": p.title,
+                "description": p.description,
+                "source_code": p.source.value if p.source else "",
+                "source_label": p.source.label if p.source else "",
+                "level_code": p.level.value if p.level else "",
+                "level_label": p.level.label if p.level else "",
+                "category_code": p.category.value if p.category else "",
+                "category_label": p.category.label if p.category else "",
+                "is_key_field": "是" if p.is_key_field else "否",
+                "key_domain_code": p.key_domain_code,
+                "start_date": p.start_date,
+                "end_date": p.end_date,
+                "budget": p.budget,
+                "approved_budget": p.approved_budget,
+                "expected_results": p.expected_results,
+                "status_code": p.status,
+                "status_display": status_labels.get(p.status, p.status),
+                "leader_name": leader.real_name if leader else "",
+                "leader_employee_id": leader.employee_id if leader else "",
+                "leader_phone": leader.phone if leader else "",
+                "leader_email": leader.email if leader else "",
+                "leader_college_code": leader.college if leader else "",
+                "leader_college": leader_college_label,
+                "leader_major": leader.major if leader else "",
+                "leader_grade": leader.grade if leader else "",
+                "leader_class_name": leader.class_name if leader else "",
+                "leader_department": leader.department if leader else "",
+                "advisors": "；".join(advisors_text),
+                "members": "；".join(members_text),
+                "achievements_count": p.export_achievements_count,
+                "proposal_file_name": get_file_name(p.proposal_file),
+                "proposal_file_url": build_project_file_url(p, "proposal_file"),
+                "attachment_file_name": get_file_name(p.attachment_file),
+                "attachment_file_url": build_project_file_url(
+                    p, "attachment_file"
+                ),
+                "final_report_url": build_project_file_url(p, "final_report"),
+                "achievement_file_url": build_project_file_url(
+                    p, "achievement_file"
+                ),
+                "created_at": p.created_at,
+                "updated_at": p.updated_at,
+                "submitted_at": p.submitted_at,
+                "closure_applied_at": p.closure_applied_at,
+            }
 
-        excel_file = generate_excel(data, headers)
         filename = f"projects_export_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-
-        response = HttpResponse(
-            excel_file.read(),
-            content_type=(
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            ),
+        return excel_download_response(
+            (build_row(p) for p in iter_export_queryset(queryset)),
+            headers,
+            filename,
         )
-        response["Content-Disposition"] = attachment_content_disposition(filename)
-        return response
 
     def _project_member_model(self):
         from ...models import ProjectMember
@@ -222,20 +207,17 @@ class ProjectAdminExportDataMixin:
         """
         导出项目编号清单
         """
-        from apps.utils.export import generate_excel
-
         queryset = self.get_queryset().select_related("leader")
-        data = []
-        for p in queryset:
-            data.append(
-                {
-                    "project_no": p.project_no,
-                    "title": p.title,
-                    "year": p.year,
-                    "college": p.leader.college if p.leader else "",
-                    "status": p.status,
-                }
-            )
+        data = (
+            {
+                "project_no": p.project_no,
+                "title": p.title,
+                "year": p.year,
+                "college": p.leader.college if p.leader else "",
+                "status": p.status,
+            }
+            for p in iter_export_queryset(queryset)
+        )
         headers = {
             "project_no": "项目编号",
             "title": "项目名称",
@@ -243,11 +225,5 @@ class ProjectAdminExportDataMixin:
             "college": "学院",
             "status": "状态",
         }
-        excel_file = generate_excel(data, headers)
         filename = f"project_numbers_{datetime.now().strftime('%Y%m%d%H%M%S')}.xlsx"
-        response = HttpResponse(
-            excel_file.read(),
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
-        response["Content-Disposition"] = attachment_content_disposition(filename)
-        return response
+        return excel_download_response(data, headers, filename)
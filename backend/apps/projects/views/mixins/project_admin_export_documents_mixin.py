@@ -12,13 +12,16 @@ from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.operations.models import AsyncTaskRecord
 from apps.operations.services import DataCenterService
 from apps.utils.downloads import attachment_content_disposition
-from apps.utils.export import safe_zip_arcname, safe_zip_path
+from apps.utils.export import safe_zip_path, zip_entries_download_response
 from apps.utils.pagination import positive_int_csv
 
 from ...services import DocumentService
+from ...services.export_service import (
+    ProjectExportService,
+    render_establishment_notice_html,
+)
 
 
 class ProjectAdminExportDocumentsMixin:
@@ -69,26 +72,7 @@ class ProjectAdminExportDocumentsMixin:
         return content
 
     def _render_establishment_notice(self, project):
-        text = self._html_text
-        html = f"""
-        <html>
-        <head>
-          <meta charset="utf-8" />
-          <title>立项通知书</title>
-        </head>
-        <body>
-          <h1 style="text-align:center;">立项通知书</h1>
-          <p>项目编号：{text(project.project_no)}</p>
-          <p>项目名称：{text(project.title)}</p>
-          <p>负责人：{text(project.leader.real_name)}({text(project.leader.employee_id)})</p>
-          <p>项目级别：{text(project.level.label if project.level else "")}</p>
-          <p>项目类别：{text(project.category.label if project.category else "")}</p>
-          <p>批准经费：{text(project.approved_budget)}</p>
-          <p>请按要求组织实施项目。</p>
-        </body>
-        </html>
-        """
-        return html
+        return render_establishment_notice_html(project)
 
     @action(methods=["get"], detail=True, url_path="export-doc")
     def export_doc(self, request, pk=None):
@@ -135,19 +119,11 @@ class ProjectAdminExportDocumentsMixin:
         )
         export_ids = [project_id for project_id in id_list if project_id in allowed_ids]
 
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for pk in export_ids:
-                try:
-                    doc_buffer, filename = DocumentService.generate_project_doc(pk)
-                    zf.writestr(safe_zip_arcname(filename), doc_buffer.getvalue())
-                except Exception as exc:
-                    self.logger.warning("Failed to export doc for project %s: %s", pk, exc)
-
-        buffer.seek(0)
-        response = HttpResponse(buffer.read(), content_type="application/zip")
-        response["Content-Disposition"] = 'attachment; filename="project_docs.zip"'
-        return response
+        return zip_entries_download_response(
+            ProjectExportService.iter_export_entries("project_docs", export_ids),
+            "project_docs.zip",
+            fallback="project_docs.zip",
+        )
 
     @action(methods=["post"], detail=False, url_path="batch-export-doc-task")
     def batch_export_doc_task(self, request):
@@ -165,25 +141,10 @@ class ProjectAdminExportDocumentsMixin:
             self.get_queryset().filter(id__in=id_list).values_list("id", flat=True)
         )
         export_ids = [project_id for project_id in id_list if project_id in allowed_ids]
-
-        buffer = io.BytesIO()
-        exported = 0
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for pk in export_ids:
-                try:
-                    doc_buffer, filename = DocumentService.generate_project_doc(pk)
-                    zf.writestr(safe_zip_arcname(filename), doc_buffer.getvalue())
-                    exported += 1
-                except Exception as exc:
-                    self.logger.warning("Failed to export doc for project %s: %s", pk, exc)
-        task = DataCenterService.create_completed_file_task(
-            request.user,
-            "批量申报书导出",
-            AsyncTaskRecord.TaskType.EXPORT,
-            "project_docs.zip",
-            buffer.getvalue(),
-            result={"total": exported},
+        task = DataCenterService.create_export_task(
+            request.user, "project_docs", export_ids
         )
+        DataCenterService.dispatch_export_task(task)
         return Response(
             {"code": 200, "message": "申报书导出任务已创建", "data": {"task_id": task.id}}
         )
@@ -231,23 +192,13 @@ class ProjectAdminExportDocumentsMixin:
                 {"code": 400, "message": "请提供项目ID列表"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        queryset = self.get_queryset().filter(id__in=id_list)
-        buffer = io.BytesIO()
-        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            for project in queryset:
-                html = self._render_establishment_notice(project)
-                zf.writestr(
-                    safe_zip_path(f"{project.project_no}_立项通知书.doc"),
-                    html,
-                )
-        task = DataCenterService.create_completed_file_task(
-            request.user,
-            "批量立项通知书生成",
-            AsyncTaskRecord.TaskType.EXPORT,
-            "establishment_notices.zip",
-            buffer.getvalue(),
-            result={"total": queryset.count()},
+        export_ids = list(
+            self.get_queryset().filter(id__in=id_list).values_list("id", flat=True)
+        )
+        task = DataCenterService.create_export_task(
+            request.user, "establishment_notices", export_ids
         )
+        DataCenterService.dispatch_export_task(task)
         return Response(
             {"code": 200, "message": "通知书生成任务已创建", "data": {"task_id": task.id}}
         )
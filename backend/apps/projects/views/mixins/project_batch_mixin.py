@@ -2,6 +2,7 @@
 项目批量操作相关 mixin
 """
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,6 +13,8 @@ from apps.system_settings.services import SystemSettingService
 from apps.utils.pagination import optional_positive_int, positive_int_list
 from ...serializers import ProjectArchiveSerializer
 from ...services.archive_service import ArchiveService
+from ...services.dashboard_service import DashboardService
+from ...services.statistics_service import BatchStatisticsService
 
 
 ADMIN_BATCH_STATUS_TARGETS = {
@@ -68,7 +71,14 @@ class ProjectBatchMixin:
             )
 
         queryset = Project.objects.filter(id__in=project_ids, batch=current_batch)
-        updated = queryset.update(status=target_status)
+        with transaction.atomic():
+            # queryset.update 不触发信号，按更新前后所在分组重算统计快照
+            stale_buckets = BatchStatisticsService.bucket_keys(queryset)
+            updated = queryset.update(status=target_status)
+            BatchStatisticsService.refresh_buckets(
+                stale_buckets | BatchStatisticsService.bucket_keys(queryset)
+            )
+        DashboardService.invalidate_cache()
         return Response(
             {"code": 200, "message": "更新成功", "data": {"updated": updated}}
         )
@@ -150,6 +160,7 @@ class ProjectBatchMixin:
         from openpyxl.utils.exceptions import InvalidFileException  # type: ignore[import-untyped]
         from apps.users.models import User, Role
         from apps.dictionaries.models import DictionaryItem
+        from ...services import ProjectNumberService
 
         try:
             wb = openpyxl.load_workbook(file)
@@ -228,13 +239,9 @@ class ProjectBatchMixin:
                     dict_type__code="project_source", value=source_code
                 ).first()
 
+                explicit_project_no = bool(project_no)
                 if not project_no:
-                    from ...services import ProjectService
-
-                    project_no = ProjectService.generate_project_no(
-                        year,
-                        leader.college,
-                    )
+                    project_no = ProjectNumberService.allocate(year, leader.college)[0]
 
                 batch = target_batch
                 if not batch:
@@ -276,6 +283,9 @@ class ProjectBatchMixin:
                         "source": source_item,
                     },
                 )
+                if explicit_project_no:
+                    # 文件中的编号可能占用计数器后续序号，后续行分配前先推进计数器
+                    ProjectNumberService.observe([project_no])
                 ProjectMember.objects.get_or_create(
                     project=project,
                     user=leader,
@@ -2,25 +2,23 @@
 Project export actions.
 """
 
-from io import BytesIO
-import zipfile
 import logging
 
-import openpyxl  # type: ignore[import-untyped]
-from django.http import HttpResponse
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from ...models import Project
 from apps.system_settings.services import SystemSettingService
-from apps.utils.downloads import attachment_content_disposition
-from apps.utils.export import safe_zip_path
+from apps.utils.export import (
+    excel_download_response,
+    iter_export_queryset,
+    safe_zip_path,
+    zip_download_response,
+)
 
-
-def _write_file_field_to_zip(zip_file, file_field, arcname):
-    with file_field.open("rb") as source:
-        zip_file.writestr(arcname, source.read())
+# 列宽在写入前按表头固定设置，避免导出后再遍历全部单元格估算宽度
+LEVEL2_EXPORT_COLUMN_WIDTHS = [18, 40, 14, 12, 24, 16, 16, 14, 22, 22]
 
 
 def _has_school_admin_scope(user):
@@ -56,70 +54,50 @@ class ProjectLevel2ExportMixin:
         if status_filter:
             projects = projects.filter(status=status_filter)
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "项目列表"
-
-        headers = [
-            "项目编号",
-            "项目名称",
-            "项目级别",
-            "负责人",
-            "指导教师",
-            "项目类别",
-            "研究领域",
-            "项目状态",
-            "创建时间",
-            "提交时间",
-        ]
-        ws.append(headers)
-
-        for project in projects:
-            level_label = project.level.label if project.level else ""
-            category_label = project.category.label if project.category else ""
-            advisor_names = ", ".join(
-                [advisor.user.real_name for advisor in project.advisors.all()]
-            )
-            research_field = project.key_domain_code if project.is_key_field else ""
-            ws.append(
-                [
-                    project.project_no,
-                    project.title,
-                    level_label,
-                    project.leader.real_name,
-                    advisor_names,
-                    category_label,
-                    research_field,
-                    project.get_status_display(),
-                    project.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    (
-                        project.submitted_at.strftime("%Y-%m-%d %H:%M:%S")
-                        if project.submitted_at
-                        else ""
-                    ),
-                ]
-            )
-
-        for column in ws.columns:
-            max_length = 0
-            column_cells = [cell for cell in column]
-            for cell in column_cells:
-                try:
-                    max_length = max(max_length, len(str(cell.value)))
-                except Exception as exc:
-                    self.logger.debug("Failed to size column: %s", exc)
-            adjusted_width = (max_length + 2) * 1.2
-            ws.column_dimensions[column_cells[0].column_letter].width = adjusted_width
-
-        response = HttpResponse(
-            content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        response["Content-Disposition"] = attachment_content_disposition(
+        projects = projects.select_related(
+            "leader", "level", "category"
+        ).prefetch_related("advisors__user")
+        status_labels = dict(Project.ProjectStatus.choices)
+
+        headers = {
+            "project_no": "项目编号",
+            "title": "项目名称",
+            "level": "项目级别",
+            "leader": "负责人",
+            "advisors": "指导教师",
+            "category": "项目类别",
+            "research_field": "研究领域",
+            "status": "项目状态",
+            "created_at": "创建时间",
+            "submitted_at": "提交时间",
+        }
+
+        def build_row(project):
+            return {
+                "project_no": project.project_no,
+                "title": project.title,
+                "level": project.level.label if project.level else "",
+                "leader": project.leader.real_name,
+                "advisors": ", ".join(
+                    advisor.user.real_name for advisor in project.advisors.all()
+                ),
+                "category": project.category.label if project.category else "",
+                "research_field": (
+                    project.key_domain_code if project.is_key_field else ""
+                ),
+                "status": status_labels.get(project.status, project.status),
+                "created_at": project.created_at,
+                "submitted_at": project.submitted_at,
+            }
+
+        return excel_download_response(
+            (build_row(project) for project in iter_export_queryset(projects)),
+            headers,
             f"projects_{user.college}.xlsx",
+            sheet_title="项目列表",
+            column_widths=LEVEL2_EXPORT_COLUMN_WIDTHS,
             fallback="projects.xlsx",
         )
-        wb.save(response)
-        return response
 
     @action(methods=["get"], detail=False, url_path="export-attachments")
     def export_attachments(self, request):
@@ -148,66 +126,38 @@ class ProjectLevel2ExportMixin:
         if status_filter:
             projects = projects.filter(status=status_filter)
 
-        zip_buffer = BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            for project in projects:
-                if project.proposal_file:
-                    try:
-                        _write_file_field_to_zip(
-                            zip_file,
-                            project.proposal_file,
+        files_to_zip = []
+        for project in projects.prefetch_related("achievements"):
+            for file_field, label in (
+                (project.proposal_file, "申报书"),
+                (project.mid_term_report, "中期报告"),
+                (project.final_report, "结题报告"),
+            ):
+                if file_field:
+                    files_to_zip.append(
+                        (
+                            file_field,
                             safe_zip_path(
                                 project.project_no,
-                                f"申报书_{project.proposal_file.name.split('/')[-1]}",
+                                f"{label}_{file_field.name.split('/')[-1]}",
                             ),
                         )
-                    except Exception as exc:
-                        self.logger.warning("Skip proposal file for project %s: %s", project.id, exc)
-
-                if project.mid_term_report:
-                    try:
-                        _write_file_field_to_zip(
-                            zip_file,
-                            project.mid_term_report,
-                            safe_zip_path(
-                                project.project_no,
-                                f"中期报告_{project.mid_term_report.name.split('/')[-1]}",
-                            ),
-                        )
-                    except Exception as exc:
-                        self.logger.warning("Skip mid-term report for project %s: %s", project.id, exc)
-
-                if project.final_report:
-                    try:
-                        _write_file_field_to_zip(
-                            zip_file,
-                            project.final_report,
+                    )
+
+            for achievement in project.achievements.all():
+                if achievement.attachment:
+                    files_to_zip.append(
+                        (
+                            achievement.attachment,
                             safe_zip_path(
                                 project.project_no,
-                                f"结题报告_{project.final_report.name.split('/')[-1]}",
+                                f"成果_{achievement.title}_{achievement.attachment.name.split('/')[-1]}",
                             ),
                         )
-                    except Exception as exc:
-                        self.logger.warning("Skip final report for project %s: %s", project.id, exc)
-
-                for achievement in project.achievements.all():
-                    if achievement.attachment:
-                        try:
-                            _write_file_field_to_zip(
-                                zip_file,
-                                achievement.attachment,
-                                safe_zip_path(
-                                    project.project_no,
-                                    f"成果_{achievement.title}_{achievement.attachment.name.split('/')[-1]}",
-                                ),
-                            )
-                        except Exception as exc:
-                            self.logger.warning("Skip achievement attachment for project %s: %s", project.id, exc)
-
-        zip_buffer.seek(0)
-        response = HttpResponse(zip_buffer.read(), content_type="application/zip")
-        response["Content-Disposition"] = attachment_content_disposition(
+                    )
+
+        return zip_download_response(
+            files_to_zip,
             f"attachments_{user.college}.zip",
             fallback="attachments.zip",
         )
-        return response
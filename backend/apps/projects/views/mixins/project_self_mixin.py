@@ -61,7 +61,7 @@ class ProjectSelfMixin:
         if status_filter:
             projects = projects.filter(status=status_filter)
 
-        projects = projects.order_by("-created_at")
+        projects = ProjectSerializer.eager_load(projects).order_by("-created_at")
 
         total = projects.count()
         start = (page - 1) * page_size
@@ -107,7 +107,7 @@ class ProjectSelfMixin:
         if title:
             drafts = drafts.filter(title__icontains=title)
 
-        drafts = drafts.order_by("-updated_at")
+        drafts = ProjectSerializer.eager_load(drafts).order_by("-updated_at")
 
         total = drafts.count()
         start = (page - 1) * page_size
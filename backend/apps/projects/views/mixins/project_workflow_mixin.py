@@ -7,7 +7,6 @@ Keep `ProjectViewSet` smaller by extracting workflow-heavy endpoints here.
 from decimal import Decimal, InvalidOperation
 
 from django.db import transaction
-from django.db.models import Avg
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import action
@@ -15,10 +14,16 @@ from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
 from apps.projects.models import ProjectPhaseInstance
+from apps.projects.services.expert_summary_service import (
+    EXPERT_SUMMARY_MAX_PROJECTS,
+    ExpertSummaryService,
+    build_summary,
+)
 from apps.projects.services.phase_service import ProjectPhaseService
 from apps.system_settings.services import WorkflowService, AdminAssignmentService
 from apps.reviews.models import Review
 from apps.reviews.services import ReviewService
+from apps.utils.pagination import positive_int_csv
 
 from ...models import Project
 
@@ -156,38 +161,51 @@ class ProjectWorkflowMixin:
             phase_instance=phase_instance,
             workflow_node_id=node_id,
         )
-        assigned = qs.count()
-        pending = qs.filter(status=Review.ReviewStatus.PENDING).count()
-        submitted = assigned - pending
-        approved_count = qs.filter(status=Review.ReviewStatus.APPROVED).count()
-        rejected_count = qs.filter(status=Review.ReviewStatus.REJECTED).count()
-        avg_score = (
-            qs.exclude(status=Review.ReviewStatus.PENDING)
-            .aggregate(avg=Avg("score"))
-            .get("avg")
+        summary = build_summary(
+            ExpertSummaryService.summarize(qs),
+            phase_instance,
+            node_id,
+            require_expert_review,
         )
+        return Response({"code": 200, "message": "获取成功", "data": summary})
 
-        return Response(
-            {
-                "code": 200,
-                "message": "获取成功",
-                "data": {
-                    "phase_instance_id": phase_instance.id if phase_instance else None,
-                    "attempt_no": phase_instance.attempt_no if phase_instance else None,
-                    "step": phase_instance.step if phase_instance else "",
-                    "state": phase_instance.state if phase_instance else "",
-                    "node_id": node_id,
-                    "require_expert_review": require_expert_review,
-                    "assigned": assigned,
-                    "submitted": submitted,
-                    "pending": pending,
-                    "approved": approved_count,
-                    "rejected": rejected_count,
-                    "all_submitted": assigned > 0 and pending == 0,
-                    "avg_score": avg_score,
+    @action(detail=False, methods=["get"], url_path="expert-summaries")
+    def expert_summaries(self, request):
+        """
+        批量获取项目当前节点的专家评审进度，供评审列表一次加载整页
+        query: review_type=APPLICATION|MID_TERM|CLOSURE, project_ids=1,2,3
+        只返回当前用户为负责管理员的项目：{project_id: summary}
+        """
+        review_type = (
+            request.query_params.get("review_type") or Review.ReviewType.APPLICATION
+        )
+        if review_type not in Review.ReviewType.values:
+            return Response(
+                {"code": 400, "message": "review_type参数错误"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        project_ids = positive_int_csv(request.query_params.get("project_ids"))
+        if project_ids is None:
+            return Response(
+                {"code": 400, "message": "project_ids格式错误"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(project_ids) > EXPERT_SUMMARY_MAX_PROJECTS:
+            return Response(
+                {
+                    "code": 400,
+                    "message": f"一次最多查询{EXPERT_SUMMARY_MAX_PROJECTS}个项目",
                 },
-            }
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        projects = (
+            self.get_queryset()
+            .filter(id__in=project_ids)
+            .select_related("leader")
+            .order_by()
         )
+        summaries = ExpertSummaryService.summaries(projects, review_type, request.user)
+        return Response({"code": 200, "message": "获取成功", "data": summaries})
 
     @action(detail=True, methods=["post"], url_path="workflow/return-to-student")
     def workflow_return_to_student(self, request, pk=None):
@@ -269,7 +269,9 @@ class ProjectViewSet(
         """
         统一返回结构，方便前端处理
         """
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = ProjectListSerializer.eager_load(
+            self.filter_queryset(self.get_queryset())
+        )
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -0,0 +1,161 @@
+"""
+Benchmark bulk expert assignment against assigning projects one at a time.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.notifications.models import Notification
+from apps.projects.models import Project, ProjectPhaseInstance
+from apps.reviews.models import ExpertGroup, Review
+from apps.reviews.services import ReviewService
+from apps.system_settings.models import ProjectBatch, WorkflowConfig, WorkflowNode
+from apps.users.models import Role, User
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark ReviewService.assign_project_to_group with synthetic projects "
+        "and experts. All data is created inside a transaction and rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--projects", type=int, default=500)
+        parser.add_argument("--experts", type=int, default=7)
+        parser.add_argument(
+            "--mode",
+            choices=["all", "bulk", "per_project"],
+            default="all",
+            help="bulk: one call for all projects; per_project: one call per project.",
+        )
+
+    def handle(self, *args, **options):
+        if options["projects"] <= 0 or options["experts"] <= 0:
+            raise CommandError("--projects and --experts must be positive")
+        modes = ["bulk", "per_project"] if options["mode"] == "all" else [options["mode"]]
+
+        self.stdout.write(
+            f"{'mode':<12}{'projects':>10}{'experts':>9}{'reviews':>9}"
+            f"{'queries':>9}{'seconds':>10}"
+        )
+        try:
+            with transaction.atomic():
+                admin, group, project_ids = self._seed(
+                    options["projects"], options["experts"]
+                )
+                for mode in modes:
+                    Notification.objects.filter(related_project_id__in=project_ids).delete()
+                    Review.objects.filter(project_id__in=project_ids).delete()
+                    reviews, queries, seconds = self._run(
+                        mode, admin, group, project_ids
+                    )
+                    self.stdout.write(
+                        f"{mode:<12}{len(project_ids):>10}{options['experts']:>9}"
+                        f"{reviews:>9}{queries:>9}{seconds:>10.2f}"
+                    )
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _run(mode, admin, group, project_ids):
+        calls = [project_ids] if mode == "bulk" else [[pid] for pid in project_ids]
+        created = 0
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for ids in calls:
+                created += len(
+                    ReviewService.assign_project_to_group(
+                        project_ids=ids, group_id=group.id, creator=admin
+                    )
+                )
+            seconds = time.perf_counter() - started
+        return created, len(queries.captured_queries), seconds
+
+    @staticmethod
+    def _seed(project_count, expert_count):
+        ProjectBatch.objects.filter(is_current=True).update(is_current=False)
+        batch = ProjectBatch.objects.create(
+            name="Benchmark",
+            year=2099,
+            code="BENCHMARK-ASSIGN",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_active=True,
+            is_current=True,
+        )
+        role = Role.objects.create(
+            code="BENCHMARK_ASSIGN_ADMIN",
+            name="Benchmark School Admin",
+            scope_dimension="SCHOOL",
+        )
+        teacher_role = Role.objects.get(code="TEACHER")
+        student_role = Role.objects.get(code="STUDENT")
+        admin = User.objects.create(
+            username="benchmark-assign-admin",
+            role_fk=role,
+            real_name="Benchmark Admin",
+            employee_id="BA0001",
+        )
+        experts = User.objects.bulk_create(
+            User(
+                username=f"benchmark-expert-{index}",
+                role_fk=teacher_role,
+                real_name=f"Expert {index}",
+                employee_id=f"BE{index:04d}",
+                is_expert=True,
+            )
+            for index in range(expert_count)
+        )
+        leader = User.objects.create(
+            username="benchmark-assign-leader",
+            role_fk=student_role,
+            real_name="Benchmark Leader",
+            employee_id="BS0001",
+        )
+        group = ExpertGroup.objects.create(name="Benchmark Group", created_by=admin)
+        group.members.add(*experts)
+
+        workflow = WorkflowConfig.objects.create(
+            name="Benchmark Application Flow",
+            phase=WorkflowConfig.Phase.APPLICATION,
+            batch=batch,
+            version=1,
+            is_active=True,
+        )
+        node = WorkflowNode.objects.create(
+            workflow=workflow,
+            code="SCHOOL_REVIEW",
+            name="校级评审",
+            node_type=WorkflowNode.NodeType.APPROVAL,
+            role_fk=role,
+            sort_order=1,
+            require_expert_review=True,
+        )
+        projects = Project.objects.bulk_create(
+            Project(
+                project_no=f"BENCH{index:06d}",
+                title=f"Benchmark Project {index}",
+                leader=leader,
+                status=Project.ProjectStatus.LEVEL1_AUDITING,
+                year=2099,
+                batch=batch,
+            )
+            for index in range(project_count)
+        )
+        ProjectPhaseInstance.objects.bulk_create(
+            ProjectPhaseInstance(
+                project=project,
+                phase=ProjectPhaseInstance.Phase.APPLICATION,
+                step=node.code,
+                current_node_id=node.id,
+            )
+            for project in projects
+        )
+        return admin, group, [project.id for project in projects]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0015_expertgroup_scope_choices'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['-created_at', '-id'], name='reviews_created_id_idx'),
+        ),
+    ]
@@ -105,6 +105,7 @@ class Review(models.Model):
                 name="reviews_proj_wfnode_idx",
             ),
             models.Index(fields=["status"], name="reviews_status_12ddaa_idx"),
+            models.Index(fields=["-created_at", "-id"], name="reviews_created_id_idx"),
         ]
 
     def __str__(self):
@@ -12,13 +12,30 @@ from ..models import (
     ExpertGroup,
 )
 from apps.projects.models import Project
-from apps.projects.models import ProjectPhaseInstance
+from apps.projects.models import ProjectAdvisor, ProjectPhaseInstance
+from apps.projects.services.dashboard_service import DashboardService
 from apps.projects.services.phase_service import ProjectPhaseService
 from apps.projects.services.archive_service import ensure_project_archive
+from apps.system_settings.models import WorkflowNode
 from apps.system_settings.services import WorkflowService
 from apps.system_settings.services import AdminAssignmentService, SystemSettingService
 from apps.notifications.services import NotificationService
 
+ASSIGNMENT_BULK_SIZE = 1000
+
+# 流程走完后各阶段的项目状态与阶段环节
+PHASE_COMPLETION = {
+    ProjectPhaseInstance.Phase.APPLICATION: (
+        Project.ProjectStatus.IN_PROGRESS,
+        "PUBLISHED",
+    ),
+    ProjectPhaseInstance.Phase.MID_TERM: (
+        Project.ProjectStatus.READY_FOR_CLOSURE,
+        "COMPLETED",
+    ),
+    ProjectPhaseInstance.Phase.CLOSURE: (Project.ProjectStatus.CLOSED, "COMPLETED"),
+}
+
 
 class ReviewService:
     """
@@ -67,17 +84,12 @@ class ReviewService:
             return next_node, True
         else:
             # 已到达流程末尾，标记阶段完成
-            phase = phase_instance.phase
-            if phase == ProjectPhaseInstance.Phase.APPLICATION:
-                project.status = Project.ProjectStatus.IN_PROGRESS
-                ProjectPhaseService.mark_completed(phase_instance, step="PUBLISHED")
-            elif phase == ProjectPhaseInstance.Phase.MID_TERM:
-                project.status = Project.ProjectStatus.READY_FOR_CLOSURE
-                ProjectPhaseService.mark_completed(phase_instance, step="COMPLETED")
-            elif phase == ProjectPhaseInstance.Phase.CLOSURE:
-                project.status = Project.ProjectStatus.CLOSED
-                ensure_project_archive(project)
-                ProjectPhaseService.mark_completed(phase_instance, step="COMPLETED")
+            completion = PHASE_COMPLETION.get(phase_instance.phase)
+            if completion:
+                project.status, step = completion
+                if project.status == Project.ProjectStatus.CLOSED:
+                    ensure_project_archive(project)
+                ProjectPhaseService.mark_completed(phase_instance, step=step)
 
             project.save(update_fields=["status"])
             return None, True
@@ -229,81 +241,83 @@ class ReviewService:
         )
 
     @staticmethod
-    def _role_scope_for_node(node):
+    def _role_scope_for_node(node, role_scopes=None):
         role_fk_id = getattr(node, "role_fk_id", None)
         if not role_fk_id:
             return None
+        if role_scopes is not None and role_fk_id in role_scopes:
+            return role_scopes[role_fk_id]
         from apps.users.models import Role
 
-        return (
+        scope = (
             Role.objects.filter(id=role_fk_id)
             .values_list("scope_dimension", flat=True)
             .first()
         )
+        if role_scopes is not None:
+            role_scopes[role_fk_id] = scope
+        return scope
 
     @staticmethod
-    def _update_project_status_for_node(project, node, phase):
+    def _project_status_for_node(project, node, phase, role_scopes=None):
         """
-        根据节点类型和阶段更新项目状态
+        节点对应的项目状态（不保存）；无法确定时返回项目当前状态
+
+        role_scopes: 可选的 {role_fk_id: scope_dimension}，批量处理时复用角色范围
         """
         # 学生节点
         if node.node_type == "SUBMIT":
             if phase == ProjectPhaseInstance.Phase.APPLICATION:
-                project.status = Project.ProjectStatus.DRAFT
-            elif phase == ProjectPhaseInstance.Phase.MID_TERM:
-                project.status = Project.ProjectStatus.IN_PROGRESS
-            elif phase == ProjectPhaseInstance.Phase.CLOSURE:
-                project.status = Project.ProjectStatus.READY_FOR_CLOSURE
-            project.save(update_fields=["status", "updated_at"])
-            return
+                return Project.ProjectStatus.DRAFT
+            if phase == ProjectPhaseInstance.Phase.MID_TERM:
+                return Project.ProjectStatus.IN_PROGRESS
+            if phase == ProjectPhaseInstance.Phase.CLOSURE:
+                return Project.ProjectStatus.READY_FOR_CLOSURE
+            return project.status
 
         # 审核节点 - 根据节点配置动态设置状态
         # 不再硬编码角色到状态的映射
 
         # 优先使用节点配置的 project_status
-        if hasattr(node, "project_status") and node.project_status:
-            try:
-                project.status = node.project_status
-                project.save(update_fields=["status", "updated_at"])
-                return
-            except Exception as e:
-                ReviewService.logger.warning(
-                    f"Invalid project_status {node.project_status} in node {node.id}: {e}"
-                )
+        if getattr(node, "project_status", None):
+            return node.project_status
 
         # 备用方案：根据阶段和节点属性推断（保持向后兼容）
         role_code = getattr(node, "role", None)
         if not role_code and hasattr(node, "get_role_code"):
             role_code = node.get_role_code()
-        role_scope = ReviewService._role_scope_for_node(node)
+        role_scope = ReviewService._role_scope_for_node(node, role_scopes)
 
         if phase == ProjectPhaseInstance.Phase.APPLICATION:
             if role_code == "TEACHER":
-                project.status = Project.ProjectStatus.TEACHER_AUDITING
-            elif role_code == "LEVEL2_ADMIN" or role_scope == "COLLEGE":
-                project.status = Project.ProjectStatus.COLLEGE_AUDITING
-            elif role_code == "LEVEL1_ADMIN" or role_scope == "SCHOOL":
-                project.status = Project.ProjectStatus.LEVEL1_AUDITING
-            else:
-                # 其他角色：使用通用审核状态
-                project.status = Project.ProjectStatus.TEACHER_AUDITING
-        elif phase == ProjectPhaseInstance.Phase.MID_TERM:
+                return Project.ProjectStatus.TEACHER_AUDITING
+            if role_code == "LEVEL2_ADMIN" or role_scope == "COLLEGE":
+                return Project.ProjectStatus.COLLEGE_AUDITING
+            if role_code == "LEVEL1_ADMIN" or role_scope == "SCHOOL":
+                return Project.ProjectStatus.LEVEL1_AUDITING
+            # 其他角色：使用通用审核状态
+            return Project.ProjectStatus.TEACHER_AUDITING
+        if phase == ProjectPhaseInstance.Phase.MID_TERM:
             if role_code == "TEACHER":
-                project.status = Project.ProjectStatus.MID_TERM_SUBMITTED
-            else:
-                project.status = Project.ProjectStatus.MID_TERM_REVIEWING
-        elif phase == ProjectPhaseInstance.Phase.CLOSURE:
+                return Project.ProjectStatus.MID_TERM_SUBMITTED
+            return Project.ProjectStatus.MID_TERM_REVIEWING
+        if phase == ProjectPhaseInstance.Phase.CLOSURE:
             if role_code == "TEACHER":
-                project.status = Project.ProjectStatus.CLOSURE_SUBMITTED
-            elif role_code == "LEVEL2_ADMIN" or role_scope == "COLLEGE":
-                project.status = Project.ProjectStatus.CLOSURE_LEVEL2_REVIEWING
-            elif role_code == "LEVEL1_ADMIN" or role_scope == "SCHOOL":
-                project.status = Project.ProjectStatus.CLOSURE_LEVEL1_REVIEWING
-            else:
-                # 其他角色：使用通用审核状态
-                project.status = Project.ProjectStatus.CLOSURE_SUBMITTED
+                return Project.ProjectStatus.CLOSURE_SUBMITTED
+            if role_code == "LEVEL2_ADMIN" or role_scope == "COLLEGE":
+                return Project.ProjectStatus.CLOSURE_LEVEL2_REVIEWING
+            if role_code == "LEVEL1_ADMIN" or role_scope == "SCHOOL":
+                return Project.ProjectStatus.CLOSURE_LEVEL1_REVIEWING
+            # 其他角色：使用通用审核状态
+            return Project.ProjectStatus.CLOSURE_SUBMITTED
+        return project.status
 
-        # 保存项目状态
+    @staticmethod
+    def _update_project_status_for_node(project, node, phase):
+        """
+        根据节点类型和阶段更新项目状态
+        """
+        project.status = ReviewService._project_status_for_node(project, node, phase)
         project.save(update_fields=["status", "updated_at"])
 
     @staticmethod
@@ -501,10 +515,11 @@ class ReviewService:
             return
         if not phase_instance.current_node_id:
             raise ValueError("流程状态异常：缺少当前节点")
-        nodes = WorkflowService.get_nodes(phase_instance.phase, review.project.batch)
-        node_order = {node.id: idx for idx, node in enumerate(nodes)}
-        current_index = node_order.get(phase_instance.current_node_id)
-        target_index = node_order.get(target_node_id)
+        graph = WorkflowService.get_workflow_graph(
+            phase_instance.phase, review.project.batch
+        )
+        current_index = graph.index_by_id.get(phase_instance.current_node_id)
+        target_index = graph.index_by_id.get(target_node_id)
         if (
             current_index is None
             or target_index is None
@@ -797,8 +812,8 @@ class ReviewService:
         增加了学院限制检查和指导老师排除检查
         """
         group = ExpertGroup.objects.get(pk=group_id)
-        experts = group.members.all()
-        if experts.filter(is_expert=False).exists():
+        experts = list(group.members.all())
+        if any(not expert.is_expert for expert in experts):
             raise ValueError("专家组包含未设置为专家的教师")
 
         # ===== 新增：学院限制检查 =====
@@ -820,22 +835,48 @@ class ReviewService:
         if not current_batch:
             raise ValueError("当前没有可用批次")
 
-        created_reviews = []
         phase = ReviewService._get_phase_from_review_type(review_type)
         if not phase:
             raise ValueError("不支持该评审类型的专家分配")
 
+        expert_ids = {expert.id for expert in experts}
+        project_ids = list(dict.fromkeys(project_ids))
+
         with transaction.atomic():
+            # 一次性预取项目、指导教师、阶段实例与节点，逐项目校验只在内存中进行
+            projects = (
+                Project.objects.filter(batch=current_batch)
+                .select_related("batch", "leader")
+                .in_bulk(project_ids)
+            )
+            advisor_conflicts = {}
+            for project_id, user_id in ProjectAdvisor.objects.filter(
+                project_id__in=projects, user_id__in=expert_ids
+            ).values_list("project_id", "user_id"):
+                advisor_conflicts.setdefault(project_id, set()).add(user_id)
+            phase_instances = ProjectPhaseService.get_current_map(projects, phase)
+            node_ids = (
+                {target_node_id}
+                if target_node_id
+                else {
+                    instance.current_node_id
+                    for instance in phase_instances.values()
+                    if instance.current_node_id
+                }
+            )
+            nodes = WorkflowNode.objects.select_related("workflow", "role_fk").in_bulk(
+                node_ids
+            )
+            admin_users = {}
+
+            targets = []
             for pid in project_ids:
-                try:
-                    project = Project.objects.get(pk=pid, batch=current_batch)
-                except Project.DoesNotExist:
+                project = projects.get(pid)
+                if project is None:
                     continue
 
                 # ===== 新增：指导老师排除检查 =====
-                advisor_ids = set(project.advisors.values_list("user_id", flat=True))
-                member_ids = set(experts.values_list("id", flat=True))
-                intersection = advisor_ids & member_ids
+                intersection = advisor_conflicts.get(project.id)
                 if intersection:
                     from apps.users.models import User
 
@@ -849,7 +890,7 @@ class ReviewService:
                         f"请重新选择专家组"
                     )
 
-                phase_instance = ProjectPhaseService.get_current(project, phase)
+                phase_instance = phase_instances.get(project.id)
                 if not phase_instance:
                     ReviewService.logger.warning(
                         "Project %s has no phase instance for expert assignment",
@@ -857,9 +898,7 @@ class ReviewService:
                     )
                     continue
                 node_id = target_node_id or phase_instance.current_node_id
-                node_obj = (
-                    WorkflowService.get_node_by_id(node_id) if node_id else None
-                )
+                node_obj = nodes.get(node_id) if node_id else None
                 ReviewService._validate_assignment_node(project, phase, node_obj)
                 if (
                     target_node_id
@@ -904,34 +943,65 @@ class ReviewService:
                         "Node %s does not require expert review", node_id
                     )
                     continue
-                assigned_user = AdminAssignmentService.resolve_admin_user(
-                    project, phase, node_obj
+                # 负责管理员只取决于节点角色与（按学院划分时）负责人学院
+                role = node_obj.role_fk
+                scoped = role and role.scope_dimension not in (None, "", "SCHOOL")
+                admin_key = (
+                    node_obj.id,
+                    project.leader.college if scoped else None,
                 )
+                assigned_user = admin_users.get(admin_key)
+                if assigned_user is None:
+                    assigned_user = AdminAssignmentService.resolve_admin_user(
+                        project, phase, node_obj
+                    )
+                    admin_users[admin_key] = assigned_user
                 if creator and assigned_user.id != creator.id:
                     raise ValueError("无权限分配该节点的专家评审任务")
                 role_code = node_obj.get_role_code()
                 if not role_code:
                     raise ValueError("审核节点未配置角色")
+                targets.append((project, phase_instance, node_obj))
+
+            if not targets:
+                return []
 
+            # 一次查询得到已分配的 (项目, 专家, 阶段实例, 节点)，只创建缺失的组合
+            existing = set(
+                Review.objects.filter(
+                    project_id__in=[project.id for project, _, _ in targets],
+                    reviewer_id__in=expert_ids,
+                    review_type=review_type,
+                    is_expert_review=True,
+                ).values_list(
+                    "project_id", "reviewer_id", "phase_instance_id", "workflow_node_id"
+                )
+            )
+            new_reviews = []
+            for project, phase_instance, node_obj in targets:
                 for expert in experts:
-                    # Check duplication
-                    if not Review.objects.filter(
-                        project=project,
-                        reviewer=expert,
-                        review_type=review_type,
-                        phase_instance=phase_instance,
-                        workflow_node_id=node_id,
-                        is_expert_review=True,
-                    ).exists():
-                        review = ReviewService.create_review(
+                    key = (project.id, expert.id, phase_instance.id, node_obj.id)
+                    if key in existing:
+                        continue
+                    existing.add(key)
+                    new_reviews.append(
+                        Review(
                             project=project,
                             phase_instance=phase_instance,
                             review_type=review_type,
-                            reviewer=expert,
-                            workflow_node=node_id,
+                            status=Review.ReviewStatus.PENDING,
                             is_expert_review=True,
+                            reviewer=expert,
+                            workflow_node=node_obj,
                         )
-                        created_reviews.append(review)
-                        NotificationService.notify_review_assigned(review)
+                    )
+
+            created_reviews = Review.objects.bulk_create(
+                new_reviews, batch_size=ASSIGNMENT_BULK_SIZE
+            )
+            NotificationService.notify_reviews_assigned(created_reviews, defer=True)
+            if created_reviews:
+                # bulk_create 不触发 post_save，需手动失效仪表板缓存
+                DashboardService.invalidate_cache()
 
         return created_reviews
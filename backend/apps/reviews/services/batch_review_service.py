@@ -0,0 +1,527 @@
+"""
+批量审核：一次加载审核记录、阶段实例与负责管理员，在同一事务内校验并流转，
+审核结果、阶段实例、项目状态与下一节点的审核记录统一批量写入。
+"""
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.notifications.services import NotificationService
+from apps.operations.models import AsyncTaskRecord, OperationLog
+from apps.operations.services import OperationLogService
+from apps.projects.models import Project, ProjectAdvisor, ProjectPhaseInstance
+from apps.projects.services.archive_service import ensure_project_archive
+from apps.projects.services.dashboard_service import DashboardService
+from apps.projects.services.statistics_service import BatchStatisticsService
+from apps.system_settings.services import AdminAssignmentService, WorkflowService
+from apps.utils.request_cache import request_cache_scope
+
+from ..models import Review
+from . import PHASE_COMPLETION, ReviewService
+
+logger = logging.getLogger(__name__)
+
+# 每条 UPDATE / INSERT 语句包含的记录数
+BATCH_REVIEW_BULK_SIZE = 500
+
+REVIEW_RESULT_FIELDS = [
+    "status",
+    "reviewer",
+    "comments",
+    "score",
+    "score_details",
+    "reviewed_at",
+    "closure_rating",
+]
+
+
+class _BatchChanges:
+    """
+    收集批量审核产生的变更，校验全部完成后一次写入
+    """
+
+    def __init__(self, pending_keys):
+        self.reviews = []
+        self.phase_instances = {}
+        self.projects = {}
+        self.stale_buckets = set()
+        self.next_reviews = []
+        self.closed_projects = []
+        self.role_scopes = {}
+        # 已存在的待审核记录 (项目, 阶段实例, 节点, 评审类型)，避免重复创建
+        self.pending_keys = pending_keys
+
+    def touch_project(self, project):
+        """修改项目状态前调用，记下项目原来所在的统计分组"""
+        if project.id not in self.projects:
+            self.stale_buckets.add(BatchStatisticsService.project_bucket_key(project))
+            self.projects[project.id] = project
+
+    def add_next_review(self, project, phase_instance, node_id, review_type):
+        key = (project.id, phase_instance.id, node_id, review_type)
+        if key in self.pending_keys:
+            return
+        self.pending_keys.add(key)
+        self.next_reviews.append(
+            Review(
+                project=project,
+                phase_instance=phase_instance,
+                workflow_node_id=node_id,
+                review_type=review_type,
+                status=Review.ReviewStatus.PENDING,
+                is_expert_review=False,
+            )
+        )
+
+    def flush(self):
+        if not self.reviews:
+            return
+        now = timezone.now()
+        Review.objects.bulk_update(
+            self.reviews, REVIEW_RESULT_FIELDS, batch_size=BATCH_REVIEW_BULK_SIZE
+        )
+        phase_instances = list(self.phase_instances.values())
+        for phase_instance in phase_instances:
+            phase_instance.updated_at = now
+        ProjectPhaseInstance.objects.bulk_update(
+            phase_instances,
+            ["current_node_id", "step", "state", "updated_at"],
+            batch_size=BATCH_REVIEW_BULK_SIZE,
+        )
+        projects = list(self.projects.values())
+        for project in projects:
+            project.updated_at = now
+        Project.objects.bulk_update(
+            projects, ["status", "updated_at"], batch_size=BATCH_REVIEW_BULK_SIZE
+        )
+        Review.objects.bulk_create(self.next_reviews, batch_size=BATCH_REVIEW_BULK_SIZE)
+        for project in self.closed_projects:
+            ensure_project_archive(project)
+
+        # bulk_update / bulk_create 不触发信号：按变更前后所在分组重算统计快照，并失效仪表板缓存
+        BatchStatisticsService.refresh_buckets(
+            self.stale_buckets
+            | {
+                BatchStatisticsService.project_bucket_key(project)
+                for project in projects
+            }
+        )
+        DashboardService.invalidate_cache()
+
+
+class BatchReviewService:
+    """
+    批量审核服务
+    """
+
+    @staticmethod
+    def _load_reviews(review_ids):
+        return list(
+            Review.objects.filter(id__in=review_ids, status=Review.ReviewStatus.PENDING)
+            .select_related(
+                "project",
+                "project__batch",
+                "project__leader",
+                "workflow_node",
+                "workflow_node__role_fk",
+                "phase_instance",
+            )
+            .select_for_update(of=("self",))
+            .order_by("id")
+        )
+
+    @staticmethod
+    def _permission_errors(user, reviews):
+        """
+        批量权限校验，规则同 ReviewViewSet.check_review_permission：
+        导师节点一次查出用户指导的项目，管理员节点按（节点, 负责人学院）解析一次负责管理员。
+        :return: {review_id: 失败原因}
+        """
+        teacher_project_ids = {
+            review.project_id
+            for review in reviews
+            if not review.reviewer_id
+            and review.workflow_node
+            and review.workflow_node.get_role_code() == "TEACHER"
+        }
+        advised = set()
+        if teacher_project_ids and (user.is_teacher or user.is_admin):
+            advised = set(
+                ProjectAdvisor.objects.filter(
+                    user=user, project_id__in=teacher_project_ids
+                ).values_list("project_id", flat=True)
+            )
+
+        admins = {}
+        errors = {}
+        for review in reviews:
+            node = review.workflow_node
+            if review.reviewer_id:
+                permitted = review.reviewer_id == user.id
+            elif not node:
+                errors[review.id] = "审核记录未绑定工作流节点，无法解析权限"
+                continue
+            elif node.get_role_code() == "TEACHER":
+                permitted = review.project_id in advised
+            else:
+                phase = ReviewService._get_phase_from_review_type(review.review_type)
+                if not phase:
+                    errors[review.id] = "审核类型不支持管理员分配"
+                    continue
+                project = review.project
+                role = node.role_fk
+                scoped = role and role.scope_dimension not in (None, "", "SCHOOL")
+                key = (node.id, project.leader.college if scoped else None)
+                if key not in admins:
+                    try:
+                        admins[key] = AdminAssignmentService.resolve_admin_user(
+                            project, phase, node
+                        ).id
+                    except ValueError as exc:
+                        admins[key] = exc
+                if isinstance(admins[key], ValueError):
+                    errors[review.id] = str(admins[key])
+                    continue
+                permitted = admins[key] == user.id
+            if not permitted:
+                errors[review.id] = "无权限"
+        return errors
+
+    @staticmethod
+    def _window_error(review, windows, check_date):
+        """
+        阶段时间窗口校验，同一 (阶段, 批次) 只读取一次配置
+        """
+        phase = ReviewService._get_phase_from_review_type(review.review_type)
+        if not phase:
+            return None
+        key = (phase, review.project.batch_id)
+        if key not in windows:
+            windows[key] = WorkflowService.check_phase_window(
+                phase, review.project.batch, check_date
+            )
+        ok, msg = windows[key]
+        return None if ok else msg or "不在审核时间范围内"
+
+    @staticmethod
+    def _expert_progress(reviews):
+        """
+        一次分组查询各审核所在节点的专家评审数：{(项目, 阶段实例, 节点): (总数, 未提交数)}
+        """
+        reviews = [
+            review
+            for review in reviews
+            if not review.is_expert_review and review.workflow_node_id
+        ]
+        if not reviews:
+            return {}
+        rows = (
+            Review.objects.filter(
+                project_id__in={review.project_id for review in reviews},
+                workflow_node_id__in={review.workflow_node_id for review in reviews},
+                is_expert_review=True,
+            )
+            .values_list("project_id", "phase_instance_id", "workflow_node_id")
+            .annotate(
+                total=Count("id"),
+                pending=Count("id", filter=Q(status=Review.ReviewStatus.PENDING)),
+            )
+            .order_by()
+        )
+        return {tuple(row[:3]): (row[3], row[4]) for row in rows}
+
+    @staticmethod
+    def _expert_error(review, progress):
+        """
+        规则同 ReviewService._ensure_expert_reviews_completed
+        """
+        if review.is_expert_review:
+            return None
+        if not review.workflow_node_id:
+            return "审核记录缺少工作流节点，无法校验专家评审状态"
+        node = review.workflow_node
+        expert_required = bool(node and node.require_expert_review)
+        if node and not expert_required:
+            return None
+        total, pending = progress.get(
+            (review.project_id, review.phase_instance_id, review.workflow_node_id),
+            (0, 0),
+        )
+        if total:
+            return "专家评审尚未全部提交" if pending else None
+        if expert_required:
+            return "请先分配专家评审"
+        return None
+
+    @staticmethod
+    def _pending_keys(reviews):
+        phase_instance_ids = {
+            review.phase_instance_id for review in reviews if review.phase_instance_id
+        }
+        return set(
+            Review.objects.filter(
+                phase_instance_id__in=phase_instance_ids,
+                status=Review.ReviewStatus.PENDING,
+                is_expert_review=False,
+            ).values_list(
+                "project_id", "phase_instance_id", "workflow_node_id", "review_type"
+            )
+        )
+
+    @staticmethod
+    def _approve(review, user, comments, score, score_details, closure_rating, changes):
+        """
+        在内存中完成一条审核通过及流程流转，校验失败时抛出 ValueError 且不修改任何对象
+        """
+        total_score, normalized_details = ReviewService._normalize_score_details(
+            review, score, score_details
+        )
+
+        phase_instance = None
+        next_node = None
+        next_node_id = None
+        if not review.is_expert_review:
+            phase_instance = review.phase_instance
+            if not phase_instance:
+                raise ValueError("审核记录缺少阶段实例，无法流转")
+            current_node_id = ReviewService._ensure_review_matches_current_node(
+                review, phase_instance
+            )
+            next_node = WorkflowService.get_next_node_by_id(
+                current_node_id, phase_instance.phase, review.project.batch
+            )
+            if next_node and next_node.node_type in ["REVIEW", "APPROVAL"]:
+                next_node_id = ReviewService._resolve_workflow_node_id(next_node)
+                if not next_node_id:
+                    raise ValueError("审核节点未绑定工作流配置，无法创建审核记录")
+
+        review.status = Review.ReviewStatus.APPROVED
+        review.reviewer = user
+        review.comments = comments
+        review.score = total_score
+        review.score_details = normalized_details
+        review.reviewed_at = timezone.now()
+        if review.review_type == Review.ReviewType.CLOSURE and closure_rating:
+            review.closure_rating = closure_rating
+        changes.reviews.append(review)
+
+        # 专家评审只更新记录，不流转状态
+        if review.is_expert_review:
+            return
+
+        project = review.project
+        changes.touch_project(project)
+        changes.phase_instances[phase_instance.id] = phase_instance
+        if next_node:
+            phase_instance.current_node_id = next_node.id
+            phase_instance.step = next_node.code
+            project.status = ReviewService._project_status_for_node(
+                project, next_node, phase_instance.phase, changes.role_scopes
+            )
+            if next_node_id:
+                changes.add_next_review(
+                    project, phase_instance, next_node_id, review.review_type
+                )
+        else:
+            completion = PHASE_COMPLETION.get(phase_instance.phase)
+            if completion:
+                project.status, phase_instance.step = completion
+                phase_instance.state = ProjectPhaseInstance.State.COMPLETED
+                if project.status == Project.ProjectStatus.CLOSED:
+                    changes.closed_projects.append(project)
+
+    @staticmethod
+    def run(
+        user,
+        review_ids,
+        action,
+        *,
+        comments="",
+        score=None,
+        score_details=None,
+        closure_rating=None,
+        target_node_id=None,
+    ):
+        """
+        批量审核 review_ids 中仍待审核的记录。
+
+        权限、时间窗口与专家评审状态一次性批量校验；审核通过在内存中流转后统一批量写入，
+        驳回涉及退回重建阶段实例，仍逐条调用 ReviewService.reject_review（各自一个保存点）。
+        通知在事务提交后批量写入。
+        :return: {"success": 成功数, "failed": [{"id": review_id, "reason": 原因}]}
+        """
+        approve = action == "approve"
+        failed = []
+        succeeded = []
+        with transaction.atomic():
+            reviews = BatchReviewService._load_reviews(review_ids)
+            errors = BatchReviewService._permission_errors(user, reviews)
+            progress = BatchReviewService._expert_progress(reviews)
+            changes = _BatchChanges(
+                BatchReviewService._pending_keys(reviews) if approve else set()
+            )
+            windows = {}
+            projects = {}
+            phase_instances = {}
+            check_date = timezone.now().date()
+            for review in reviews:
+                reason = errors.get(review.id) or BatchReviewService._window_error(
+                    review, windows, check_date
+                )
+                if reason:
+                    failed.append({"id": review.id, "reason": reason})
+                    continue
+                # 同一项目、阶段实例的多条审核共享同一对象，前一条的流转对后一条可见
+                review.project = projects.setdefault(review.project_id, review.project)
+                if review.phase_instance_id:
+                    review.phase_instance = phase_instances.setdefault(
+                        review.phase_instance_id, review.phase_instance
+                    )
+                try:
+                    reason = BatchReviewService._expert_error(review, progress)
+                    if reason:
+                        raise ValueError(reason)
+                    if approve:
+                        BatchReviewService._approve(
+                            review,
+                            user,
+                            comments,
+                            score,
+                            score_details,
+                            closure_rating,
+                            changes,
+                        )
+                        result = True
+                    else:
+                        result = ReviewService.reject_review(
+                            review, user, comments, target_node_id
+                        )
+                except ValueError as exc:
+                    failed.append({"id": review.id, "reason": str(exc)})
+                    continue
+                if not result:
+                    failed.append({"id": review.id, "reason": "审核流程处理失败"})
+                    continue
+                if review.is_expert_review:
+                    key = (
+                        review.project_id,
+                        review.phase_instance_id,
+                        review.workflow_node_id,
+                    )
+                    if key in progress:
+                        total, pending = progress[key]
+                        progress[key] = (total, pending - 1)
+                succeeded.append(review)
+
+            changes.flush()
+            NotificationService.notify_review_results(
+                [review.project for review in succeeded],
+                approve,
+                comments,
+                defer=True,
+            )
+
+        return {"success": len(succeeded), "failed": failed}
+
+    @staticmethod
+    def create_task(user, review_ids, action, **params):
+        action_name = "通过" if action == "approve" else "驳回"
+        return AsyncTaskRecord.objects.create(
+            task_type=AsyncTaskRecord.TaskType.BATCH_REVIEW,
+            title=f"批量审核{action_name}（{len(review_ids)}条）",
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+            progress=0,
+            message="任务已创建",
+            payload={"review_ids": list(review_ids), "action": action, **params},
+            created_by=user,
+        )
+
+    @staticmethod
+    def dispatch_task(task):
+        """
+        投递批量审核任务到 Celery；投递失败时在当前进程内同步执行。
+        """
+        try:
+            from ..tasks import run_batch_review_task
+
+            async_result = run_batch_review_task.delay(task.id)
+            payload = dict(task.payload, celery_task_id=async_result.id)
+            AsyncTaskRecord.objects.filter(id=task.id).update(payload=payload)
+        except Exception:
+            logger.exception(
+                "Failed to enqueue batch review task %s; running synchronously",
+                task.id,
+            )
+            BatchReviewService.run_task(task.id)
+        task.refresh_from_db()
+        return task
+
+    @staticmethod
+    def run_task(task_id):
+        claimed = AsyncTaskRecord.objects.filter(
+            id=task_id,
+            status=AsyncTaskRecord.TaskStatus.PENDING,
+        ).update(
+            status=AsyncTaskRecord.TaskStatus.RUNNING,
+            progress=10,
+            started_at=timezone.now(),
+            message="正在批量审核",
+        )
+        task = AsyncTaskRecord.objects.select_related("created_by__role_fk").get(
+            id=task_id
+        )
+        if not claimed:
+            return task
+
+        payload = dict(task.payload)
+        payload.pop("celery_task_id", None)
+        review_ids = payload.pop("review_ids", [])
+        action = payload.pop("action", "")
+        try:
+            if not task.created_by:
+                raise ValueError("任务创建人不存在")
+            # 任务不在请求范围内，开启请求级缓存复用流程图、节点与系统配置
+            with request_cache_scope():
+                result = BatchReviewService.run(
+                    task.created_by, review_ids, action, **payload
+                )
+            task.status = AsyncTaskRecord.TaskStatus.SUCCESS
+            task.message = (
+                f"成功 {result['success']} 条，失败 {len(result['failed'])} 条"
+            )
+            task.result = result
+            log_status = OperationLog.LogStatus.SUCCESS
+            detail = {
+                "action": action,
+                "success": result["success"],
+                "failed": len(result["failed"]),
+            }
+        except Exception as exc:
+            logger.exception("Failed to run batch review task %s", task.id)
+            message = (
+                str(exc) if isinstance(exc, ValueError) else "批量审核失败，请稍后重试"
+            )
+            task.status = AsyncTaskRecord.TaskStatus.FAILED
+            task.message = message
+            task.result = {"errors": [message]}
+            log_status = OperationLog.LogStatus.FAILED
+            detail = {"action": action, "error": message}
+        task.progress = 100
+        task.completed_at = timezone.now()
+        task.save(
+            update_fields=["status", "progress", "message", "result", "completed_at"]
+        )
+        OperationLogService.log(
+            operator=task.created_by,
+            module="审核管理",
+            action="批量审核",
+            target_type="AsyncTaskRecord",
+            target_id=task.id,
+            target_name=task.title,
+            status=log_status,
+            detail=detail,
+        )
+        return task
@@ -0,0 +1,13 @@
+try:
+    from config.celery import app
+except Exception:  # pragma: no cover
+    app = None
+
+from .services.batch_review_service import BatchReviewService
+
+
+if app:
+
+    @app.task(name="reviews.run_batch_review_task")
+    def run_batch_review_task(task_id):
+        BatchReviewService.run_task(task_id)
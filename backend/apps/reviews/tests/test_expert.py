@@ -1,8 +1,11 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from apps.projects.models import Project, ProjectPhaseInstance
 from apps.projects.services.phase_service import ProjectPhaseService
+from apps.notifications.models import Notification
 from apps.reviews.models import Review, ExpertGroup
 from apps.reviews.services import ReviewService
 from apps.dictionaries.models import DictionaryItem, DictionaryType
@@ -297,3 +300,48 @@ class ExpertGroupTestCase(TestCase):
                 is_expert_review=True,
             ).exists()
         )
+
+    def test_bulk_assignment_query_count_does_not_grow_with_projects(self):
+        with CaptureQueriesContext(connection) as single:
+            ReviewService.assign_project_to_group(
+                project_ids=[self.project.id],
+                group_id=self.group.id,
+                creator=self.admin,
+            )
+
+        extra_ids = []
+        for index in range(3):
+            project = Project.objects.create(
+                project_no=f"DC2025010{index}",
+                title=f"Bulk Review Project {index}",
+                leader=self.student,
+                status=Project.ProjectStatus.SUBMITTED,
+                year=2025,
+                level=self.level,
+                batch=self.batch,
+            )
+            ProjectPhaseService.ensure_current(
+                project,
+                ProjectPhaseInstance.Phase.APPLICATION,
+                step=self.college_node.code,
+            )
+            extra_ids.append(project.id)
+
+        # 通知在事务提交后批量写入，不计入分配本身的查询数
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as bulk:
+                created = ReviewService.assign_project_to_group(
+                    project_ids=[self.project.id, *extra_ids],
+                    group_id=self.group.id,
+                    creator=self.admin,
+                )
+
+        self.assertEqual(len(created), 6)
+        self.assertEqual(len(bulk.captured_queries), len(single.captured_queries))
+        self.assertEqual(
+            Notification.objects.filter(
+                related_project_id__in=extra_ids,
+                notification_type=Notification.NotificationType.REVIEW,
+            ).count(),
+            6,
+        )
@@ -1,8 +1,12 @@
 from django.contrib.auth import get_user_model
 from decimal import Decimal
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
+from apps.notifications.models import Notification
+from apps.operations.models import AsyncTaskRecord
 from apps.projects.models import Project, ProjectChangeRequest, ProjectPhaseInstance
 from apps.reviews.models import ExpertGroup, Review
 from apps.reviews.services import ReviewService
@@ -325,6 +329,172 @@ class ReviewApiValidationTestCase(TestCase):
         review.refresh_from_db()
         self.assertEqual(review.status, Review.ReviewStatus.PENDING)
 
+    def _college_reviews(self, count, start=0):
+        """
+        学院审核 -> 校级审核 两级流程下 count 条待学院审核的记录（共用同一流程）
+        """
+        if not hasattr(self, "_college_workflow_nodes"):
+            workflow = WorkflowConfig.objects.create(
+                name="Batch Engine Workflow",
+                phase=WorkflowConfig.Phase.APPLICATION,
+                batch=self.batch,
+                version=1,
+                is_active=True,
+            )
+            self._college_workflow_nodes = (
+                WorkflowNode.objects.create(
+                    workflow=workflow,
+                    code="COLLEGE_REVIEW",
+                    name="学院审核",
+                    node_type=WorkflowNode.NodeType.APPROVAL,
+                    role_fk=self.admin.role_fk,
+                    sort_order=1,
+                ),
+                WorkflowNode.objects.create(
+                    workflow=workflow,
+                    code="SCHOOL_REVIEW",
+                    name="校级审核",
+                    node_type=WorkflowNode.NodeType.APPROVAL,
+                    role_fk=self.level1_admin.role_fk,
+                    sort_order=2,
+                ),
+            )
+        college_node = self._college_workflow_nodes[0]
+        reviews = []
+        for index in range(start, start + count):
+            project = Project.objects.create(
+                project_no=f"RVB2026{index:04d}",
+                title=f"批量审核项目{index}",
+                leader=self.student,
+                status=Project.ProjectStatus.COLLEGE_AUDITING,
+                year=self.batch.year,
+                batch=self.batch,
+            )
+            phase_instance = ProjectPhaseInstance.objects.create(
+                project=project,
+                phase=ProjectPhaseInstance.Phase.APPLICATION,
+                attempt_no=1,
+                step=college_node.code,
+                current_node_id=college_node.id,
+                state=ProjectPhaseInstance.State.IN_PROGRESS,
+                created_by=self.student,
+            )
+            reviews.append(
+                Review.objects.create(
+                    project=project,
+                    phase_instance=phase_instance,
+                    workflow_node=college_node,
+                    review_type=Review.ReviewType.APPLICATION,
+                    status=Review.ReviewStatus.PENDING,
+                )
+            )
+        return reviews
+
+    def _batch_approve(self, reviews):
+        return self.client.post(
+            "/api/v1/reviews/batch-review/",
+            {
+                "review_ids": [review.id for review in reviews],
+                "action": "approve",
+                "comments": "同意",
+            },
+            format="json",
+        )
+
+    def test_batch_review_approves_in_fixed_queries(self):
+        # 首次审核预热配置与流程缓存，留一条待审核记录使统计分组始终存在
+        with self.captureOnCommitCallbacks(execute=True):
+            reviews = self._college_reviews(12)
+            warm_up, small, large = reviews[:1], reviews[1:3], reviews[3:11]
+            self._batch_approve(warm_up)
+
+        counts = []
+        for batch in (small, large):
+            with CaptureQueriesContext(connection) as queries, (
+                self.captureOnCommitCallbacks(execute=True)
+            ):
+                response = self._batch_approve(batch)
+            self.assertEqual(
+                response.data["data"], {"success": len(batch), "failed": []}
+            )
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+        school_node = self._college_workflow_nodes[1]
+        for review in reviews[:11]:
+            review.refresh_from_db()
+            self.assertEqual(review.status, Review.ReviewStatus.APPROVED)
+            self.assertEqual(review.reviewer_id, self.admin.id)
+            self.assertEqual(review.project.status, Project.ProjectStatus.LEVEL1_AUDITING)
+            self.assertEqual(review.phase_instance.current_node_id, school_node.id)
+            self.assertEqual(review.phase_instance.step, school_node.code)
+        self.assertEqual(
+            Review.objects.filter(
+                workflow_node=school_node, status=Review.ReviewStatus.PENDING
+            ).count(),
+            11,
+        )
+        self.assertEqual(
+            Notification.objects.filter(
+                recipient=self.student, title="项目审核通过"
+            ).count(),
+            11,
+        )
+
+    def test_batch_review_reports_pending_expert_reviews(self):
+        ready, waiting = self._college_reviews(2)
+        college_node = self._college_workflow_nodes[0]
+        college_node.require_expert_review = True
+        college_node.save(update_fields=["require_expert_review"])
+        Review.objects.create(
+            project=ready.project,
+            phase_instance=ready.phase_instance,
+            workflow_node=college_node,
+            review_type=Review.ReviewType.APPLICATION,
+            status=Review.ReviewStatus.APPROVED,
+            is_expert_review=True,
+            reviewer=self.level1_admin,
+        )
+        Review.objects.create(
+            project=waiting.project,
+            phase_instance=waiting.phase_instance,
+            workflow_node=college_node,
+            review_type=Review.ReviewType.APPLICATION,
+            status=Review.ReviewStatus.PENDING,
+            is_expert_review=True,
+            reviewer=self.level1_admin,
+        )
+
+        response = self._batch_approve([ready, waiting])
+
+        self.assertEqual(response.data["data"]["success"], 1)
+        self.assertEqual(
+            response.data["data"]["failed"],
+            [{"id": waiting.id, "reason": "专家评审尚未全部提交"}],
+        )
+        waiting.refresh_from_db()
+        self.assertEqual(waiting.status, Review.ReviewStatus.PENDING)
+        self.assertEqual(waiting.project.status, Project.ProjectStatus.COLLEGE_AUDITING)
+
+    @override_settings(BATCH_REVIEW_ASYNC_THRESHOLD=2)
+    def test_batch_review_over_threshold_runs_as_task(self):
+        reviews = self._college_reviews(3)
+
+        response = self._batch_approve(reviews)
+
+        self.assertEqual(response.status_code, 200)
+        task = AsyncTaskRecord.objects.get(id=response.data["data"]["task"]["id"])
+        self.assertEqual(task.task_type, AsyncTaskRecord.TaskType.BATCH_REVIEW)
+        self.assertEqual(task.status, AsyncTaskRecord.TaskStatus.SUCCESS)
+        self.assertEqual(task.created_by, self.admin)
+        self.assertEqual(task.result, {"success": 3, "failed": []})
+        self.assertFalse(
+            Review.objects.filter(
+                id__in=[review.id for review in reviews],
+                status=Review.ReviewStatus.PENDING,
+            ).exists()
+        )
+
     def test_revise_rejected_review_updates_comment_without_rejecting_again(self):
         review = self._pending_review(self.batch, "RV20260004")
         review.status = Review.ReviewStatus.REJECTED
@@ -2,6 +2,7 @@
 审核管理视图
 """
 
+from django.conf import settings
 from django.utils import timezone
 from django.db.models import Exists, OuterRef, Q
 from decimal import Decimal, InvalidOperation
@@ -11,8 +12,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
 from apps.notifications.services import NotificationService
+from apps.operations.serializers import AsyncTaskRecordSerializer
 from apps.system_settings.services import SystemSettingService, AdminAssignmentService
 from apps.utils.pagination import (
+    KeysetPageNumberPagination,
     non_negative_int,
     optional_positive_int,
     positive_int_list,
@@ -21,6 +24,7 @@ from apps.utils.pagination import (
 from ..models import Review
 from ..serializers import ReviewActionSerializer, ReviewSerializer
 from ..services import ReviewService
+from ..services.batch_review_service import BatchReviewService
 
 
 def _parse_approved_budget(value):
@@ -52,6 +56,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     ]
     search_fields = ["project__project_no", "project__title"]
     ordering_fields = ["created_at", "reviewed_at"]
+    pagination_class = KeysetPageNumberPagination
 
     def _resp(self, request, payload, status_code=status.HTTP_200_OK):
         return Response(payload, status=status_code)
@@ -573,57 +578,48 @@ class ReviewViewSet(viewsets.ModelViewSet):
             else:
                 target_node_id = None
 
-        success = 0
-        failed = []
-        for review in self.get_queryset().filter(
-            id__in=review_ids, status=Review.ReviewStatus.PENDING
-        ):
-            try:
-                permitted = self.check_review_permission(review, request.user)
-            except ValueError as exc:
-                failed.append({"id": review.id, "reason": str(exc)})
-                continue
-            if not permitted:
-                failed.append({"id": review.id, "reason": "无权限"})
-                continue
-
-            # 检查审核时间窗口 - 按阶段窗口配置
-            ok, msg = self._check_review_time_window(review)
-            if not ok:
-                failed.append({"id": review.id, "reason": msg or "不在审核时间范围内"})
-                continue
-            try:
-                result = None
-                if action_type == "approve":
-                    result = ReviewService.approve_review(
-                        review,
-                        request.user,
-                        comments,
-                        score,
-                        closure_rating,
-                        score_details,
-                    )
-                else:
-                    result = ReviewService.reject_review(
-                        review, request.user, comments, target_node_id
-                    )
-            except ValueError as exc:
-                failed.append({"id": review.id, "reason": str(exc)})
-                continue
-            if not result:
-                failed.append({"id": review.id, "reason": "审核流程处理失败"})
-                continue
-            NotificationService.notify_review_result(
-                review.project, action_type == "approve", comments
+        review_ids = list(
+            self.get_queryset()
+            .filter(id__in=review_ids, status=Review.ReviewStatus.PENDING)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        params = {
+            "comments": comments,
+            "score": score,
+            "score_details": score_details,
+            "closure_rating": closure_rating,
+            "target_node_id": target_node_id,
+        }
+
+        # 条数较多时转为后台任务，逐条结果写入任务记录，可在任务中心查看
+        if len(review_ids) > settings.BATCH_REVIEW_ASYNC_THRESHOLD:
+            task = BatchReviewService.create_task(
+                request.user, review_ids, action_type, **params
+            )
+            task = BatchReviewService.dispatch_task(task)
+            return self._resp(
+                request,
+                {
+                    "code": 200,
+                    "message": "批量审核已转入后台处理，可在任务中心查看结果",
+                    "data": {
+                        "task": AsyncTaskRecordSerializer(
+                            task, context={"request": request}
+                        ).data
+                    },
+                },
             )
-            success += 1
 
+        result = BatchReviewService.run(
+            request.user, review_ids, action_type, **params
+        )
         return self._resp(
             request,
             {
                 "code": 200,
                 "message": "批量审核完成",
-                "data": {"success": success, "failed": failed},
+                "data": result,
             },
         )
 
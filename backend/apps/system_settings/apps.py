@@ -5,3 +5,6 @@ class SystemSettingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.system_settings"
     verbose_name = "系统设置"
+
+    def ready(self):
+        from . import signals  # noqa: F401
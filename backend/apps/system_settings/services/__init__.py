@@ -2,10 +2,21 @@
 系统设置服务
 """
 
+import copy
+
 from ..models import SystemSetting, ProjectBatch
 from .workflow_service import WorkflowService
 from .admin_assignment_service import AdminAssignmentService
+from apps.utils.cache import CacheNamespace
 from apps.utils.pagination import optional_positive_int
+from apps.utils.request_cache import request_cached
+
+SETTINGS_CACHE = CacheNamespace(
+    "system_settings", timeout_setting="SYSTEM_SETTINGS_CACHE_TIMEOUT"
+)
+SETTINGS_CACHE_PREFIX = SETTINGS_CACHE.prefix
+# 缓存中区分“无当前批次”与“未缓存”
+_NO_BATCH = "__none__"
 
 
 DEFAULT_SETTINGS = {
@@ -53,13 +64,41 @@ class SystemSettingService:
 
     @staticmethod
     def get_current_batch():
-        return (
+        batch = request_cached(
+            f"{SETTINGS_CACHE_PREFIX}current_batch",
+            lambda: SystemSettingService._cached(
+                "current_batch", SystemSettingService._load_current_batch
+            ),
+        )
+        return None if batch == _NO_BATCH else batch
+
+    @staticmethod
+    def _load_current_batch():
+        batch = (
             ProjectBatch.objects.filter(
                 status=ProjectBatch.STATUS_ACTIVE, is_active=True, is_deleted=False
             )
             .order_by("-is_current", "-year", "-id")
             .first()
         )
+        return batch if batch is not None else _NO_BATCH
+
+    @staticmethod
+    def get_batch_settings(batch_id):
+        """
+        获取批次下全部启用配置 {code: data}，一次查询覆盖所有配置编码。
+        """
+        return request_cached(
+            f"{SETTINGS_CACHE_PREFIX}batch_settings:{batch_id}",
+            lambda: SystemSettingService._cached(
+                f"batch_settings:{batch_id}",
+                lambda: dict(
+                    SystemSetting.objects.filter(
+                        batch_id=batch_id, is_active=True
+                    ).values_list("code", "data")
+                ),
+            ),
+        )
 
     @staticmethod
     def get_setting(code, default=None, batch=None):
@@ -67,40 +106,48 @@ class SystemSettingService:
         获取指定批次的配置。
         每个批次必须有自己的独立配置，不应该回退到全局配置。
         """
-        batch_obj = batch
-        if batch_obj is None:
+        if batch is None:
             batch_obj = SystemSettingService.get_current_batch()
-        elif isinstance(batch_obj, int):
-            batch_obj = ProjectBatch.objects.filter(id=batch_obj).first()
-        elif isinstance(batch_obj, str):
-            batch_id = optional_positive_int(batch_obj)
-            batch_obj = (
-                ProjectBatch.objects.filter(id=batch_id).first()
-                if batch_id is not None
-                else None
-            )
+            batch_id = batch_obj.id if batch_obj else None
+        elif isinstance(batch, int):
+            batch_id = batch
+        elif isinstance(batch, str):
+            batch_id = optional_positive_int(batch)
+        else:
+            batch_id = batch.id
 
         # 只查找指定批次的配置，不回退到全局配置
-        setting = None
-        if batch_obj:
-            setting = SystemSetting.objects.filter(
-                code=code, is_active=True, batch=batch_obj
-            ).first()
+        data = None
+        if batch_id:
+            data = SystemSettingService.get_batch_settings(batch_id).get(code)
 
         # 如果找到配置，合并到默认值
         base = default or DEFAULT_SETTINGS.get(code, {})
-        if setting:
+        if data is not None:
             merged = dict(base)
-            merged.update(setting.data or {})
+            merged.update(copy.deepcopy(data) or {})
             return merged
         return base
 
+    @staticmethod
+    def invalidate_cache():
+        """
+        批次或配置变更后失效缓存（含当前请求内的请求级缓存）
+        """
+        SETTINGS_CACHE.invalidate()
+
+    @staticmethod
+    def _cached(name, loader):
+        return SETTINGS_CACHE.get_or_set(name, loader)
+
     # 时间窗口检查统一使用阶段窗口配置
     # 请使用 WorkflowService.check_phase_window
 
 
 __all__ = [
     "DEFAULT_SETTINGS",
+    "SETTINGS_CACHE",
+    "SETTINGS_CACHE_PREFIX",
     "SystemSettingService",
     "WorkflowService",
     "AdminAssignmentService",
@@ -2,11 +2,21 @@
 Workflow configuration helper.
 """
 
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import date
-from typing import List, Optional, Dict, Any, cast
+from typing import List, Optional, Dict, Any, Tuple, Union, cast
+
+from django.conf import settings
+from django.db import connection
 
 from apps.system_settings.models import WorkflowConfig, WorkflowNode, ProjectBatch
+from apps.utils.cache import CacheNamespace
+from apps.utils.request_cache import get_request_cache, request_cached
+
+# 编译后的流程图保存在进程内，共享缓存中只保存版本号
+WORKFLOW_CACHE = CacheNamespace("workflow_graph")
+WORKFLOW_CACHE_PREFIX = WORKFLOW_CACHE.prefix
 
 
 @dataclass(frozen=True)
@@ -22,6 +32,103 @@ class WorkflowNodeDef:
     role_fk_id: Optional[int] = None  # 角色外键ID
 
 
+@dataclass(frozen=True)
+class WorkflowGraph:
+    """
+    编译后的流程图：节点按 ID / code 建立索引，前后节点与退回目标预先计算。
+    """
+
+    phase: str
+    workflow_id: Optional[int]
+    nodes: Tuple[WorkflowNodeDef, ...]
+    batch_id: Optional[int] = None  # 流程配置所属批次（全局流程为 None）
+    by_id: Dict[int, WorkflowNodeDef] = field(default_factory=dict)
+    by_code: Dict[str, WorkflowNodeDef] = field(default_factory=dict)
+    index_by_id: Dict[int, int] = field(default_factory=dict)
+    next_by_id: Dict[int, Optional[WorkflowNodeDef]] = field(default_factory=dict)
+    next_by_code: Dict[str, Optional[WorkflowNodeDef]] = field(default_factory=dict)
+    previous_by_code: Dict[str, Optional[WorkflowNodeDef]] = field(
+        default_factory=dict
+    )
+    reject_targets_by_id: Dict[int, Tuple[WorkflowNodeDef, ...]] = field(
+        default_factory=dict
+    )
+
+    @property
+    def persisted(self) -> bool:
+        """节点是否来自已落库的流程配置（否则为内置默认流程）"""
+        return self.workflow_id is not None
+
+    @classmethod
+    def compile(
+        cls,
+        phase: str,
+        workflow_id: Optional[int],
+        nodes: List[WorkflowNodeDef],
+        batch_id: Optional[int] = None,
+    ) -> "WorkflowGraph":
+        by_id: Dict[int, WorkflowNodeDef] = {}
+        by_code: Dict[str, WorkflowNodeDef] = {}
+        index_by_id: Dict[int, int] = {}
+        next_by_id: Dict[int, Optional[WorkflowNodeDef]] = {}
+        next_by_code: Dict[str, Optional[WorkflowNodeDef]] = {}
+        previous_by_code: Dict[str, Optional[WorkflowNodeDef]] = {}
+        for idx, node in enumerate(nodes):
+            next_node = nodes[idx + 1] if idx + 1 < len(nodes) else None
+            # 与逐个遍历的查找保持一致：ID / code 重复时以第一个节点为准
+            if node.id not in by_id:
+                by_id[node.id] = node
+                index_by_id[node.id] = idx
+                next_by_id[node.id] = next_node
+            if node.code not in by_code:
+                by_code[node.code] = node
+                next_by_code[node.code] = next_node
+                previous_by_code[node.code] = nodes[idx - 1] if idx > 0 else None
+
+        reject_targets_by_id: Dict[int, Tuple[WorkflowNodeDef, ...]] = {}
+        for node_id, node in by_id.items():
+            target = (
+                by_id.get(node.allowed_reject_to)
+                if node.allowed_reject_to is not None
+                else None
+            )
+            reject_targets_by_id[node_id] = (target,) if target else ()
+
+        return cls(
+            phase=phase,
+            workflow_id=workflow_id,
+            nodes=tuple(nodes),
+            batch_id=batch_id,
+            by_id=by_id,
+            by_code=by_code,
+            index_by_id=index_by_id,
+            next_by_id=next_by_id,
+            next_by_code=next_by_code,
+            previous_by_code=previous_by_code,
+            reject_targets_by_id=reject_targets_by_id,
+        )
+
+
+class _WorkflowGraphStore:
+    """
+    进程内流程图缓存，按全局版本号整体失效；另有短时过期，
+    版本号未能在进程间同步时（如共享缓存不可用），其他进程最多沿用旧流程图
+    WORKFLOW_PROCESS_CACHE_TIMEOUT 秒。
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.expires_at = time.monotonic() + settings.WORKFLOW_PROCESS_CACHE_TIMEOUT
+        self.entries: Dict[Any, Any] = {}
+
+    def is_current(self, version):
+        return self.version == version and time.monotonic() < self.expires_at
+
+
+_graph_store = _WorkflowGraphStore()
+_MISSING = object()
+
+
 DEFAULT_WORKFLOWS = {
     "APPLICATION": [
         WorkflowNodeDef(
@@ -207,70 +314,155 @@ DEFAULT_WORKFLOWS = {
 
 
 class WorkflowService:
+    @staticmethod
+    def _batch_id(batch: Union[ProjectBatch, int, None]) -> Optional[int]:
+        if batch is None or isinstance(batch, int):
+            return batch
+        return cast(Any, batch).id
+
     @staticmethod
     def get_active_workflow(
-        phase: str, batch: Optional[ProjectBatch] = None
+        phase: str, batch: Union[ProjectBatch, int, None] = None
     ) -> Optional[WorkflowConfig]:
         """获取激活的流程配置"""
         qs = WorkflowConfig.objects.filter(phase=phase, is_active=True)
-        if batch:
-            workflow = qs.filter(batch=batch).order_by("-version", "-id").first()
+        batch_id = WorkflowService._batch_id(batch)
+        if batch_id:
+            workflow = qs.filter(batch_id=batch_id).order_by("-version", "-id").first()
             if workflow:
                 return workflow
         return qs.filter(batch__isnull=True).order_by("-version", "-id").first()
 
+    @staticmethod
+    def _build_node_def(node: WorkflowNode) -> WorkflowNodeDef:
+        role_code = node.get_role_code()
+        if not role_code:
+            raise ValueError(f"工作流节点未绑定角色: {cast(Any, node).id}")
+        return WorkflowNodeDef(
+            id=cast(Any, node).id,
+            code=node.code,
+            name=node.name,
+            node_type=node.node_type,
+            role=role_code,
+            require_expert_review=node.require_expert_review,
+            return_policy=node.return_policy,
+            allowed_reject_to=node.allowed_reject_to,
+            role_fk_id=cast(Any, node).role_fk_id,
+        )
+
+    @staticmethod
+    def _compile_graph(phase: str, batch_id: Optional[int]) -> WorkflowGraph:
+        workflow = WorkflowService.get_active_workflow(phase, batch_id)
+        nodes = []
+        if workflow:
+            nodes = list(
+                WorkflowNode.objects.filter(workflow=workflow, is_active=True)
+                .select_related("role_fk")
+                .order_by("sort_order", "id")
+            )
+        if not nodes:
+            return WorkflowGraph.compile(phase, None, DEFAULT_WORKFLOWS.get(phase, []))
+        return WorkflowGraph.compile(
+            phase,
+            cast(Any, workflow).id,
+            [WorkflowService._build_node_def(node) for node in nodes],
+            batch_id=cast(Any, workflow).batch_id,
+        )
+
+    @staticmethod
+    def get_workflow_graph(
+        phase: str, batch: Union[ProjectBatch, int, None] = None
+    ) -> WorkflowGraph:
+        """获取（已缓存的）编译后流程图"""
+        batch_id = WorkflowService._batch_id(batch)
+
+        def load():
+            graph = WorkflowService._process_cached(
+                ("graph", phase, batch_id),
+                lambda: WorkflowService._compile_graph(phase, batch_id),
+            )
+            WorkflowService._remember_node_locations(graph)
+            return graph
+
+        return request_cached(f"{WORKFLOW_CACHE_PREFIX}graph:{phase}:{batch_id}", load)
+
+    @staticmethod
+    def _remember_node_locations(graph: WorkflowGraph):
+        # 已编译流程中的节点无需再按节点ID查询所属流程
+        if not graph.persisted:
+            return
+        location = (graph.phase, graph.batch_id)
+        request_cache = get_request_cache()
+        for node_id in graph.by_id:
+            if request_cache is not None:
+                request_cache.setdefault(
+                    f"{WORKFLOW_CACHE_PREFIX}location:{node_id}", location
+                )
+            if not connection.in_atomic_block:
+                _graph_store.entries.setdefault(("location", node_id), location)
+
+    @staticmethod
+    def _node_location(node_id: int) -> Optional[Tuple[str, Optional[int]]]:
+        """节点所属流程的 (phase, batch_id)，节点不存在时返回 None"""
+        return request_cached(
+            f"{WORKFLOW_CACHE_PREFIX}location:{node_id}",
+            lambda: WorkflowService._process_cached(
+                ("location", node_id),
+                lambda: WorkflowNode.objects.filter(id=node_id)
+                .values_list("workflow__phase", "workflow__batch_id")
+                .first(),
+            ),
+        )
+
+    @staticmethod
+    def invalidate_cache():
+        """
+        流程配置、节点或角色变更后失效流程图缓存。
+        """
+        WORKFLOW_CACHE.invalidate()
+
+    @staticmethod
+    def _process_cached(key, loader):
+        global _graph_store
+        version = request_cached(
+            f"{WORKFLOW_CACHE_PREFIX}version", WORKFLOW_CACHE.version
+        )
+        store = _graph_store
+        if not store.is_current(version):
+            store = _WorkflowGraphStore(version)
+            _graph_store = store
+        value = store.entries.get(key, _MISSING)
+        WORKFLOW_CACHE.record(hit=value is not _MISSING)
+        if value is _MISSING:
+            value = loader()
+            # 事务内读到的可能是未提交的流程配置，只在事务外写入进程缓存
+            if not connection.in_atomic_block:
+                store.entries[key] = value
+        return value
+
     @staticmethod
     def get_nodes(
         phase: str, batch: Optional[ProjectBatch] = None
     ) -> List[WorkflowNodeDef]:
         """获取流程所有节点"""
-        workflow = WorkflowService.get_active_workflow(phase, batch)
-        if not workflow:
-            return DEFAULT_WORKFLOWS.get(phase, [])
-        nodes = list(
-            WorkflowNode.objects.filter(workflow=workflow, is_active=True)
-            .select_related("role_fk")
-            .order_by("sort_order", "id")
-            .all()
-        )
-        if not nodes:
-            return DEFAULT_WORKFLOWS.get(phase, [])
-        node_defs: List[WorkflowNodeDef] = []
-        for node in nodes:
-            role_code = node.get_role_code()
-            if not role_code:
-                raise ValueError(f"工作流节点未绑定角色: {cast(Any, node).id}")
-            node_defs.append(
-                WorkflowNodeDef(
-                    id=cast(Any, node).id,
-                    code=node.code,
-                    name=node.name,
-                    node_type=node.node_type,
-                    role=role_code,
-                    require_expert_review=node.require_expert_review,
-                    return_policy=node.return_policy,
-                    allowed_reject_to=node.allowed_reject_to,
-                    role_fk_id=cast(Any, node).role_fk_id,
-                )
-            )
-        return node_defs
+        return list(WorkflowService.get_workflow_graph(phase, batch).nodes)
 
     @staticmethod
     def get_node_by_id(node_id: int) -> Optional[WorkflowNode]:
         """根据ID获取节点对象"""
-        try:
-            return WorkflowNode.objects.select_related("workflow", "role_fk").get(
-                id=node_id
-            )
-        except WorkflowNode.DoesNotExist:
-            return None
+        return request_cached(
+            f"{WORKFLOW_CACHE_PREFIX}node:{node_id}",
+            lambda: WorkflowNode.objects.select_related("workflow", "role_fk")
+            .filter(id=node_id)
+            .first(),
+        )
 
     @staticmethod
     def get_initial_node(
         phase: str, batch: Optional[ProjectBatch] = None
     ) -> Optional[WorkflowNodeDef]:
         """获取首个节点（学生提交节点）"""
-        nodes = WorkflowService.get_nodes(phase, batch)
+        nodes = WorkflowService.get_workflow_graph(phase, batch).nodes
         return nodes[0] if nodes else None
 
     @staticmethod
@@ -280,51 +472,38 @@ class WorkflowService:
         batch: Optional[ProjectBatch] = None,
     ) -> Optional[WorkflowNodeDef]:
         """根据当前节点ID获取下一节点"""
-        current_node = WorkflowService.get_node_by_id(current_node_id)
-        if current_node:
-            phase = current_node.workflow.phase
-            batch = current_node.workflow.batch
+        location = WorkflowService._node_location(current_node_id)
+        batch_ref: Union[ProjectBatch, int, None] = batch
+        if location:
+            phase, batch_ref = location
         if not phase:
             return None
 
-        nodes = WorkflowService.get_nodes(phase, batch)
-        for idx, node in enumerate(nodes):
-            if node.id == current_node_id:
-                return nodes[idx + 1] if idx + 1 < len(nodes) else None
-        return None
+        graph = WorkflowService.get_workflow_graph(phase, batch_ref)
+        return graph.next_by_id.get(current_node_id)
 
     @staticmethod
     def get_next_node(
         phase: str, current_code: str, batch: Optional[ProjectBatch] = None
     ) -> Optional[WorkflowNodeDef]:
         """根据节点code获取下一节点（向后兼容）"""
-        nodes = WorkflowService.get_nodes(phase, batch)
-        for idx, node in enumerate(nodes):
-            if node.code == current_code:
-                return nodes[idx + 1] if idx + 1 < len(nodes) else None
-        return None
+        graph = WorkflowService.get_workflow_graph(phase, batch)
+        return graph.next_by_code.get(current_code)
 
     @staticmethod
     def get_previous_node(
         phase: str, current_code: str, batch: Optional[ProjectBatch] = None
     ) -> Optional[WorkflowNodeDef]:
         """根据节点code获取上一节点（向后兼容）"""
-        nodes = WorkflowService.get_nodes(phase, batch)
-        for idx, node in enumerate(nodes):
-            if node.code == current_code:
-                return nodes[idx - 1] if idx - 1 >= 0 else None
-        return None
+        graph = WorkflowService.get_workflow_graph(phase, batch)
+        return graph.previous_by_code.get(current_code)
 
     @staticmethod
     def get_node_by_code(
         phase: str, code: str, batch: Optional[ProjectBatch] = None
     ) -> Optional[WorkflowNodeDef]:
         """根据code获取节点"""
-        nodes = WorkflowService.get_nodes(phase, batch)
-        for node in nodes:
-            if node.code == code:
-                return node
-        return None
+        return WorkflowService.get_workflow_graph(phase, batch).by_code.get(code)
 
     @staticmethod
     def get_reject_target_nodes(
@@ -333,48 +512,35 @@ class WorkflowService:
         batch: Optional[ProjectBatch] = None,
     ) -> List[WorkflowNodeDef]:
         """获取当前节点可退回的目标节点列表"""
-        current_node = WorkflowService.get_node_by_id(current_node_id)
-        if current_node:
-            if not current_node.allowed_reject_to:
-                return []
-            target_nodes = (
-                WorkflowNode.objects.filter(
-                    id=current_node.allowed_reject_to, is_active=True
-                )
-                .select_related("role_fk")
-                .order_by("sort_order", "id")
-            )
-            node_defs: List[WorkflowNodeDef] = []
-            for node in target_nodes:
-                role_code = node.get_role_code()
-                if not role_code:
-                    raise ValueError(f"工作流节点未绑定角色: {cast(Any, node).id}")
-                node_defs.append(
-                    WorkflowNodeDef(
-                        id=cast(Any, node).id,
-                        code=node.code,
-                        name=node.name,
-                        node_type=node.node_type,
-                        role=role_code,
-                        require_expert_review=node.require_expert_review,
-                        return_policy=node.return_policy,
-                        allowed_reject_to=node.allowed_reject_to,
-                        role_fk_id=cast(Any, node).role_fk_id,
-                    )
-                )
-            return node_defs
+        location = WorkflowService._node_location(current_node_id)
+        if location:
+            graph = WorkflowService.get_workflow_graph(*location)
+            current_def = graph.by_id.get(current_node_id)
+            if current_def is not None:
+                if not current_def.allowed_reject_to:
+                    return []
+                if current_def.allowed_reject_to in graph.by_id:
+                    return list(graph.reject_targets_by_id[current_node_id])
+            # 节点不在当前启用流程中或退回目标跨流程，按数据库配置解析
+            return WorkflowService._load_reject_targets(current_node_id)
 
         if not phase:
             return []
 
-        nodes = WorkflowService.get_nodes(phase, batch)
-        current_def = next((node for node in nodes if node.id == current_node_id), None)
-        if not current_def or current_def.allowed_reject_to is None:
+        graph = WorkflowService.get_workflow_graph(phase, batch)
+        return list(graph.reject_targets_by_id.get(current_node_id, ()))
+
+    @staticmethod
+    def _load_reject_targets(current_node_id: int) -> List[WorkflowNodeDef]:
+        current_node = WorkflowService.get_node_by_id(current_node_id)
+        if not current_node or not current_node.allowed_reject_to:
             return []
-        target_def = next(
-            (node for node in nodes if node.id == current_def.allowed_reject_to), None
+        target_nodes = (
+            WorkflowNode.objects.filter(id=current_node.allowed_reject_to, is_active=True)
+            .select_related("role_fk")
+            .order_by("sort_order", "id")
         )
-        return [target_def] if target_def else []
+        return [WorkflowService._build_node_def(node) for node in target_nodes]
 
     @staticmethod
     def validate_workflow_nodes(workflow_id: int) -> Dict[str, Any]:
@@ -0,0 +1,12 @@
+"""
+批次、系统配置与流程配置变更时失效相关缓存
+"""
+
+from apps.users.models import Role
+
+from .models import ProjectBatch, SystemSetting, WorkflowConfig, WorkflowNode
+from .services import SETTINGS_CACHE
+from .services.workflow_service import WORKFLOW_CACHE
+
+SETTINGS_CACHE.invalidate_on(ProjectBatch, SystemSetting)
+WORKFLOW_CACHE.invalidate_on(WorkflowConfig, WorkflowNode, Role)
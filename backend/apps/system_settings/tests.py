@@ -1,9 +1,14 @@
 import base64
+import time
+from io import StringIO
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import SimpleTestCase
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APIClient
 
 from apps.projects.models import Project
@@ -15,7 +20,14 @@ from apps.system_settings.models import (
     WorkflowNode,
 )
 from apps.system_settings.serializers import CertificateSettingSerializer
+from apps.system_settings.services import (
+    SETTINGS_CACHE,
+    SystemSettingService,
+    WorkflowService,
+)
+from apps.system_settings.services.workflow_service import WORKFLOW_CACHE
 from apps.users.models import Role
+from apps.utils.request_cache import request_cache_scope
 
 
 PNG_1X1 = base64.b64decode(
@@ -146,6 +158,69 @@ class BatchWorkflowViewSetTestCase(TestCase):
             f"workflows/APPLICATION/nodes/{node.id}/"
         )
 
+    def test_workflow_lookups_reuse_compiled_graph_within_request(self):
+        with request_cache_scope():
+            next_node = WorkflowService.get_next_node_by_id(self.submit_node.id)
+
+            with self.assertNumQueries(0):
+                targets = WorkflowService.get_reject_target_nodes(self.review_node.id)
+                review = WorkflowService.get_node_by_code(
+                    WorkflowConfig.Phase.APPLICATION, "REVIEW", self.batch
+                )
+                previous = WorkflowService.get_previous_node(
+                    WorkflowConfig.Phase.APPLICATION, "REVIEW", self.batch
+                )
+                last = WorkflowService.get_next_node_by_id(self.review_node.id)
+
+        self.assertEqual(next_node.id, self.review_node.id)
+        self.assertEqual([target.id for target in targets], [self.submit_node.id])
+        self.assertEqual(review.id, self.review_node.id)
+        self.assertEqual(previous.id, self.submit_node.id)
+        self.assertIsNone(last)
+
+    def test_node_changes_invalidate_cached_workflow_graph(self):
+        with patch(
+            "apps.system_settings.services.workflow_service.connection",
+            in_atomic_block=False,
+        ):
+            WorkflowService.get_nodes(WorkflowConfig.Phase.APPLICATION, self.batch)
+            with self.assertNumQueries(0):
+                self.assertIsNone(
+                    WorkflowService.get_next_node_by_id(self.review_node.id)
+                )
+
+            final_node = WorkflowNode.objects.create(
+                workflow=self.workflow,
+                code="FINAL",
+                name="终审",
+                node_type=WorkflowNode.NodeType.APPROVAL,
+                role_fk=self.admin_role,
+                sort_order=3,
+                allowed_reject_to=self.review_node.id,
+            )
+
+            next_node = WorkflowService.get_next_node_by_id(self.review_node.id)
+
+        self.assertEqual(next_node.id, final_node.id)
+
+    def test_process_workflow_graph_expires_without_version_change(self):
+        with patch(
+            "apps.system_settings.services.workflow_service.connection",
+            in_atomic_block=False,
+        ):
+            WorkflowService.get_nodes(WorkflowConfig.Phase.APPLICATION, self.batch)
+            # 模拟其他进程修改了流程，而本进程看不到版本号变化
+            WorkflowNode.objects.filter(id=self.review_node.id).update(name="复审")
+            with patch(
+                "apps.system_settings.services.workflow_service.time.monotonic",
+                return_value=time.monotonic() + 3600,
+            ):
+                nodes = WorkflowService.get_nodes(
+                    WorkflowConfig.Phase.APPLICATION, self.batch
+                )
+
+        self.assertIn("复审", [node.name for node in nodes])
+
     def test_reorder_nodes_rejects_invalid_node_ids(self):
         response = self.client.post(
             self._reorder_url(),
@@ -552,3 +627,148 @@ class ProjectBatchViewSetTestCase(TestCase):
         response = self.client.get(f"/api/v1/system-settings/batches/{batch.id}/")
 
         self.assertEqual(response.status_code, 403)
+
+
+class SystemSettingCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.batch = ProjectBatch.objects.create(
+            name="缓存批次",
+            year=2026,
+            code="CACHE2026",
+            status=ProjectBatch.STATUS_ACTIVE,
+            is_current=True,
+            is_active=True,
+        )
+        SystemSetting.objects.create(
+            code="LIMIT_RULES",
+            name="限制规则",
+            batch=self.batch,
+            data={"max_members": 3},
+        )
+
+    def _publishable_cache(self):
+        # TestCase 在事务内运行，模拟事务外的请求以写入跨请求缓存
+        return patch("apps.utils.cache.connection", in_atomic_block=False)
+
+    def test_request_reads_batch_and_settings_at_most_once(self):
+        with request_cache_scope():
+            with self.assertNumQueries(2):
+                batch = SystemSettingService.get_current_batch()
+                limit_rules = SystemSettingService.get_setting("LIMIT_RULES")
+                process_rules = SystemSettingService.get_setting("PROCESS_RULES")
+                SystemSettingService.get_current_batch()
+                SystemSettingService.get_setting("LIMIT_RULES", batch=self.batch)
+
+        self.assertEqual(batch, self.batch)
+        self.assertEqual(limit_rules["max_members"], 3)
+        self.assertEqual(limit_rules["max_advisors"], 2)
+        self.assertFalse(process_rules["allow_active_reapply"])
+
+    def test_following_requests_read_settings_from_cache(self):
+        with self._publishable_cache():
+            SystemSettingService.get_setting("LIMIT_RULES")
+
+            with self.assertNumQueries(0):
+                batch = SystemSettingService.get_current_batch()
+                limit_rules = SystemSettingService.get_setting("LIMIT_RULES")
+
+        self.assertEqual(batch, self.batch)
+        self.assertEqual(limit_rules["max_members"], 3)
+
+    def test_setting_save_invalidates_cached_settings(self):
+        with self._publishable_cache():
+            SystemSettingService.get_setting("LIMIT_RULES")
+            setting = SystemSetting.objects.get(code="LIMIT_RULES", batch=self.batch)
+            setting.data = {"max_members": 4}
+            setting.save(update_fields=["data"])
+
+            limit_rules = SystemSettingService.get_setting("LIMIT_RULES")
+
+        self.assertEqual(limit_rules["max_members"], 4)
+
+    @override_settings(CACHE_STATS_ENABLED=True)
+    def test_cache_records_hits_and_misses_per_namespace(self):
+        with self._publishable_cache():
+            SystemSettingService.get_setting("LIMIT_RULES")
+            SystemSettingService.get_setting("LIMIT_RULES")
+
+        self.assertEqual(
+            SETTINGS_CACHE.stats(), {"hits": 2, "misses": 2, "hit_rate": 0.5}
+        )
+        output = StringIO()
+        call_command("cache_stats", "system_settings", "--reset", stdout=output)
+        self.assertIn("50.0%", output.getvalue())
+        self.assertEqual(SETTINGS_CACHE.stats()["hits"], 0)
+
+    def test_tagged_entries_follow_every_namespace_version(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            return len(loads)
+
+        with self._publishable_cache():
+            self.assertEqual(
+                SETTINGS_CACHE.get_or_set("tagged", load, tags=[WORKFLOW_CACHE]), 1
+            )
+            self.assertEqual(
+                SETTINGS_CACHE.get_or_set("tagged", load, tags=[WORKFLOW_CACHE]), 1
+            )
+            WorkflowService.invalidate_cache()
+            self.assertEqual(
+                SETTINGS_CACHE.get_or_set("tagged", load, tags=[WORKFLOW_CACHE]), 2
+            )
+            SystemSettingService.invalidate_cache()
+            self.assertEqual(
+                SETTINGS_CACHE.get_or_set("tagged", load, tags=[WORKFLOW_CACHE]), 3
+            )
+
+    def test_lost_version_key_never_reuses_a_version(self):
+        loads = []
+
+        def load():
+            loads.append(1)
+            return len(loads)
+
+        with self._publishable_cache():
+            SETTINGS_CACHE.get_or_set("reseeded", load)
+            version = SETTINGS_CACHE.version()
+            # 模拟 Redis 淘汰或重启后版本键丢失
+            cache.delete(f"{SETTINGS_CACHE.name}:version")
+            reseeded = SETTINGS_CACHE.version()
+            self.assertEqual(SETTINGS_CACHE.get_or_set("reseeded", load), 2)
+
+        self.assertNotEqual(reseeded, version)
+        self.assertGreater(reseeded, 1)
+
+    def test_set_current_invalidates_cached_current_batch(self):
+        admin = get_user_model().objects.create_user(
+            username="cache_level1_admin",
+            password="password123",
+            role_fk=Role.objects.get_or_create(
+                code="LEVEL1_ADMIN",
+                defaults={"name": "校级管理员", "scope_dimension": "SCHOOL"},
+            )[0],
+            employee_id="CACHE0001",
+        )
+        next_batch = ProjectBatch.objects.create(
+            name="下一批次",
+            year=2027,
+            code="CACHE2027",
+            status=ProjectBatch.STATUS_DRAFT,
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+
+        with self._publishable_cache():
+            self.assertEqual(SystemSettingService.get_current_batch(), self.batch)
+            self.batch.status = ProjectBatch.STATUS_FINISHED
+            self.batch.is_current = False
+            self.batch.save(update_fields=["status", "is_current"])
+            response = client.post(
+                f"/api/v1/system-settings/batches/{next_batch.id}/set-current/"
+            )
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(SystemSettingService.get_current_batch(), next_batch)
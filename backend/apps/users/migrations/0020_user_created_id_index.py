@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0019_alter_role_scope_dimension'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='users_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0 on 2026-10-18 12:54
+
+import apps.utils.search
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# 用户与项目的搜索向量共用这些函数，统一在此创建（projects.0040 依赖本迁移）。
+# 函数内对其他自定义函数的调用带上 schema：pg_restore 以空 search_path 重建表达式索引
+SEARCH_FUNCTIONS_SQL = r"""
+CREATE OR REPLACE FUNCTION search_ngram_tokens(value text) RETURNS text[]
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT coalesce(array_agg(DISTINCT grams.token), '{}')
+    FROM (
+        SELECT regexp_replace(lower(value), '[[:space:][:punct:]]+', '', 'g') AS text
+    ) AS normalized,
+    LATERAL (
+        SELECT substr(normalized.text, i, 1) AS token
+        FROM generate_series(1, char_length(normalized.text)) AS i
+        UNION
+        SELECT substr(normalized.text, i, 2)
+        FROM generate_series(1, char_length(normalized.text) - 1) AS i
+    ) AS grams
+$$;
+
+CREATE OR REPLACE FUNCTION search_ngrams(VARIADIC parts text[]) RETURNS tsvector
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT array_to_tsvector(coalesce(array_agg(DISTINCT token), '{}'))
+    FROM unnest(parts) AS part, unnest(public.search_ngram_tokens(part)) AS token
+$$;
+
+CREATE OR REPLACE FUNCTION search_ngram_query(value text) RETURNS tsquery
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT string_agg('''' || grams.token || '''', ' & ')::tsquery
+    FROM (
+        SELECT regexp_replace(lower(value), '[[:space:][:punct:]]+', '', 'g') AS text
+    ) AS normalized,
+    LATERAL (
+        SELECT substr(normalized.text, i, 1) AS token
+        FROM generate_series(1, char_length(normalized.text)) AS i
+        WHERE char_length(normalized.text) = 1
+        UNION
+        SELECT substr(normalized.text, i, 2)
+        FROM generate_series(1, char_length(normalized.text) - 1) AS i
+    ) AS grams
+$$;
+"""
+
+DROP_SEARCH_FUNCTIONS_SQL = """
+DROP FUNCTION IF EXISTS search_ngram_query(text);
+DROP FUNCTION IF EXISTS search_ngrams(VARIADIC text[]);
+DROP FUNCTION IF EXISTS search_ngram_tokens(text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0020_user_created_id_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(SEARCH_FUNCTIONS_SQL, DROP_SEARCH_FUNCTIONS_SQL),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(models.Func(models.F('username'), models.F('employee_id'), models.F('real_name'), function='search_ngrams', output_field=apps.utils.search.NgramSearchField()), name='users_search_idx'),
+        ),
+    ]
@@ -5,9 +5,15 @@
 """
 
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.core.validators import RegexValidator
 
+from apps.utils.search import search_ngrams
+
+# 模糊搜索的字段：GIN 表达式索引与查询条件必须使用同一表达式
+USER_SEARCH_FIELDS = ("username", "employee_id", "real_name")
+
 
 class Role(models.Model):
     """
@@ -154,6 +160,10 @@ class User(AbstractUser):
         verbose_name = "用户"
         verbose_name_plural = verbose_name
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="users_created_id_idx"),
+            GinIndex(search_ngrams(*USER_SEARCH_FIELDS), name="users_search_idx"),
+        ]
 
     def __str__(self):
         return f"{self.real_name}({self.employee_id})"
@@ -5,6 +5,9 @@
 from django.contrib.auth import get_user_model
 from django.db.models import Q
 
+from apps.users.models import USER_SEARCH_FIELDS
+from apps.utils.search import ngram_filter
+
 User = get_user_model()
 
 
@@ -16,6 +19,18 @@ ADMIN_ROLE_FILTER = Q(role_fk__scope_dimension__isnull=False) | Q(
 )
 
 
+def search_users(queryset, term):
+    """
+    按用户名、工号/学号、姓名模糊搜索：n-gram 索引筛出候选，再按 icontains 复核
+    """
+    return queryset.filter(
+        ngram_filter(term, USER_SEARCH_FIELDS),
+        Q(username__icontains=term)
+        | Q(employee_id__icontains=term)
+        | Q(real_name__icontains=term),
+    )
+
+
 class UserRepository:
     """
     用户数据访问类
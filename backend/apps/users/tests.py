@@ -300,6 +300,36 @@ class AdminUserRoleValidationTestCase(TestCase):
         self.assertIn("UT20001", employee_ids)
         self.assertIn("US20001", employee_ids)
 
+    def test_admin_user_list_search_matches_substrings(self):
+        User.objects.create_user(
+            username="search_teacher",
+            employee_id="UT30001",
+            real_name="欧阳明远",
+            password="password123",
+            role_fk=self.teacher_role,
+        )
+        User.objects.create_user(
+            username="search_student",
+            employee_id="US30002",
+            real_name="司马光",
+            password="password123",
+            role_fk=Role.objects.get(code="STUDENT"),
+        )
+
+        def search(term):
+            response = self.client.get("/api/v1/auth/admin/users/", {"search": term})
+            self.assertEqual(response.status_code, 200)
+            return {
+                item["employee_id"] for item in response.data["data"]["results"]
+            }
+
+        self.assertEqual(search("阳明"), {"UT30001"})
+        self.assertEqual(search("光"), {"US30002"})
+        self.assertEqual(search("ut3000"), {"UT30001"})
+        self.assertEqual(search("SEARCH_"), {"UT30001", "US30002"})
+        # n-gram 候选需经 icontains 复核：两个字都出现但不相邻时不匹配
+        self.assertEqual(search("欧明"), set())
+
     def test_custom_school_admin_can_create_user(self):
         self.client.force_authenticate(user=self.custom_school_admin)
 
@@ -14,9 +14,10 @@ from django.conf import settings
 from ...models import User
 from ...password_validation import get_password_validation_errors
 from ...permissions import IsAdmin
+from ...repositories.user_repository import search_users
 from ...serializers import UserSerializer, UserCreateSerializer
 from ...services import UserService
-from apps.utils.pagination import positive_int_query
+from apps.utils.pagination import list_page
 
 logger = logging.getLogger(__name__)
 
@@ -91,11 +92,7 @@ class AdminUserViewSet(viewsets.ModelViewSet):
         # 搜索
         search = self.request.query_params.get("search", "")
         if search:
-            queryset = queryset.filter(
-                Q(username__icontains=search)
-                | Q(employee_id__icontains=search)
-                | Q(real_name__icontains=search)
-            )
+            queryset = search_users(queryset, search)
 
         college = self.request.query_params.get("college", "")
         if college:
@@ -152,34 +149,20 @@ class AdminUserViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         """
         获取用户列表（分页）
+        ?pagination=cursor 时使用游标分页，?count=cached 时总数使用短期缓存
         """
-        queryset = self.get_queryset()
-
-        # 分页
-        page = positive_int_query(request.query_params, "page", 1)
-        page_size = positive_int_query(request.query_params, "page_size", 10, 100)
-
-        total = queryset.count()
-        start = (page - 1) * page_size
-        end = start + page_size
-        users = queryset[start:end]
-
-        serializer = self.get_serializer(users, many=True)
+        try:
+            data = list_page(self.get_queryset(), request.query_params)
+        except ValueError as exc:
+            return self._resp(
+                request,
+                {"code": 400, "message": str(exc)},
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+        data["results"] = self.get_serializer(data["results"], many=True).data
+        data["count"] = data["total"]  # total 向后兼容
 
-        return self._resp(
-            request,
-            {
-                "code": 200,
-                "message": "获取成功",
-                "data": {
-                    "results": serializer.data,
-                    "count": total,
-                    "total": total,  # 向后兼容
-                    "page": page,
-                    "page_size": page_size,
-                },
-            },
-        )
+        return self._resp(request, {"code": 200, "message": "获取成功", "data": data})
 
     def retrieve(self, request, *args, **kwargs):
         """
@@ -0,0 +1,189 @@
+"""
+跨请求缓存：按命名空间组织带版本号的缓存键。
+
+每个命名空间在共享缓存中保存一个版本号，缓存键形如 ``<命名空间>:<版本>:<键>``；
+失效时只需递增版本号，旧条目随超时自然淘汰。缓存条目可以额外依赖其他命名空间
+（标签），任一命名空间失效都会使其失效。命中/未命中次数记录在共享缓存中，
+多进程部署时同样可以汇总观察。
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+
+from .request_cache import clear_request_cache
+
+_MISSING = object()
+
+# 已声明的命名空间，供统计命令列出
+_namespaces = {}
+
+
+def _version_key(name):
+    return f"{name}:version"
+
+
+def _stats_key(name, outcome):
+    return f"cache_stats:{name}:{outcome}"
+
+
+def _new_version():
+    """
+    新的版本号种子：取当前时间（微秒），版本键丢失（淘汰、Redis 重启）后重新初始化
+    不会回到用过的版本号，旧版本的缓存条目与进程内缓存都不会被重新命中
+    """
+    return time.time_ns() // 1000
+
+
+def _incr(key, initial=1):
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, initial, timeout=None):
+            cache.incr(key)
+
+
+class CacheNamespace:
+    """
+    一组可整体失效的缓存条目。
+
+    :param name: 命名空间名称，同时作为请求级缓存键的前缀
+    :param timeout_setting: 条目默认超时所读取的 settings 名称；为空时使用缓存后端的默认超时
+    """
+
+    def __init__(self, name, timeout_setting=None):
+        self.name = name
+        self.prefix = f"{name}:"
+        self.timeout_setting = timeout_setting
+        _namespaces[name] = self
+
+    def __repr__(self):
+        return f"CacheNamespace({self.name!r})"
+
+    @property
+    def timeout(self):
+        if not self.timeout_setting:
+            return None
+        return getattr(settings, self.timeout_setting)
+
+    def version(self):
+        return versions(self)[0]
+
+    def key(self, key, tags=()):
+        """
+        当前版本下的完整缓存键；tags 中命名空间的版本也计入键中
+        """
+        parts = ".".join(str(version) for version in versions(self, *tags))
+        return f"{self.name}:{parts}:{key}"
+
+    def get_or_set(self, key, loader, timeout=_MISSING, tags=()):
+        """
+        读取缓存，未命中时调用 loader() 并写入。
+
+        事务内可能读到未提交的数据，只在事务外写入缓存；loader 返回 None 时不缓存。
+        """
+        full_key = self.key(key, tags)
+        value = cache.get(full_key)
+        if value is not None:
+            self.record(hit=True)
+            return value
+        self.record(hit=False)
+        value = loader()
+        if value is not None and not connection.in_atomic_block:
+            cache.set(
+                full_key,
+                value,
+                timeout=self.timeout if timeout is _MISSING else timeout,
+            )
+        return value
+
+    def invalidate(self):
+        """
+        立即递增版本号并在事务提交后再次递增，避免提交前其他请求读到旧数据后回填缓存；
+        同时清理当前请求内以该命名空间为前缀的请求级缓存。
+        """
+        clear_request_cache(self.prefix)
+        self._bump()
+        transaction.on_commit(self._bump)
+
+    def _bump(self):
+        _incr(_version_key(self.name), initial=_new_version())
+
+    def invalidate_on(self, *senders, signals=(post_save, post_delete)):
+        """
+        模型保存或删除时失效该命名空间
+        """
+
+        def invalidate_cache(sender, **kwargs):
+            self.invalidate()
+
+        for sender in senders:
+            for signal in signals:
+                signal.connect(
+                    invalidate_cache,
+                    sender=sender,
+                    weak=False,
+                    dispatch_uid=f"invalidate_cache:{self.name}",
+                )
+        return invalidate_cache
+
+    def record(self, hit):
+        """
+        记录一次命中或未命中；进程内缓存（如流程图）也通过它上报
+        """
+        if settings.CACHE_STATS_ENABLED:
+            _incr(_stats_key(self.name, "hits" if hit else "misses"))
+
+    def stats(self):
+        values = cache.get_many(
+            [_stats_key(self.name, "hits"), _stats_key(self.name, "misses")]
+        )
+        hits = values.get(_stats_key(self.name, "hits"), 0)
+        misses = values.get(_stats_key(self.name, "misses"), 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else None,
+        }
+
+    def reset_stats(self):
+        cache.delete_many(
+            [_stats_key(self.name, "hits"), _stats_key(self.name, "misses")]
+        )
+
+
+def versions(*namespaces):
+    """
+    一次读取多个命名空间的当前版本号，尚未初始化（或版本键已丢失）的以 _new_version() 为种子
+    """
+    keys = [_version_key(namespace.name) for namespace in namespaces]
+    found = cache.get_many(keys)
+    result = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            seed = _new_version()
+            cache.add(key, seed, timeout=None)
+            version = cache.get(key, seed)
+        result.append(version)
+    return result
+
+
+def is_shared_cache():
+    """
+    默认缓存是否在进程间共享；本地内存缓存（仅开发环境）只对当前进程可见
+    """
+    return not isinstance(caches["default"], LocMemCache)
+
+
+def get_namespace(name):
+    return _namespaces.get(name)
+
+
+def registered_namespaces():
+    return [_namespaces[name] for name in sorted(_namespaces)]
@@ -1,11 +1,37 @@
 
+import logging
 import re
+import tempfile
 import zipfile
+from functools import partial
 from io import BytesIO
-from datetime import datetime
+from datetime import date, datetime, time
+from decimal import Decimal
 from pathlib import Path
 import openpyxl  # type: ignore[import-untyped]
-from django.utils.timezone import localtime
+from openpyxl.utils import get_column_letter  # type: ignore[import-untyped]
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, SuspiciousFileOperation
+from django.db.models import QuerySet
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.timezone import is_aware, localtime
+
+from .downloads import attachment_content_disposition
+
+logger = logging.getLogger(__name__)
+
+# 单次从源文件读取并写入压缩流的字节数
+ZIP_STREAM_CHUNK_SIZE = 64 * 1024
+# 落盘模式下，超过该大小的压缩包会从内存转存到临时文件
+ZIP_SPOOL_MAX_MEMORY_SIZE = 8 * 1024 * 1024
+
+XLSX_CONTENT_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+# 导出时每次从数据库游标读取的行数
+EXCEL_ITERATOR_CHUNK_SIZE = 500
+EXCEL_SPOOL_MAX_MEMORY_SIZE = 8 * 1024 * 1024
+EXCEL_NATIVE_TYPES = (str, bool, int, float, Decimal, date, time)
 
 
 SAFE_ARCNAME_SEGMENT_RE = re.compile(r'[\x00-\x1f<>:"\\|?*]+')
@@ -48,6 +74,101 @@ def safe_zip_path(*segments, fallback="file"):
         return fallback
     return "/".join(safe_segments)
 
+
+def excel_cell_value(value):
+    """
+    Convert a Python value to something openpyxl writes natively.
+
+    Dates, numbers and decimals keep their type so spreadsheets can sort and sum
+    them; aware datetimes are converted to local naive time.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if is_aware(value):
+            value = localtime(value)
+        return value.replace(tzinfo=None)
+    if isinstance(value, EXCEL_NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def iter_export_queryset(queryset, chunk_size=EXCEL_ITERATOR_CHUNK_SIZE):
+    """
+    Iterate a queryset in server-side chunks instead of caching every row.
+    """
+    if isinstance(queryset, QuerySet):
+        return queryset.iterator(chunk_size=chunk_size)
+    return iter(queryset)
+
+
+def _field_getters(item, fields):
+    if isinstance(item, dict):
+        return [partial(_dict_value, field=field) for field in fields]
+
+    meta = getattr(item, "_meta", None)
+    getters = []
+    for field in fields:
+        choices = None
+        if meta is not None:
+            try:
+                model_field = meta.get_field(field)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is not None and model_field.choices:
+                choices = dict(model_field.flatchoices)
+        if choices:
+            getters.append(partial(_choice_value, field=field, choices=choices))
+        else:
+            getters.append(partial(_attr_value, field=field))
+    return getters
+
+
+def _dict_value(item, field):
+    return item.get(field)
+
+
+def _attr_value(item, field):
+    return getattr(item, field, None)
+
+
+def _choice_value(item, field, choices):
+    value = getattr(item, field, None)
+    return choices.get(value, value)
+
+
+def iter_excel_rows(data, fields):
+    """
+    Yield rows of native cell values for dictionaries or model instances.
+
+    Field accessors (including choice display maps) are resolved once from the
+    first item instead of being looked up per cell.
+    """
+    getters = None
+    for item in data:
+        if getters is None:
+            getters = _field_getters(item, fields)
+        yield [excel_cell_value(getter(item)) for getter in getters]
+
+
+def write_excel(data, headers, output, sheet_title="Export Data", column_widths=None):
+    """
+    Stream rows into a write-only workbook saved to ``output``.
+    :param data: Iterable of dictionaries or objects
+    :param headers: Dictionary mapping field names to column headers {field: header}
+    :param column_widths: Optional list of column widths, in header order
+    """
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title[:31])
+    for col_idx, width in enumerate(column_widths or [], 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    ws.append(list(headers.values()))
+    for row in iter_excel_rows(data, list(headers.keys())):
+        ws.append(row)
+    wb.save(output)
+    return output
+
+
 def generate_excel(data, headers, filename="export.xlsx"):
     """
     Generate an Excel file from a list of dictionaries.
@@ -56,37 +177,178 @@ def generate_excel(data, headers, filename="export.xlsx"):
     :param filename: Filename for the download
     :return: BytesIO object containing the Excel file
     """
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Export Data"
-
-    # Write headers
-    header_keys = list(headers.keys())
-    for col_idx, header in enumerate(headers.values(), 1):
-        ws.cell(row=1, column=col_idx, value=header)
-
-    # Write data
-    for row_idx, item in enumerate(data, 2):
-        for col_idx, field in enumerate(header_keys, 1):
-            value = getattr(item, field, None) if hasattr(item, field) else item.get(field)
-            
-            # Handle Choice Fields (get display value)
-            if hasattr(item, f"get_{field}_display"):
-                 value = getattr(item, f"get_{field}_display")()
-            
-            # Handle standard fields
-            if isinstance(value, datetime):
-                value = localtime(value).strftime("%Y-%m-%d %H:%M:%S")
-            elif value is None:
-                value = ""
-            
-            ws.cell(row=row_idx, column=col_idx, value=str(value))
-
     output = BytesIO()
-    wb.save(output)
+    write_excel(data, headers, output)
     output.seek(0)
     return output
 
+
+def excel_download_response(
+    data,
+    headers,
+    filename,
+    sheet_title="Export Data",
+    column_widths=None,
+    fallback="export.xlsx",
+):
+    """
+    Build an xlsx download response; the workbook is spooled to a temporary file
+    so large exports do not stay in memory while being sent.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_MEMORY_SIZE)
+    write_excel(
+        data,
+        headers,
+        output,
+        sheet_title=sheet_title,
+        column_widths=column_widths,
+    )
+    output.seek(0)
+    response = FileResponse(output, content_type=XLSX_CONTENT_TYPE)
+    response["Content-Disposition"] = attachment_content_disposition(
+        filename, fallback=fallback
+    )
+    return response
+
+
+class _ZipStreamSink:
+    """
+    Write-only target for ZipFile that hands written bytes back to a generator.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        return None
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_zip_source(file_source):
+    if hasattr(file_source, "open"):
+        return file_source.open("rb")
+    file_path = Path(file_source)
+    if not file_path.exists():
+        return None
+    return file_path.open("rb")
+
+
+def _write_zip_files(zf, files, chunk_size=ZIP_STREAM_CHUNK_SIZE):
+    """
+    Copy each source into the archive chunk by chunk, yielding after every chunk
+    so callers can flush compressed output without holding whole files in memory.
+    """
+    for file_source, arcname in files:
+        safe_arcname = safe_zip_arcname(arcname)
+        try:
+            source = _open_zip_source(file_source)
+        except (OSError, SuspiciousFileOperation, ValueError) as exc:
+            logger.warning("Skip missing zip source %s: %s", safe_arcname, exc)
+            continue
+        if source is None:
+            continue
+        with source:
+            with zf.open(safe_arcname, "w") as entry:
+                for chunk in iter(partial(source.read, chunk_size), b""):
+                    entry.write(chunk)
+                    yield
+
+
+def _write_zip_entries(zf, entries):
+    """
+    Write in-memory ``(arcname, content)`` entries, skipping ``None`` placeholders
+    that generators use for failed items. Yields after every entry.
+    """
+    for entry in entries:
+        if entry is None:
+            continue
+        arcname, content = entry
+        zf.writestr(arcname, content)
+        yield
+
+
+def _iter_zip(write):
+    """
+    Yield the archive built by ``write(zf)`` as byte chunks, flushing the
+    compressed output every time the writer yields.
+    """
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        for _ in write(zf):
+            data = sink.drain()
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _zip_response(write, filename, fallback, spool_to_disk):
+    """
+    Build a ZIP download response from the archive written by ``write(zf)``
+    without materializing it in memory.
+
+    By default the archive is streamed to the client as it is compressed. With
+    spool_to_disk the archive is written to a spooled temporary file first so
+    the response carries a Content-Length.
+    """
+    if spool_to_disk is None:
+        spool_to_disk = getattr(settings, "EXPORT_ZIP_SPOOL_TO_DISK", False)
+    if spool_to_disk:
+        output = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX_MEMORY_SIZE)
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
+            for _ in write(zf):
+                pass
+        output.seek(0)
+        response = FileResponse(output, content_type="application/zip")
+    else:
+        response = StreamingHttpResponse(
+            _iter_zip(write), content_type="application/zip"
+        )
+    response["Content-Disposition"] = attachment_content_disposition(
+        filename, fallback=fallback
+    )
+    return response
+
+
+def iter_zip_stream(files, chunk_size=ZIP_STREAM_CHUNK_SIZE):
+    """
+    Yield a ZIP archive as byte chunks while it is being built.
+    :param files: Iterable of tuples (file_path_or_file_field, arcname_in_zip)
+    """
+    return _iter_zip(lambda zf: _write_zip_files(zf, files, chunk_size))
+
+
+def zip_download_response(files, filename, fallback="download", spool_to_disk=None):
+    """
+    ZIP download of files or file fields, see _zip_response.
+    :param files: Iterable of tuples (file_path_or_file_field, arcname_in_zip)
+    """
+    return _zip_response(
+        lambda zf: _write_zip_files(zf, files), filename, fallback, spool_to_disk
+    )
+
+
+def zip_entries_download_response(
+    entries, filename, fallback="download", spool_to_disk=None
+):
+    """
+    ZIP download of generated in-memory ``(arcname, content)`` entries, so
+    documents rendered on the fly are compressed as soon as they are ready.
+    """
+    return _zip_response(
+        lambda zf: _write_zip_entries(zf, entries), filename, fallback, spool_to_disk
+    )
+
+
 def generate_zip(files, filename="attachments.zip"):
     """
     Generate a ZIP file from a list of file paths or file fields.
@@ -96,15 +358,8 @@ def generate_zip(files, filename="attachments.zip"):
     """
     output = BytesIO()
     with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zf:
-        for file_source, arcname in files:
-            safe_arcname = safe_zip_arcname(arcname)
-            if hasattr(file_source, "open"):
-                with file_source.open("rb") as source:
-                    zf.writestr(safe_arcname, source.read())
-            else:
-                file_path = Path(file_source)
-                if file_path.exists():
-                    zf.write(file_path, safe_arcname)
-    
+        for _ in _write_zip_files(zf, files):
+            pass
+
     output.seek(0)
     return output
@@ -1,3 +1,26 @@
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+from functools import cached_property, partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# 游标分页的稳定排序，created_at 相同的记录按 id 区分
+CURSOR_ORDERING = ("-created_at", "-id")
+COUNT_MODES = ("exact", "cached", "none")
+INVALID_CURSOR_MESSAGE = "分页游标无效"
+
+
 def positive_int_query(query_params, name, default, maximum=None):
     try:
         value = int(query_params.get(name, default))
@@ -63,3 +86,172 @@ def positive_int_csv(value):
     if value in (None, ""):
         return []
     return positive_int_list([part.strip() for part in str(value).split(",")])
+
+
+def is_cursor_request(query_params):
+    """
+    ?pagination=cursor 或携带 cursor 参数时使用游标分页
+    """
+    return query_params.get("pagination") == "cursor" or bool(
+        query_params.get("cursor")
+    )
+
+
+def count_mode(query_params, default="exact"):
+    mode = query_params.get("count", default)
+    return mode if mode in COUNT_MODES else default
+
+
+def encode_cursor(instance):
+    payload = json.dumps(
+        [instance.created_at.isoformat(), instance.pk], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """
+    解析游标，返回 (created_at, id)；无法解析时返回 None
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(pk)
+    except (binascii.Error, TypeError, ValueError):
+        return None
+
+
+def keyset_page(queryset, cursor, page_size):
+    """
+    按 (-created_at, -id) 取 cursor 之后的一页，返回 (记录列表, 下一页游标)。
+    不使用 OFFSET，翻到多深的页耗时都相同。
+    """
+    queryset = queryset.order_by(*CURSOR_ORDERING)
+    if cursor is not None:
+        created_at, pk = cursor
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    rows = list(queryset[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(rows[-1])
+
+
+def queryset_count(queryset, mode="exact"):
+    """
+    统计总数。cached 模式按 SQL 缓存 PAGINATION_COUNT_CACHE_TIMEOUT 秒（结果可能略有滞后），
+    none 模式不统计。
+    """
+    if mode == "none":
+        return None
+    if mode != "cached":
+        return queryset.count()
+    queryset = queryset.order_by()
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = "pagination:count:" + hashlib.sha1(f"{sql}|{params!r}".encode()).hexdigest()
+    total = cache.get(key)
+    if total is None:
+        total = queryset.count()
+        cache.set(key, total, timeout=settings.PAGINATION_COUNT_CACHE_TIMEOUT)
+    return total
+
+
+def list_page(queryset, query_params, default_page_size=10, max_page_size=100):
+    """
+    自定义列表接口的分页：默认按页码（page/page_size），?pagination=cursor 时按游标。
+    返回包含 results（模型实例）的字典；游标无效时抛出 ValueError。
+    """
+    page_size = positive_int_query(
+        query_params, "page_size", default_page_size, max_page_size
+    )
+    if not is_cursor_request(query_params):
+        page = positive_int_query(query_params, "page", 1)
+        start = (page - 1) * page_size
+        return {
+            "results": list(queryset[start : start + page_size]),
+            "total": queryset_count(queryset, count_mode(query_params)),
+            "page": page,
+            "page_size": page_size,
+        }
+
+    cursor = None
+    token = query_params.get("cursor")
+    if token:
+        cursor = decode_cursor(token)
+        if cursor is None:
+            raise ValueError(INVALID_CURSOR_MESSAGE)
+    rows, next_cursor = keyset_page(queryset, cursor, page_size)
+    return {
+        "results": rows,
+        "total": queryset_count(queryset, count_mode(query_params, "cached")),
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
+
+
+class CountModePaginator(DjangoPaginator):
+    def __init__(self, *args, count_mode="exact", **kwargs):
+        self.count_mode = count_mode
+        super().__init__(*args, **kwargs)
+
+    @cached_property
+    def count(self):
+        # 页码分页需要总数校验页码，none 模式同样精确统计
+        if self.count_mode != "cached" or not hasattr(self.object_list, "query"):
+            return super().count
+        return queryset_count(self.object_list, self.count_mode)
+
+
+class KeysetPageNumberPagination(PageNumberPagination):
+    """
+    默认与 PageNumberPagination 相同；?count=cached 时缓存总数，
+    ?pagination=cursor 时按 (-created_at, -id) 游标分页，翻页参数为不透明的 cursor。
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = is_cursor_request(request.query_params)
+        if not self.cursor_mode:
+            self.django_paginator_class = partial(
+                CountModePaginator, count_mode=count_mode(request.query_params)
+            )
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        cursor = None
+        token = request.query_params.get("cursor")
+        if token:
+            cursor = decode_cursor(token)
+            if cursor is None:
+                raise NotFound(INVALID_CURSOR_MESSAGE)
+        self.request = request
+        self.total = queryset_count(
+            queryset, count_mode(request.query_params, "cached")
+        )
+        rows, self.next_cursor = keyset_page(queryset, cursor, page_size)
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        next_url = None
+        if self.next_cursor:
+            next_url = replace_query_param(
+                self.request.build_absolute_uri(), "cursor", self.next_cursor
+            )
+        return Response(
+            {
+                "count": self.total,
+                "next": next_url,
+                "previous": None,
+                "next_cursor": self.next_cursor,
+                "results": data,
+            }
+        )
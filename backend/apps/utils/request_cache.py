@@ -0,0 +1,64 @@
+"""
+请求级缓存：同一次请求内重复读取的数据只查询一次。
+"""
+
+from contextvars import ContextVar
+
+_request_cache = ContextVar("request_cache", default=None)
+
+_MISSING = object()
+
+
+def get_request_cache():
+    """
+    返回当前请求的缓存字典；不在请求范围内（如 Celery 任务、管理命令）时返回 None。
+    """
+    return _request_cache.get()
+
+
+def request_cached(key, loader):
+    """
+    在当前请求内按 key 缓存 loader() 的结果；请求范围外直接调用 loader。
+    """
+    cache = _request_cache.get()
+    if cache is None:
+        return loader()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache[key] = value
+    return value
+
+
+def clear_request_cache(prefix=None):
+    cache = _request_cache.get()
+    if cache is None:
+        return
+    if prefix is None:
+        cache.clear()
+        return
+    for key in [key for key in cache if str(key).startswith(prefix)]:
+        cache.pop(key, None)
+
+
+class request_cache_scope:
+    """
+    开启一个请求级缓存作用域，可作为上下文管理器在请求之外复用。
+    """
+
+    def __enter__(self):
+        self._token = _request_cache.set({})
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _request_cache.reset(self._token)
+        return False
+
+
+class RequestCacheMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with request_cache_scope():
+            return self.get_response(request)
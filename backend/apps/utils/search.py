@@ -0,0 +1,55 @@
+"""
+基于 n-gram 的模糊搜索：中文没有空格分词，按单字和相邻两字切分成 tsvector，
+用 GIN 表达式索引筛出候选行，再由 icontains 精确复核。向量不落表，普通查询不会读取它。
+
+SQL 函数 search_ngram_tokens / search_ngrams / search_ngram_query 由迁移
+users.0021_user_search_vector 创建。
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models import F, Func, Lookup, Q
+
+# 对应 SQL 归一化 regexp_replace(..., '[[:space:][:punct:]]+', '')：[[:punct:]] 随数据库
+# 区域设置还可能包含全角标点、符号等非 ASCII 字符，这里按最宽的口径去掉所有非字母数字
+SEARCH_NON_ALNUM_RE = re.compile(r"[\W_]+")
+
+
+class NgramSearchField(SearchVectorField):
+    """
+    search_ngrams() 表达式的输出类型（tsvector），支持 ``__ngram`` 查询
+    """
+
+
+@NgramSearchField.register_lookup
+class NgramMatch(Lookup):
+    lookup_name = "ngram"
+    prepare_rhs = False
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} @@ search_ngram_query({rhs})", [*lhs_params, *rhs_params]
+
+
+def search_ngrams(*fields):
+    """
+    指定字段的 n-gram 向量表达式，用于 GIN 表达式索引和 ngram_filter
+    """
+    return Func(
+        *(F(field) for field in fields),
+        function="search_ngrams",
+        output_field=NgramSearchField(),
+    )
+
+
+def ngram_filter(term, fields):
+    """
+    候选行筛选条件；fields 须与表达式索引的字段一致才能走索引。
+    搜索词去掉空白和标点后为空时不做筛选（返回空 Q），
+    否则 search_ngram_query 返回 NULL，所有行都会被过滤掉
+    """
+    if not SEARCH_NON_ALNUM_RE.sub("", term):
+        return Q()
+    return Q(NgramMatch(search_ngrams(*fields), term))
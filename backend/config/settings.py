@@ -2,6 +2,7 @@
 Django settings for dachuang management system project.
 """
 
+import importlib.util
 import os
 from pathlib import Path
 from datetime import timedelta
@@ -110,6 +111,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "apps.utils.request_cache.RequestCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -156,9 +158,30 @@ DATABASES = {
         "PASSWORD": _db_password,
         "HOST": _db_host,
         "PORT": _db_port,
+        "OPTIONS": {"connect_timeout": _env_int("DB_CONNECT_TIMEOUT", 10)},
     }
 }
 
+# Connection reuse: "none" opens a connection per request, "persistent" keeps it
+# for DB_CONN_MAX_AGE seconds (checked before reuse), "pool" uses Django's psycopg 3
+# connection pool and falls back to "persistent" when psycopg_pool is not installed.
+DB_CONN_MODE = (_env_value("DB_CONN_MODE") or "persistent").lower()
+if DB_CONN_MODE not in {"none", "persistent", "pool"}:
+    raise RuntimeError("DB_CONN_MODE must be one of: none, persistent, pool.")
+if DB_CONN_MODE == "pool" and not (
+    importlib.util.find_spec("psycopg") and importlib.util.find_spec("psycopg_pool")
+):
+    DB_CONN_MODE = "persistent"
+if DB_CONN_MODE == "persistent":
+    DATABASES["default"]["CONN_MAX_AGE"] = _env_int("DB_CONN_MAX_AGE", 60)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+elif DB_CONN_MODE == "pool":
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": _env_int("DB_POOL_MIN_SIZE", 2),
+        "max_size": _env_int("DB_POOL_MAX_SIZE", 10),
+        "timeout": _env_int("DB_POOL_TIMEOUT", 10),
+    }
+
 # Custom User Model
 AUTH_USER_MODEL = "users.User"
 
@@ -210,6 +233,86 @@ DATA_UPLOAD_MAX_MEMORY_SIZE = _env_int(
 DATA_UPLOAD_MAX_NUMBER_FILES = _env_int("DJANGO_DATA_UPLOAD_MAX_NUMBER_FILES", 20)
 DATA_UPLOAD_MAX_NUMBER_FIELDS = _env_int("DJANGO_DATA_UPLOAD_MAX_NUMBER_FIELDS", 2000)
 
+# Bulk attachment ZIP downloads stream by default; enable spooling to a temporary
+# file when a proxy in front of the app requires a Content-Length header.
+EXPORT_ZIP_SPOOL_TO_DISK = _env_bool("DJANGO_EXPORT_ZIP_SPOOL_TO_DISK", False)
+# Worker processes used to render batch application documents (.docx). The pool
+# forks the current process, which is unsafe from multi-threaded servers and
+# unavailable on Windows, so it is opt-in: the default of 1 keeps rendering in
+# the request/task process. Enable it only under process-based workers.
+DOCUMENT_EXPORT_WORKERS = _env_int("DJANGO_DOCUMENT_EXPORT_WORKERS", 1)
+# Optional directory holding project_application.docx / project_midterm.docx /
+# project_closure.docx templates with {{placeholder}} fields; built-in layouts
+# are used for any template that is missing.
+DOCUMENT_TEMPLATE_DIR = _env_value("DJANGO_DOCUMENT_TEMPLATE_DIR")
+# Batch review requests covering more reviews than this run as a background
+# task (see the task center) instead of inside the HTTP request.
+BATCH_REVIEW_ASYNC_THRESHOLD = _env_int("DJANGO_BATCH_REVIEW_ASYNC_THRESHOLD", 100)
+# Publishing more projects than this runs as a background task with progress
+# reported in the task center.
+PUBLICATION_ASYNC_THRESHOLD = _env_int("DJANGO_PUBLICATION_ASYNC_THRESHOLD", 200)
+
+# Shared cache used by apps.utils.cache (settings, dictionaries, workflow graph
+# versions, dashboards, counters). Every worker must see the same entries and
+# invalidations, so with DJANGO_DEBUG=false the cache defaults to the Celery
+# broker's Redis when DJANGO_CACHE_URL is unset. Only development falls back to
+# a per-process local-memory cache.
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CACHE_URL = _env_value("DJANGO_CACHE_URL")
+if not CACHE_URL and not DEBUG:
+    if not CELERY_BROKER_URL.startswith(("redis://", "rediss://", "unix://")):
+        raise RuntimeError(
+            "DJANGO_CACHE_URL must point at a shared Redis cache when DJANGO_DEBUG=false."
+        )
+    CACHE_URL = CELERY_BROKER_URL
+CACHE_KEY_PREFIX = _env_value("DJANGO_CACHE_KEY_PREFIX") or "dachuang"
+if CACHE_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": CACHE_KEY_PREFIX,
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+        }
+    }
+# Record per-namespace hit/miss counters in the shared cache (one extra
+# increment per lookup, so off by default); see `manage.py cache_stats`.
+CACHE_STATS_ENABLED = _env_bool("DJANGO_CACHE_STATS_ENABLED", False)
+
+# Cross-request cache lifetime (seconds) for the current batch and its settings;
+# entries are invalidated whenever a batch or setting is saved.
+SYSTEM_SETTINGS_CACHE_TIMEOUT = _env_int("DJANGO_SYSTEM_SETTINGS_CACHE_TIMEOUT", 300)
+
+# Short-lived per-user/per-scope dashboard cache (seconds); project and review
+# status changes invalidate it early.
+DASHBOARD_CACHE_TIMEOUT = _env_int("DJANGO_DASHBOARD_CACHE_TIMEOUT", 60)
+
+# Lifetime (seconds) of the per-user unread notification counters. Counters are
+# adjusted in place after each commit; the timeout bounds drift from races.
+# Only used with a shared cache; a local-memory cache counts from the database.
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = _env_int(
+    "DJANGO_NOTIFICATION_UNREAD_CACHE_TIMEOUT", 600
+)
+
+# Lifetime (seconds) of the per-process compiled workflow graphs. They are also
+# dropped as soon as the shared workflow version changes; the timeout bounds how
+# long another worker can route approvals through an outdated graph.
+WORKFLOW_PROCESS_CACHE_TIMEOUT = _env_int("DJANGO_WORKFLOW_PROCESS_CACHE_TIMEOUT", 5)
+
+# Lifetime (seconds) of the cached active-dictionary snapshot; any dictionary
+# type or item write switches to a new snapshot version immediately.
+DICTIONARY_CACHE_TIMEOUT = _env_int("DJANGO_DICTIONARY_CACHE_TIMEOUT", 3600)
+
+# Lifetime (seconds) of list totals cached for ?count=cached and cursor pages.
+PAGINATION_COUNT_CACHE_TIMEOUT = _env_int("DJANGO_PAGINATION_COUNT_CACHE_TIMEOUT", 60)
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -307,8 +410,7 @@ LOGGING = {
     },
 }
 
-# Celery / async task settings
-CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+# Celery / async task settings (CELERY_BROKER_URL is read with the cache settings)
 CELERY_RESULT_BACKEND = os.environ.get(
     "CELERY_RESULT_BACKEND", CELERY_BROKER_URL
 )
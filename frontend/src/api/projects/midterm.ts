@@ -11,6 +11,17 @@ export function getProjectExpertSummary(
   });
 }
 
+export function getProjectExpertSummaries(params: {
+  review_type?: string;
+  project_ids: number[];
+}) {
+  return request({
+    url: "/projects/expert-summaries/",
+    method: "get",
+    params: { ...params, project_ids: params.project_ids.join(",") },
+  });
+}
+
 export function finalizeMidterm(
   projectId: number,
   data: { action: "pass" | "return"; reason?: string }